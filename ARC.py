@@ -9,8 +9,8 @@ import argparse
 import logging
 import os
 
-from arc.common import read_yaml_file
 from arc.main import ARC
+from arc.serialization import read_file
 
 
 def parse_command_line_arguments(command_line_args=None):
@@ -46,7 +46,7 @@ def main():
     args = parse_command_line_arguments()
     input_file = args.file
     project_directory = os.path.abspath(os.path.dirname(args.file))
-    input_dict = read_yaml_file(path=input_file, project_directory=project_directory)
+    input_dict = read_file(path=input_file, project_directory=project_directory)
     try:
         input_dict['project']
     except KeyError:
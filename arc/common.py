@@ -362,8 +362,88 @@ def save_yaml_file(path: str,
     content = yaml.dump(data=content)
     if os.path.dirname(path) and not os.path.exists(os.path.dirname(path)):
         os.makedirs(os.path.dirname(path))
-    with open(path, 'w') as f:
+    # write to a temporary file and then replace the original file, so a crash mid-write won't corrupt it
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
         f.write(content)
+    os.replace(temp_path, path)
+
+
+def append_yaml_document(path: str,
+                         content: list or dict,
+                         ) -> None:
+    """
+    Append a document to a multi-document YAML file (e.g., a restart journal).
+    The file is flushed to the disk, so a crash could at most truncate the last appended document.
+
+    Args:
+        path (str): The YAML file path to append to.
+        content (list, dict): The content to append as a new document.
+    """
+    yaml.add_representer(str, string_representer)
+    content = yaml.dump(data=content, explicit_start=True)
+    with open(path, 'a') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_yaml_documents(path: str) -> list:
+    """
+    Read all documents of a multi-document YAML file.
+    Reading stops at the first corrupted document (e.g., a document truncated by a crash while it was written).
+
+    Args:
+        path (str): The YAML file path to read.
+
+    Returns:
+        list: The documents read from the file.
+    """
+    documents = list()
+    with open(path, 'r') as f:
+        try:
+            for document in yaml.load_all(stream=f, Loader=yaml.FullLoader):
+                documents.append(document)
+        except yaml.YAMLError:
+            logger.warning(f'Could not read the documents in {path} after document number {len(documents)}.')
+    return documents
+
+
+def replay_restart_journal(restart_dict: dict,
+                           journal_path: str,
+                           ) -> dict:
+    """
+    Apply the incremental updates recorded in a restart journal to a restart dictionary.
+    The journal is only replayed if it was started for this restart dictionary (i.e., if the journal IDs match).
+
+    Args:
+        restart_dict (dict): The restart dictionary read from the restart file.
+        journal_path (str): The restart journal file path.
+
+    Returns:
+        dict: The updated restart dictionary.
+    """
+    if 'restart_journal_id' not in restart_dict or not os.path.isfile(journal_path):
+        return restart_dict
+    documents = read_yaml_documents(journal_path)
+    if not documents or not isinstance(documents[0], dict) \
+            or documents[0].get('restart_journal_id') != restart_dict['restart_journal_id']:
+        return restart_dict
+    species_dicts = {species_dict['label']: species_dict for species_dict in restart_dict.get('species', list())}
+    for delta in documents[1:]:
+        if not isinstance(delta, dict):
+            continue
+        restart_dict.setdefault('output', dict()).update(delta.get('output', dict()))
+        species_dicts.update(delta.get('species', dict()))
+        restart_dict.setdefault('running_jobs', dict()).update(delta.get('running_jobs', dict()))
+        for label in delta.get('removed', list()):
+            # a species which was removed from the project
+            species_dicts.pop(label, None)
+            restart_dict['output'].pop(label, None)
+            restart_dict['running_jobs'].pop(label, None)
+    restart_dict['species'] = list(species_dicts.values())
+    logger.debug(f'Replayed {len(documents) - 1} restart journal entries from {journal_path}')
+    return restart_dict
 
 
 def globalize_paths(file_path: str,
@@ -425,6 +505,128 @@ def globalize_path(string: str,
     return string
 
 
+class LazyFileLines(object):
+    """
+    A lazily read (and cached) sequence of the lines of a text file, either in forward or in reverse order.
+    Lines are only read as far as they are accessed, so a large file is never read entirely if only its beginning
+    (or its end, if ``reverse`` is ``True``) is needed. In reverse order, the file is read in blocks from its end.
+    Lines are returned as by ``readlines()``, i.e., with their trailing newline character.
+
+    Usage::
+
+        with LazyFileLines(path, reverse=True) as reverse_lines:
+            for line in reverse_lines:
+                ...
+
+    Args:
+        path (str): The file path.
+        reverse (bool, optional): Whether to read the lines from the end of the file.
+        block_size (int, optional): The size in bytes of blocks read from the end of the file in reverse order.
+    """
+
+    def __init__(self, path: str, reverse: bool = False, block_size: int = 65536):
+        self.path = path
+        self.reverse = reverse
+        self.block_size = block_size
+        self._lines = list()
+        self._exhausted = False
+        if reverse:
+            self._file = open(path, 'rb')
+            self._position = self._file.seek(0, os.SEEK_END)
+            self._buffer = b''  # the (possibly incomplete) line preceding the lines already read
+            self._terminated = False  # whether the buffer is followed by a newline character
+        else:
+            self._file = open(path, 'r')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            while self._read_more():
+                pass
+        else:
+            while index >= len(self._lines) and self._read_more():
+                pass
+        return self._lines[index]
+
+    def __iter__(self):
+        i = 0
+        while True:
+            try:
+                line = self[i]
+            except IndexError:
+                return
+            yield line
+            i += 1
+
+    def __len__(self):
+        while self._read_more():
+            pass
+        return len(self._lines)
+
+    def _read_more(self) -> bool:
+        """
+        Read more lines from the file.
+
+        Returns:
+            bool: Whether more lines could be read.
+        """
+        if self._exhausted:
+            return False
+        if not self.reverse:
+            line = self._file.readline()
+            if line:
+                self._lines.append(line)
+                return True
+            self._exhausted = True
+            self.close()
+            return False
+        num_lines = len(self._lines)
+        if self._position == 0:
+            # the buffer is the first line of the file
+            if self._buffer or self._terminated:
+                self._lines.append(self._decode(self._buffer, self._terminated))
+            self._exhausted = True
+            self.close()
+        else:
+            read_size = min(self.block_size, self._position)
+            self._position -= read_size
+            self._file.seek(self._position)
+            parts = (self._file.read(read_size) + self._buffer).split(b'\n')
+            for i in range(len(parts) - 1, 0, -1):
+                terminated = i < len(parts) - 1 or self._terminated
+                if parts[i] or terminated:
+                    self._lines.append(self._decode(parts[i], terminated))
+            self._buffer = parts[0]
+            self._terminated = self._terminated or len(parts) > 1
+        return len(self._lines) > num_lines or not self._exhausted
+
+    @staticmethod
+    def _decode(line: bytes, terminated: bool) -> str:
+        """
+        Decode a line read in binary mode.
+
+        Args:
+            line (bytes): The line without its newline character.
+            terminated (bool): Whether the line is followed by a newline character in the file.
+
+        Returns:
+            str: The decoded line.
+        """
+        line = line.decode('utf-8', errors='replace')
+        if line.endswith('\r'):
+            line = line[:-1]
+        return line + '\n' if terminated else line
+
+
 def string_representer(dumper, data):
     """
     Add a custom string representer to use block literals for multiline strings.
@@ -493,15 +695,105 @@ def colliding_atoms(xyz: dict,
     Returns:
          bool: ``True`` if they are colliding, ``False`` otherwise.
     """
-    if len(xyz['symbols']) == 1:
-        # monoatomic
-        return False
+    return colliding_atoms_list([xyz], threshold=threshold)[0]
+
+
+def colliding_atoms_list(xyzs: List[dict],
+                         threshold: float = 0.55,
+                         ) -> List[bool]:
+    """
+    Check whether atoms are too close to each other in each of several geometries (see ``colliding_atoms()``),
+    e.g., in many conformers of the same species. Each geometry is screened by ``get_colliding_atoms()``,
+    which stops at the first colliding pair of atoms.
+
+    Args:
+        xyzs (List[dict]): Entries are Cartesian coordinates.
+        threshold (float, optional): The collision threshold to use.
+
+    Returns:
+         List[bool]: Entries are ``True`` if atoms are colliding in the respective geometry, ``False`` otherwise.
+    """
+    collisions, radii, symbols = list(), None, None
+    for xyz in xyzs:
+        if xyz['symbols'] != symbols:
+            symbols = xyz['symbols']
+            radii = np.array([get_covalent_radius(symbol) for symbol in symbols]) * threshold
+        collisions.append(get_colliding_atoms(coords=xyz['coords'], radii=radii) is not None)
+    return collisions
+
+
+def get_colliding_atoms(coords: Union[list, tuple, np.ndarray],
+                        radii: np.ndarray,
+                        ) -> Optional[Tuple[int, int]]:
+    """
+    Get a pair of atoms which are too close to each other, i.e., their distance is shorter than the sum of their radii.
+    Atoms are hashed into a uniform grid with a cell size of the largest collision distance, so only atoms in the same
+    or in adjacent cells are compared. Each of the 14 (half) neighboring cell directions is screened in one vectorized
+    step, and the screening stops at the first direction in which colliding atoms are found.
+
+    Args:
+        coords (Union[list, tuple, np.ndarray]): The Cartesian coordinates (in Angstrom).
+        radii (np.ndarray): The atomic collision radii (in Angstrom), e.g., fractions of the covalent radii.
+
+    Returns:
+        Optional[Tuple[int, int]]: The 0-indexed atom indices of a colliding pair, ``None`` if no atoms collide.
+    """
+    num_atoms = len(coords)
+    if num_atoms < 2:
+        return None
+    coords = np.asarray(coords, dtype=np.float64)
+    cell_size = 2 * float(np.max(radii))
+    if cell_size <= 0:
+        return None
+    cells = np.floor(coords / cell_size).astype(np.int64)
+    cells -= cells.min(axis=0) - 1  # pad by one cell, so keys of neighboring cells are valid
+    dims = cells.max(axis=0) + 2
+    strides = np.array([dims[1] * dims[2], dims[2], 1], dtype=np.int64)
+    keys = cells @ strides
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    for offset in HALF_NEIGHBOR_CELL_OFFSETS:
+        target_keys = keys + int(np.dot(offset, strides))
+        starts = np.searchsorted(sorted_keys, target_keys, side='left')
+        counts = np.searchsorted(sorted_keys, target_keys, side='right') - starts
+        num_pairs = int(counts.sum())
+        if not num_pairs:
+            continue
+        # expand the (atom, atoms in the target cell) ranges into pairs of atom indices
+        first = np.repeat(np.arange(num_atoms), counts)
+        second = order[np.repeat(starts, counts) + np.arange(num_pairs) - np.repeat(np.cumsum(counts) - counts, counts)]
+        if offset == (0, 0, 0):
+            mask = first < second
+            first, second = first[mask], second[mask]
+        distances = np.sqrt(np.sum((coords[first] - coords[second]) ** 2, axis=1))
+        colliding = np.flatnonzero(distances < radii[first] + radii[second])
+        if colliding.size:
+            i, j = int(first[colliding[0]]), int(second[colliding[0]])
+            return min(i, j), max(i, j)
+    return None
+
+
+def get_covalent_radius(symbol: str) -> float:
+    """
+    Get the covalent radius of an element (as used by ``qcel.molutil.guess_connectivity()``).
+
+    Args:
+        symbol (str): The chemical element symbol.
+
+    Returns:
+        float: The covalent radius in Angstrom.
+    """
+    if symbol not in COVALENT_RADII:
+        COVALENT_RADII[symbol] = qcel.covalentradii.get(symbol, units='bohr', missing=4.0) / 1.8897259886  # Bohr to A
+    return COVALENT_RADII[symbol]
+
 
-    geometry = np.array([np.array(coord, np.float64) * 1.8897259886 for coord in xyz['coords']])  # convert A to Bohr
-    qcel_out = qcel.molutil.guess_connectivity(symbols=xyz['symbols'], geometry=geometry, threshold=threshold)
-    logger.debug(qcel_out)
+# Covalent radii (in Angstrom) of the elements used so far, keys are element symbols
+COVALENT_RADII = dict()
 
-    return bool(len(qcel_out))
+# The cell offsets needed to compare each pair of neighboring cells in a uniform grid once, the cell itself first
+HALF_NEIGHBOR_CELL_OFFSETS = [(0, 0, 0)] + [(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)
+                                            if (i, j, k) > (0, 0, 0)]
 
 
 # a bond length dictionary of single bonds, Angstrom
@@ -10,6 +10,7 @@ import os
 import time
 import unittest
 
+import numpy as np
 import pandas as pd
 from rmgpy.molecule.molecule import Molecule
 
@@ -55,6 +56,54 @@ class TestCommon(unittest.TestCase):
         with self.assertRaises(InputError):
             common.read_yaml_file('nopath')
 
+    def test_replay_restart_journal(self):
+        """Test appending to and replaying a restart journal"""
+        journal_path = os.path.join(arc_path, 'arc', 'testing', 'restart_journal.yml')
+        restart_dict = {'project': 'journal_test', 'restart_journal_id': 'abc',
+                        'output': {'H2O': {'convergence': None}},
+                        'species': [{'label': 'H2O', 'multiplicity': 1}],
+                        'running_jobs': {'H2O': [{'job_name': 'opt_a1'}]}}
+        common.save_yaml_file(path=journal_path, content={'restart_journal_id': 'abc'})
+        common.append_yaml_document(path=journal_path, content={'output': {'H2O': {'convergence': True}},
+                                                                'running_jobs': {'H2O': []}})
+        common.append_yaml_document(path=journal_path, content={'species': {'OH': {'label': 'OH', 'multiplicity': 2}},
+                                                                'running_jobs': {'OH': [{'job_name': 'opt_a2'}]}})
+        common.append_yaml_document(path=journal_path, content={'species': {'H2': {'label': 'H2', 'multiplicity': 1}},
+                                                                'output': {'H2': {'convergence': None}}})
+        common.append_yaml_document(path=journal_path, content={'removed': ['H2']})  # e.g., a species was removed
+        with open(journal_path, 'a') as f:
+            f.write('---\nspecies: {OH: [truncated')  # a crash while appending the last entry
+        self.assertEqual(len(common.read_yaml_documents(journal_path)), 5)
+        replayed_dict = common.replay_restart_journal(restart_dict=copy.deepcopy(restart_dict),
+                                                      journal_path=journal_path)
+        self.assertEqual(replayed_dict['output'], {'H2O': {'convergence': True}})
+        self.assertEqual(replayed_dict['species'], [{'label': 'H2O', 'multiplicity': 1},
+                                                    {'label': 'OH', 'multiplicity': 2}])
+        self.assertEqual(replayed_dict['running_jobs'], {'H2O': [], 'OH': [{'job_name': 'opt_a2'}]})
+        # a journal started for a different restart file is ignored
+        restart_dict['restart_journal_id'] = 'def'
+        self.assertEqual(common.replay_restart_journal(restart_dict=copy.deepcopy(restart_dict),
+                                                       journal_path=journal_path), restart_dict)
+        os.remove(journal_path)
+
+    def test_lazy_file_lines(self):
+        """Test reading the lines of a file lazily, in forward and in reverse order"""
+        path = os.path.join(arc_path, 'arc', 'testing', 'composite', 'SO2OO_CBS-QB3.log')
+        with open(path, 'r') as f:
+            lines = f.readlines()
+        with common.LazyFileLines(path, reverse=True, block_size=100) as reverse_lines:
+            self.assertEqual(reverse_lines[0], lines[-1])
+            self.assertEqual(reverse_lines[10], lines[-11])
+            self.assertLess(len(reverse_lines._lines), 20)  # only the end of the file was read
+            self.assertEqual(list(reverse_lines), lines[::-1])
+            self.assertEqual(reverse_lines[-1], lines[0])
+        with common.LazyFileLines(path) as forward_lines:
+            self.assertEqual(forward_lines[3], lines[3])
+            self.assertEqual(len(forward_lines._lines), 4)
+            self.assertEqual(len(forward_lines), len(lines))
+            with self.assertRaises(IndexError):
+                forward_lines[len(lines)]
+
     def test_get_git_commit(self):
         """Test the get_git_commit() function"""
         git_commit = common.get_git_commit()
@@ -183,6 +232,24 @@ H       1.98414750   -0.79355889   -0.24492049"""  # colliding atoms
         self.assertTrue(common.colliding_atoms(converter.str_to_xyz(xyz_2)))
         self.assertTrue(common.colliding_atoms(converter.str_to_xyz(xyz_3)))
 
+    def test_colliding_atoms_list(self):
+        """Test screening many geometries for colliding atoms in a batch"""
+        xyz_no = converter.str_to_xyz("""C      0.0 0.0 0.0
+H       0.0 0.0 1.09""")
+        xyz_yes = converter.str_to_xyz("""C      0.0 0.0 0.0
+H       0.0 0.0 0.5""")
+        xyz_far = converter.str_to_xyz("""C      0.0 0.0 0.0
+H       0.0 0.0 1.09
+O       0.0 0.0 25.0
+O       0.0 0.5 25.0""")
+        self.assertEqual(common.colliding_atoms_list([xyz_no, xyz_yes, xyz_far, xyz_no]), [False, True, True, False])
+        self.assertEqual(common.colliding_atoms_list(list()), list())
+
+        radii = np.array([common.get_covalent_radius(symbol) for symbol in xyz_far['symbols']]) * 0.55
+        self.assertEqual(common.get_colliding_atoms(xyz_far['coords'], radii), (2, 3))
+        self.assertIsNone(common.get_colliding_atoms(xyz_no['coords'], radii[:2]))
+        self.assertAlmostEqual(common.get_covalent_radius('C'), 0.76, 2)
+
     def test_check_ess_settings(self):
         """Test the check_ess_settings function"""
         server_names = list(servers.keys())
@@ -11,13 +11,14 @@ import math
 import os
 import shutil
 import yaml
+from typing import List, Tuple
 
 from arc.common import determine_model_chemistry_type, get_logger
 from arc.exceptions import JobError, InputError
 from arc.job.inputs import input_files
 from arc.job.local import get_last_modified_time, submit_job, delete_job, execute_command, check_job_status, \
     rename_output
-from arc.job.submit import submit_scripts
+from arc.job.submit import array_submit_scripts, submit_scripts
 from arc.job.ssh import SSHClient
 from arc.job.trsh import determine_ess_status, trsh_job_on_server
 from arc.plotter import save_geo
@@ -1333,9 +1334,14 @@ end
             if os.path.isfile(xyz_path):
                 self.local_path_to_xyz = xyz_path
 
-    def run(self):
+    def run(self, submit=True):
         """
         Execute the Job.
+
+        Args:
+            submit (bool, optional): Whether to submit the job to the server queue. If ``False``, only the submit script
+                                     and the input file are written, e.g., so the job could be submitted later
+                                     as a task of a job array (see ``submit_job_array()``).
         """
         if self.fine:
             logger.info(f'Running job {self.job_name} for {self.species_name} (fine opt)')
@@ -1351,6 +1357,13 @@ end
         self.write_submit_script()
         logger.debug('writing input file...')
         self.write_input_file()
+        if submit:
+            self.submit_to_queue()
+
+    def submit_to_queue(self):
+        """
+        Submit the Job to the server queue. The submit script and the input file should have already been written.
+        """
         if self.server != 'local':
             ssh = SSHClient(self.server)
             logger.debug('submitting job...')
@@ -1364,7 +1377,8 @@ end
                 self.job_status[0], self.job_id = ssh.submit_job(remote_path=self.remote_path)
         else:
             # running locally
-            self.job_status[0], self.job_id = submit_job(path=self.local_path)
+            self.job_status[0], self.job_id = submit_job(path=self.local_path, cpus=self.cpu_cores,
+                                                         memory=self.total_job_memory_gb)
 
     def delete(self):
         """
@@ -1425,7 +1439,7 @@ end
         lines1, lines2 = list(), list()
         content = ''
         cluster_soft = servers[self.server]['cluster_soft'].lower()
-        if cluster_soft in ['oge', 'sge']:
+        if cluster_soft in ['oge', 'sge', 'local']:
             local_file_path1 = os.path.join(self.local_path, 'out.txt')
             local_file_path2 = os.path.join(self.local_path, 'err.txt')
             if self.server != 'local':
@@ -1793,6 +1807,9 @@ end
         elif cluster_software in ['slurm']:
             # In Slurm, `#SBATCH --mem-per-cpu={2000}` specify the amount of memory required per cpu core to be 2000 MB.
             self.submit_script_memory = math.ceil(total_submit_script_memory / self.cpu_cores)  # MB
+        elif cluster_software in ['local']:
+            # ARC's local process pool accounts for the total job memory, write it to the submit script like in OGE.
+            self.submit_script_memory = math.ceil(total_submit_script_memory)  # MB
 
         # determine amount of memory in job input file based on ESS
         if self.software.lower() in ['molpro', 'terachem']:
@@ -1887,3 +1904,94 @@ end
                 self.additional_files_to_upload.append({'name': 'geo', 'source': 'path', 'make_x': False,
                                                         'local': os.path.join(self.local_path, 'coord.xyz'),
                                                         'remote': os.path.join(self.remote_path, 'coord.xyz')})
+
+
+def get_job_array_directives(job: Job) -> Tuple[str, ...]:
+    """
+    Get the resource directives (e.g., memory, time, and cpus) of a job's submit script,
+    which are used as the directives of a job array the job is a task of.
+    Directives which must be unique per array (e.g., the job name) are excluded.
+
+    Args:
+        job (Job): The job, its submit script should have already been written (see ``Job.run(submit=False)``).
+
+    Returns:
+        Tuple[str, ...]: The directive lines.
+    """
+    if servers[job.server]['cluster_soft'].lower() == 'slurm':
+        directive_prefix, excluded_directives = '#SBATCH', ['-J', '--job-name', '--array', '-a']
+    else:
+        directive_prefix, excluded_directives = '#$', ['-N', '-o', '-e', '-t']
+    directives = list()
+    for line in job.submit.splitlines():
+        splits = line.split()
+        if len(splits) > 1 and splits[0] == directive_prefix and splits[1].split('=')[0] not in excluded_directives:
+            directives.append(line)
+    return tuple(directives)
+
+
+def submit_job_array(jobs: List[Job]) -> str:
+    """
+    Submit several same-shaped jobs (same server, software, and resources) as a single job array (Slurm)
+    or task array (OGE). The submit script and the input file of each job should have already been written
+    (see ``Job.run(submit=False)``). Each array task runs the regular submit script of its job in the job's folder,
+    and the job ID of each job is set to an '<array job ID>_<task ID>' string, so its status is tracked
+    (and it could be troubleshooted) just like any other job.
+
+    Args:
+        jobs (List[Job]): The jobs to submit as array tasks.
+
+    Raises:
+        JobError: If the jobs don't all run on the same server, or have different resource directives.
+
+    Returns:
+        str: The job array submission status, 'running' if the submission was successful.
+    """
+    first_job = jobs[0]
+    server = first_job.server
+    if any(job.server != server for job in jobs):
+        raise JobError(f'All tasks of a job array must run on the same server, got: {[job.server for job in jobs]}')
+    cluster_soft = servers[server]['cluster_soft']
+    # the resource directives (e.g., memory, time, and cpus) of the array are those of the tasks
+    directives = get_job_array_directives(first_job)
+    for job in jobs[1:]:
+        if get_job_array_directives(job) != directives:
+            raise JobError(f'All tasks of a job array must have the same resource directives, got:\n'
+                           f'{first_job.job_name}: {directives}\n{job.job_name}: {get_job_array_directives(job)}')
+    if server != 'local':
+        task_dirs = [f'"$HOME/{job.remote_path}"' for job in jobs]
+    else:
+        task_dirs = [f'"{job.local_path}"' for job in jobs]
+    array_name = first_job.job_server_name
+    array_submit = array_submit_scripts[cluster_soft].format(name=array_name,
+                                                             directives='\n'.join(directives),
+                                                             num_tasks=len(jobs),
+                                                             task_dirs=' '.join(task_dirs),
+                                                             submit_filename=submit_filename[cluster_soft])
+    folder_name = 'TSs' if first_job.is_ts else 'Species'
+    local_path = os.path.join(first_job.project_directory, 'calcs', folder_name, first_job.species_name,
+                              'arrays', array_name)
+    if not os.path.isdir(local_path):
+        os.makedirs(local_path)
+    with open(os.path.join(local_path, submit_filename[cluster_soft]), 'w') as f:
+        f.write(array_submit)
+    logger.info(f'Submitting jobs {[job.job_name for job in jobs]} for {first_job.species_name} '
+                f'as job array {array_name}')
+    if server != 'local':
+        # parentheses don't play well in folder names:
+        species_name_for_remote_path = first_job.species_name.replace('(', '_').replace(')', '_')
+        remote_path = os.path.join('runs', 'ARC_Projects', first_job.project, species_name_for_remote_path,
+                                   'arrays', array_name)
+        ssh = SSHClient(server)
+        ssh.send_command_to_server(command=f'mkdir -p {remote_path}')
+        ssh.upload_file(remote_file_path=os.path.join(remote_path, submit_filename[cluster_soft]),
+                        file_string=array_submit)
+        status, array_id = ssh.submit_job(remote_path=remote_path)
+    else:
+        status, array_id = submit_job(path=local_path)
+    for i, job in enumerate(jobs):
+        if status == 'running':
+            job.job_status[0], job.job_id = status, f'{array_id}_{i + 1}'
+        else:
+            job.job_status[0], job.job_id = 'errored', 0
+    return status
@@ -5,15 +5,20 @@
 This module contains unit tests of the arc.job.job module
 """
 
+import copy
 import datetime
 import math
 import os
 import shutil
+import time
 import unittest
+from unittest.mock import patch
 
-from arc.exceptions import InputError
-from arc.job.job import Job
-from arc.settings import arc_path
+import arc.job.local as local
+from arc.exceptions import InputError, JobError
+from arc.job.job import Job, get_job_array_directives, submit_job_array
+from arc.job.submit import submit_scripts
+from arc.settings import arc_path, servers
 
 
 class TestJob(unittest.TestCase):
@@ -408,6 +413,61 @@ class TestJob(unittest.TestCase):
         self.assertEqual(test_job.basis_set, basis_expected)
         self.assertEqual(test_job.auxiliary_basis_set, auxillary_expected)
 
+    def test_run_job_on_a_local_server_without_a_queue(self):
+        """Test running a Job end-to-end on a 'local' server with the 'Local' cluster software (no queue)"""
+        local_gaussian = """#!/bin/bash
+echo "memory: {memory}, cpus: {cpus}"
+for i in 1 2 3 4 5; do echo " Leave Link    1 at $i" >> input.log; done
+echo " Normal termination of Gaussian 16" >> input.log
+"""
+        with patch.dict(servers, {'local': {'cluster_soft': 'Local', 'un': '<username>', 'cpus': 4, 'memory': 16}}), \
+                patch.dict(submit_scripts, {'local': {'gaussian': local_gaussian}}), \
+                patch.object(local, '_local_executor', None):
+            job = Job(project='arc_project_for_testing_delete_after_usage3', ess_settings={'gaussian': ['local']},
+                      species_name='tst_spc', xyz=self.xyz_c, job_type='sp',
+                      job_level_of_theory_dict={'method': 'b3lyp', 'basis': '6-31+g(d)'}, multiplicity=3,
+                      job_num=101, cpu_cores=2, total_job_memory_gb=4, testing=True,
+                      project_directory=os.path.join(arc_path, 'Projects',
+                                                     'arc_project_for_testing_delete_after_usage3'))
+            self.assertEqual(job.server, 'local')
+            self.assertEqual(job.submit_script_memory, math.ceil(4 * 1024 * 1.1))  # total MB
+            job.run()
+            self.assertIn(f'memory: {job.submit_script_memory}, cpus: 2', job.submit)
+            self.assertEqual(job.job_status[0], 'running')
+            self.assertIsInstance(job.job_id, int)
+            for _ in range(100):
+                job.determine_job_status()
+                if job.job_status[0] == 'done':
+                    break
+                time.sleep(0.1)
+            self.assertEqual(job.job_status[0], 'done')
+            self.assertEqual(job.job_status[1]['status'], 'done')
+            self.assertTrue(os.path.isfile(os.path.join(job.local_path, 'output.out')))
+            with open(os.path.join(job.local_path, 'out.txt'), 'r') as f:
+                self.assertEqual(f.read(), f'memory: {job.submit_script_memory}, cpus: 2\n')
+
+    def test_get_job_array_directives(self):
+        """Test getting the resource directives of a job array task"""
+        job1, job2 = copy.copy(self.job1), copy.copy(self.job1)
+        job1.submit = """#!/bin/bash -l
+#$ -N a100
+#$ -l long
+#$ -l h_rt=120:00:00
+#$ -pe singlenode 8
+#$ -l h=!node60.cluster
+#$ -cwd
+#$ -o out.txt
+#$ -e err.txt
+
+g16 < input.gjf > input.log
+"""
+        self.assertEqual(get_job_array_directives(job1), ('#$ -l long', '#$ -l h_rt=120:00:00',
+                                                          '#$ -pe singlenode 8', '#$ -l h=!node60.cluster',
+                                                          '#$ -cwd'))
+        job2.job_name, job2.submit = 'opt_a101', job1.submit.replace('a100', 'a101').replace('120:00', '24:00')
+        with self.assertRaises(JobError):
+            submit_job_array([job1, job2])
+
     @classmethod
     def tearDownClass(cls):
         """
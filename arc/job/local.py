@@ -5,23 +5,200 @@
 A module for running jobs on the local machine.
 When transitioning to Python 3, use
 `subprocess.run() <https://docs.python.org/3/library/subprocess.html#subprocess.run>`_
+
+Jobs are submitted to the local cluster software queue (OGE or Slurm), unless the cluster software of the 'local'
+server is set to 'Local', in which case jobs are executed directly by ARC in a local process pool
+(see ``LocalExecutor``), e.g., on a workstation without a batch system.
 """
 
 import datetime
 import os
 import re
 import shutil
+import signal
 import subprocess
+import threading
 import time
 
 from arc.common import get_logger
 from arc.exceptions import SettingsError
-from arc.job.ssh import check_job_status_in_stdout
-from arc.settings import servers, check_status_command, submit_command, submit_filename, delete_command, output_filename
+from arc.job.ssh import check_job_status_in_stdout, format_job_id_for_deletion, get_job_ids_from_status_line
+from arc.settings import (servers, check_status_command, default_job_settings, submit_command, submit_filename,
+                          delete_command, output_filename)
 
 
 logger = get_logger()
 
+_local_executor = None
+
+
+class LocalExecutor(object):
+    """
+    Execute jobs on the local machine without a cluster software queue.
+    Each job's submit script is executed by bash in the job's folder as a separate process (stdout and stderr are
+    written to out.txt and err.txt, respectively, like in OGE). Jobs are started in the order they were submitted
+    as long as enough CPU cores and memory are free, a job which requests more than the total resources is
+    executed alone.
+
+    Args:
+        cpus (int): The total number of CPU cores available for jobs.
+        memory (float): The total memory available for jobs in GB.
+
+    Attributes:
+        cpus (int): The total number of CPU cores available for jobs.
+        memory (float): The total memory available for jobs in GB.
+        used_cpus (int): The number of CPU cores allocated to the currently running jobs.
+        used_memory (float): The memory allocated to the currently running jobs in GB.
+        pending (list): Entries are (job ID, job folder path, CPU cores, memory) tuples of jobs waiting for resources.
+        processes (dict): Keys are job IDs of running jobs, values are (process, CPU cores, memory) tuples.
+        finished (dict): Keys are job IDs of finished jobs, values are the process return codes.
+    """
+
+    def __init__(self, cpus, memory):
+        self.cpus = cpus
+        self.memory = memory
+        self.used_cpus = 0
+        self.used_memory = 0
+        self.pending = list()
+        self.processes = dict()
+        self.finished = dict()
+        self._last_job_id = 0
+        self._lock = threading.RLock()
+
+    def submit(self, path, cpus=None, memory=None):
+        """
+        Submit a job to the local process pool.
+
+        Args:
+            path (str): The job's folder path, where the submit script is located.
+            cpus (int, optional): The number of CPU cores requested for the job.
+            memory (float, optional): The memory requested for the job in GB.
+
+        Returns:
+            int: The job ID.
+        """
+        cpus = cpus or default_job_settings.get('job_cpu_cores', 8)
+        memory = memory or default_job_settings.get('job_total_memory_gb', 14)
+        with self._lock:
+            job_id = self._get_new_job_id()
+            self.pending.append((job_id, path, cpus, memory))
+            self._start_pending_jobs()
+        return job_id
+
+    def _get_new_job_id(self):
+        """
+        Get a new job ID. IDs are based on the submission time in milliseconds (and are increasing within a run),
+        so that job IDs of a restarted ARC project, which are loaded from the restart file, are not reused.
+
+        Returns:
+            int: The job ID.
+        """
+        self._last_job_id = max(self._last_job_id + 1, int(time.time() * 1000))
+        return self._last_job_id
+
+    def check_job_status(self, job_id):
+        """
+        Check the status of a job in the local process pool.
+
+        Args:
+            job_id (int): The job ID.
+
+        Returns:
+            str: The job status, either 'running' (also for jobs waiting for resources) or 'done'.
+        """
+        with self._lock:
+            if job_id in self.processes or any(job_id == pending_job[0] for pending_job in self.pending):
+                return 'running'
+        return 'done'
+
+    def running_jobs_ids(self):
+        """
+        Get the IDs of all running and pending jobs.
+
+        Returns:
+            list: Entries are job IDs.
+        """
+        with self._lock:
+            return list(self.processes.keys()) + [pending_job[0] for pending_job in self.pending]
+
+    def delete(self, job_id):
+        """
+        Delete a running or a pending job.
+
+        Args:
+            job_id (int): The job ID.
+        """
+        with self._lock:
+            self.pending = [pending_job for pending_job in self.pending if pending_job[0] != job_id]
+            if job_id in self.processes:
+                # the job runs in its own process group, also terminate the ESS processes spawned by the script
+                try:
+                    os.killpg(self.processes[job_id][0].pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+    def _start_pending_jobs(self):
+        """
+        Start pending jobs (in order) as long as there are enough free resources.
+        """
+        with self._lock:
+            while self.pending:
+                job_id, path, cpus, memory = self.pending[0]
+                if self.processes and (self.used_cpus + cpus > self.cpus or self.used_memory + memory > self.memory):
+                    break
+                self.pending.pop(0)
+                submit_script = submit_filename[servers['local']['cluster_soft']]
+                with open(os.path.join(path, 'out.txt'), 'w') as out, open(os.path.join(path, 'err.txt'), 'w') as err:
+                    process = subprocess.Popen(['bash', submit_script], cwd=path, stdout=out, stderr=err,
+                                               start_new_session=True)
+                self.processes[job_id] = (process, cpus, memory)
+                self.used_cpus += cpus
+                self.used_memory += memory
+                threading.Thread(target=self._wait_for_job, args=(job_id, process), daemon=True).start()
+
+    def _wait_for_job(self, job_id, process):
+        """
+        Wait for a job process to terminate, then release its resources and start pending jobs.
+
+        Args:
+            job_id (int): The job ID.
+            process (subprocess.Popen): The job process.
+        """
+        return_code = process.wait()
+        with self._lock:
+            _, cpus, memory = self.processes.pop(job_id)
+            self.used_cpus -= cpus
+            self.used_memory -= memory
+            self.finished[job_id] = return_code
+            self._start_pending_jobs()
+
+
+def get_local_executor():
+    """
+    Get the local process pool executor, initialize it on first use.
+    The available resources are taken from the 'cpus' and 'memory' keys of the 'local' server in settings.py,
+    defaulting to all CPU cores of the machine and to the default job memory, respectively.
+
+    Returns:
+        LocalExecutor: The local executor.
+    """
+    global _local_executor
+    if _local_executor is None:
+        _local_executor = LocalExecutor(cpus=servers['local'].get('cpus', os.cpu_count() or 1),
+                                        memory=servers['local'].get('memory',
+                                                                    default_job_settings.get('job_total_memory_gb', 14)))
+    return _local_executor
+
+
+def uses_local_executor():
+    """
+    Check whether jobs on the 'local' server are executed by the local process pool rather than by a queue.
+
+    Returns:
+        bool: Whether the local process pool is used.
+    """
+    return 'local' in servers and servers['local']['cluster_soft'].lower() == 'local'
+
 
 def execute_command(command, shell=True, no_fail=False):
     """
@@ -119,6 +296,8 @@ def check_job_status(job_id):
         14428     debug xq1371m2   user_name  R 50-04:04:46      1 node06
 
     """
+    if uses_local_executor():
+        return get_local_executor().check_job_status(job_id)
     server = 'local'
     cmd = check_status_command[servers[server]['cluster_soft']] + ' -u $USER'
     stdout = execute_command(cmd)[0]
@@ -129,7 +308,11 @@ def delete_job(job_id):
     """
     Deletes a running job
     """
-    cmd = delete_command[servers['local']['cluster_soft']] + ' ' + str(job_id)
+    if uses_local_executor():
+        get_local_executor().delete(job_id)
+        return
+    cmd = delete_command[servers['local']['cluster_soft']] + ' ' \
+        + format_job_id_for_deletion(job_id=job_id, cluster_soft=servers['local']['cluster_soft'])
     success = bool(execute_command(cmd, no_fail=True))
     if not success:  # Check if the job is still running. If not then this failure does not matter
         logger.warning(f'Detected possible error when trying to delete job {job_id}. Checking to see if the job is '
@@ -147,21 +330,27 @@ def check_running_jobs_ids():
     """
     Return a list of ``int`` representing job IDs of all jobs submitted by the user on a server
     """
+    if uses_local_executor():
+        return get_local_executor().running_jobs_ids()
     running_jobs_ids = list()
     cmd = check_status_command[servers['local']['cluster_soft']] + ' -u $USER'
     stdout = execute_command(cmd)[0]
     for i, status_line in enumerate(stdout):
         if (servers['local']['cluster_soft'].lower() == 'slurm' and i > 0)\
                 or (servers['local']['cluster_soft'].lower() == 'oge' and i > 1):
-            running_jobs_ids.append(int(status_line.split()[0]))
+            running_jobs_ids.extend(get_job_ids_from_status_line(status_line=status_line,
+                                                                 cluster_soft=servers['local']['cluster_soft']))
     return running_jobs_ids
 
 
-def submit_job(path):
+def submit_job(path, cpus=None, memory=None):
     """
     Submit a job
     `path` is the job's folder path, where the submit script is located (without the submit script file name)
+    `cpus` and `memory` (in GB) are the job's requested resources, only used by the local process pool executor
     """
+    if uses_local_executor():
+        return 'running', get_local_executor().submit(path=path, cpus=cpus, memory=memory)
     job_status = ''
     job_id = 0
     cmd = 'cd ' + path + '; ' + submit_command[servers['local']['cluster_soft']] + ' '\
@@ -170,7 +359,8 @@ def submit_job(path):
     if 'submitted' in stdout[0].lower():
         job_status = 'running'
         if servers['local']['cluster_soft'].lower() == 'oge':
-            job_id = int(stdout[0].split()[2])
+            # a job array is reported as 'Your job-array 582682.1-45:1 ("a9654") has been submitted'
+            job_id = int(stdout[0].split()[2].split('.')[0])
         elif servers['local']['cluster_soft'].lower() == 'slurm':
             job_id = int(stdout[0].split()[3])
         else:
@@ -216,7 +406,12 @@ def delete_all_local_arc_jobs(jobs=None):
         jobs (Optional[List[str]]): Specific ARC job IDs to delete.
     """
     server = 'local'
-    if server in servers:
+    if uses_local_executor():
+        # jobs executed by the local process pool are children of this ARC process
+        executor = get_local_executor()
+        for job_id in executor.running_jobs_ids():
+            executor.delete(job_id)
+    elif server in servers:
         print('\nDeleting all ARC jobs from local server...')
         cmd = check_status_command[servers[server]['cluster_soft']] + ' -u $USER'
         stdout = execute_command(cmd, no_fail=True)[0]
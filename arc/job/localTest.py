@@ -8,6 +8,7 @@ This module contains unit tests of the arc.job.local module
 import datetime
 import os
 import shutil
+import time
 import unittest
 
 import arc.job.local as local
@@ -50,6 +51,38 @@ class TestLocal(unittest.TestCase):
         self.assertTrue(os.path.isfile(path2))
         shutil.rmtree(os.path.join(arc_path, 'scratch'))
 
+    def test_local_executor(self):
+        """Test executing jobs in the local process pool with CPU and memory accounting"""
+        paths = [os.path.join(arc_path, 'scratch', 'local_executor', f'job{i}') for i in range(3)]
+        for path in paths:
+            if not os.path.exists(path):
+                os.makedirs(path)
+            with open(os.path.join(path, 'submit.sh'), 'w') as f:
+                f.write('sleep 0.2\necho "done"\n')
+        executor = local.LocalExecutor(cpus=4, memory=16)
+        job_ids = [executor.submit(path=paths[0], cpus=2, memory=8),
+                   executor.submit(path=paths[1], cpus=4, memory=8),
+                   executor.submit(path=paths[2], cpus=2, memory=8)]
+        self.assertEqual(len(set(job_ids)), 3)
+        # job IDs are not reused by a new executor, e.g., when ARC is restarted
+        time.sleep(0.01)
+        self.assertGreater(local.LocalExecutor(cpus=4, memory=16)._get_new_job_id(), max(job_ids))
+        self.assertEqual(executor.used_cpus, 2)
+        self.assertEqual([pending_job[0] for pending_job in executor.pending], job_ids[1:])  # in order
+        self.assertEqual(sorted(executor.running_jobs_ids()), sorted(job_ids))
+        self.assertTrue(all(executor.check_job_status(job_id) == 'running' for job_id in job_ids))
+        for _ in range(100):
+            if not executor.running_jobs_ids():
+                break
+            time.sleep(0.1)
+        self.assertTrue(all(executor.check_job_status(job_id) == 'done' for job_id in job_ids))
+        self.assertEqual(executor.used_cpus, 0)
+        self.assertEqual(executor.used_memory, 0)
+        self.assertEqual(executor.finished, {job_id: 0 for job_id in job_ids})
+        with open(os.path.join(paths[0], 'out.txt'), 'r') as f:
+            self.assertEqual(f.read(), 'done\n')
+        shutil.rmtree(os.path.join(arc_path, 'scratch'))
+
 
 if __name__ == '__main__':
     unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
@@ -5,14 +5,20 @@
 A module for SSHing into servers.
 Used for giving commands, uploading, and downloading files.
 
+Connections are kept in a process-wide pool of persistent (keep-alive) transports, one per server.
+All SSHClient instances of a server share the pooled connection, and every command or file transfer
+opens a new channel on it, so the SSH handshake is only paid for when (re)connecting.
+
 Todo:
     * delete scratch files of a failed job: ssh nodeXX; rm scratch/dhdhdhd/job_number
 """
 
+import atexit
 import datetime
 import logging
 import os
 import re
+import threading
 import time
 
 import paramiko
@@ -24,10 +30,17 @@ from arc.settings import servers, check_status_command, submit_command, submit_f
 
 logger = get_logger()
 
+KEEPALIVE_INTERVAL = 60  # seconds between keep-alive packets sent over pooled connections
+
+# The process-wide connection pool. Keys are server names, values are connected paramiko SSHClient objects.
+_connection_pool = dict()
+_connection_pool_lock = threading.RLock()
+
 
 class SSHClient(object):
     """
     This is a class for communicating with remote servers via SSH.
+    All instances of the same server share a persistent connection from the process-wide pool.
 
     Args:
         server (str): The server name as specified in ARCs's settings file under ``servers`` as a key.
@@ -55,11 +68,8 @@ class SSHClient(object):
         If remote_path is not an empty string, the command will be executed in the directory path it points to.
         Returns lists of stdout, stderr corresponding to the commands sent.
         """
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.load_system_host_keys(filename=self.key)
         try:
-            ssh.connect(hostname=self.address, username=self.un)
+            ssh = self.get_pooled_connection()
         except:
             return '', 'paramiko failed to connect'
         if isinstance(command, list):
@@ -71,13 +81,13 @@ class SSHClient(object):
         try:
             _, stdout, stderr = ssh.exec_command(command)
         except:  # SSHException: Timeout opening channel.
-            try:  # try again
+            try:  # try again over a fresh connection
+                ssh = self.get_pooled_connection(reconnect=True)
                 _, stdout, stderr = ssh.exec_command(command)
             except:
                 return '', 'ssh timed-out after two trials'
         stdout = stdout.readlines()
         stderr = stderr.readlines()
-        ssh.close()
         return stdout, stderr
 
     def upload_file(self, remote_file_path, local_file_path='', file_string=''):
@@ -88,7 +98,7 @@ class SSHClient(object):
         if local_file_path and not os.path.isfile(local_file_path):
             raise InputError(f'Cannot upload a non-existing file. '
                              f'Check why file in path {local_file_path} is missing.')
-        sftp, ssh = self.connect()
+        sftp, _ = self.connect()
         i, max_times_to_try = 1, 30
         success = False
         sleep_time = 10  # seconds
@@ -105,11 +115,10 @@ class SSHClient(object):
                 success = True
                 i = 1000
             i += 1
+        sftp.close()
         if not success:
             raise ServerError(f'Could not write file {remote_file_path} on {self.server}. '
                               f'Tried {max_times_to_try} times.')
-        sftp.close()
-        ssh.close()
 
     def download_file(self, remote_file_path, local_file_path):
         """
@@ -138,25 +147,23 @@ class SSHClient(object):
         """
         Download a file from `remote_file_path` to `local_file_path`.
         """
-        sftp, ssh = self.connect()
+        sftp, _ = self.connect()
         try:
             sftp.get(remotepath=remote_file_path, localpath=local_file_path)
         except IOError:
             logger.debug(f'Got an IOError when trying to download file {remote_file_path} from {self.server}')
         sftp.close()
-        ssh.close()
 
     def read_remote_file(self, remote_path, filename):
         """
         Read a remote file. `remote_path` is the remote path (required), a `filename` is also required.
         Returns the file's content.
         """
-        sftp, ssh = self.connect()
+        sftp, _ = self.connect()
         full_path = os.path.join(remote_path, filename)
         with sftp.open(full_path, 'r') as f_remote:
             content = f_remote.readlines()
         sftp.close()
-        ssh.close()
         return content
 
     def check_job_status(self, job_id):
@@ -196,7 +203,8 @@ class SSHClient(object):
         """
         Deletes a running job
         """
-        cmd = delete_command[servers[self.server]['cluster_soft']] + ' ' + str(job_id)
+        cmd = delete_command[servers[self.server]['cluster_soft']] + ' ' \
+            + format_job_id_for_deletion(job_id=job_id, cluster_soft=servers[self.server]['cluster_soft'])
         self.send_command_to_server(cmd)
 
     def check_running_jobs_ids(self):
@@ -209,7 +217,8 @@ class SSHClient(object):
         for i, status_line in enumerate(stdout):
             if (servers[self.server]['cluster_soft'].lower() == 'slurm' and i > 0)\
                     or (servers[self.server]['cluster_soft'].lower() == 'oge' and i > 1):
-                running_jobs_ids.append(int(status_line.split()[0]))
+                running_jobs_ids.extend(get_job_ids_from_status_line(status_line=status_line,
+                                                                     cluster_soft=servers[self.server]['cluster_soft']))
         return running_jobs_ids
 
     def submit_job(self, remote_path):
@@ -229,7 +238,8 @@ class SSHClient(object):
         elif 'submitted' in stdout[0].lower():
             job_status = 'running'
             if servers[self.server]['cluster_soft'].lower() == 'oge':
-                job_id = int(stdout[0].split()[2])
+                # a job array is reported as 'Your job-array 582682.1-45:1 ("a9654") has been submitted'
+                job_id = int(stdout[0].split()[2].split('.')[0])
             elif servers[self.server]['cluster_soft'].lower() == 'slurm':
                 job_id = int(stdout[0].split()[3])
             else:
@@ -259,7 +269,49 @@ class SSHClient(object):
         raise ServerError(f'Could not connect to server {self.server} even after {times_tried} trials.')
 
     def try_connecting(self):
-        """A helper function for connecting via paramiko, returns the `sftp` and `ssh` objects"""
+        """
+        A helper function for connecting via paramiko, returns the `sftp` and `ssh` objects.
+        The `ssh` object is the pooled connection to the server, the `sftp` object is a new channel opened on it
+        which should be closed by the caller.
+        """
+        try:
+            ssh = self.get_pooled_connection()
+            sftp = ssh.open_sftp()
+        except:
+            # The pooled transport might have silently died, try again over a fresh connection:
+            ssh = self.get_pooled_connection(reconnect=True)
+            sftp = ssh.open_sftp()
+        return sftp, ssh
+
+    def get_pooled_connection(self, reconnect=False):
+        """
+        Get the persistent connection to the server from the process-wide pool.
+        A new connection is only established if there's no healthy pooled connection to the server.
+
+        Args:
+            reconnect (bool, optional): Whether to drop the pooled connection and establish a new one.
+
+        Returns:
+            paramiko.SSHClient: A connected SSH client.
+        """
+        with _connection_pool_lock:
+            ssh = _connection_pool.get(self.server, None)
+            if ssh is not None:
+                if not reconnect and is_connection_alive(ssh):
+                    return ssh
+                logger.debug(f'Re-establishing the connection to {self.server}')
+                close_connection(self.server)
+            ssh = self._open_connection()
+            _connection_pool[self.server] = ssh
+            return ssh
+
+    def _open_connection(self):
+        """
+        Establish a new keep-alive connection to the server via paramiko.
+
+        Returns:
+            paramiko.SSHClient: A connected SSH client.
+        """
         ssh = paramiko.SSHClient()
         ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         ssh.load_system_host_keys(filename=self.key)
@@ -269,21 +321,67 @@ class SSHClient(object):
             # This sometimes gives "SSHException: Error reading SSH protocol banner[Error 104] Connection reset by peer"
             # Try again:
             ssh.connect(hostname=self.address, username=self.un)
-        sftp = ssh.open_sftp()
-        return sftp, ssh
+        ssh.get_transport().set_keepalive(KEEPALIVE_INTERVAL)
+        return ssh
 
     def get_last_modified_time(self, remote_file_path):
         """returns the last modified time of `remote_file_path` in a datetime format"""
-        sftp, ssh = self.connect()
+        sftp, _ = self.connect()
         try:
             timestamp = sftp.stat(remote_file_path).st_mtime
         except IOError:
             return None
-        sftp.close()
-        ssh.close()
+        finally:
+            sftp.close()
         return datetime.datetime.fromtimestamp(timestamp)
 
 
+def is_connection_alive(ssh):
+    """
+    Check whether a paramiko connection is healthy.
+
+    Args:
+        ssh (paramiko.SSHClient): The SSH client to check.
+
+    Returns:
+        bool: Whether the connection's transport is active, ``True`` if it is.
+    """
+    transport = ssh.get_transport()
+    if transport is None or not transport.is_active():
+        return False
+    try:
+        transport.send_ignore()
+    except (EOFError, OSError, paramiko.SSHException):
+        return False
+    return True
+
+
+def close_connection(server):
+    """
+    Close the pooled connection to a server, if it exists.
+
+    Args:
+        server (str): The server name.
+    """
+    with _connection_pool_lock:
+        ssh = _connection_pool.pop(server, None)
+        if ssh is not None:
+            try:
+                ssh.close()
+            except Exception:
+                pass
+
+
+@atexit.register
+def close_all_connections():
+    """
+    Close all pooled connections. Called automatically when the process exits.
+    """
+    with _connection_pool_lock:
+        for server in list(_connection_pool.keys()):
+            close_connection(server)
+
+
 def write_file(sftp, remote_file_path, local_file_path='', file_string=''):
     """
     Write a file. If `file_string` is given, write it as the content of the file.
@@ -321,16 +419,33 @@ def check_job_status_in_stdout(job_id, stdout, server):
     """
     if not isinstance(stdout, list):
         stdout = stdout.splitlines()
+    is_array_task = isinstance(job_id, str) and '_' in job_id
     for status_line in stdout:
-        if str(job_id) in status_line:
+        if is_array_task:
+            # this is a task of a job array, pending tasks might be reported in a single line as a range
+            try:
+                if job_id in get_job_ids_from_status_line(status_line=status_line,
+                                                          cluster_soft=servers[server]['cluster_soft']):
+                    break
+            except (IndexError, ValueError):
+                # this is a header line
+                continue
+        elif str(job_id) in status_line:
             break
     else:
         return 'done'
     status = status_line.split()[4]
-    if status.lower() in ['r', 'qw', 't']:
+    if status.lower() in ['r', 'qw', 't'] or is_array_task and status.lower() == 'pd':
+        # array tasks waiting for their turn to run (e.g., when the array is throttled) are pending ('PD' in Slurm)
         return 'running'
     else:
         if servers[server]['cluster_soft'].lower() == 'oge':
+            if is_array_task:
+                # the queue of an array task is followed by the slots and the task ID columns
+                queues = [split for split in status_line.split() if '@' in split and '.cluster' in split]
+                if queues:
+                    return 'errored on node ' + queues[0].split('@')[1].split('.')[0][-2:]
+                return 'errored'
             if '.cluster' in status_line:
                 try:
                     return 'errored on node ' + status_line.split()[-1].split('@')[1].split('.')[0][-2:]
@@ -344,6 +459,84 @@ def check_job_status_in_stdout(job_id, stdout, server):
             raise ValueError(f'Unknown cluster software {servers[server]["cluster_soft"]}')
 
 
+def get_job_ids_from_status_line(status_line, cluster_soft):
+    """
+    Get the job IDs represented by a line of the queue status output (e.g., of qstat or squeue).
+    Tasks of job arrays are represented by '<array job ID>_<task ID>' strings, all other jobs by integers.
+    Pending array tasks are often reported in a single line as a range of task IDs,
+    in which case an ID is returned for each of the tasks.
+
+    Status line formats::
+
+        OGE:   '540420 0.45326 a1340    user_name  r  10/26/2018 11:08:30 long1@node18.cluster  8'
+               '540421 0.45326 a1341    user_name  r  10/26/2018 11:08:30 long1@node18.cluster  8  3'
+               '540421 0.45326 a1341    user_name  qw 10/26/2018 11:08:30                        8  4-45:1'
+        Slurm: '14428       long    a1371 user_name  R    5:04:46  1 node06'
+               '14429_3     long    a1372 user_name  R    5:04:46  1 node06'
+               '14429_[4-45] long   a1372 user_name PD       0:00  1 (Resources)'
+
+    Args:
+        status_line (str): A line from the queue status output.
+        cluster_soft (str): The cluster software.
+
+    Returns:
+        list: The job IDs.
+    """
+    splits = status_line.split()
+    if cluster_soft.lower() == 'slurm':
+        if '_' not in splits[0]:
+            return [int(splits[0])]
+        array_id, tasks = splits[0].split('_', 1)
+        return [f'{int(array_id)}_{task}' for task in expand_task_ids(tasks)]
+    if cluster_soft.lower() == 'oge':
+        # the queue column (e.g., 'long1@node18.cluster') is only reported for jobs which are assigned to a node
+        num_columns = 9 if any('@' in split for split in splits) else 8
+        if len(splits) <= num_columns:
+            return [int(splits[0])]
+        return [f'{int(splits[0])}_{task}' for task in expand_task_ids(splits[-1])]
+    raise ValueError(f'Unknown cluster software {cluster_soft}')
+
+
+def expand_task_ids(tasks):
+    """
+    Expand a job array task ID specification into a list of task IDs.
+
+    Args:
+        tasks (str): The task IDs as reported by the cluster software, e.g., '3', '[4-45]', '[1,3,5-7%2]', '4-45:1'.
+
+    Returns:
+        list: Entries are integer task IDs.
+    """
+    task_ids = list()
+    tasks = tasks.strip('[]').split('%')[0]  # remove a Slurm concurrency limit, if exists
+    for task_range in tasks.split(','):
+        if '-' in task_range:
+            step = int(task_range.split(':')[1]) if ':' in task_range else 1
+            first, last = task_range.split(':')[0].split('-')
+            task_ids.extend(range(int(first), int(last) + 1, step))
+        else:
+            task_ids.append(int(task_range))
+    return task_ids
+
+
+def format_job_id_for_deletion(job_id, cluster_soft):
+    """
+    Format a job ID as an argument of the cluster software's job deletion command.
+
+    Args:
+        job_id (int, str): The job ID, or a '<array job ID>_<task ID>' string of a job array task.
+        cluster_soft (str): The cluster software.
+
+    Returns:
+        str: The formatted job ID.
+    """
+    job_id = str(job_id)
+    if '_' in job_id and cluster_soft.lower() == 'oge':
+        array_id, task_id = job_id.split('_')
+        return f'{array_id} -t {task_id}'
+    return job_id
+
+
 def delete_all_arc_jobs(server_list, jobs=None):
     """
     Delete all ARC-spawned jobs (with job name starting with `a` and a digit) from :list:servers
@@ -7,6 +7,8 @@ This module contains unit tests of the arc.job.ssh module
 
 import unittest
 
+import paramiko
+
 import arc.job.ssh as ssh
 
 
@@ -29,6 +31,70 @@ class TestSSH(unittest.TestCase):
         status3 = ssh.check_job_status_in_stdout(job_id=582600, stdout=stdout, server='server1')
         self.assertEqual(status3, 'done')
 
+        # job array tasks, the task ID follows the queue and the slots columns
+        stdout = """job-ID  prior   name       user         state submit/start at     queue                          slots ja-task-ID 
+-----------------------------------------------------------------------------------------------------------------
+ 588335 0.45451 a1341      alongd       r     05/07/2019 16:24:31 long3@node67.cluster              8 1
+ 588335 0.45451 a1341      alongd       Eqw   05/07/2019 16:24:31 long3@node68.cluster              8 2
+ 588335 0.45451 a1341      alongd       Eqw   05/07/2019 16:24:31                                   8 3
+ 588335 0.45451 a1341      alongd       qw    05/07/2019 16:24:31                                   8 4-8:1"""
+        self.assertEqual(ssh.check_job_status_in_stdout(job_id='588335_1', stdout=stdout, server='server1'),
+                         'running')
+        self.assertEqual(ssh.check_job_status_in_stdout(job_id='588335_2', stdout=stdout, server='server1'),
+                         'errored on node 68')
+        self.assertEqual(ssh.check_job_status_in_stdout(job_id='588335_3', stdout=stdout, server='server1'),
+                         'errored')
+        self.assertEqual(ssh.check_job_status_in_stdout(job_id='588335_6', stdout=stdout, server='server1'),
+                         'running')
+        self.assertEqual(ssh.check_job_status_in_stdout(job_id='588335_9', stdout=stdout, server='server1'),
+                         'done')
+        stdout = """             JOBID PARTITION     NAME     USER ST       TIME  NODES NODELIST(REASON)
+           14429_3      long    a1372 user_name  R    5:04:46      1 node06
+      14429_[4-45]      long    a1372 user_name PD       0:00      1 (Resources)"""
+        self.assertEqual(ssh.check_job_status_in_stdout(job_id='14429_3', stdout=stdout, server='server2'),
+                         'running')
+        self.assertEqual(ssh.check_job_status_in_stdout(job_id='14429_7', stdout=stdout, server='server2'),
+                         'running')
+
+    def test_get_job_ids_from_status_line(self):
+        """Test getting job IDs from a queue status line, including job array tasks"""
+        line = '14428       long    a1371 user_name  R    5:04:46  1 node06'
+        self.assertEqual(ssh.get_job_ids_from_status_line(status_line=line, cluster_soft='Slurm'), [14428])
+        line = '14429_3     long    a1372 user_name  R    5:04:46  1 node06'
+        self.assertEqual(ssh.get_job_ids_from_status_line(status_line=line, cluster_soft='Slurm'), ['14429_3'])
+        line = '14429_[4-6] long    a1372 user_name PD       0:00  1 (Resources)'
+        self.assertEqual(ssh.get_job_ids_from_status_line(status_line=line, cluster_soft='Slurm'),
+                         ['14429_4', '14429_5', '14429_6'])
+        line = ' 588334 0.45451 pf1005a    alongd       r     05/07/2019 16:24:31 long3@node67.cluster     48'
+        self.assertEqual(ssh.get_job_ids_from_status_line(status_line=line, cluster_soft='OGE'), [588334])
+        line = ' 588335 0.45451 a1341    alongd       r     05/07/2019 16:24:31 long3@node67.cluster     8  3'
+        self.assertEqual(ssh.get_job_ids_from_status_line(status_line=line, cluster_soft='OGE'), ['588335_3'])
+        line = ' 588335 0.45451 a1341    alongd       qw    05/07/2019 16:24:31                          8  4-8:2'
+        self.assertEqual(ssh.get_job_ids_from_status_line(status_line=line, cluster_soft='OGE'),
+                         ['588335_4', '588335_6', '588335_8'])
+
+    def test_expand_task_ids(self):
+        """Test expanding job array task IDs"""
+        self.assertEqual(ssh.expand_task_ids('3'), [3])
+        self.assertEqual(ssh.expand_task_ids('[4-7]'), [4, 5, 6, 7])
+        self.assertEqual(ssh.expand_task_ids('[1,3,5-7%2]'), [1, 3, 5, 6, 7])
+        self.assertEqual(ssh.expand_task_ids('4-9:2'), [4, 6, 8])
+
+    def test_format_job_id_for_deletion(self):
+        """Test formatting job IDs for deletion"""
+        self.assertEqual(ssh.format_job_id_for_deletion(582682, 'OGE'), '582682')
+        self.assertEqual(ssh.format_job_id_for_deletion('582682_3', 'OGE'), '582682 -t 3')
+        self.assertEqual(ssh.format_job_id_for_deletion('14429_3', 'Slurm'), '14429_3')
+
+    def test_connection_pool(self):
+        """Test the health check and closing of pooled connections"""
+        client = paramiko.SSHClient()
+        self.assertFalse(ssh.is_connection_alive(client))  # never connected, no transport
+        ssh._connection_pool['server1'] = client
+        ssh.close_connection('server1')
+        self.assertNotIn('server1', ssh._connection_pool)
+        ssh.close_connection('server1')  # closing a non-existing connection should not raise
+
 
 if __name__ == '__main__':
     unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
@@ -419,3 +419,33 @@ rm -rf $WorkDir
 """,
     }
 }
+
+
+# Job array submit scripts, sorted in a dictionary with cluster software as keys.
+# A job array bundles several same-shaped jobs (tasks), each task runs the regular submit script of its job
+# in the job's folder. The resource {directives} are taken from the submit script of the first task.
+array_submit_scripts = {
+    'OGE': """#!/bin/bash -l
+
+#$ -N {name}
+{directives}
+#$ -t 1-{num_tasks}
+
+TASK_DIRS=({task_dirs})
+cd "${{TASK_DIRS[$((SGE_TASK_ID - 1))]}}"
+
+bash {submit_filename} > out.txt 2> err.txt
+
+""",
+    'Slurm': """#!/bin/bash -l
+#SBATCH -J {name}
+{directives}
+#SBATCH --array=1-{num_tasks}
+
+TASK_DIRS=({task_dirs})
+cd "${{TASK_DIRS[$((SLURM_ARRAY_TASK_ID - 1))]}}"
+
+bash {submit_filename} > slurm-$SLURM_JOB_ID.out 2>&1
+
+""",
+}
@@ -5,6 +5,7 @@
 The ARC troubleshooting ("trsh") module
 """
 
+import itertools
 import math
 import os
 from typing import Optional, Tuple, Union
@@ -12,7 +13,8 @@ from typing import Optional, Tuple, Union
 import numpy as np
 import pandas as pd
 
-from arc.common import (check_torsion_change,
+from arc.common import (LazyFileLines,
+                        check_torsion_change,
                         determine_ess,
                         estimate_orca_mem_cpu_requirement,
                         get_logger,
@@ -20,8 +22,8 @@ from arc.common import (check_torsion_change,
                         is_same_sequence_sublist,
                         is_str_float)
 from arc.exceptions import InputError, SpeciesError, TrshError
-from arc.job.local import execute_command
-from arc.job.ssh import SSHClient
+from arc.job.local import delete_job
+from arc.job.ssh import SSHClient, format_job_id_for_deletion
 from arc.settings import (delete_command,
                           inconsistency_ab,
                           inconsistency_az,
@@ -71,15 +73,15 @@ def determine_ess_status(output_path: str,
         software = determine_ess(log_file=output_path)
 
     keywords, error, = list(), ''
-    with open(output_path, 'r') as f:
-        lines = f.readlines()
-        if len(lines) < 5:
+    # the output file is read from its end, and only as far back as needed (termination messages are near the end)
+    with LazyFileLines(output_path, reverse=True) as reverse_lines:
+        try:
+            reverse_lines[4]
+        except IndexError:
             return 'errored', ['NoOutput'], 'Log file could not be read', ''
-        forward_lines = tuple(lines)
-        reverse_lines = tuple(lines[::-1])
 
         if software == 'gaussian':
-            for line in forward_lines[-1:-20:-1]:
+            for line in itertools.islice(reverse_lines, 19):
                 if 'Normal termination' in line:
                     return 'done', list(), '', ''
             for i, line in enumerate(reverse_lines):
@@ -121,15 +123,15 @@ def determine_ess_status(output_path: str,
                         keywords = ['MaxOptCycles', 'GL913']
                         error = 'Maximum optimization cycles reached.'
                     if any([keyword in ['GL301', 'GL401'] for keyword in keywords]):
-                        additional_info = forward_lines[len(forward_lines) - i - 2]
+                        additional_info = reverse_lines[i + 1]  # the line preceding the termination line
                         if 'No data on chk file' in additional_info \
                                 or 'Basis set data is not on the checkpoint file' in additional_info:
                             keywords = ['CheckFile']
                             error = additional_info.rstrip()
                         elif 'GL301' in keywords:
-                            if 'Atomic number out of range for' in forward_lines[len(forward_lines) - i - 2]:
+                            if 'Atomic number out of range for' in additional_info:
                                 keywords.append('BasisSet')
-                                error = f'The basis set {forward_lines[len(forward_lines) - i - 2].split()[6]} ' \
+                                error = f'The basis set {additional_info.split()[6]} ' \
                                         f'is not appropriate for the this chemistry.'
                             else:
                                 keywords.append('InputError')
@@ -212,15 +214,17 @@ def determine_ess_status(output_path: str,
             for i, line in enumerate(reverse_lines):
                 if 'ORCA TERMINATED NORMALLY' in line:
                     # not done yet, things can still go wrong (e.g., SCF energy might blow up)
-                    for j, info in enumerate(forward_lines):
-                        if 'Starting incremental Fock matrix formation' in info:
-                            while not is_str_float(forward_lines[j + 1].split()[1]):
-                                j += 1
-                            scf_energy_initial_iteration = float(forward_lines[j + 1].split()[1])
-                        if 'TOTAL SCF ENERGY' in info:
-                            # this value is very close to the scf energy at last iteration and is easier to parse
-                            scf_energy_last_iteration = float(forward_lines[j + 3].split()[3])
-                            break
+                    # the SCF energies are read from the beginning of the file
+                    with LazyFileLines(output_path) as forward_lines:
+                        for j, info in enumerate(forward_lines):
+                            if 'Starting incremental Fock matrix formation' in info:
+                                while not is_str_float(forward_lines[j + 1].split()[1]):
+                                    j += 1
+                                scf_energy_initial_iteration = float(forward_lines[j + 1].split()[1])
+                            if 'TOTAL SCF ENERGY' in info:
+                                # this value is very close to the scf energy at last iteration and is easier to parse
+                                scf_energy_last_iteration = float(forward_lines[j + 3].split()[3])
+                                break
                     # Check if final SCF energy makes sense
                     scf_energy_ratio = scf_energy_last_iteration / scf_energy_initial_iteration
                     scf_energy_ratio_threshold = 2  # it is rare that this ratio > 2
@@ -391,7 +395,7 @@ def determine_ess_status(output_path: str,
             return 'errored', keywords, error, line
 
         elif software == 'terachem':
-            for line in lines[::-1]:
+            for line in reverse_lines:
                 if 'Job finished:' in line:
                     return 'done', list(), '', ''
                 elif 'incorrect method' in line.lower():
@@ -1124,17 +1128,17 @@ def trsh_job_on_server(server: str,
         logger.error(f'Job {job_name} has server status "{job_server_status}" on {server}.')
 
     # delete current server run
-    command = delete_command[servers[server]['cluster_soft']] + ' ' + str(job_id)
     if server == 'local':
-        execute_command(command)
+        delete_job(job_id)
         return None, True
     else:
+        command = delete_command[servers[server]['cluster_soft']] + ' ' \
+            + format_job_id_for_deletion(job_id=job_id, cluster_soft=servers[server]['cluster_soft'])
         ssh = SSHClient(server)
         ssh.send_command_to_server(command)
 
     if servers[server]['cluster_soft'].lower() == 'oge':
         logger.error('Troubleshooting by changing node.')
-        ssh = SSHClient(server)
         # find available nodes
         stdout = ssh.send_command_to_server(command=list_available_nodes_command[servers[server]['cluster_soft']])[0]
         for line in stdout:
@@ -25,15 +25,17 @@ from rmgpy.reaction import Reaction
 from rmgpy.species import Species
 
 import arc.rmgdb as rmgdb
-from arc.common import VERSION, format_level_of_theory_inputs, format_level_of_theory_for_logging, read_yaml_file, \
+from arc.common import VERSION, format_level_of_theory_inputs, format_level_of_theory_for_logging, \
     time_lapse, check_ess_settings, initialize_log, log_footer, get_logger, save_yaml_file, initialize_job_types, \
-    determine_model_chemistry_type
+    determine_model_chemistry_type, replay_restart_journal
 from arc.exceptions import InputError, SettingsError, SpeciesError
 from arc.job.ssh import SSHClient
 from arc.processor import process_arc_project
 from arc.reaction import ARCReaction
 from arc.scheduler import Scheduler
-from arc.settings import arc_path, default_levels_of_theory, servers, valid_chars, default_job_types
+from arc.serialization import read_file
+from arc.settings import arc_path, default_levels_of_theory, restart_file_format, servers, valid_chars, \
+    default_job_types
 from arc.species.species import ARCSpecies
 from arc.utils.scale import determine_scaling_factors
 
@@ -103,6 +105,21 @@ class ARC(object):
         n_confs (int, optional): The number of lowest force field conformers to consider.
         e_confs (float, optional): The energy threshold in kJ/mol above the lowest energy conformer below which
                                    force field conformers are considered.
+        conformer_max_workers (int, optional): The max number of local processes used to generate force field
+                                               conformers. The ``default_conformer_max_workers`` setting is used if
+                                               not given.
+        conformer_combination_search (str, optional): The strategy for searching force field conformer combinations
+                                                      of species with many torsions, either 'lowest_conformer' or
+                                                      'simulated_annealing'. The
+                                                      ``default_conformer_combination_search`` setting is used if
+                                                      not given.
+        conformer_max_ff_evaluations (int, optional): The max number of force field evaluations of a stochastic
+                                                      conformer combination search. The
+                                                      ``default_conformer_max_ff_evaluations`` setting is used if
+                                                      not given.
+        conformer_wall_time (float, optional): A wall time budget in seconds for embedding random force field
+                                               conformers per species. The ``conformer_wall_time`` setting is used if
+                                               not given.
         keep_checks (bool, optional): Whether to keep all Gaussian checkfiles when ARC terminates. True to keep,
                                       default is False.
         dont_gen_confs (list, optional): A list of species labels for which conformer generation should be avoided
@@ -155,6 +172,11 @@ class ARC(object):
         n_confs (int): The number of lowest force field conformers to consider.
         e_confs (float): The energy threshold in kJ/mol above the lowest energy conformer below which
                          force field conformers are considered.
+        conformer_max_workers (int): The max number of local processes used to generate force field conformers.
+        conformer_combination_search (str): The strategy for searching force field conformer combinations.
+        conformer_max_ff_evaluations (int): The max number of force field evaluations of a stochastic
+                                            conformer combination search.
+        conformer_wall_time (float): A wall time budget in seconds for embedding random force field conformers.
         execution_time (str): Overall execution time.
         lib_long_desc (str): A multiline description of levels of theory for the outputted RMG libraries.
         running_jobs (dict): A dictionary of jobs submitted in a precious ARC instance, used for restarting ARC.
@@ -192,7 +214,8 @@ class ARC(object):
                  job_memory=None, ess_settings=None, bath_gas=None, adaptive_levels=None, freq_scale_factor=None,
                  calc_freq_factor=True, n_confs=10, e_confs=5, dont_gen_confs=None, keep_checks=False,
                  solvation=None, compare_to_rmg=True, compute_thermo=True, compute_rates=True, compute_transport=True,
-                 specific_job_type='', statmech_adapter='Arkane'):
+                 specific_job_type='', statmech_adapter='Arkane', conformer_max_workers=None,
+                 conformer_combination_search=None, conformer_max_ff_evaluations=None, conformer_wall_time=None):
         self.__version__ = VERSION
         self.verbose = verbose
         self.output = dict()
@@ -225,6 +248,10 @@ class ARC(object):
             self.solvation = solvation
             self.n_confs = n_confs
             self.e_confs = e_confs
+            self.conformer_max_workers = conformer_max_workers
+            self.conformer_combination_search = conformer_combination_search
+            self.conformer_max_ff_evaluations = conformer_max_ff_evaluations
+            self.conformer_wall_time = conformer_wall_time
             self.adaptive_levels = adaptive_levels
             self.project_directory = project_directory if project_directory is not None \
                 else os.path.join(arc_path, 'Projects', self.project)
@@ -346,13 +373,17 @@ class ARC(object):
             logger.info('\n')
 
         # make a backup copy of the restart file if it exists (but don't save an updated one just yet)
-        if os.path.isfile(os.path.join(self.project_directory, 'restart.yml')):
+        if os.path.isfile(os.path.join(self.project_directory, f'restart.{restart_file_format}')):
             if not os.path.isdir(os.path.join(self.project_directory, 'log_and_restart_archive')):
                 os.mkdir(os.path.join(self.project_directory, 'log_and_restart_archive'))
             local_time = datetime.datetime.now().strftime("%H%M%S_%b%d_%Y")
-            restart_backup_name = 'restart.old.' + local_time + '.yml'
-            shutil.copy(os.path.join(self.project_directory, 'restart.yml'),
+            restart_backup_name = 'restart.old.' + local_time + f'.{restart_file_format}'
+            shutil.copy(os.path.join(self.project_directory, f'restart.{restart_file_format}'),
                         os.path.join(self.project_directory, 'log_and_restart_archive', restart_backup_name))
+            if os.path.isfile(os.path.join(self.project_directory, 'restart_journal.yml')):
+                shutil.copy(os.path.join(self.project_directory, 'restart_journal.yml'),
+                            os.path.join(self.project_directory, 'log_and_restart_archive',
+                                         'restart_journal.old.' + local_time + '.yml'))
 
     def as_dict(self) -> dict:
         """
@@ -417,6 +448,14 @@ class ARC(object):
         restart_dict['job_memory'] = self.memory
         restart_dict['n_confs'] = self.n_confs
         restart_dict['e_confs'] = self.e_confs
+        if self.conformer_max_workers is not None:
+            restart_dict['conformer_max_workers'] = self.conformer_max_workers
+        if self.conformer_combination_search is not None:
+            restart_dict['conformer_combination_search'] = self.conformer_combination_search
+        if self.conformer_max_ff_evaluations is not None:
+            restart_dict['conformer_max_ff_evaluations'] = self.conformer_max_ff_evaluations
+        if self.conformer_wall_time is not None:
+            restart_dict['conformer_wall_time'] = self.conformer_wall_time
         restart_dict['specific_job_type'] = self.specific_job_type
         if self.keep_checks:
             restart_dict['keep_checks'] = self.keep_checks
@@ -429,7 +468,7 @@ class ARC(object):
         in the restart dictionary.
         """
         if isinstance(input_dict, str):
-            input_dict = read_yaml_file(path=input_dict, project_directory=self.project_directory)
+            input_dict = read_file(path=input_dict, project_directory=self.project_directory)
         if project is None and 'project' not in input_dict:
             raise InputError('A project name must be given')
         self.project = project if project is not None else input_dict['project']
@@ -439,6 +478,9 @@ class ARC(object):
             os.makedirs(self.project_directory)
         initialize_log(log_file=os.path.join(self.project_directory, 'arc.log'), project=self.project,
                        project_directory=self.project_directory, verbose=self.verbose)
+        # apply the changes saved after the restart file was last compacted
+        input_dict = replay_restart_journal(restart_dict=input_dict,
+                                            journal_path=os.path.join(self.project_directory, 'restart_journal.yml'))
         self.t0 = time.time()  # init time
         self.execution_time = None
         self.compute_thermo = input_dict['compute_thermo'] if 'compute_thermo' in input_dict else True
@@ -452,6 +494,14 @@ class ARC(object):
         self.solvation = input_dict['solvation'] if 'solvation' in input_dict else None
         self.n_confs = input_dict['n_confs'] if 'n_confs' in input_dict else 10
         self.e_confs = input_dict['e_confs'] if 'e_confs' in input_dict else 5  # kJ/mol
+        self.conformer_max_workers = input_dict['conformer_max_workers'] \
+            if 'conformer_max_workers' in input_dict else None
+        self.conformer_combination_search = input_dict['conformer_combination_search'] \
+            if 'conformer_combination_search' in input_dict else None
+        self.conformer_max_ff_evaluations = input_dict['conformer_max_ff_evaluations'] \
+            if 'conformer_max_ff_evaluations' in input_dict else None
+        self.conformer_wall_time = input_dict['conformer_wall_time'] \
+            if 'conformer_wall_time' in input_dict else None
         self.adaptive_levels = input_dict['adaptive_levels'] if 'adaptive_levels' in input_dict else None
         self.keep_checks = input_dict['keep_checks'] if 'keep_checks' in input_dict else False
         self.allow_nonisomorphic_2d = input_dict['allow_nonisomorphic_2d'] \
@@ -591,7 +641,10 @@ class ARC(object):
                                    max_job_time=self.max_job_time, allow_nonisomorphic_2d=self.allow_nonisomorphic_2d,
                                    memory=self.memory, adaptive_levels=self.adaptive_levels,
                                    n_confs=self.n_confs, e_confs=self.e_confs, dont_gen_confs=self.dont_gen_confs,
-                                   fine_only=self.fine_only)
+                                   fine_only=self.fine_only, conformer_max_workers=self.conformer_max_workers,
+                                   conformer_combination_search=self.conformer_combination_search,
+                                   conformer_max_ff_evaluations=self.conformer_max_ff_evaluations,
+                                   conformer_wall_time=self.conformer_wall_time)
 
         save_yaml_file(path=os.path.join(self.project_directory, 'output', 'status.yml'), content=self.scheduler.output)
 
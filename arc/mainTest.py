@@ -120,7 +120,10 @@ class TestARC(unittest.TestCase):
     def test_from_dict(self):
         """Test the from_dict() method of ARC"""
         restart_dict = {'composite_method': '',
+                        'conformer_combination_search': 'simulated_annealing',
                         'conformer_level': 'b97-d3/6-311+g(d,p)',
+                        'conformer_max_ff_evaluations': 500,
+                        'conformer_wall_time': 120,
                         'fine': True,
                         'freq_level': 'wb97x-d3/6-311+g(d,p)',
                         'freq_scale_factor': 0.96,
@@ -165,6 +168,9 @@ class TestARC(unittest.TestCase):
         self.assertTrue(arc1.job_types['rotors'])
         self.assertEqual(arc1.sp_level, 'ccsdt-f12/cc-pvqz-f12')
         self.assertEqual(arc1.level_of_theory, '')
+        self.assertEqual(arc1.conformer_combination_search, 'simulated_annealing')
+        self.assertEqual(arc1.conformer_max_ff_evaluations, 500)
+        self.assertEqual(arc1.conformer_wall_time, 120)
         self.assertEqual(arc1.arc_species_list[0].label, 'testing_spc1')
         self.assertFalse(arc1.arc_species_list[0].is_ts)
         self.assertEqual(arc1.arc_species_list[0].charge, 1)
@@ -7,14 +7,16 @@ A module for parsing information from various files.
 
 import os
 import re
+from functools import lru_cache
 from typing import Match, Optional, Union
 
 import numpy as np
 import pandas as pd
 import qcelemental as qcel
 
+import rmgpy.constants as constants
 from arkane.exceptions import LogError
-from arkane.ess import ess_factory, GaussianLog, MolproLog, OrcaLog, QChemLog, TeraChemLog
+from arkane.ess import ess_factory, GaussianLog
 
 from arc.common import determine_ess, get_logger, is_same_pivot
 from arc.exceptions import InputError, ParserError
@@ -23,81 +25,20 @@ from arc.species.converter import str_to_xyz, xyz_from_data
 
 logger = get_logger()
 
+HARTREE_TO_KJ_MOL = constants.E_h * constants.Na * 0.001
+
 
 def parse_frequencies(path, software):
     """
     Parse the frequencies from a freq job output file.
     """
-    lines = _get_lines_from_file(path)
-    freqs = np.array([], np.float64)
-    if software.lower() == 'qchem':
-        for line in lines:
-            if ' Frequency:' in line:
-                items = line.split()
-                for i, item in enumerate(items):
-                    if i:
-                        freqs = np.append(freqs, [(float(item))])
-    elif software.lower() == 'gaussian':
-        with open(path, 'r') as f:
-            line = f.readline()
-            while line != '':
-                if 'Frequencies --' in line:
-                    freqs = np.append(freqs, [float(frq) for frq in line.split()[2:]])
-                line = f.readline()
-    elif software.lower() == 'molpro':
-        read = False
-        for line in lines:
-            if 'Nr' in line and '[1/cm]' in line:
-                continue
-            if read:
-                if line == os.linesep:
-                    read = False
-                    continue
-                freqs = np.append(freqs, [float(line.split()[-1])])
-            if 'Low' not in line and 'Vibration' in line and 'Wavenumber' in line:
-                read = True
-    elif software.lower() == 'orca':
-        with open(path, 'r') as f:
-            line = f.readline()
-            read = True
-            while line:
-                if 'VIBRATIONAL FREQUENCIES' in line:
-                    while read:
-                        if not line.strip():
-                            line = f.readline()
-                        elif not line.split()[0] == '0:':
-                            line = f.readline()
-                        else:
-                            read = False
-                    while line.strip():
-                        if float(line.split()[1]) != 0.0:
-                            freqs = np.append(freqs, [float(line.split()[1])])
-                        line = f.readline()
-                    break
-                else:
-                    line = f.readline()
-    elif software.lower() == 'terachem':
-        read_output = False
-        for line in lines:
-            if '=== Mode' in line:
-                # example: '=== Mode 1: 1198.526 cm^-1 ==='
-                freqs = np.append(freqs, [float(line.split()[3])])
-            elif 'Vibrational Frequencies/Thermochemical Analysis After Removing Rotation and Translation' in line:
-                read_output = True
-                continue
-            elif read_output:
-                if 'Temperature (Kelvin):' in line or 'Frequency(cm-1)' in line:
-                    continue
-                if not line.strip():
-                    break
-                # example:
-                # 'Mode  Eigenvalue(AU)  Frequency(cm-1)  Intensity(km/mol)   Vib.Temp(K)      ZPE(AU) ...'
-                # '  1     0.0331810528   170.5666870932      52.2294230772  245.3982965841   0.0003885795 ...'
-                freqs = np.append(freqs, [float(line.split()[2])])
-
-    else:
+    if software.lower() not in log_handlers:
         raise ParserError(f'parse_frequencies() can currently only parse Gaussian, Molpro, Orca, QChem and TeraChem '
                           f'files, got {software}')
+    freqs = parse_log(path=path, software=software).get('frequencies')
+    if freqs is None:
+        raise ParserError(f'Could not parse frequencies from {path}')
+    freqs = np.array(freqs, np.float64)
     logger.debug(f'Using parser.parse_frequencies(). Determined frequencies are: {freqs}')
     return freqs
 
@@ -176,19 +117,10 @@ def parse_geometry(path):
         logger.debug(f'Could not parse xyz from {path}')
 
         # try parsing Gaussian standard orientation instead of the input orientation parsed by Arkane
-        lines = _get_lines_from_file(path)
-        xyz_str = ''
-        for i in range(len(lines)):
-            if 'Standard orientation:' in lines[i]:
-                xyz_str = ''
-                j = i
-                while not lines[j].split()[0].isdigit():
-                    j += 1
-                while '-------------------' not in lines[j]:
-                    splits = lines[j].split()
-                    xyz_str += f'{qcel.periodictable.to_E(int(splits[1]))}  {splits[3]}  {splits[4]}  {splits[5]}\n'
-                    j += 1
-                break
+        try:
+            xyz_str = parse_log(path=path).get('standard_orientation')
+        except (InputError, ParserError):
+            xyz_str = None
 
         if xyz_str:
             return str_to_xyz(xyz_str)
@@ -204,6 +136,9 @@ def parse_t1(path):
     """
     if not os.path.isfile(path):
         raise InputError('Could not find file {0}'.format(path))
+    t1 = _get_log_quantity(path=path, quantity='t1')
+    if t1 is not None:
+        return t1
     log = ess_factory(fullpath=path)
     try:
         t1 = log.get_T1_diagnostic()
@@ -226,6 +161,10 @@ def parse_e_elect(path, zpe_scale_factor=1.):
     """
     if not os.path.isfile(path):
         raise InputError(f'Could not find file {path}')
+    e_elect = _get_log_quantity(path=path, quantity='e_elect')
+    if e_elect is not None:
+        energy, scalable_zpe = e_elect
+        return (energy - scalable_zpe * zpe_scale_factor) * HARTREE_TO_KJ_MOL
     log = ess_factory(fullpath=path)
     try:
         e_elect = log.load_energy(zpe_scale_factor) * 0.001  # convert to kJ/mol
@@ -247,6 +186,9 @@ def parse_zpe(path):
     """
     if not os.path.isfile(path):
         raise InputError('Could not find file {0}'.format(path))
+    zpe = _get_log_quantity(path=path, quantity='zpe')
+    if zpe is not None:
+        return zpe * 0.001  # convert to kJ/mol
     log = ess_factory(fullpath=path)
     try:
         zpe = log.load_zero_point_energy() * 0.001  # convert to kJ/mol
@@ -273,6 +215,12 @@ def parse_1d_scan_energies(path):
     """
     if not os.path.isfile(path):
         raise InputError(f'Could not find file {path}')
+    scan_energies = _get_log_quantity(path=path, quantity='scan_energies')
+    if scan_energies is not None:
+        energies = (np.array(scan_energies, np.float64) - min(scan_energies)) * HARTREE_TO_KJ_MOL
+        angles = np.arange(0.0, 2 * np.pi + 0.00001, 2 * np.pi / (len(energies) - 1), np.float64)
+        angles *= 180 / np.pi  # convert to degrees
+        return energies, angles
     log = ess_factory(fullpath=path)
     try:
         energies, angles = log.load_scan_energies()
@@ -642,58 +590,11 @@ def parse_dipole_moment(path):
     """
     Parse the dipole moment in Debye from an opt job output file.
     """
-    lines = _get_lines_from_file(path)
-    log = ess_factory(path)
-    dipole_moment = None
-    if isinstance(log, GaussianLog):
-        # example:
-        # Dipole moment (field-independent basis, Debye):
-        # X=             -0.0000    Y=             -0.0000    Z=             -1.8320  Tot=              1.8320
-        read = False
-        for line in lines:
-            if 'dipole moment' in line.lower() and 'debye' in line.lower():
-                read = True
-            elif read:
-                dipole_moment = float(line.split()[-1])
-                read = False
-    elif isinstance(log, MolproLog):
-        # example: ' Dipole moment /Debye                   2.96069859     0.00000000     0.00000000'
-        for line in lines:
-            if 'dipole moment' in line.lower() and '/debye' in line.lower():
-                splits = line.split()
-                dm_x, dm_y, dm_z = float(splits[-3]), float(splits[-2]), float(splits[-1])
-                dipole_moment = (dm_x ** 2 + dm_y ** 2 + dm_z ** 2) ** 0.5
-    elif isinstance(log, OrcaLog):
-        # example: 'Magnitude (Debye)      :      2.11328'
-        for line in lines:
-            if 'Magnitude (Debye)' in line:
-                dipole_moment = float(line.split()[-1])
-    elif isinstance(log, QChemLog):
-        # example:
-        #     Dipole Moment (Debye)
-        #          X       0.0000      Y       0.0000      Z       2.0726
-        #        Tot       2.0726
-        skip = False
-        read = False
-        for line in lines:
-            if 'dipole moment' in line.lower() and 'debye' in line.lower():
-                skip = True
-            elif skip:
-                skip = False
-                read = True
-            elif read:
-                dipole_moment = float(line.split()[-1])
-                read = False
-    elif isinstance(log, TeraChemLog):
-        # example: 'DIPOLE MOMENT: {-0.000178, -0.000003, -0.000019} (|D| = 0.000179) DEBYE'
-        for line in lines:
-            if 'dipole moment' in line.lower() and 'debye' in line.lower():
-                splits = line.split('{')[1].split('}')[0].replace(',', '').split()
-                dm_x, dm_y, dm_z = float(splits[0]), float(splits[1]), float(splits[2])
-                dipole_moment = (dm_x ** 2 + dm_y ** 2 + dm_z ** 2) ** 0.5
-    else:
+    software = determine_ess(path)
+    if software not in log_handlers or 'dipole_moment' not in log_handlers[software]:
         raise ParserError('Currently dipole moments can only be parsed from either Gaussian, Molpro, Orca, QChem, '
                           'or TeraChem optimization output files')
+    dipole_moment = parse_log(path=path, software=software).get('dipole_moment')
     if dipole_moment is None:
         raise ParserError('Could not parse the dipole moment')
     return dipole_moment
@@ -703,14 +604,16 @@ def parse_polarizability(path):
     """
     Parse the polarizability from a freq job output file, returns the value in Angstrom^3.
     """
-    lines = _get_lines_from_file(path)
-    polarizability = None
-    for line in lines:
-        if 'Isotropic polarizability for W' in line:
-            # example:  Isotropic polarizability for W=    0.000000       11.49 Bohr**3.
-            # 1 Bohr = 0.529177 Angstrom
-            polarizability = float(line.split()[-2]) * 0.529177 ** 3
-    return polarizability
+    if not os.path.isfile(path):
+        raise InputError(f'Could not find file {path}')
+    try:
+        return parse_log(path=path).get('polarizability')
+    except (InputError, ParserError):
+        # not a log file of a supported ESS, look for the polarizability line anyway
+        handler = Polarizability()
+        for line in _get_lines_from_file(path):
+            handler.feed(line)
+        return handler.value
 
 
 def _get_lines_from_file(path) -> list:
@@ -1037,3 +940,675 @@ def parse_scan_conformers(file_path: str) -> pd.DataFrame:
     if not red_ind.empty:
         scan_conformers.drop(red_ind, inplace=True)
     return scan_conformers
+
+
+def parse_log(path: str,
+              software: Optional[str] = None,
+              ) -> 'ParsedLog':
+    """
+    Get the quantities parsed from an ESS log file in a single streaming pass.
+    Parsed logs are cached, an unmodified log file is only read once.
+
+    Args:
+        path (str): The ESS log file path.
+        software (str, optional): The ESS which generated the log file, determined from the file if not given.
+
+    Raises:
+        InputError: If the file could not be found.
+        ParserError: If the ESS is not supported.
+
+    Returns:
+        ParsedLog: The parsed log.
+    """
+    if not os.path.isfile(path):
+        raise InputError(f'Could not find file {path}')
+    software = software.lower() if software is not None else determine_ess(path)
+    if software not in log_handlers:
+        raise ParserError(f'Cannot parse log files of {software}, supported ESS are: {list(log_handlers.keys())}')
+    stat = os.stat(path)
+    # the modification time and size are part of the cache key, so a modified file is parsed again
+    return _parse_log(path=os.path.abspath(path), software=software, mtime=stat.st_mtime_ns, size=stat.st_size)
+
+
+def _get_log_quantity(path: str,
+                      quantity: str,
+                      ):
+    """
+    Get a quantity parsed from an ESS log file in the streaming pass of ``parse_log()``, if possible.
+    The callers fall back to Arkane's log classes if ``None`` is returned, e.g., for methods or ESS
+    for which the quantity isn't extracted in the streaming pass.
+
+    Args:
+        path (str): The ESS log file path.
+        quantity (str): The quantity name.
+
+    Returns:
+        The parsed quantity, ``None`` if it could not be parsed.
+    """
+    try:
+        return parse_log(path=path).get(quantity)
+    except (InputError, ParserError):
+        return None
+
+
+@lru_cache(maxsize=128)
+def _parse_log(path: str,
+               software: str,
+               mtime: int,
+               size: int,
+               ) -> 'ParsedLog':
+    """
+    A cached helper function for parsing an ESS log file.
+
+    Args:
+        path (str): The absolute ESS log file path.
+        software (str): The ESS which generated the log file.
+        mtime (int): The file modification time in nanoseconds.
+        size (int): The file size in bytes.
+
+    Returns:
+        ParsedLog: The parsed log.
+    """
+    return ParsedLog(path=path, software=software)
+
+
+class ParsedLog(object):
+    """
+    The quantities parsed from an ESS log file.
+    The file is read line by line in a single pass, and each line is fed to all handlers registered for the ESS
+    in ``log_handlers``, so only the parsed quantities (not the file content) are kept in memory.
+
+    Args:
+        path (str): The ESS log file path.
+        software (str): The ESS which generated the log file.
+
+    Attributes:
+        path (str): The ESS log file path.
+        software (str): The ESS which generated the log file.
+        quantities (dict): Keys are quantity names (e.g., 'frequencies'), values are the parsed quantities
+                           (``None`` if a quantity was not found in the log file).
+    """
+
+    def __init__(self, path: str, software: str):
+        self.path = path
+        self.software = software
+        handlers = {quantity: handler() for quantity, handler in log_handlers[software].items()}
+        failed = set()
+        with open(path, 'r') as f:
+            for line in f:
+                for quantity, handler in handlers.items():
+                    if quantity in failed:
+                        continue
+                    try:
+                        handler.feed(line)
+                    except (IndexError, ValueError):
+                        # an unexpected format shouldn't prevent parsing the other quantities
+                        logger.debug(f'Could not parse {quantity} from {path}, got an unexpected line:\n{line}')
+                        failed.add(quantity)
+        for handler in handlers.values():
+            handler.finalize()
+        self.quantities = {quantity: handler.value if quantity not in failed else None
+                           for quantity, handler in handlers.items()}
+
+    def get(self, quantity: str):
+        """
+        Get a parsed quantity.
+
+        Args:
+            quantity (str): The quantity name.
+
+        Returns:
+            The parsed quantity, ``None`` if it was not found or is not parsed for this ESS.
+        """
+        return self.quantities.get(quantity, None)
+
+
+class LogHandler(object):
+    """
+    A base class for extracting a quantity from an ESS log file which is fed line by line.
+
+    Attributes:
+        value: The extracted quantity, ``None`` if it was not found.
+    """
+
+    def __init__(self):
+        self.value = None
+
+    def feed(self, line: str):
+        """
+        Process the next line of the log file.
+
+        Args:
+            line (str): The line.
+        """
+        raise NotImplementedError
+
+    def finalize(self):
+        """
+        Set the value after the last line of the log file was processed, if it depends on several lines.
+        """
+        pass
+
+
+class GaussianFrequencies(LogHandler):
+    """Extract the frequencies from a Gaussian log file"""
+
+    def __init__(self):
+        super().__init__()
+        self.value = list()
+
+    def feed(self, line):
+        if 'Frequencies --' in line:
+            self.value.extend(float(frq) for frq in line.split()[2:])
+
+
+class MolproFrequencies(LogHandler):
+    """Extract the frequencies from a Molpro log file"""
+
+    def __init__(self):
+        super().__init__()
+        self.value = list()
+        self.read = False
+
+    def feed(self, line):
+        if 'Nr' in line and '[1/cm]' in line:
+            return
+        if self.read:
+            if line == os.linesep:
+                self.read = False
+                return
+            self.value.append(float(line.split()[-1]))
+        if 'Low' not in line and 'Vibration' in line and 'Wavenumber' in line:
+            self.read = True
+
+
+class OrcaFrequencies(LogHandler):
+    """Extract the (non-zero) frequencies from the first frequencies block of an Orca log file"""
+
+    def __init__(self):
+        super().__init__()
+        self.value = list()
+        self.stage = 'search'  # 'search' -> 'skip' (to the first mode) -> 'read' -> 'done'
+
+    def feed(self, line):
+        if self.stage == 'search' and 'VIBRATIONAL FREQUENCIES' in line:
+            self.stage = 'skip'
+        if self.stage == 'skip' and line.strip() and line.split()[0] == '0:':
+            self.stage = 'read'
+        if self.stage == 'read':
+            if not line.strip():
+                self.stage = 'done'
+            elif float(line.split()[1]) != 0.0:
+                self.value.append(float(line.split()[1]))
+
+
+class QChemFrequencies(LogHandler):
+    """Extract the frequencies from a QChem log file"""
+
+    def __init__(self):
+        super().__init__()
+        self.value = list()
+
+    def feed(self, line):
+        if ' Frequency:' in line:
+            self.value.extend(float(item) for item in line.split()[1:])
+
+
+class TeraChemFrequencies(LogHandler):
+    """Extract the frequencies from a TeraChem log file"""
+
+    def __init__(self):
+        super().__init__()
+        self.value = list()
+        self.read = False
+        self.done = False
+
+    def feed(self, line):
+        if self.done:
+            return
+        if '=== Mode' in line:
+            # example: '=== Mode 1: 1198.526 cm^-1 ==='
+            self.value.append(float(line.split()[3]))
+        elif 'Vibrational Frequencies/Thermochemical Analysis After Removing Rotation and Translation' in line:
+            self.read = True
+        elif self.read:
+            if 'Temperature (Kelvin):' in line or 'Frequency(cm-1)' in line:
+                return
+            if not line.strip():
+                self.done = True
+                return
+            # example:
+            # 'Mode  Eigenvalue(AU)  Frequency(cm-1)  Intensity(km/mol)   Vib.Temp(K)      ZPE(AU) ...'
+            # '  1     0.0331810528   170.5666870932      52.2294230772  245.3982965841   0.0003885795 ...'
+            self.value.append(float(line.split()[2]))
+
+
+class GaussianDipoleMoment(LogHandler):
+    """Extract the (last) dipole moment in Debye from a Gaussian log file"""
+
+    def __init__(self):
+        super().__init__()
+        self.read = False
+
+    def feed(self, line):
+        # example:
+        # Dipole moment (field-independent basis, Debye):
+        # X=             -0.0000    Y=             -0.0000    Z=             -1.8320  Tot=              1.8320
+        if 'dipole moment' in line.lower() and 'debye' in line.lower():
+            self.read = True
+        elif self.read:
+            self.value = float(line.split()[-1])
+            self.read = False
+
+
+class MolproDipoleMoment(LogHandler):
+    """Extract the (last) dipole moment in Debye from a Molpro log file"""
+
+    def feed(self, line):
+        # example: ' Dipole moment /Debye                   2.96069859     0.00000000     0.00000000'
+        if 'dipole moment' in line.lower() and '/debye' in line.lower():
+            splits = line.split()
+            dm_x, dm_y, dm_z = float(splits[-3]), float(splits[-2]), float(splits[-1])
+            self.value = (dm_x ** 2 + dm_y ** 2 + dm_z ** 2) ** 0.5
+
+
+class OrcaDipoleMoment(LogHandler):
+    """Extract the (last) dipole moment in Debye from an Orca log file"""
+
+    def feed(self, line):
+        # example: 'Magnitude (Debye)      :      2.11328'
+        if 'Magnitude (Debye)' in line:
+            self.value = float(line.split()[-1])
+
+
+class QChemDipoleMoment(LogHandler):
+    """Extract the (last) dipole moment in Debye from a QChem log file"""
+
+    def __init__(self):
+        super().__init__()
+        self.skip = False
+        self.read = False
+
+    def feed(self, line):
+        # example:
+        #     Dipole Moment (Debye)
+        #          X       0.0000      Y       0.0000      Z       2.0726
+        #        Tot       2.0726
+        if 'dipole moment' in line.lower() and 'debye' in line.lower():
+            self.skip = True
+        elif self.skip:
+            self.skip = False
+            self.read = True
+        elif self.read:
+            self.value = float(line.split()[-1])
+            self.read = False
+
+
+class TeraChemDipoleMoment(LogHandler):
+    """Extract the (last) dipole moment in Debye from a TeraChem log file"""
+
+    def feed(self, line):
+        # example: 'DIPOLE MOMENT: {-0.000178, -0.000003, -0.000019} (|D| = 0.000179) DEBYE'
+        if 'dipole moment' in line.lower() and 'debye' in line.lower():
+            splits = line.split('{')[1].split('}')[0].replace(',', '').split()
+            dm_x, dm_y, dm_z = float(splits[0]), float(splits[1]), float(splits[2])
+            self.value = (dm_x ** 2 + dm_y ** 2 + dm_z ** 2) ** 0.5
+
+
+class Polarizability(LogHandler):
+    """Extract the (last) isotropic polarizability in Angstrom^3 from a log file"""
+
+    def feed(self, line):
+        if 'Isotropic polarizability for W' in line:
+            # example:  Isotropic polarizability for W=    0.000000       11.49 Bohr**3.
+            # 1 Bohr = 0.529177 Angstrom
+            self.value = float(line.split()[-2]) * 0.529177 ** 3
+
+
+class GaussianStandardOrientation(LogHandler):
+    """Extract the first standard orientation geometry (as an xyz string) from a Gaussian log file"""
+
+    def __init__(self):
+        super().__init__()
+        self.stage = 'search'  # 'search' -> 'skip' (the table header) -> 'read' -> 'done'
+        self.xyz_str = ''
+
+    def feed(self, line):
+        if self.stage == 'search':
+            if 'Standard orientation:' in line:
+                self.stage = 'skip'
+            return
+        if self.stage == 'skip' and line.split() and line.split()[0].isdigit():
+            self.stage = 'read'
+        if self.stage == 'read':
+            if '-------------------' in line:
+                self.value, self.stage = self.xyz_str, 'done'
+                return
+            splits = line.split()
+            self.xyz_str += f'{qcel.periodictable.to_E(int(splits[1]))}  {splits[3]}  {splits[4]}  {splits[5]}\n'
+
+
+class ElectronicEnergy(LogHandler):
+    """
+    A base class for extracting the (last) electronic energy in Hartree from a log file.
+    The value is a tuple of the energy and of a ZPE (in Hartree) which should still be scaled and subtracted from it
+    (only for Gaussian composite methods, otherwise 0), see ``parse_e_elect()``.
+
+    Attributes:
+        energy (float): The electronic energy in Hartree.
+        scalable_zpe (float): The ZPE in Hartree to scale and subtract from the energy.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.energy = None
+        self.scalable_zpe = 0.0
+
+    def finalize(self):
+        if self.energy is not None:
+            self.value = (self.energy, self.scalable_zpe)
+
+
+class GaussianElectronicEnergy(ElectronicEnergy):
+    """
+    Extract the electronic energy from a Gaussian log file, for composite methods this is E0 without the ZPE.
+    Post-HF energies override the SCF energy.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.e_elect = None
+        self.e0_composite = None
+        self.zpe, self.zpe_is_scaled = None, False
+        self.archive = ''
+
+    def feed(self, line):
+        if self.archive:
+            # the rest of a ZeroPoint entry in the archive block, which could be split across two lines
+            self._read_zpe_from_archive(self.archive + line.strip())
+        elif 'SCF Done:' in line:
+            # example: ' SCF Done:  E(RB+HF-LYP) =  -698.994550553     A.U. after   13 cycles'
+            self.e_elect = float(line.split()[4])
+        elif ' E2(' in line and ' E(' in line:
+            # example: ' E2(B2PLYPD3) =    -0.1730297598D+00 E(B2PLYPD3) =    -0.11566617402D+03'
+            self.e_elect = float(line.split()[-1].replace('D', 'E'))
+        elif 'MP2 =' in line:
+            # example: ' E2 =    -0.3038458093D+00 EUMP2 =    -0.11451380219D+03'
+            self.e_elect = float(line.split()[-1].replace('D', 'E'))
+        elif 'CCSD(T)= ' in line:
+            # example: ' CCSD(T)= -0.11466143498D+03'
+            self.e_elect = float(line.split()[1].replace('D', 'E'))
+        elif 'CBS-QB3 (0 K)' in line:
+            # example: ' CBS-QB3 (0 K)=          -698.186333 CBS-QB3 Energy=            -698.181982'
+            self.e0_composite = float(line.split()[3])
+        elif 'G3(0 K)' in line or 'G4(0 K)' in line or 'G4MP2(0 K)' in line:
+            # example: ' G4(0 K)=          -79.757327 G4 Energy=          -79.753815'
+            self.e0_composite = float(line.split()[2])
+        elif 'E(ZPE)=' in line:
+            # the ZPE of composite methods, already scaled
+            # example: ' E(ZPE)=                   0.014845 E(Thermal)=                  0.019195'
+            self.zpe, self.zpe_is_scaled = float(line.split()[1]), True
+        elif '\\ZeroPoint=' in line:
+            self._read_zpe_from_archive(line.strip())
+
+    def finalize(self):
+        if self.e0_composite is None:
+            self.energy = self.e_elect
+        elif self.zpe is not None:  # otherwise, the ZPE of the composite method could not be found
+            if self.zpe_is_scaled:
+                self.energy = self.e0_composite - self.zpe
+            else:
+                self.energy, self.scalable_zpe = self.e0_composite, self.zpe
+        super().finalize()
+
+    def _read_zpe_from_archive(self, archive):
+        """
+        Read the unscaled ZPE from the archive block, e.g., '=3.588e-04\\ZeroPoint=0.0149945\\Thermal=0.019321'.
+
+        Args:
+            archive (str): The archive block text starting at the ZeroPoint entry line.
+        """
+        start = archive.find('\\ZeroPoint=') + 11
+        end = archive.find('\\', start)
+        if end == -1 and not self.archive:
+            self.archive = archive  # the entry continues in the next line
+            return
+        self.archive = ''
+        self.zpe, self.zpe_is_scaled = float(archive[start:end]), False
+
+
+class MolproElectronicEnergy(ElectronicEnergy):
+    """
+    Extract the electronic energy from a Molpro log file. For F12 methods, the F12a energy is used with double- and
+    triple-zeta basis sets, and the F12b energy with larger basis sets. MRCI energies aren't extracted.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.basis = None
+        self.f12a, self.f12b, self.last = None, None, None
+        self.mrci = False
+
+    def feed(self, line):
+        if self.basis is None and 'basis' in line.lower():
+            # example: ' basis=cc-pvtz-f12'
+            self.basis = line.lower()
+        elif 'mrci' in line.lower():
+            self.mrci = True
+        elif line.strip().startswith('!') and 'energy' in line.lower():
+            # examples: ' !RHF STATE 1.1 Energy                -95.260555729010'
+            #           ' !CCSD(T)-F12a total energy           -95.744622041865'
+            energy = float(line.split()[-1])
+            if 'ccsd(t)-f12a' in line.lower():
+                self.f12a = energy
+            elif 'ccsd(t)-f12b' in line.lower():
+                self.f12b = energy
+            self.last = energy
+
+    def finalize(self):
+        if self.mrci:
+            return
+        if self.f12a is not None and self.basis is not None and ('vtz' in self.basis or 'vdz' in self.basis):
+            self.energy = self.f12a
+        elif self.f12b is not None:
+            self.energy = self.f12b
+        else:
+            self.energy = self.last
+        super().finalize()
+
+
+class OrcaElectronicEnergy(ElectronicEnergy):
+    """Extract the (last) electronic energy from an Orca log file"""
+
+    def feed(self, line):
+        # example: 'FINAL SINGLE POINT ENERGY      -114.411172663225'
+        if 'FINAL SINGLE POINT ENERGY' in line:
+            self.energy = float(line.split()[-1])
+
+
+class QChemElectronicEnergy(ElectronicEnergy):
+    """Extract the electronic energy from a QChem log file, the final energy of an optimization is preferred"""
+
+    def __init__(self):
+        super().__init__()
+        self.final_energy, self.total_energy = None, None
+
+    def feed(self, line):
+        if 'Final energy is' in line:
+            # example: ' Final energy is   -111.870957705938'
+            self.final_energy = float(line.split()[3])
+        elif 'Total energy in the final basis set' in line:
+            # example: ' Total energy in the final basis set = -79.8274585748'
+            self.total_energy = float(line.split()[8])
+
+    def finalize(self):
+        self.energy = self.final_energy if self.final_energy is not None else self.total_energy
+        super().finalize()
+
+
+class TeraChemElectronicEnergy(ElectronicEnergy):
+    """Extract the (last) electronic energy from a TeraChem output or results file"""
+
+    def __init__(self):
+        super().__init__()
+        self.read = False
+
+    def feed(self, line):
+        if 'FINAL ENERGY:' in line:
+            # example: 'FINAL ENERGY: -114.5008455547 a.u.'
+            self.energy = float(line.split()[2])
+        elif 'Ground state energy (a.u.):' in line:
+            # example:
+            # Ground state energy (a.u.):
+            #      -114.5008455547
+            self.read = True
+        elif self.read:
+            self.energy = float(line.split()[0])
+            self.read = False
+
+
+class GaussianZPE(LogHandler):
+    """Extract the (last, unscaled) ZPE in J/mol from a Gaussian log file"""
+
+    def __init__(self):
+        super().__init__()
+        self.archive = ''
+
+    def feed(self, line):
+        # Don't read the ZPE from the "E(ZPE)=" line of composite methods, it is already scaled.
+        if self.archive or '\\ZeroPoint=' in line:
+            # example: '=3.588e-04\\ZeroPoint=0.0149945\\Thermal=0.019321\\Dipole=0.,0.,-0.161740'
+            archive = self.archive + line.strip()
+            start = archive.find('\\ZeroPoint=') + 11
+            end = archive.find('\\', start)
+            if end == -1 and not self.archive:
+                self.archive = archive  # the entry continues in the next line
+                return
+            self.archive = ''
+            self.value = float(archive[start:end]) * constants.E_h * constants.Na
+        elif 'Zero-point correction=' in line:
+            # example: ' Zero-point correction=                           0.014994 (Hartree/Particle)'
+            self.value = float(line.split()[2]) * constants.E_h * constants.Na
+
+
+class MolproZPE(LogHandler):
+    """Extract the (last) ZPE in J/mol from a Molpro log file"""
+
+    def __init__(self):
+        super().__init__()
+        self.electronic_energy = None
+
+    def feed(self, line):
+        # example:
+        #  Electronic Energy at 0 [K]:                      -114.342934 [H]
+        #  Electronic Energy + Zero-Point correction:       -114.316351 [H]
+        if 'Electronic Energy at 0 [K]:' in line:
+            self.electronic_energy = float(line.split()[5])
+        elif 'Electronic Energy + Zero-Point correction:' in line and self.electronic_energy is not None:
+            self.value = (float(line.split()[5]) - self.electronic_energy) * constants.E_h * constants.Na
+
+
+class OrcaZPE(LogHandler):
+    """Extract the (last) ZPE in J/mol from an Orca log file"""
+
+    def feed(self, line):
+        # example: 'Zero point energy                ...      0.02700781 Eh      16.95 kcal/mol'
+        if 'Zero point energy' in line:
+            self.value = float(line.split()[4]) * constants.E_h * constants.Na
+
+
+class QChemZPE(LogHandler):
+    """Extract the (last) ZPE in J/mol from a QChem log file"""
+
+    def feed(self, line):
+        # example: '   Zero point vibrational energy:       47.343 kcal/mol'
+        if 'Zero point vibrational energy:' in line:
+            self.value = float(line.split()[4]) * 4184  # convert kcal/mol to J/mol
+
+
+class MolproT1(LogHandler):
+    """Extract the (last) T1 diagnostic from a Molpro log file"""
+
+    def feed(self, line):
+        # example: ' Norm of t1 vector:      0.04591224      S-energy:    -0.00000015      T1 diagnostic:  0.00867660'
+        if 'T1 diagnostic:' in line:
+            self.value = float(line.split()[-1])
+
+
+class OrcaT1(LogHandler):
+    """Extract the (last) T1 diagnostic from an Orca log file"""
+
+    def feed(self, line):
+        # example: 'T1 diagnostic                              ...      0.00795237'
+        if 'T1 diagnostic' in line:
+            self.value = float(line.split()[-1])
+
+
+class GaussianScanEnergies(LogHandler):
+    """
+    Extract the energies in Hartree of a 1D torsion scan from a Gaussian log file.
+    The SCF energy right before each "Optimization completed" line is taken for relaxed scans,
+    and every SCF energy is taken for rigid scans. The value is ``None`` if less than two energies were found.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.energies = list()
+        self.e_elect = None
+        self.rigid_scan, self.opt_freq = False, False
+
+    def feed(self, line):
+        if line.strip().startswith('#'):
+            # the route section, e.g.: ' #P opt=(modredundant, calcfc, noeigentest) b3lyp/6-311+g(d,p) scf=xqc'
+            if 'freq' in line.lower():
+                self.opt_freq = True  # the energy of the last (frequency) step isn't a scan point
+            if '# scan' in line.lower():
+                self.rigid_scan = True
+        if 'SCF Done:' in line:
+            self.e_elect = float(line.split()[4])
+            if self.rigid_scan:
+                self.energies.append(self.e_elect)
+        elif 'Optimization completed' in line and self.e_elect is not None:
+            self.energies.append(self.e_elect)
+
+    def finalize(self):
+        energies = self.energies[:-1] if self.opt_freq else self.energies
+        if len(energies) > 1:
+            self.value = energies
+
+
+# The quantities extracted by ``ParsedLog`` for each ESS, values are ``LogHandler`` classes.
+log_handlers = {'gaussian': {'frequencies': GaussianFrequencies,
+                             'dipole_moment': GaussianDipoleMoment,
+                             'polarizability': Polarizability,
+                             'standard_orientation': GaussianStandardOrientation,
+                             'e_elect': GaussianElectronicEnergy,
+                             'zpe': GaussianZPE,
+                             'scan_energies': GaussianScanEnergies,
+                             },
+                'molpro': {'frequencies': MolproFrequencies,
+                           'dipole_moment': MolproDipoleMoment,
+                           'polarizability': Polarizability,
+                           'e_elect': MolproElectronicEnergy,
+                           'zpe': MolproZPE,
+                           't1': MolproT1,
+                           },
+                'orca': {'frequencies': OrcaFrequencies,
+                         'dipole_moment': OrcaDipoleMoment,
+                         'polarizability': Polarizability,
+                         'e_elect': OrcaElectronicEnergy,
+                         'zpe': OrcaZPE,
+                         't1': OrcaT1,
+                         },
+                'qchem': {'frequencies': QChemFrequencies,
+                          'dipole_moment': QChemDipoleMoment,
+                          'polarizability': Polarizability,
+                          'e_elect': QChemElectronicEnergy,
+                          'zpe': QChemZPE,
+                          },
+                'terachem': {'frequencies': TeraChemFrequencies,
+                             'dipole_moment': TeraChemDipoleMoment,
+                             'polarizability': Polarizability,
+                             'e_elect': TeraChemElectronicEnergy,
+                             },
+                }
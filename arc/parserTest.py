@@ -9,6 +9,8 @@ import numpy as np
 import os
 import unittest
 
+from arkane.ess import ess_factory
+
 import arc.parser as parser
 from arc.settings import arc_path
 from arc.species import ARCSpecies
@@ -311,6 +313,84 @@ H      -0.59436200   -0.94730400    0.00000000"""
         polar1 = parser.parse_polarizability(path1)
         self.assertAlmostEqual(polar1, 3.99506, 4)
 
+        path2 = os.path.join(arc_path, 'arc', 'testing', 'freq', 'CH2O_freq_molpro.out')
+        self.assertIsNone(parser.parse_polarizability(path2))
+
+    def test_parse_log(self):
+        """Test parsing several quantities from a log file in a single pass"""
+        path = os.path.join(arc_path, 'arc', 'testing', 'composite', 'SO2OO_CBS-QB3.log')
+        parsed_log = parser.parse_log(path)
+        self.assertEqual(parsed_log.software, 'gaussian')
+        self.assertEqual(parsed_log.get('dipole_moment'), 0.63)
+        self.assertAlmostEqual(parsed_log.get('polarizability'), 3.99506, 4)
+        self.assertEqual(len(parsed_log.get('frequencies')), 9)
+        self.assertIn('S  0.000000  0.000000  0.244712', parsed_log.get('standard_orientation'))
+        self.assertIsNone(parsed_log.get('t1'))
+        self.assertEqual(parsed_log.get('e_elect'), (-698.186333 - 0.014845, 0.0))  # E0 without the scaled ZPE
+        self.assertEqual(parsed_log.get('zpe'), parser.parse_zpe(path) * 1000)
+        self.assertIs(parser.parse_log(path, software='Gaussian'), parsed_log)  # cached
+
+        path = os.path.join(arc_path, 'arc', 'testing', 'sp', 'mehylamine_CCSD(T).out')
+        parsed_log = parser.parse_log(path)
+        self.assertEqual(parsed_log.get('e_elect'), (-95.744622041865, 0.0))  # F12a with a triple-zeta basis set
+        self.assertEqual(parsed_log.get('t1'), 0.0086766)
+        self.assertIsNone(parsed_log.get('zpe'))
+
+    def test_parse_log_parity_with_arkane(self):
+        """Test that the streaming pass parses the same energies, ZPEs, T1 diagnostics and scans as Arkane"""
+        # keys are ESS, values are dictionaries of log files (relative to arc/testing) and the quantities to compare
+        logs = {'gaussian': {os.path.join('composite', 'SO2OO_CBS-QB3.log'): ['e_elect', 'zpe'],
+                             'CHO_neg_freq.out': ['e_elect', 'zpe'],
+                             os.path.join('restart', '1_restart_thermo', 'freq_a19031.out'): ['e_elect', 'zpe'],
+                             os.path.join('restart', '1_restart_thermo', 'sp_a19032.out'): ['e_elect'],
+                             os.path.join('trsh', 'gaussian', 'l913.out'): ['e_elect', 'zpe'],
+                             os.path.join('rotor_scans', 'H2O2.out'): ['scan_energies'],
+                             os.path.join('rotor_scans', 'sBuOH.out'): ['scan_energies'],
+                             os.path.join('rotor_scans', 'CH3C(O)O_FreeRotor.out'): ['scan_energies'],
+                             },
+                'molpro': {os.path.join('sp', 'mehylamine_CCSD(T).out'): ['e_elect', 't1'],
+                           os.path.join('freq', 'CH2O_freq_molpro.out'): ['e_elect', 'zpe', 't1'],
+                           },
+                'orca': {'orca_example_freq.log': ['e_elect', 'zpe'],
+                         'orca_example_opt.log': ['e_elect'],
+                         os.path.join('trsh', 'orca', 'orca_successful_sp.log'): ['e_elect', 't1'],
+                         os.path.join('trsh', 'orca', 'orca_successful_sp_scf.log'): ['e_elect', 't1'],
+                         },
+                'qchem': {os.path.join('freq', 'C2H6_freq_QChem.out'): ['e_elect', 'zpe'],
+                          os.path.join('freq', 'NO3_freq_QChem_fails_on_cclib.out'): ['e_elect', 'zpe'],
+                          'N2H4_opt_QChem.out': ['e_elect'],
+                          os.path.join('xyz', 'qchem_output.out'): ['e_elect', 'zpe'],
+                          },
+                'terachem': {os.path.join('sp', 'formaldehyde_sp_terachem_output.out'): ['e_elect'],
+                             os.path.join('freq', 'formaldehyde_freq_terachem_output.out'): ['e_elect'],
+                             os.path.join('freq', 'ethylamine_freq_terachem_output.out'): ['e_elect'],
+                             },
+                }
+        for software, quantities_per_log in logs.items():
+            for file_name, quantities in quantities_per_log.items():
+                path = os.path.join(arc_path, 'arc', 'testing', file_name)
+                parsed_log = parser.parse_log(path, software=software)
+                log = ess_factory(fullpath=path)
+                for quantity in quantities:
+                    value = parsed_log.get(quantity)
+                    self.assertIsNotNone(value, msg=f'{quantity} was not parsed from {file_name}')
+                    if quantity == 'e_elect':
+                        energy, scalable_zpe = value
+                        self.assertAlmostEqual((energy - scalable_zpe * 0.99) * parser.HARTREE_TO_KJ_MOL * 1000,
+                                               log.load_energy(zpe_scale_factor=0.99), places=2,
+                                               msg=f'{quantity} of {file_name}')
+                    elif quantity == 'zpe':
+                        self.assertAlmostEqual(value, log.load_zero_point_energy(), places=2,
+                                               msg=f'{quantity} of {file_name}')
+                    elif quantity == 't1':
+                        self.assertAlmostEqual(value, log.get_T1_diagnostic(), places=8,
+                                               msg=f'{quantity} of {file_name}')
+                    elif quantity == 'scan_energies':
+                        energies, angles = parser.parse_1d_scan_energies(path)
+                        arkane_energies, arkane_angles = log.load_scan_energies()
+                        np.testing.assert_almost_equal(energies, arkane_energies * 0.001)
+                        np.testing.assert_almost_equal(angles, arkane_angles * 180 / np.pi)
+
     def test_process_conformers_file(self):
         """Test processing ARC conformer files"""
         path1 = os.path.join(arc_path, 'arc', 'testing', 'xyz', 'conformers_before_optimization.txt')
@@ -6,16 +6,24 @@ A module for scheduling jobs
 Includes spawning, terminating, checking, and troubleshooting various jobs
 """
 
+import copy
 import datetime
 import itertools
 import logging
+import math
+import multiprocessing
 import os
 import shutil
+import sys
 import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from logging.handlers import QueueListener
 from IPython.display import display
 from typing import Optional, Tuple
 
-from arc.common import (extermum_list,
+from arc.common import (append_yaml_document,
+                        extermum_list,
                         format_level_of_theory_for_logging,
                         format_level_of_theory_inputs,
                         get_logger,
@@ -25,7 +33,7 @@ from arc.common import (extermum_list,
                         sort_two_lists_by_the_first)
 from arc import plotter
 from arc import parser
-from arc.job.job import Job
+from arc.job.job import Job, get_job_array_directives, submit_job_array
 from arc.exceptions import (InputError,
                             SanitizationError,
                             SchedulerError,
@@ -33,6 +41,7 @@ from arc.exceptions import (InputError,
                             TrshError)
 from arc.job.local import check_running_jobs_ids
 from arc.job.ssh import SSHClient
+from arc.job.submit import array_submit_scripts
 from arc.job.trsh import (scan_quality_check,
                           trsh_conformer_isomorphism,
                           trsh_ess_job,
@@ -44,15 +53,27 @@ from arc.species.species import (ARCSpecies,
                                  TSGuess)
 from arc.species.converter import (check_isomorphism,
                                    compare_confs,
+                                   modify_dihedrals,
                                    molecules_from_xyz,
                                    standardize_xyz_string,
                                    str_to_xyz,
-                                   xyz_to_coords_list,
                                    xyz_to_str)
-from arc.settings import default_job_settings, default_job_types, rotor_scan_resolution
+from arc.settings import (default_conformer_combination_search,
+                          default_conformer_max_ff_evaluations,
+                          default_conformer_max_workers,
+                          default_job_settings,
+                          default_job_types,
+                          max_concurrent_conformer_generations,
+                          max_concurrent_job_downloads,
+                          min_poll_interval,
+                          restart_file_format,
+                          restart_journal_compaction_interval,
+                          rotor_scan_resolution,
+                          servers)
 import arc.rmgdb as rmgdb
+from arc.serialization import save_file
 import arc.species.conformers as conformers  # import after importing plotter to avoid circular import
-from arc.species.vectors import get_angle, calculate_dihedral_angle
+from arc.species.vectors import calculate_angles, calculate_dihedral_angle, calculate_dihedral_angles
 
 logger = get_logger()
 
@@ -140,6 +161,13 @@ class Scheduler(object):
         n_confs (int, optional): The number of lowest force field conformers to consider.
         e_confs (float, optional): The energy threshold in kJ/mol above the lowest energy conformer below which
                                    force field conformers are considered.
+        conformer_max_workers (int, optional): The max number of local processes used for force field conformers.
+        conformer_combination_search (str, optional): The strategy for searching force field conformer combinations.
+        conformer_max_ff_evaluations (int, optional): The max number of force field evaluations of a stochastic
+                                                      conformer combination search.
+        conformer_wall_time (float, optional): A wall time budget in seconds for embedding random force field
+                                               conformers per species. The ``conformer_wall_time`` setting is used if
+                                               not given.
         solvation (dict): This argument, if not ``None``, requests that a calculation be performed in the presence of a
                           solvent by placing the solute in a cavity within the solvent reaction field.
                           Keys are:
@@ -164,6 +192,22 @@ class Scheduler(object):
         running_jobs (dict): A dictionary of currently running jobs (a subset of `job_dict`).
                              Keys are species/TS label, values are lists of job names (e.g. 'conformer3', 'opt_a123').
         servers_jobs_ids (list): A list of relevant job IDs currently running on the server.
+        server_job_ids (dict): The most recent queue snapshot of each server. Keys are server names,
+                               values are lists of job IDs currently running on the respective server.
+        server_poll_times (dict): Keys are server names, values are the times (in seconds since the epoch)
+                                  at which the respective server queue was last polled.
+        job_status_futures (dict): Keys are (species label, job name) tuples of jobs which terminated on the server
+                                   (job names, e.g., 'conformer0', aren't unique across species), values are futures
+                                   of their status determination (including downloading and parsing the output
+                                   files), concurrently executed by ``job_status_executor``.
+        job_status_executor (ThreadPoolExecutor): A thread pool for determining the status of terminated jobs.
+        conformer_generation_futures (dict): Keys are species labels, values are futures of their force field
+                                             conformer generation, executed by ``conformer_generation_executor``.
+        conformer_generation_executor (ProcessPoolExecutor): A process pool for generating force field conformers.
+        conformer_generation_log_listener (QueueListener): Handles the log records of the conformer generation
+                                                           processes using the handlers of the ARC logger.
+        pending_array_jobs (list): Jobs which were prepared but not submitted yet,
+                                   to be submitted as job array tasks by ``submit_pending_job_arrays()``.
         output (dict): Output dictionary with status per job type and final QM file paths for all species.
         ess_settings (dict): A dictionary of available ESS and a corresponding server list.
         job_additional_options (dict): Additional specifications to control the execution of a job.
@@ -172,7 +216,14 @@ class Scheduler(object):
         project_directory (str): Folder path for the project: the input file path or ARC/Projects/project-name.
         save_restart (bool): Whether to start saving a restart file. ``True`` only after all species are loaded
                              (otherwise saves a partial file and may cause loss of information).
-        restart_path (str): Path to the `restart.yml` file to be saved.
+        restart_path (str): Path to the restart file to be saved (e.g., `restart.yml`).
+        restart_journal_path (str): Path to the restart journal file, to which changes of the restart dictionary
+                                    are appended between compactions into the restart file.
+        restart_dirty_labels (set): Labels of species whose 'output', 'species', or 'running_jobs' entries changed since
+                                    they were last saved to the restart file or journal.
+        restart_saved_labels (set): Labels of species saved to the restart file and journal, ``None`` before the
+                                    restart file was first saved.
+        restart_journal_entries (int): The number of entries appended to the restart journal since its compaction.
         max_job_time (float): The maximal allowed job time on the server in hours (can be fractional).
         testing (bool): Used for internal ARC testing (generating the object w/o executing it).
         rmg_database (RMGDatabase): The RMG database object.
@@ -184,6 +235,11 @@ class Scheduler(object):
         n_confs (int): The number of lowest force field conformers to consider.
         e_confs (float): The energy threshold in kJ/mol above the lowest energy conformer below which
                          force field conformers are considered.
+        conformer_max_workers (int): The max number of local processes used for force field conformers.
+        conformer_combination_search (str): The strategy for searching force field conformer combinations.
+        conformer_max_ff_evaluations (int): The max number of force field evaluations of a stochastic
+                                            conformer combination search.
+        conformer_wall_time (float): A wall time budget in seconds for embedding random force field conformers.
         job_types (dict): A dictionary of job types to execute. Keys are job types, values are boolean.
         bath_gas (str): A bath gas. Currently used in OneDMin to calc L-J parameters.
                         Allowed values are He, Ne, Ar, Kr, H2, N2, O2.
@@ -234,6 +290,10 @@ class Scheduler(object):
                  n_confs: int = 10,
                  e_confs: float = 5,
                  fine_only: bool = False,
+                 conformer_max_workers: int = None,
+                 conformer_combination_search: str = None,
+                 conformer_max_ff_evaluations: int = None,
+                 conformer_wall_time: float = None,
                  ) -> None:
         self.rmg_database = rmg_database
         self.restart_dict = restart_dict
@@ -245,6 +305,14 @@ class Scheduler(object):
         self.project_directory = project_directory
         self.job_dict = dict()
         self.servers_jobs_ids = list()
+        self.server_job_ids = dict()
+        self.server_poll_times = dict()
+        self.job_status_futures = dict()
+        self.job_status_executor = None
+        self.conformer_generation_futures = dict()
+        self.conformer_generation_executor = None
+        self.conformer_generation_log_listener = None
+        self.pending_array_jobs = list()
         self.running_jobs = dict()
         self.allow_nonisomorphic_2d = allow_nonisomorphic_2d
         self.testing = testing
@@ -254,6 +322,10 @@ class Scheduler(object):
         self.adaptive_levels = adaptive_levels
         self.n_confs = n_confs
         self.e_confs = e_confs
+        self.conformer_max_workers = conformer_max_workers or default_conformer_max_workers
+        self.conformer_combination_search = conformer_combination_search or default_conformer_combination_search
+        self.conformer_max_ff_evaluations = conformer_max_ff_evaluations or default_conformer_max_ff_evaluations
+        self.conformer_wall_time = conformer_wall_time
         self.dont_gen_confs = dont_gen_confs or list()
         self.job_types = job_types if job_types is not None else default_job_types
         self.fine_only = fine_only
@@ -268,7 +340,13 @@ class Scheduler(object):
                 self.restore_running_jobs()
         self.initialize_output_dict()
 
-        self.restart_path = os.path.join(self.project_directory, 'restart.yml')
+        self.restart_path = os.path.join(self.project_directory, f'restart.{restart_file_format}')
+        self.restart_journal_path = os.path.join(self.project_directory, 'restart_journal.yml')
+        self.restart_dirty_labels = set()
+        self.restart_saved_labels = None
+        self.restart_journal_entries = 0
+        # memoize force field results of conformer searches in the project folder, so they survive a restart
+        conformers.force_field_cache.set_path(os.path.join(self.project_directory, 'force_field_cache.db'))
         self.report_time = time.time()  # init time for reporting status every 1 hr
         self.servers = list()
         self.composite_method = composite_method
@@ -470,14 +548,31 @@ class Scheduler(object):
             logger.debug(f'Currently running jobs:\n{self.running_jobs}')
             self.timer = True
             job_list = list()
+            self.get_servers_jobs_ids()  # updates `self.servers_jobs_ids` once per pass for all species
+            self.submit_terminated_jobs_status_checks()  # download and parse outputs concurrently
+            self.process_generated_conformers()  # spawn conformer jobs for species with newly generated conformers
             for label in self.unique_species_labels:
+                if label in self.conformer_generation_futures:
+                    # conformers of this species are still being generated in the background
+                    continue
                 # look for completed jobs and decide what jobs to run next
-                self.get_servers_jobs_ids()  # updates `self.servers_jobs_ids`
                 try:
                     job_list = self.running_jobs[label]
                 except KeyError:
                     continue
-                for job_name in job_list:
+                job_names = list(job_list)
+                for job_name in job_names:
+                    # handle all terminated jobs of this species in this pass (iterate over a copy of job_list,
+                    # since terminated jobs are removed from it and newly spawned jobs are appended to it)
+                    if job_name not in self.running_jobs.get(label, list()):
+                        # this job was already ended or deleted while handling another job of this species
+                        continue
+                    job = self.get_running_job(label=label, job_name=job_name)
+                    if job is not None and (label, job.job_name) in self.job_status_futures \
+                            and not self.job_status_futures[(label, job.job_name)].done():
+                        # this job terminated on the server, but its output files are still being downloaded
+                        # and parsed, don't wait for it
+                        continue
                     if 'conformer' in job_name:
                         i = int(job_name[9:])  # the conformer number. parsed from a string like 'conformer12'.
                         job = self.job_dict[label]['conformers'][i]
@@ -488,7 +583,7 @@ class Scheduler(object):
                                 self.parse_conformer(job=job, label=label, i=i)
                             # Just terminated a conformer job.
                             # Are there additional conformer jobs currently running for this species?
-                            for spec_jobs in job_list:
+                            for spec_jobs in self.running_jobs[label]:
                                 if 'conformer' in spec_jobs and spec_jobs != job_name:
                                     break
                             else:
@@ -506,7 +601,6 @@ class Scheduler(object):
                                     else:
                                         self.run_composite_job(label)
                             self.timer = False
-                            break
                     elif 'opt' in job_name \
                             and self.job_dict[label]['opt'][job_name].job_id not in self.servers_jobs_ids:
                         # val is 'opt1', 'opt2', etc., or 'optfreq1', optfreq2', etc.
@@ -517,7 +611,6 @@ class Scheduler(object):
                             if success:
                                 self.spawn_post_opt_jobs(label=label, job_name=job_name)
                         self.timer = False
-                        break
                     elif 'freq' in job_name \
                             and self.job_dict[label]['freq'][job_name].job_id not in self.servers_jobs_ids:
                         # this is NOT an 'optfreq' job
@@ -526,7 +619,6 @@ class Scheduler(object):
                         if successful_server_termination:
                             self.check_freq_job(label=label, job=job)
                         self.timer = False
-                        break
                     elif 'sp' in job_name \
                             and self.job_dict[label]['sp'][job_name].job_id not in self.servers_jobs_ids:
                         job = self.job_dict[label]['sp'][job_name]
@@ -534,7 +626,6 @@ class Scheduler(object):
                         if successful_server_termination:
                             self.check_sp_job(label=label, job=job)
                         self.timer = False
-                        break
                     elif 'composite' in job_name \
                             and self.job_dict[label]['composite'][job_name].job_id not in self.servers_jobs_ids:
                         job = self.job_dict[label]['composite'][job_name]
@@ -556,7 +647,6 @@ class Scheduler(object):
                                             and self.composite_method:
                                         self.run_onedmin_job(label)
                         self.timer = False
-                        break
                     elif 'directed_scan' in job_name \
                             and self.job_dict[label]['directed_scan'][job_name].job_id not in self.servers_jobs_ids:
                         job = self.job_dict[label]['directed_scan'][job_name]
@@ -578,7 +668,6 @@ class Scheduler(object):
                                             f'pivots {pivots} successfully terminated.\n')
                                 self.process_directed_scans(label, pivots=job.pivots)
                         self.timer = False
-                        break
                     elif 'scan' in job_name and 'directed' not in job_name \
                             and self.job_dict[label]['scan'][job_name].job_id not in self.servers_jobs_ids:
                         job = self.job_dict[label]['scan'][job_name]
@@ -586,7 +675,6 @@ class Scheduler(object):
                         if successful_server_termination:
                             self.check_scan_job(label=label, job=job)
                         self.timer = False
-                        break
                     elif 'irc' in job_name \
                             and self.job_dict[label]['irc'][job_name].job_id not in self.servers_jobs_ids:
                         job = self.job_dict[label]['irc'][job_name]
@@ -594,7 +682,6 @@ class Scheduler(object):
                         if successful_server_termination:
                             self.check_irc_job(label=label, job=job)
                         self.timer = False
-                        break
                     elif 'orbitals' in job_name \
                             and self.job_dict[label]['orbitals'][job_name].job_id not in self.servers_jobs_ids:
                         job = self.job_dict[label]['orbitals'][job_name]
@@ -607,7 +694,6 @@ class Scheduler(object):
                             if os.path.isfile(job.local_path_to_orbitals_file):
                                 shutil.copyfile(job.local_path_to_orbitals_file, orbitals_path)
                         self.timer = False
-                        break
                     elif 'onedmin' in job_name \
                             and self.job_dict[label]['onedmin'][job_name].job_id not in self.servers_jobs_ids:
                         job = self.job_dict[label]['onedmin'][job_name]
@@ -625,7 +711,6 @@ class Scheduler(object):
                                     opt_path=self.output[label]['paths']['geo'], bath_gas=job.bath_gas,
                                     opt_level=self.opt_level)
                         self.timer = False
-                        break
                     elif 'ff_param_fit' in job_name \
                             and self.job_dict[label]['ff_param_fit'][job_name].job_id not in self.servers_jobs_ids:
                         job = self.job_dict[label]['ff_param_fit'][job_name]
@@ -651,15 +736,17 @@ class Scheduler(object):
                                          f'MMFF94s conformers instead of fitting a force field for species {label}, '
                                          f'although its force_field attribute was set to "fit".')
                             self.species_dict[label].force_field = 'MMFF94s'
-                            self.species_dict[label].generate_conformers(n_confs=self.n_confs,
-                                                                         e_confs=self.e_confs,
-                                                                         plot_path=os.path.join(self.project_directory,
-                                                                                                'output', 'Species',
-                                                                                                label, 'geometry',
-                                                                                                'conformers'))
+                            self.species_dict[label].generate_conformers(
+                                n_confs=self.n_confs,
+                                e_confs=self.e_confs,
+                                max_workers=self.conformer_max_workers,
+                                combination_search=self.conformer_combination_search,
+                                max_ff_evaluations=self.conformer_max_ff_evaluations,
+                                wall_time=self.conformer_wall_time,
+                                plot_path=os.path.join(self.project_directory, 'output', 'Species', label, 'geometry',
+                                                       'conformers'))
                             self.process_conformers(label)
                         self.timer = False
-                        break
                     elif 'gromacs' in job_name \
                             and self.job_dict[label]['gromacs'][job_name].job_id not in self.servers_jobs_ids:
                         job = self.job_dict[label]['gromacs'][job_name]
@@ -667,7 +754,6 @@ class Scheduler(object):
                         if successful_server_termination:
                             self.check_md_job(label=label, job=job)
                         self.timer = False
-                        break
 
                 if self.species_dict[label].is_ts and not self.species_dict[label].ts_conf_spawned \
                         and not any([tsg.success is None for tsg in self.species_dict[label].ts_guesses]):
@@ -678,20 +764,43 @@ class Scheduler(object):
                     self.run_ts_conformer_jobs(label=label)
                     self.species_dict[label].ts_conf_spawned = True
 
+                job_list = self.running_jobs[label]
                 if not len(job_list) and not (self.species_dict[label].is_ts
                                               and not self.species_dict[label].ts_conf_spawned):
                     self.check_all_done(label)
                     if not self.running_jobs[label]:
                         # delete the label only if it represents an empty dictionary
                         del self.running_jobs[label]
-
-            if self.timer and len(job_list):
-                time.sleep(30)  # wait 30 sec before bugging the servers again.
+                        self.restart_dirty_labels.add(label)
+                if self.running_jobs.get(label, list()) != job_names:
+                    # jobs of this species terminated in this pass, save it again after all of them were handled,
+                    # since the species could have been modified after it was saved while handling them
+                    # (e.g., its geometry path is set after the optimized geometry is saved)
+                    self.save_restart_dict(label=label)
+
+            if self.timer and self.conformer_generation_futures:
+                # no job terminated in this pass, wait until a server queue poll is due before bugging the servers again,
+                # or until conformers of another species are generated
+                wait(list(self.conformer_generation_futures.values()), timeout=self.get_time_to_next_poll(),
+                     return_when=FIRST_COMPLETED)
+            elif self.timer and len(job_list):
+                # no job terminated in this pass, wait until a server queue poll is due before bugging the servers again
+                time.sleep(self.get_time_to_next_poll())
             t = time.time() - self.report_time
             if t > 3600 and self.running_jobs:
                 self.report_time = time.time()
                 logger.info(f'Currently running jobs:\n{self.running_jobs}')
 
+        if self.job_status_executor is not None:
+            self.job_status_executor.shutdown(wait=True)
+            self.job_status_executor = None
+        if self.conformer_generation_executor is not None:
+            self.conformer_generation_executor.shutdown(wait=True)
+            self.conformer_generation_executor = None
+            self.conformer_generation_log_listener.stop()
+            self.conformer_generation_log_listener = None
+        self.save_restart_dict(compact=True)
+
         # After exiting the Scheduler while loop, append all YAML species not directly calculated to the species_dict:
         for spc in self.species_list:
             if spc.yml_path is not None:
@@ -700,7 +809,7 @@ class Scheduler(object):
     def run_job(self, label, xyz, level_of_theory, job_type, fine=False, software=None, shift='', trsh='', memory=None,
                 conformer=-1, ess_trsh_methods=None, scan='', pivots=None, occ=None, scan_trsh='', scan_res=None,
                 max_job_time=None, confs=None, radius=None, directed_scan_type=None, directed_scans=None,
-                directed_dihedrals=None, rotor_index=None, cpu_cores=None, irc_direction=None):
+                directed_dihedrals=None, rotor_index=None, cpu_cores=None, irc_direction=None, job_array=False):
         """
         A helper function for running (all) jobs.
 
@@ -738,6 +847,9 @@ class Scheduler(object):
             rotor_index (int): The 0-indexed rotor number (key) in the species.rotors_dict dictionary.
             cpu_cores (int, optional): The total number of cpu cores requested for a job.
             irc_direction (str, optional): The direction to run the IRC computation.
+            job_array (bool, optional): Whether the job could be submitted as a task of a job array.
+                                        If ``True`` and the server supports job arrays, the job is only prepared here,
+                                        and is submitted later by ``submit_pending_job_arrays()``.
         """
         max_job_time = max_job_time or self.max_job_time  # if it's None, set to default
         ess_trsh_methods = ess_trsh_methods if ess_trsh_methods is not None else list()
@@ -761,6 +873,8 @@ class Scheduler(object):
                   directed_scan_type=directed_scan_type, directed_scans=directed_scans, rotor_index=rotor_index,
                   directed_dihedrals=directed_dihedrals, cpu_cores=cpu_cores)
         if job.software is not None:
+            job_array = job_array and job.server in servers and servers[job.server].get('job_arrays', False) \
+                and servers[job.server]['cluster_soft'] in array_submit_scripts
             if conformer < 0:
                 # this is NOT a conformer DFT job
                 self.running_jobs[label].append(job.job_name)  # mark as a running job
@@ -768,15 +882,44 @@ class Scheduler(object):
                     # Jobs of this type haven't been spawned for label
                     self.job_dict[label][job_type] = dict()
                 self.job_dict[label][job_type][job.job_name] = job
-                self.job_dict[label][job_type][job.job_name].run()
             else:
                 # Running a conformer DFT job. Append differently to job_dict.
                 self.running_jobs[label].append('conformer{0}'.format(conformer))  # mark as a running job
                 self.job_dict[label]['conformers'][conformer] = job  # save job object
-                self.job_dict[label]['conformers'][conformer].run()  # run the job
-            self.save_restart_dict()
+            self.restart_dirty_labels.add(label)
+            job.run(submit=not job_array)
+            if job_array:
+                # the job will be submitted as a job array task by submit_pending_job_arrays()
+                self.pending_array_jobs.append(job)
+                return
+            self.save_restart_dict(label=label)
             if job.server not in self.servers:
                 self.servers.append(job.server)
+            self.add_job_id_to_server_snapshot(job)
+
+    def submit_pending_job_arrays(self):
+        """
+        Submit all jobs prepared by ``run_job(job_array=True)``.
+        Same-shaped jobs (same species, job type, server, software, and resource directives) are bundled and submitted
+        as a single job array, jobs without a same-shaped counterpart are submitted individually.
+        """
+        groups = dict()
+        for job in self.pending_array_jobs:
+            key = (job.species_name, job.job_type, job.server, job.software, job.cpu_cores, job.total_job_memory_gb,
+                   job.max_job_time, get_job_array_directives(job))
+            groups.setdefault(key, list()).append(job)
+        self.pending_array_jobs = list()
+        for jobs in groups.values():
+            if len(jobs) > 1:
+                submit_job_array(jobs)
+            else:
+                jobs[0].submit_to_queue()
+            for job in jobs:
+                if job.server not in self.servers:
+                    self.servers.append(job.server)
+                self.add_job_id_to_server_snapshot(job)
+        if groups:
+            self.save_restart_dict()
 
     def end_job(self, job, label, job_name):
         """
@@ -790,8 +933,9 @@ class Scheduler(object):
         Returns:
              bool: `True` if job terminated successfully on the server, `False` otherwise.
         """
+        self.restart_dirty_labels.add(label)  # the job is removed from running_jobs
         try:
-            job.determine_job_status()  # also downloads output file
+            self.determine_job_status(job=job, label=label)  # also downloads output file
         except IOError:
             if job.job_type not in ['orbitals']:
                 logger.warning('Tried to determine status of job {0}, but it seems like the job never ran.'
@@ -834,9 +978,57 @@ class Scheduler(object):
                 for rotors_dict in self.species_dict[label].rotors_dict.values():
                     if rotors_dict['pivots'] == job.pivots:
                         rotors_dict['scan_path'] = job.local_path_to_output_file
-            self.save_restart_dict()
+            self.save_restart_dict(label=label)
             return True
 
+    def determine_job_status(self, job: Job, label: str):
+        """
+        Determine the status of a job. If the status was concurrently determined in the background, collect the result,
+        otherwise determine it now.
+
+        Args:
+            job (Job): The job object.
+            label (str): The species label.
+
+        Raises:
+            IOError: If the output file and any additional server information cannot be found.
+        """
+        future = self.job_status_futures.pop((label, job.job_name), None)
+        if future is not None:
+            future.result()  # re-raises exceptions raised in the worker thread (e.g., IOError)
+        else:
+            job.determine_job_status()
+
+    def submit_terminated_jobs_status_checks(self):
+        """
+        Submit all jobs which are no longer running on their server to the job status thread pool,
+        so their output files are concurrently downloaded and parsed while the Scheduler handles other jobs.
+        """
+        for label, job_names in self.running_jobs.items():
+            for job_name in job_names:
+                job = self.get_running_job(label=label, job_name=job_name)
+                if job is not None and job.job_id not in self.servers_jobs_ids \
+                        and (label, job.job_name) not in self.job_status_futures:
+                    if self.job_status_executor is None:
+                        self.job_status_executor = ThreadPoolExecutor(max_workers=max_concurrent_job_downloads)
+                    self.job_status_futures[(label, job.job_name)] = \
+                        self.job_status_executor.submit(job.determine_job_status)
+
+    def get_running_job(self, label: str, job_name: str) -> Optional[Job]:
+        """
+        Get the Job object of a job listed in ``self.running_jobs``.
+
+        Args:
+            label (str): The species label.
+            job_name (str): The job name from the running_jobs dict (e.g., 'opt_a103' or 'conformer3').
+
+        Returns:
+            Optional[Job]: The corresponding job object, ``None`` if it could not be found.
+        """
+        if 'conformer' in job_name:
+            return self.job_dict[label].get('conformers', dict()).get(int(job_name[9:]), None)
+        return self.job_dict[label].get(job_name.rsplit('_', 1)[0], dict()).get(job_name, None)
+
     def _run_a_job(self, job, label):
         """
         A helper function to run ARC job (used internally).
@@ -891,11 +1083,20 @@ class Scheduler(object):
                         # just embed in RDKit and use MMFF94s for opt and energies
                         if self.species_dict[label].initial_xyz is None:
                             self.species_dict[label].initial_xyz = self.species_dict[label].get_xyz()
+                    elif not self.testing:
+                        # run the combinatorial method w/o fitting a force field in a background process,
+                        # conformer jobs will be spawned as soon as the conformers of this species are generated
+                        self.submit_conformer_generation(label)
+                        continue
                     else:
                         # run the combinatorial method w/o fitting a force field
                         self.species_dict[label].generate_conformers(
                             n_confs=self.n_confs,
                             e_confs=self.e_confs,
+                            max_workers=self.conformer_max_workers,
+                            combination_search=self.conformer_combination_search,
+                            max_ff_evaluations=self.conformer_max_ff_evaluations,
+                            wall_time=self.conformer_wall_time,
                             plot_path=os.path.join(
                                 self.project_directory, 'output', 'Species', label, 'geometry', 'conformers'))
                     self.process_conformers(label)
@@ -907,6 +1108,77 @@ class Scheduler(object):
                     # the species was defined with xyz's
                     self.process_conformers(label)
 
+    def submit_conformer_generation(self, label: str):
+        """
+        Submit the force field conformer generation of a species to a pool of background processes,
+        so conformer jobs of species whose conformers were already generated run while other species are processed.
+        The conformer jobs of this species are spawned by ``process_generated_conformers()``.
+
+        Args:
+            label (str): The species label.
+        """
+        # process pool workers are daemonic in Python < 3.9, and daemonic processes cannot start force field workers
+        max_workers = self.conformer_max_workers if sys.version_info >= (3, 9) else 1
+        if self.conformer_generation_executor is None:
+            mp_context = multiprocessing.get_context(conformers.PROCESS_START_METHOD)
+            # send the log records of the conformer generation processes to the ARC log
+            log_queue = mp_context.Queue()
+            self.conformer_generation_log_listener = QueueListener(log_queue, *logger.handlers,
+                                                                   respect_handler_level=True)
+            self.conformer_generation_log_listener.start()
+            # don't fork this process, it runs SSH and job output download threads
+            self.conformer_generation_executor = ProcessPoolExecutor(
+                max_workers=max_concurrent_conformer_generations,
+                mp_context=mp_context,
+                initializer=conformers.initialize_conformer_generation_process,
+                initargs=(conformers.force_field_cache.path, log_queue, logger.level))
+            if max_workers < self.conformer_max_workers:
+                logger.warning(f'Conformers are generated in background processes, which cannot use multiple force '
+                               f'field worker processes in Python {sys.version_info[0]}.{sys.version_info[1]}. '
+                               f'Using one process per species instead of conformer_max_workers='
+                               f'{self.conformer_max_workers} (requires Python >= 3.9).')
+        if label not in self.running_jobs:
+            self.running_jobs[label] = list()
+        kwargs = self.species_dict[label].get_conformer_generation_kwargs(
+            n_confs=self.n_confs,
+            e_confs=self.e_confs,
+            max_workers=max_workers,
+            combination_search=self.conformer_combination_search,
+            max_ff_evaluations=self.conformer_max_ff_evaluations,
+            wall_time=self.conformer_wall_time,
+            plot_path=os.path.join(self.project_directory, 'output', 'Species', label, 'geometry', 'conformers'))
+        self.conformer_generation_futures[label] = \
+            self.conformer_generation_executor.submit(conformers.generate_conformers, **kwargs)
+
+    def process_generated_conformers(self):
+        """
+        Store the conformers of all species whose background conformer generation has finished,
+        and spawn their conformer jobs.
+        If the background generation failed (e.g., a worker process crashed), generate the conformers in this process.
+        """
+        for label, future in list(self.conformer_generation_futures.items()):
+            if not future.done():
+                continue
+            del self.conformer_generation_futures[label]
+            try:
+                lowest_confs = future.result()
+            except Exception as e:
+                logger.error(f'Could not generate conformers for {label} in a background process, got:\n{e}\n'
+                             f'Generating them in the main ARC process instead.')
+                self.species_dict[label].generate_conformers(
+                    n_confs=self.n_confs,
+                    e_confs=self.e_confs,
+                    max_workers=self.conformer_max_workers,
+                    combination_search=self.conformer_combination_search,
+                    max_ff_evaluations=self.conformer_max_ff_evaluations,
+                    wall_time=self.conformer_wall_time,
+                    plot_path=os.path.join(self.project_directory, 'output', 'Species', label, 'geometry',
+                                           'conformers'))
+            else:
+                self.species_dict[label].add_generated_conformers(lowest_confs)
+            self.process_conformers(label)
+            self.save_restart_dict(label=label)
+
     def run_ts_conformer_jobs(self, label):
         """
         Spawn opt jobs at the ts_guesses level of theory for the TS guesses.
@@ -925,7 +1197,8 @@ class Scheduler(object):
             self.job_dict[label]['conformers'] = dict()
             for i, tsg in enumerate(successful_tsgs):
                 self.run_job(label=label, xyz=tsg.initial_xyz, level_of_theory=self.ts_guess_level,
-                             job_type='conformer', conformer=i)
+                             job_type='conformer', conformer=i, job_array=True)
+            self.submit_pending_job_arrays()
         elif len(successful_tsgs) == 1:
             if 'opt' not in self.job_dict[label] and 'composite' not in self.job_dict[label]:
                 # proceed only if opt (/composite) not already spawned
@@ -1077,11 +1350,8 @@ class Scheduler(object):
                 pivots = self.species_dict[label].rotors_dict[i]['pivots']
                 if not isinstance(scan[0], list):
                     # check that a 1D rotors is not linear
-                    coords = xyz_to_coords_list(self.species_dict[label].get_xyz())
-                    v1 = [c1 - c2 for c1, c2 in zip(coords[scan[0] - 1], coords[scan[1] - 1])]
-                    v2 = [c2 - c1 for c1, c2 in zip(coords[scan[1] - 1], coords[scan[2] - 1])]
-                    v3 = [c1 - c2 for c1, c2 in zip(coords[scan[2] - 1], coords[scan[3] - 1])]
-                    angle1, angle2 = get_angle(v1, v2, units='degs'), get_angle(v2, v3, units='degs')
+                    angle1, angle2 = calculate_angles(coords=self.species_dict[label].get_xyz(),
+                                                      atoms=[scan[:3], scan[1:]], index=1).tolist()
                     if any([abs(angle - 180.0) < 0.15 for angle in [angle1, angle2]]):
                         # this is not a torsional mode, invalidate rotor
                         self.species_dict[label].rotors_dict[i]['success'] = False
@@ -1183,6 +1453,10 @@ class Scheduler(object):
             self.species_dict[label].force_field = 'MMFF94s'
             self.species_dict[label].generate_conformers(n_confs=self.n_confs,
                                                          e_confs=self.e_confs,
+                                                         max_workers=self.conformer_max_workers,
+                                                         combination_search=self.conformer_combination_search,
+                                                         max_ff_evaluations=self.conformer_max_ff_evaluations,
+                                                         wall_time=self.conformer_wall_time,
                                                          plot_path=os.path.join(self.project_directory, 'output',
                                                                                 'Species', label, 'geometry',
                                                                                 'conformers'))
@@ -1275,7 +1549,8 @@ class Scheduler(object):
         Raises:
             InputError: If the species directed scan type has an unexpected value,
                         or if ``xyz`` wasn't given for a cont_opt job.
-            SchedulerError: If the rotor scan resolution as defined in settings.py is illegal.
+            SchedulerError: If the rotor scan resolution as defined in settings.py is illegal,
+                            or if the dihedral angles of the scans could not be calculated.
         """
         increment = rotor_scan_resolution
         if divmod(360, increment)[1]:
@@ -1297,49 +1572,44 @@ class Scheduler(object):
         elif 'brute' in directed_scan_type:
             # spawn jobs all at once
             dihedrals = dict()
-            for scan in scans:
-                original_dihedral = calculate_dihedral_angle(coords=xyz['coords'], torsion=scan)
+            original_dihedrals = calculate_dihedral_angles(coords=xyz, torsions=scans, index=1).tolist()
+            if any(math.isnan(dihedral) for dihedral in original_dihedrals):
+                raise SchedulerError(f'Could not calculate the dihedral angles of scans {scans} of species {label}')
+            for scan, original_dihedral in zip(scans, original_dihedrals):
                 dihedrals[tuple(scan)] = [round(original_dihedral + i * increment
                                                 if original_dihedral + i * increment <= 180.0
                                                 else original_dihedral + i * increment - 360.0, 2)
                                           for i in range(int(360 / increment) + 1)]
-            modified_xyz = xyz
             if 'diagonal' not in directed_scan_type:
                 # increment dihedrals one by one (resulting in an ND scan)
-                all_dihedral_combinations = list(itertools.product(*[dihedrals[tuple(scan)] for scan in scans]))
-                for dihedral_tuple in all_dihedral_combinations:
-                    for scan, dihedral in zip(scans, dihedral_tuple):
-                        self.species_dict[label].set_dihedral(scan=scan, deg_abs=dihedral, count=False,
-                                                              xyz=modified_xyz)
-                        modified_xyz = self.species_dict[label].initial_xyz
-                    self.species_dict[label].rotors_dict[rotor_index]['number_of_running_jobs'] += 1
-                    self.run_job(label=label, xyz=modified_xyz, level_of_theory=self.scan_level,
-                                 job_type='directed_scan', directed_scan_type=directed_scan_type,
-                                 directed_scans=scans, directed_dihedrals=list(dihedral_tuple),
-                                 rotor_index=rotor_index, pivots=pivots)
+                dihedral_combinations = [list(dihedral_tuple) for dihedral_tuple
+                                         in itertools.product(*[dihedrals[tuple(scan)] for scan in scans])]
             else:
                 # increment all dihedrals at once (resulting in a unique 1D scan along several changing dimensions)
-                for i in range(len(dihedrals[tuple(scans[0])])):
-                    for scan in scans:
-                        dihedral = dihedrals[tuple(scan)][i]
-                        self.species_dict[label].set_dihedral(scan=scan, deg_abs=dihedral, count=False,
-                                                              xyz=modified_xyz)
-                        modified_xyz = self.species_dict[label].initial_xyz
-                    directed_dihedrals = [dihedrals[tuple(scan)][i] for scan in scans]
-                    self.species_dict[label].rotors_dict[rotor_index]['number_of_running_jobs'] += 1
-                    self.run_job(label=label, xyz=modified_xyz, level_of_theory=self.scan_level,
-                                 job_type='directed_scan', directed_scan_type=directed_scan_type,
-                                 directed_scans=scans, directed_dihedrals=directed_dihedrals,
-                                 rotor_index=rotor_index, pivots=pivots)
+                dihedral_combinations = [[dihedrals[tuple(scan)][i] for scan in scans]
+                                         for i in range(len(dihedrals[tuple(scans[0])]))]
+            for modified_xyz, directed_dihedrals in zip(self.get_directed_scan_xyzs(label, xyz, scans,
+                                                                                    dihedral_combinations),
+                                                        dihedral_combinations):
+                self.species_dict[label].rotors_dict[rotor_index]['number_of_running_jobs'] += 1
+                self.run_job(label=label, xyz=modified_xyz, level_of_theory=self.scan_level,
+                             job_type='directed_scan', directed_scan_type=directed_scan_type,
+                             directed_scans=scans, directed_dihedrals=directed_dihedrals,
+                             rotor_index=rotor_index, pivots=pivots, job_array=True)
+            self.submit_pending_job_arrays()
 
         elif 'cont' in directed_scan_type:
             # spawn jobs one by one
             if not len(self.species_dict[label].rotors_dict[rotor_index]['cont_indices']):
                 self.species_dict[label].rotors_dict[rotor_index]['cont_indices'] = [0] * len(scans)
             if not len(self.species_dict[label].rotors_dict[rotor_index]['original_dihedrals']):
+                original_dihedrals = calculate_dihedral_angles(
+                    coords=xyz, torsions=self.species_dict[label].rotors_dict[rotor_index]['scan'], index=1).tolist()
+                if any(math.isnan(dihedral) for dihedral in original_dihedrals):
+                    raise SchedulerError(f'Could not calculate the dihedral angles of scans {scans} '
+                                         f'of species {label}')
                 self.species_dict[label].rotors_dict[rotor_index]['original_dihedrals'] = \
-                    ['{0:.2f}'.format(calculate_dihedral_angle(coords=xyz['coords'], torsion=scan, index=1))
-                     for scan in self.species_dict[label].rotors_dict[rotor_index]['scan']]  # stores as str for YAML
+                    ['{0:.2f}'.format(dihedral) for dihedral in original_dihedrals]  # stores as str for YAML
             rotor_dict = self.species_dict[label].rotors_dict[rotor_index]
             scans = rotor_dict['scan']
             pivots = rotor_dict['pivots']
@@ -1401,6 +1671,34 @@ class Scheduler(object):
                             and index < len(scans) - 1):
                         self.species_dict[label].rotors_dict[rotor_index]['cont_indices'][index] = 0
 
+    def get_directed_scan_xyzs(self, label, xyz, scans, dihedral_combinations):
+        """
+        Get the geometries of a brute force directed scan.
+        All geometries are generated at once from a single zmat where possible,
+        otherwise the dihedral angles are set one geometry at a time.
+
+        Args:
+            label (str): The species label.
+            xyz (dict): The 3D coordinates to modify.
+            scans (list): Entries are lists of four-atom dihedral scan indices (1-indexed).
+            dihedral_combinations (list): Entries are lists of the dihedral angles to set, one angle per scan.
+
+        Returns:
+            list: Entries are the modified xyz coordinates corresponding to ``dihedral_combinations``.
+        """
+        species = self.species_dict[label]
+        mol = molecules_from_xyz(xyz, multiplicity=species.multiplicity, charge=species.charge)[1]
+        modified_xyzs = modify_dihedrals(xyz=xyz, torsions=[[index - 1 for index in scan] for scan in scans],
+                                         dihedrals=dihedral_combinations, mol=mol) if mol is not None else None
+        if modified_xyzs is None:
+            modified_xyzs, modified_xyz = list(), xyz
+            for directed_dihedrals in dihedral_combinations:
+                for scan, dihedral in zip(scans, directed_dihedrals):
+                    species.set_dihedral(scan=scan, deg_abs=dihedral, count=False, xyz=modified_xyz)
+                    modified_xyz = species.initial_xyz
+                modified_xyzs.append(modified_xyz)
+        return modified_xyzs
+
     def spawn_md_jobs(self, label, prev_conf_list=None, num_confs=None):
         """
         Embed conformers and run a molecular dynamics optimization using a fitted force field.
@@ -1560,7 +1858,8 @@ class Scheduler(object):
                 self.job_dict[label]['conformers'] = dict()
                 for i, xyz in enumerate(self.species_dict[label].conformers):
                     self.run_job(label=label, xyz=xyz, level_of_theory=self.conformer_level,
-                                 job_type='conformer', conformer=i)
+                                 job_type='conformer', conformer=i, job_array=True)
+                self.submit_pending_job_arrays()
             elif len(self.species_dict[label].conformers) == 1:
                 logger.info(f'Only one conformer is available for species {label}, using it as initial xyz.')
                 self.species_dict[label].initial_xyz = self.species_dict[label].conformers[0]
@@ -1912,7 +2211,7 @@ class Scheduler(object):
             freq_ok = self.check_negative_freq(label=label, job=job, vibfreqs=frequencies)
             if freq_ok:
                 # Update restart dictionary and save the yaml restart file:
-                self.save_restart_dict()
+                self.save_restart_dict(label=label)
                 success = True  # run freq / scan jobs on this optimized geometry
                 if not self.species_dict[label].is_ts:
                     is_isomorphic = self.species_dict[label].check_xyz_isomorphism(
@@ -1973,6 +2272,7 @@ class Scheduler(object):
                         product = True if label in rxn.products else False
                         if reactant or product:
                             ts = self.species_dict[rxn.ts_label]
+                            self.restart_dirty_labels.add(rxn.ts_label)
                             for tsg in ts.ts_guesses:
                                 if reactant and \
                                         not any([reactant_xyz[0] == label for reactant_xyz in tsg.reactants_xyz]):
@@ -1987,7 +2287,7 @@ class Scheduler(object):
                 logger.info('\nOptimized geometry for {label}{rxn} at {level}:\n{xyz}'.format(
                     label=label, rxn=rxn_str, level=format_level_of_theory_for_logging(job.job_level_of_theory_dict),
                     xyz=xyz_to_str(self.species_dict[label].final_xyz)))
-                self.save_restart_dict()
+                self.save_restart_dict(label=label)
                 self.output[label]['paths']['geo'] = job.local_path_to_output_file  # will be overwritten with freq
                 if not self.species_dict[label].is_ts:
                     plotter.draw_structure(species=self.species_dict[label], project_directory=self.project_directory)
@@ -2079,7 +2379,7 @@ class Scheduler(object):
             self.output[label]['paths']['freq'] = job.local_path_to_output_file
             if not self.testing:
                 # Update restart dictionary and save the yaml restart file:
-                self.save_restart_dict()
+                self.save_restart_dict(label=label)
             return True
 
     def check_sp_job(self, label, job):
@@ -2096,7 +2396,7 @@ class Scheduler(object):
         elif job.job_status[1]['status'] == 'done':
             self.post_sp_actions(label, sp_path=os.path.join(job.local_path, 'output.out'))
             # Update restart dictionary and save the yaml restart file:
-            self.save_restart_dict()
+            self.save_restart_dict(label=label)
             if self.species_dict[label].number_of_atoms == 1:
                 # save the geometry from the sp job for monoatomic species for which no opt/freq jobs will be spawned
                 self.output[label]['paths']['geo'] = job.local_path_to_output_file
@@ -2254,7 +2554,7 @@ class Scheduler(object):
                                        original_dihedral=self.species_dict[label].rotors_dict[i]['original_dihedrals'])
 
         # Save the restart dictionary
-        self.save_restart_dict()
+        self.save_restart_dict(label=label)
 
     def check_directed_scan(self, label, pivots, scan, energies):
         """
@@ -2330,7 +2630,7 @@ class Scheduler(object):
                         rotor_dict['success'] = False
 
         # Save the restart dictionary
-        self.save_restart_dict()
+        self.save_restart_dict(label=label)
 
     def check_directed_scan_job(self, label, job):
         """
@@ -2486,19 +2786,65 @@ class Scheduler(object):
                                if key in self.job_types and self.job_types[key]}
             logger.error(f'Species {label} did not converge. Job type status is: {job_type_status}')
         # Update restart dictionary and save the yaml restart file:
-        self.save_restart_dict()
+        self.save_restart_dict(label=label)
 
-    def get_servers_jobs_ids(self):
+    def get_servers_jobs_ids(self, force: bool = False):
         """
-        Check status on all active servers, return a list of relevant running job IDs
+        Check status on all active servers, update ``self.servers_jobs_ids`` with a list of relevant running job IDs.
+        Each server queue is polled at most once per its minimal poll interval,
+        otherwise the most recent snapshot of that server's queue is used.
+
+        Args:
+            force (bool, optional): Whether to poll all servers regardless of the time of their most recent poll.
         """
-        self.servers_jobs_ids = list()
+        now = time.time()
         for server in self.servers:
+            interval = servers[server].get('min_poll_interval', min_poll_interval) if server in servers \
+                else min_poll_interval
+            if not force and server in self.server_poll_times and now - self.server_poll_times[server] < interval:
+                # use the most recent snapshot of this server's queue
+                continue
             if server != 'local':
                 ssh = SSHClient(server)
-                self.servers_jobs_ids.extend(ssh.check_running_jobs_ids())
+                self.server_job_ids[server] = ssh.check_running_jobs_ids()
             else:
-                self.servers_jobs_ids.extend(check_running_jobs_ids())
+                self.server_job_ids[server] = check_running_jobs_ids()
+            self.server_poll_times[server] = now
+        self.servers_jobs_ids = [job_id for server in self.servers for job_id in self.server_job_ids.get(server, list())]
+
+    def get_time_to_next_poll(self, max_wait: float = 30) -> float:
+        """
+        Get the time until the queue of any of the active servers is due to be polled again.
+
+        Args:
+            max_wait (float, optional): The maximal time to return in seconds.
+
+        Returns:
+            float: The time to wait in seconds (at least one second and at most ``max_wait``).
+        """
+        wait = max_wait
+        now = time.time()
+        for server in self.servers:
+            if server not in self.server_poll_times:
+                return 1
+            interval = servers[server].get('min_poll_interval', min_poll_interval) if server in servers \
+                else min_poll_interval
+            wait = min(wait, self.server_poll_times[server] + interval - now)
+        return max(wait, 1)
+
+    def add_job_id_to_server_snapshot(self, job: Job):
+        """
+        Add the ID of a newly submitted job to the most recent queue snapshot of its server,
+        so the job isn't considered as terminated before the server queue is polled again.
+
+        Args:
+            job (Job): The job object.
+        """
+        if job.job_id:
+            if job.server in self.server_job_ids and job.job_id not in self.server_job_ids[job.server]:
+                self.server_job_ids[job.server].append(job.job_id)
+            if job.job_id not in self.servers_jobs_ids:
+                self.servers_jobs_ids.append(job.job_id)
 
     def troubleshoot_negative_freq(self, label, job):
         """
@@ -2744,7 +3090,7 @@ class Scheduler(object):
                          conformer=conformer, scan=job.scan, pivots=job.pivots, scan_res=job.scan_res, shift=shift,
                          directed_dihedrals=job.directed_dihedrals, directed_scans=job.directed_scans,
                          cpu_cores=cpu_cores)
-        self.save_restart_dict()
+        self.save_restart_dict(label=label)
 
     def troubleshoot_conformer_isomorphism(self, label):
         """
@@ -2802,7 +3148,9 @@ class Scheduler(object):
                 if job_name in self.running_jobs[label]:
                     logger.info(f'Deleted job {job_name}')
                     job.delete()
+                    self.job_status_futures.pop((label, job.job_name), None)
         self.running_jobs[label] = list()
+        self.restart_dirty_labels.add(label)
 
     def restore_running_jobs(self):
         """
@@ -2858,24 +3206,78 @@ class Scheduler(object):
                 content += '\n\n'
                 logger.info(content)
 
-    def save_restart_dict(self):
+    def save_restart_dict(self, label=None, compact=False):
         """
-        Update the restart_dict and save the restart.yml file.
+        Update the restart_dict and save it.
+        Only the entries of species which changed since the last save (see ``restart_dirty_labels``) are appended to
+        the restart journal, together with a record of species which were removed.
+        The journal is periodically compacted by saving the entire restart_dict as the restart file.
+
+        Args:
+            label (str, optional): The label of a species which changed.
+            compact (bool, optional): Whether to compact the restart journal regardless of its length.
         """
+        if label is not None:
+            self.restart_dirty_labels.add(label)
         if self.save_restart and self.restart_dict is not None:
-            logger.debug('Creating a restart file...')
-            self.restart_dict['output'] = self.output
-            self.restart_dict['species'] = [spc.as_dict() for spc in self.species_dict.values()]
-            self.restart_dict['running_jobs'] = dict()
-            for spc in self.species_dict.values():
-                if spc.label in self.running_jobs:
-                    self.restart_dict['running_jobs'][spc.label] = \
-                        [self.job_dict[spc.label][job_name.rsplit('_', 1)[0]][job_name].as_dict()
-                         for job_name in self.running_jobs[spc.label] if 'conformer' not in job_name] \
-                        + [self.job_dict[spc.label]['conformers'][int(job_name.split('mer')[1])].as_dict()
-                           for job_name in self.running_jobs[spc.label] if 'conformer' in job_name]
-            logger.debug('Dumping restart dictionary:\n{0}'.format(self.restart_dict))
-            save_yaml_file(path=self.restart_path, content=self.restart_dict)
+            if compact or self.restart_saved_labels is None \
+                    or self.restart_journal_entries >= restart_journal_compaction_interval:
+                self.compact_restart_journal()
+                return
+            delta = dict()
+            for dirty_label in sorted(self.restart_dirty_labels):
+                if dirty_label not in self.species_dict:
+                    continue
+                if dirty_label in self.output:
+                    delta.setdefault('output', dict())[dirty_label] = self.output[dirty_label]
+                delta.setdefault('species', dict())[dirty_label] = self.species_dict[dirty_label].as_dict()
+                # species with no running jobs are marked with an empty list
+                delta.setdefault('running_jobs', dict())[dirty_label] = self.get_running_jobs_dicts(dirty_label)
+            removed_labels = sorted(self.restart_saved_labels - set(self.species_dict.keys()))
+            if removed_labels:
+                delta['removed'] = removed_labels
+            if delta:
+                logger.debug('Appending to the restart journal:\n{0}'.format(delta))
+                append_yaml_document(path=self.restart_journal_path, content=delta)
+                self.restart_journal_entries += 1
+            self.restart_saved_labels = set(self.species_dict.keys())
+            self.restart_dirty_labels = set()
+
+    def compact_restart_journal(self):
+        """
+        Save the entire restart_dict as the restart file and start a new (empty) restart journal for it.
+        """
+        logger.debug('Creating a restart file...')
+        self.restart_dict['output'] = self.output
+        self.restart_dict['species'] = [spc.as_dict() for spc in self.species_dict.values()]
+        self.restart_dict['running_jobs'] = {label: self.get_running_jobs_dicts(label)
+                                             for label in self.species_dict.keys() if label in self.running_jobs}
+        self.restart_dict['restart_journal_id'] = uuid.uuid4().hex
+        logger.debug('Dumping restart dictionary:\n{0}'.format(self.restart_dict))
+        save_file(path=self.restart_path, content=self.restart_dict)
+        # a journal with a different ID (e.g., if ARC crashes right here) is ignored when restarting
+        save_yaml_file(path=self.restart_journal_path,
+                       content={'restart_journal_id': self.restart_dict['restart_journal_id']})
+        self.restart_saved_labels = set(self.species_dict.keys())
+        self.restart_dirty_labels = set()
+        self.restart_journal_entries = 0
+
+    def get_running_jobs_dicts(self, label):
+        """
+        Get the dictionaries of the running jobs of a species, as saved in the restart file.
+
+        Args:
+            label (str): The species label.
+
+        Returns:
+            list: Entries are the respective job dictionaries.
+        """
+        if label not in self.running_jobs:
+            return list()
+        return [self.job_dict[label][job_name.rsplit('_', 1)[0]][job_name].as_dict()
+                for job_name in self.running_jobs[label] if 'conformer' not in job_name] \
+            + [self.job_dict[label]['conformers'][int(job_name.split('mer')[1])].as_dict()
+               for job_name in self.running_jobs[label] if 'conformer' in job_name]
 
     def make_reaction_labels_info_file(self):
         """A helper function for creating the `reactions labels.info` file"""
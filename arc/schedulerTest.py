@@ -8,10 +8,16 @@ This module contains unit tests for the arc.scheduler module
 import unittest
 import os
 import shutil
+import time
+from concurrent.futures import Future
 
 import arc.rmgdb as rmgdb
 import arc.parser as parser
-from arc.common import almost_equal_coords_lists, format_level_of_theory_inputs
+from arc.common import (almost_equal_coords_lists,
+                        format_level_of_theory_inputs,
+                        read_yaml_documents,
+                        read_yaml_file,
+                        replay_restart_journal)
 from arc.job.job import Job
 from arc.plotter import save_conformers_file
 from arc.scheduler import Scheduler
@@ -241,6 +247,125 @@ H      -1.82570782    0.42754384   -0.56130718"""
                          'not a torsional mode (angles = 179.91, 110.38 degrees)')
         self.assertFalse(self.sched1.species_dict['CtripCO'].rotors_dict[0]['success'])
 
+    def test_get_servers_jobs_ids(self):
+        """Test that a recent server queue snapshot is shared instead of polling the server again"""
+        self.sched1.servers = ['server1', 'server2']
+        self.sched1.server_job_ids = {'server1': [582682, 588334], 'server2': [14428]}
+        self.sched1.server_poll_times = {'server1': time.time(), 'server2': time.time()}
+        self.sched1.get_servers_jobs_ids()
+        self.assertEqual(self.sched1.servers_jobs_ids, [582682, 588334, 14428])
+
+        self.job3.server, self.job3.job_id = 'server2', 14430
+        self.sched1.add_job_id_to_server_snapshot(self.job3)
+        self.assertEqual(self.sched1.server_job_ids['server2'], [14428, 14430])
+        self.assertIn(14430, self.sched1.servers_jobs_ids)
+        self.sched1.get_servers_jobs_ids()
+        self.assertEqual(self.sched1.servers_jobs_ids, [582682, 588334, 14428, 14430])
+
+        self.sched1.server_poll_times = {'server1': time.time() - 15, 'server2': time.time()}
+        self.assertAlmostEqual(self.sched1.get_time_to_next_poll(), 5, 0)  # server1 has a 20 sec default interval
+        self.sched1.server_poll_times = {'server1': time.time() - 100, 'server2': time.time()}
+        self.assertEqual(self.sched1.get_time_to_next_poll(), 1)
+        del self.sched1.server_poll_times['server1']
+        self.assertEqual(self.sched1.get_time_to_next_poll(), 1)
+        self.sched1.servers, self.sched1.server_job_ids, self.sched1.server_poll_times = list(), dict(), dict()
+
+    def test_get_running_job(self):
+        """Test getting a Job object of a running job"""
+        self.sched1.job_dict['C2H6'] = {'freq': {self.job3.job_name: self.job3}}
+        self.sched1.job_dict['methylamine'] = {'conformers': {0: self.job1, 1: self.job2}}
+        self.assertIs(self.sched1.get_running_job(label='C2H6', job_name=self.job3.job_name), self.job3)
+        self.assertIs(self.sched1.get_running_job(label='methylamine', job_name='conformer1'), self.job2)
+        self.assertIsNone(self.sched1.get_running_job(label='methylamine', job_name='opt_a1000'))
+
+    def test_job_status_futures(self):
+        """Test that concurrently determined job statuses are kept per species"""
+        xyz = {'symbols': ('C',), 'isotopes': (12,), 'coords': ((0.0, 0.0, 0.0),)}
+        job4 = Job(project='project_test', ess_settings=self.ess_settings, species_name='C2H6', xyz=xyz,
+                   job_type='conformer', conformer=0,
+                   job_level_of_theory_dict={'method': 'b97-d3', 'basis': '6-311+g(d,p)'},
+                   multiplicity=1, project_directory=self.project_directory, job_num=104)
+        self.assertEqual(self.job1.job_name, job4.job_name)
+        determined = list()
+        self.job1.determine_job_status = lambda: determined.append('methylamine')
+        job4.determine_job_status = lambda: determined.append('C2H6')
+        self.sched1.job_dict['methylamine'] = {'conformers': {0: self.job1}}
+        self.sched1.job_dict['C2H6'] = {'conformers': {0: job4}}
+        self.sched1.running_jobs = {'methylamine': ['conformer0'], 'C2H6': ['conformer0']}
+        self.sched1.servers_jobs_ids = list()
+        self.sched1.submit_terminated_jobs_status_checks()
+        self.assertEqual(sorted(self.sched1.job_status_futures.keys()),
+                         [('C2H6', 'conformer0'), ('methylamine', 'conformer0')])
+        self.sched1.determine_job_status(job=job4, label='C2H6')
+        self.assertEqual(list(self.sched1.job_status_futures.keys()), [('methylamine', 'conformer0')])
+        self.sched1.determine_job_status(job=self.job1, label='methylamine')
+        self.assertEqual(self.sched1.job_status_futures, dict())
+        self.assertEqual(sorted(determined), ['C2H6', 'methylamine'])
+        del self.job1.determine_job_status
+        self.sched1.running_jobs = dict()
+        self.sched1.job_status_executor.shutdown()
+        self.sched1.job_status_executor = None
+
+    def test_process_generated_conformers(self):
+        """Test storing conformers generated in a background process"""
+        conformers, conformer_energies = list(self.sched1.species_dict['C2H6'].conformers), \
+            list(self.sched1.species_dict['C2H6'].conformer_energies)
+        xyz = {'symbols': ('C', 'C', 'H', 'H', 'H', 'H', 'H', 'H'), 'isotopes': (12, 12, 1, 1, 1, 1, 1, 1),
+               'coords': ((0.0, 0.0, 0.7654), (0.0, 0.0, -0.7654), (0.0, 1.0194, 1.1597), (-0.8828, -0.5097, 1.1597),
+                          (0.8828, -0.5097, 1.1597), (0.0, -1.0194, -1.1597), (0.8828, 0.5097, -1.1597),
+                          (-0.8828, 0.5097, -1.1597))}
+        running_future, done_future = Future(), Future()
+        done_future.set_result([{'index': 0, 'xyz': xyz, 'FF energy': 10.2, 'source': 'MMFF94s'}])
+        self.sched1.conformer_generation_futures = {'methylamine': running_future, 'C2H6': done_future}
+        self.sched1.process_generated_conformers()
+        self.assertEqual(list(self.sched1.conformer_generation_futures.keys()), ['methylamine'])
+        self.assertEqual(self.sched1.species_dict['C2H6'].conformers[-1], xyz)
+        self.assertIsNone(self.sched1.species_dict['C2H6'].conformer_energies[-1])
+        self.sched1.conformer_generation_futures = dict()
+        self.sched1.species_dict['C2H6'].conformers = conformers
+        self.sched1.species_dict['C2H6'].conformer_energies = conformer_energies
+
+    def test_save_restart_dict(self):
+        """Test journaling only the species which changed, and recording removed species"""
+        project_directory = os.path.join(arc_path, 'Projects', 'arc_project_for_testing_delete_after_usage3',
+                                         'restart_journal')
+        sched = Scheduler(project='project_test', ess_settings=self.ess_settings,
+                          species_list=[ARCSpecies(label='H2O', smiles='O'), ARCSpecies(label='OH', smiles='[OH]')],
+                          composite_method='',
+                          conformer_level=format_level_of_theory_inputs(default_levels_of_theory['conformer'])[0],
+                          opt_level=format_level_of_theory_inputs(default_levels_of_theory['opt'])[0],
+                          freq_level=format_level_of_theory_inputs(default_levels_of_theory['freq'])[0],
+                          sp_level=format_level_of_theory_inputs(default_levels_of_theory['sp'])[0],
+                          ts_guess_level=format_level_of_theory_inputs(default_levels_of_theory['ts_guesses'])[0],
+                          rmg_database=self.rmg_database, project_directory=project_directory, testing=True,
+                          job_types=self.job_types1)
+        sched.save_restart, sched.restart_dict = True, {'project': 'project_test'}
+        sched.save_restart_dict()  # the first save compacts the journal into the restart file
+        self.assertEqual(len(read_yaml_documents(sched.restart_journal_path)), 1)
+
+        sched.output['OH']['info'] = 'changed'
+        sched.save_restart_dict(label='OH')
+        sched.save_restart_dict()  # nothing changed
+        del sched.species_dict['H2O']
+        sched.save_restart_dict()
+        geo_path = os.path.join(project_directory, 'calcs', 'Species', 'OH', 'opt_a1', 'output.out')
+        sched.output['OH']['paths']['geo'] = geo_path  # set after OH was saved while parsing its opt job
+        sched.save_restart_dict(label='OH')  # saved again after all terminated jobs of OH were handled
+        documents = read_yaml_documents(sched.restart_journal_path)
+        self.assertEqual(len(documents), 4)
+        self.assertEqual(list(documents[1]['species'].keys()), ['OH'])
+        self.assertEqual(documents[1]['output']['OH']['info'], 'changed')
+        self.assertEqual(documents[1]['running_jobs'], {'OH': []})
+        self.assertEqual(documents[2], {'removed': ['H2O']})
+        self.assertEqual(documents[3]['output']['OH']['paths']['geo'], geo_path)
+
+        restart_dict = replay_restart_journal(restart_dict=read_yaml_file(sched.restart_path),
+                                              journal_path=sched.restart_journal_path)
+        self.assertEqual([species_dict['label'] for species_dict in restart_dict['species']], ['OH'])
+        self.assertEqual(list(restart_dict['output'].keys()), ['OH'])
+        self.assertEqual(restart_dict['output']['OH']['info'], 'changed')
+        self.assertEqual(restart_dict['output']['OH']['paths']['geo'], geo_path)
+
     @classmethod
     def tearDownClass(cls):
         """
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""
+A module for saving and loading ARC's restart and output dictionaries
+(e.g., the ``ARCSpecies.as_dict()`` and ``Job.as_dict()`` entries of a restart file).
+The serialization format is determined by the file extension:
+
+- YAML (``.yml`` or ``.yaml``): Human readable, ARC's default format.
+- NPZ (``.npz``): A compact binary format which is much faster to save and load.
+  The coordinates of all xyz dictionaries and xyz strings (as stored in restart dictionaries)
+  are stored in a single contiguous float array, and the rest of the content is stored as a JSON string.
+
+The conversion between the formats is lossless (see ``convert_file()``).
+"""
+
+import datetime
+import json
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+from arc.common import globalize_path, read_yaml_file, save_yaml_file
+from arc.exceptions import ConverterError, InputError
+from arc.species.converter import str_to_xyz, xyz_to_str
+
+
+yaml_extensions = ['.yml', '.yaml']
+binary_extensions = ['.npz']
+
+
+def save_file(path: str,
+              content: list or dict,
+              ) -> None:
+    """
+    Save content (usually a restart dictionary) in a format determined by the file extension.
+
+    Args:
+        path (str): The file path to save.
+        content (list, dict): The content to save.
+
+    Raises:
+        InputError: If the file extension is not supported.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in yaml_extensions:
+        save_yaml_file(path=path, content=content)
+    elif extension in binary_extensions:
+        json_string, coords = encode_content(content)
+        if os.path.dirname(path) and not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        # write to a temporary file and then replace the original file, so a crash mid-write won't corrupt it
+        temp_path = path + '.tmp' + extension
+        np.savez(temp_path, content=np.frombuffer(json_string.encode('utf-8'), dtype=np.uint8), coords=coords)
+        os.replace(temp_path, path)
+    else:
+        raise InputError(f'Unsupported file extension "{extension}" for {path}, '
+                         f'supported extensions are: {yaml_extensions + binary_extensions}')
+
+
+def read_file(path: str,
+              project_directory: Optional[str] = None,
+              ) -> list or dict:
+    """
+    Read content (usually a restart dictionary) saved in a format determined by the file extension.
+    Files with an extension other than a binary one are read as YAML files (e.g., an ARC input file).
+
+    Args:
+        path (str): The file path to read.
+        project_directory (str, optional): The current project directory to rebase file paths upon.
+
+    Raises:
+        InputError: If the file could not be found.
+
+    Returns:
+        list or dict: The content read from the file.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in binary_extensions:
+        if not os.path.isfile(path):
+            raise InputError(f'Could not find the file {path}')
+        with np.load(path, allow_pickle=False) as data:
+            content = decode_content(json_string=data['content'].tobytes().decode('utf-8'), coords=data['coords'])
+        if project_directory is not None:
+            content = _globalize(content, project_directory if project_directory[-1] == '/'
+                                 else project_directory + '/')
+        return content
+    return read_yaml_file(path=path, project_directory=project_directory)
+
+
+def convert_file(source_path: str,
+                 target_path: str,
+                 ) -> None:
+    """
+    Convert a file between the supported serialization formats (e.g., a restart.yml file into a restart.npz file).
+
+    Args:
+        source_path (str): The path of the file to convert.
+        target_path (str): The path of the converted file.
+    """
+    save_file(path=target_path, content=read_file(path=source_path))
+
+
+def encode_content(content: list or dict) -> Tuple[str, np.ndarray]:
+    """
+    Encode content as a JSON string and an array of coordinates.
+
+    Args:
+        content (list, dict): The content to encode.
+
+    Returns:
+        Tuple[str, np.ndarray]:
+            - The JSON string.
+            - The coordinates of all xyz dictionaries and xyz strings in the content, an N x 3 float array.
+    """
+    coords = list()
+    json_string = json.dumps(_encode(content, coords), separators=(',', ':'))
+    coords = np.array(coords, dtype=np.float64) if coords else np.zeros((0, 3), dtype=np.float64)
+    return json_string, coords
+
+
+def decode_content(json_string: str,
+                   coords: np.ndarray,
+                   ) -> list or dict:
+    """
+    Decode content encoded by ``encode_content()``.
+
+    Args:
+        json_string (str): The JSON string.
+        coords (np.ndarray): The coordinates of all xyz dictionaries and xyz strings in the content.
+
+    Returns:
+        list or dict: The decoded content.
+    """
+    return _decode(json.loads(json_string), coords.tolist())
+
+
+def _is_xyz_dict(obj: dict) -> bool:
+    """
+    Check whether a dictionary is an ARC xyz dictionary with a tuple of float coordinate tuples.
+
+    Args:
+        obj (dict): The dictionary to check.
+
+    Returns:
+        bool: Whether the dictionary is an xyz dictionary.
+    """
+    return len(obj) == 3 and 'symbols' in obj and 'isotopes' in obj and 'coords' in obj \
+        and isinstance(obj['coords'], tuple) \
+        and all(isinstance(coord, tuple) and len(coord) == 3 and all(type(c) is float for c in coord)
+                for coord in obj['coords'])
+
+
+def _xyz_from_str(obj: str) -> Optional[dict]:
+    """
+    Get the xyz dictionary of an xyz string formatted by ``converter.xyz_to_str()`` (as stored in restart dictionaries),
+    only if the string could be restored exactly from it.
+
+    Args:
+        obj (str): The string to check.
+
+    Returns:
+        Optional[dict]: The xyz dictionary, ``None`` if the string is not such an xyz string.
+    """
+    # lines formatted by xyz_to_str() are 46 characters long with 4 entries,
+    # quickly skip other strings (str_to_xyz() would also parse a file path)
+    if len(obj) % 47 != 46 or any(len(line) != 46 or len(line.split()) != 4 for line in obj.split('\n')):
+        return None
+    try:
+        xyz = str_to_xyz(obj)
+    except (ConverterError, IndexError, KeyError, ValueError):
+        return None
+    return xyz if xyz_to_str(xyz) == obj else None
+
+
+def _encode(obj, coords: list):
+    """
+    Recursively encode an object into JSON serializable types.
+    Xyz dictionaries, xyz strings, tuples, dictionaries with non-string keys, date-times, and numpy arrays
+    are tagged so they could be restored.
+
+    Args:
+        obj: The object to encode.
+        coords (list): Coordinates of xyz dictionaries and xyz strings, appended to in place.
+
+    Raises:
+        InputError: If the object type cannot be encoded.
+
+    Returns:
+        The encoded object.
+    """
+    if isinstance(obj, str):
+        xyz = _xyz_from_str(obj)
+        if xyz is None:
+            return obj
+        start = len(coords)
+        coords.extend(xyz['coords'])
+        return {'__xyz_str__': [_encode(xyz['symbols'], coords), _encode(xyz['isotopes'], coords),
+                                start, len(coords)]}
+    if obj is None or isinstance(obj, (bool, int, float)):
+        return obj
+    if isinstance(obj, dict):
+        if _is_xyz_dict(obj):
+            start = len(coords)
+            coords.extend(obj['coords'])
+            return {'__xyz__': [_encode(obj['symbols'], coords), _encode(obj['isotopes'], coords),
+                                start, len(coords)]}
+        if all(isinstance(key, str) and not key.startswith('__') for key in obj.keys()):
+            return {key: _encode(val, coords) for key, val in obj.items()}
+        return {'__dict__': [[_encode(key, coords), _encode(val, coords)] for key, val in obj.items()]}
+    if isinstance(obj, tuple):
+        return {'__tuple__': [_encode(entry, coords) for entry in obj]}
+    if isinstance(obj, list):
+        return [_encode(entry, coords) for entry in obj]
+    if isinstance(obj, datetime.datetime):
+        return {'__datetime__': obj.isoformat()}
+    if isinstance(obj, np.ndarray):
+        return {'__ndarray__': obj.tolist(), 'dtype': str(obj.dtype)}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise InputError(f'Cannot serialize {obj} of type {type(obj)}')
+
+
+def _globalize(obj, project_directory: str):
+    """
+    Recursively rebase the file paths in decoded content on the current project directory,
+    like ``arc.common.globalize_paths()`` does for the lines of a YAML file.
+
+    Args:
+        obj: The decoded object.
+        project_directory (str): The current project directory to rebase upon, ending with a slash.
+
+    Returns:
+        The object with rebased file paths.
+    """
+    if isinstance(obj, str):
+        return globalize_path(obj, project_directory)
+    if isinstance(obj, list):
+        return [_globalize(entry, project_directory) for entry in obj]
+    if isinstance(obj, tuple):
+        return tuple(_globalize(entry, project_directory) for entry in obj)
+    if isinstance(obj, dict):
+        return {key: _globalize(val, project_directory) for key, val in obj.items()}
+    return obj
+
+
+def _decode(obj, coords: list):
+    """
+    Recursively decode an object encoded by ``_encode()``.
+
+    Args:
+        obj: The object to decode.
+        coords (list): Coordinates of all xyz dictionaries and xyz strings.
+
+    Returns:
+        The decoded object.
+    """
+    if isinstance(obj, list):
+        return [_decode(entry, coords) for entry in obj]
+    if not isinstance(obj, dict):
+        return obj
+    if '__xyz__' in obj:
+        symbols, isotopes, start, stop = obj['__xyz__']
+        return {'symbols': _decode(symbols, coords),
+                'isotopes': _decode(isotopes, coords),
+                'coords': tuple(tuple(coord) for coord in coords[start:stop])}
+    if '__xyz_str__' in obj:
+        symbols, isotopes, start, stop = obj['__xyz_str__']
+        return xyz_to_str({'symbols': _decode(symbols, coords),
+                           'isotopes': _decode(isotopes, coords),
+                           'coords': tuple(tuple(coord) for coord in coords[start:stop])})
+    if '__tuple__' in obj:
+        return tuple(_decode(entry, coords) for entry in obj['__tuple__'])
+    if '__dict__' in obj:
+        return {_decode(key, coords): _decode(val, coords) for key, val in obj['__dict__']}
+    if '__datetime__' in obj:
+        return datetime.datetime.fromisoformat(obj['__datetime__'])
+    if '__ndarray__' in obj:
+        return np.array(obj['__ndarray__'], dtype=obj['dtype'])
+    return {key: _decode(val, coords) for key, val in obj.items()}
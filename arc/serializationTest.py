@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+"""
+This module contains unit tests for the arc.serialization module
+"""
+
+import datetime
+import os
+import shutil
+import unittest
+
+import numpy as np
+
+import arc.serialization as serialization
+from arc.common import read_yaml_file
+from arc.exceptions import InputError
+from arc.main import ARC
+from arc.settings import arc_path
+from arc.species.species import ARCSpecies
+
+
+class TestSerialization(unittest.TestCase):
+    """
+    Contains unit tests for the serialization module
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        A method that is run before all unit tests in this class.
+        """
+        cls.maxDiff = None
+        cls.scratch_path = os.path.join(arc_path, 'arc', 'testing', 'serialization_scratch')
+        if not os.path.isdir(cls.scratch_path):
+            os.makedirs(cls.scratch_path)
+
+    def test_encode_and_decode_content(self):
+        """Test encoding and decoding content with xyz dictionaries and non-JSON types"""
+        xyz = {'symbols': ('O', 'H', 'H'), 'isotopes': (16, 1, 1),
+               'coords': ((0.0, 0.0, 0.1173), (0.0, 0.7572, -0.4692), (0.0, -0.7572, -0.4692))}
+        content = {'label': 'H2O',
+                   'conformers': [xyz, xyz],
+                   'rotors_dict': {0: {'pivots': [1, 2], 'scan': (3, 1, 2, 4)}},
+                   'dihedrals': {(1, 2, 3, 4): [0.1, -179.9]},
+                   '__private': None,
+                   'initial_time': datetime.datetime(2020, 5, 14, 16, 31, 5),
+                   'e0': np.float64(-76.4),
+                   'freqs': np.array([1620.2, 3720.1, 3832.9])}
+        json_string, coords = serialization.encode_content(content)
+        self.assertIsInstance(json_string, str)
+        self.assertEqual(coords.shape, (6, 3))
+        self.assertTrue(coords.flags['C_CONTIGUOUS'])
+        decoded_content = serialization.decode_content(json_string=json_string, coords=coords)
+        freqs = decoded_content.pop('freqs')
+        self.assertTrue(np.array_equal(freqs, content.pop('freqs')))
+        self.assertEqual(decoded_content, content)
+        self.assertIsInstance(decoded_content['conformers'][0]['coords'][0], tuple)
+
+        with self.assertRaises(InputError):
+            serialization.encode_content({'unknown': object()})
+
+    def test_convert_file(self):
+        """Test losslessly converting a restart file between YAML and the binary format"""
+        restart_path = os.path.join(arc_path, 'arc', 'testing', 'restart', '1_restart_thermo', 'restart.yml')
+        binary_path = os.path.join(self.scratch_path, 'restart.npz')
+        yaml_path = os.path.join(self.scratch_path, 'restart.yml')
+        serialization.convert_file(source_path=restart_path, target_path=binary_path)
+        self.assertEqual(serialization.read_file(binary_path), read_yaml_file(restart_path))
+        serialization.convert_file(source_path=binary_path, target_path=yaml_path)
+        self.assertEqual(read_yaml_file(yaml_path), read_yaml_file(restart_path))
+
+        with self.assertRaises(InputError):
+            serialization.save_file(path=os.path.join(self.scratch_path, 'restart.txt'), content={})
+
+    def test_arc_restart_dict(self):
+        """Test saving and reading an ARC restart dictionary, storing the xyz strings of species as coordinates"""
+        xyz = """O       0.00000000    0.00000000    0.11730000
+H       0.00000000    0.75720000   -0.46920000
+H       0.00000000   -0.75720000   -0.46920000"""
+        spc = ARCSpecies(label='H2O', smiles='O', xyz=xyz)
+        arc0 = ARC(project='arc_project_for_testing_delete_after_usage_serialization', arc_species_list=[spc],
+                   project_directory=os.path.join(self.scratch_path, 'project'))
+        restart_dict = arc0.as_dict()
+        self.assertIn(xyz, restart_dict['species'][0]['conformers'])
+        json_string, coords = serialization.encode_content(restart_dict)
+        self.assertNotIn('0.75720000', json_string)
+        self.assertEqual(coords.shape[0] % 3, 0)
+        self.assertGreaterEqual(coords.shape[0], 3)
+        binary_path = os.path.join(self.scratch_path, 'restart_arc.npz')
+        serialization.save_file(path=binary_path, content=restart_dict)
+        self.assertEqual(serialization.read_file(binary_path), restart_dict)
+
+    def test_read_file(self):
+        """Test reading files, rebasing file paths on the project directory"""
+        restart_path = os.path.join(arc_path, 'arc', 'testing', 'restart', 'restart_paths.yml')
+        yaml_path = os.path.join(self.scratch_path, 'restart_paths.yml')
+        binary_path = os.path.join(self.scratch_path, 'restart_paths.npz')
+        text_path = os.path.join(self.scratch_path, 'restart_paths.txt')
+        shutil.copyfile(restart_path, yaml_path)
+        shutil.copyfile(restart_path, text_path)
+        serialization.convert_file(source_path=restart_path, target_path=binary_path)
+        project_directory = os.path.join(arc_path, 'Projects', 'project_test')
+        content = serialization.read_file(binary_path, project_directory=project_directory)
+        self.assertEqual(content['paths']['sp'],
+                         os.path.join(project_directory, 'calcs', 'Species', 'HCN', 'sp_a38230', 'output.out'))
+        self.assertEqual(content, serialization.read_file(yaml_path, project_directory=project_directory))
+        self.assertEqual(serialization.read_file(text_path), read_yaml_file(restart_path))  # read as YAML
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        A function that is run ONCE after all unit tests in this class.
+        Delete all project directories created during these unit tests
+        """
+        shutil.rmtree(cls.scratch_path, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
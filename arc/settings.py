@@ -15,6 +15,9 @@ import string
 # https://www.digitalocean.com/community/tutorials/how-to-set-up-ssh-keys--2
 # If ARC is being executed on a server, and ESS are available on that server, define a server named 'local',
 # for which only the cluster software and user name are required.
+# If no cluster software is installed on the local machine (e.g., a workstation), set the cluster software of 'local'
+# to 'Local', and ARC will execute the local jobs directly in a process pool, limited by the 'cpus' and 'memory' (GB)
+# of 'local' (defaulting to all CPU cores of the machine and to the default job memory, respectively).
 # servers = {
 #     'pharos': {
 #         'cluster_soft': 'OGE',  # Oracle Grid Engine (Sun Grin Engine)
@@ -32,6 +35,12 @@ import string
 #        'cluster_soft': 'OGE',
 #        'un': '<username>',
 #    },
+#    # 'local': {
+#    #     'cluster_soft': 'Local',  # no queue, ARC executes the jobs in a local process pool
+#    #     'un': '<username>',
+#    #     'cpus': 16,
+#    #     'memory': 64,
+#    # },
 # }
 servers = {
     'server1': {
@@ -47,6 +56,8 @@ servers = {
         'key': 'path_to_rsa_key',
         'cpus': 48,  # number of cpu's per node, optional (default: 8)
         'memory': 128,  # amount of memory per node in GB, optional (default: 16)
+        'min_poll_interval': 60,  # min time in seconds between queue status checks, optional (default: 20)
+        'job_arrays': True,  # submit same-shaped jobs (e.g., conformers) as a job array, optional (default: False)
     },
     'local': {
         'cluster_soft': 'OGE',
@@ -101,14 +112,63 @@ submit_command = {'OGE': 'export SGE_ROOT=/opt/sge; /opt/sge/bin/lx24-amd64/qsub
 delete_command = {'OGE': 'export SGE_ROOT=/opt/sge; /opt/sge/bin/lx24-amd64/qdel',
                   'Slurm': '/usr/bin/scancel'}
 
+# The minimal time interval (in seconds) between two consecutive queue status checks (e.g., qstat, squeue)
+# of the same server. The most recent queue snapshot of a server is shared by all species within this interval.
+# A server-specific interval could be set using the optional 'min_poll_interval' key of the ``servers`` dictionary.
+min_poll_interval = 20
+
+# The maximal number of terminated jobs for which output files are concurrently downloaded and parsed.
+max_concurrent_job_downloads = 8
+
+# The maximal number of species for which force field conformers are concurrently generated in background processes.
+# Conformer jobs of a species are submitted as soon as its own conformers are generated.
+max_concurrent_conformer_generations = 4
+
+# The restart file format, either 'yml' (human readable) or 'npz' (binary, much faster to save and load for large
+# projects). Use arc.serialization.convert_file() to losslessly convert a restart file between the formats.
+restart_file_format = 'yml'
+
+# Changes to the restart file are appended to a restart journal (restart_journal.yml in the project folder),
+# the journal is compacted into restart.yml after this number of entries.
+restart_journal_compaction_interval = 100
+
+# The maximal number of local processes used to embed and optimize force field conformers of a species.
+# The generated conformers do not depend on this number, set it to 1 to run serially in the ARC process.
+# Could be overridden per project using the ``conformer_max_workers`` ARC argument.
+default_conformer_max_workers = 1
+
+# The strategy for searching force field conformer combinations of species with many torsions
+# (see COMBINATION_SEARCHES in conformers.py, e.g., 'lowest_conformer' or 'simulated_annealing'),
+# and the max number of force field evaluations of a stochastic combination search.
+# Could be overridden per project using the ``conformer_combination_search``
+# and ``conformer_max_ff_evaluations`` ARC arguments.
+default_conformer_combination_search = 'lowest_conformer'
+default_conformer_max_ff_evaluations = 1000
+
+# Force field results of dihedral combinations are memoized, so repeated combinations aren't optimized again.
+# These are the max number of entries kept in memory, and on disk (in the force_field_cache.db file in the project
+# folder, which is kept between ARC restarts). Least recently used entries are evicted first.
+force_field_cache_sizes = {'memory': 20000,
+                           'disk': 1000000,
+                           }
+
+# A wall time budget (in seconds) for embedding random force field conformers per species.
+# If set, conformers are embedded in batches, and embedding stops once no new unique low energy conformers are found
+# or once the budget is used. The number of conformers determined by the species size is then only an upper limit.
+# Set to ``None`` to always embed this number of conformers.
+# Could be overridden per project using the ``conformer_wall_time`` ARC argument.
+conformer_wall_time = None
+
 list_available_nodes_command = {'OGE': 'export SGE_ROOT=/opt/sge; /opt/sge/bin/lx24-amd64/qstat -f | grep "/8 " | grep "long" | grep -v "8/8"| grep -v "aAu"',
                                 'Slurm': 'sinfo'}
 
 submit_filename = {'OGE': 'submit.sh',
-                   'Slurm': 'submit.sl'}
+                   'Slurm': 'submit.sl',
+                   'Local': 'submit.sh'}
 
 t_max_format = {'OGE': 'hours',
-                'Slurm': 'days'}
+                'Slurm': 'days',
+                'Local': 'hours'}
 
 input_filename = {'gaussian': 'input.gjf',
                   'molpro': 'input.in',
@@ -31,23 +31,39 @@ Module workflow::
     generate_conformers
         generate_force_field_conformers
             get_force_field_energies, rdkit_force_field or openbabel_force_field_on_rdkit_conformers,
-            determine_dihedrals
+            determine_dihedrals (get_dihedral_angle_matrix)
         deduce_new_conformers
-            get_torsion_angles, determine_torsion_symmetry, determine_torsion_sampling_points,
+            get_torsion_angles (get_torsion_angle_matrix), determine_torsion_symmetry,
+            determine_torsion_sampling_points (get_wells),
             change_dihedrals_and_force_field_it
         get_lowest_confs
 
 """
 
+import bisect
 import copy
+import atexit
+import hashlib
 import logging
+import logging.handlers
+import math
+import multiprocessing
+import os
+import random
+import sqlite3
 import sys
 import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from itertools import product
+from typing import Optional
 
+import numpy as np
 import openbabel as ob
 import pybel as pyb
 from rdkit import Chem
+from rdkit.Chem import rdMolTransforms as rdMT
 from rdkit.Chem.rdchem import EditableMol as RDMol
 
 import rmgpy.molecule.group as gr
@@ -56,9 +72,14 @@ from rmgpy.molecule.converter import to_ob_mol
 from rmgpy.molecule.molecule import Atom, Bond, Molecule
 from rmgpy.molecule.element import C as C_ELEMENT, H as H_ELEMENT, F as F_ELEMENT, Cl as Cl_ELEMENT, I as I_ELEMENT
 
-from arc.common import logger, determine_top_group_indices
+from arc.common import colliding_atoms_list, logger, determine_top_group_indices
 from arc.exceptions import ConformerError, InputError
 import arc.plotter
+from arc import serialization
+from arc.settings import (conformer_wall_time,
+                          default_conformer_combination_search,
+                          default_conformer_max_ff_evaluations,
+                          force_field_cache_sizes)
 from arc.species import converter, vectors
 
 
@@ -97,9 +118,49 @@ MAX_COMBINATION_ITERATIONS = 25
 # A threshold below which all combinations will be generated. Above it just samples of the entire search space.
 COMBINATION_THRESHOLD = 1000
 
+# The strategies for searching conformer combinations above the COMBINATION_THRESHOLD
+# (the default strategy and evaluation budget are set in settings.py):
+# 'lowest_conformer' iteratively modifies the dihedrals of the lowest conformer (up to MAX_COMBINATION_ITERATIONS),
+# 'simulated_annealing' anneals over the torsion wells within a budget of max force field evaluations
+COMBINATION_SEARCHES = ['lowest_conformer', 'simulated_annealing']
+
+# The initial and final simulated annealing temperatures (in the force field energy units)
+ANNEALING_TEMPERATURES = (10.0, 0.1)
+
 # Consolidation tolerances for Z matrices
 CONSOLIDATION_TOLS = {'R': 1e-2, 'A': 1e-2, 'D': 1e-2}
 
+# Adaptive embedding of force field conformers within a wall time budget: the number of conformers embedded per batch,
+# and the number of consecutive batches without new unique low energy conformers after which embedding stops
+ADAPTIVE_EMBED_BATCH_SIZE = 50
+ADAPTIVE_EMBED_PATIENCE = 2
+
+# The max difference (in Angstrom) between interatomic distances of conformers considered identical
+# when checking whether adaptive embedding still finds new conformers
+ADAPTIVE_EMBED_DISTANCE_TOL = 0.01
+
+# The number of conformers for which distance matrix fingerprints are computed at once when pruning conformers
+FINGERPRINT_CHUNK_SIZE = 256
+
+# The number of decimals to which coordinates (in Angstrom) and dihedral angles (in degrees)
+# are rounded in force field cache keys
+FF_CACHE_XYZ_DECIMALS = 4
+FF_CACHE_DIHEDRAL_DECIMALS = 2
+
+# The number of force field cache entries written to the cache file between two consecutive commits
+FF_CACHE_COMMIT_INTERVAL = 500
+
+# The number of chunks per worker process into which force field tasks are split (for load balancing)
+CHUNKS_PER_WORKER = 4
+
+# The start method of worker processes. Worker processes aren't forked, since forking a process which runs threads
+# (e.g., SSH connections or job output downloads in the Scheduler) might deadlock the child process
+PROCESS_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Process pools used for force field computations, keys are (process ID, max number of workers) tuples
+# (a pool is only used by the process that created it)
+_process_pools = dict()
+
 
 def generate_conformers(mol_list,
                         label,
@@ -120,6 +181,10 @@ def generate_conformers(mol_list,
                         return_all_conformers=False,
                         plot_path=None,
                         print_logs=True,
+                        max_workers=1,
+                        combination_search=None,
+                        max_ff_evaluations=None,
+                        wall_time=None,
                         ) -> list:
     """
     Generate conformers for (non-TS) species starting from a list of RMG Molecules.
@@ -152,6 +217,16 @@ def generate_conformers(mol_list,
                                    If None, the plot will not be shown (nor saved).
         print_logs (bool, optional): Whether define a logger so logs are also printed to stdout.
                                      Useful when run outside of ARC. True to print.
+        max_workers (int, optional): The max number of local processes to use for force field computations.
+                                     The results do not depend on this number. 1 runs serially.
+        combination_search (str, optional): The strategy for searching conformer combinations if there are more
+                                            than ``combination_threshold`` combinations,
+                                            either 'lowest_conformer' or 'simulated_annealing'.
+        max_ff_evaluations (int, optional): The maximum number of force field evaluations of a stochastic
+                                            conformer combination search.
+        wall_time (float, optional): A wall time budget (in seconds) for embedding random force field conformers.
+                                     If given, conformers are embedded in batches until no new unique low energy
+                                     conformers are found, up to the number determined automatically.
 
     Raises:
         ConformerError: If something goes wrong.
@@ -208,12 +283,15 @@ def generate_conformers(mol_list,
 
     max_combination_iterations = max_combination_iterations or MAX_COMBINATION_ITERATIONS
     combination_threshold = combination_threshold or COMBINATION_THRESHOLD
+    combination_search = combination_search or default_conformer_combination_search
+    max_ff_evaluations = max_ff_evaluations or default_conformer_max_ff_evaluations
+    wall_time = wall_time if wall_time is not None else conformer_wall_time
 
     if torsions is None or tops is None:
         torsions, tops = determine_rotors(mol_list)
     conformers = generate_force_field_conformers(
         mol_list=mol_list, label=label, xyzs=xyzs, torsion_num=len(torsions), charge=charge, multiplicity=multiplicity,
-        num_confs=num_confs_to_generate, force_field=force_field)
+        num_confs=num_confs_to_generate, force_field=force_field, max_workers=max_workers, wall_time=wall_time)
 
     if len(conformers):
         conformers = determine_dihedrals(conformers, torsions)
@@ -222,9 +300,11 @@ def generate_conformers(mol_list,
             label, conformers, torsions, tops, mol_list, smeared_scan_res, plot_path=plot_path,
             combination_threshold=combination_threshold, force_field=force_field,
             max_combination_iterations=max_combination_iterations, diastereomers=diastereomers,
-            de_threshold=de_threshold)
+            de_threshold=de_threshold, max_workers=max_workers, combination_search=combination_search,
+            max_ff_evaluations=max_ff_evaluations)
 
-        new_conformers = determine_chirality(conformers=new_conformers, label=label, mol=mol_list[0])
+        new_conformers = determine_chirality(conformers=new_conformers, label=label, mol=mol_list[0],
+                                             max_workers=max_workers)
 
         lowest_confs = get_lowest_confs(label, new_conformers, n=n_confs, e=e_confs)
 
@@ -250,7 +330,8 @@ def generate_conformers(mol_list,
 
 def deduce_new_conformers(label, conformers, torsions, tops, mol_list, smeared_scan_res=None, plot_path=None,
                           combination_threshold=1000, force_field='MMFF94s', max_combination_iterations=25,
-                          diastereomers=None, de_threshold=None):
+                          diastereomers=None, de_threshold=None, max_workers=1, combination_search='lowest_conformer',
+                          max_ff_evaluations=None):
     """
     By knowing the existing torsion wells, get the geometries of all important conformers.
     Validate that atoms don't collide in the generated conformers (don't consider ones where they do).
@@ -271,6 +352,11 @@ def deduce_new_conformers(label, conformers, torsions, tops, mol_list, smeared_s
                                         representing specific diastereomers to keep.
         de_threshold (float, optional): An energy threshold (in kJ/mol) above which wells in a torsion
                                         will not be considered.
+        max_workers (int, optional): The max number of local processes to use for force field computations.
+        combination_search (str, optional): The strategy for searching conformer combinations if there are more
+                                            than ``combination_threshold`` combinations.
+        max_ff_evaluations (int, optional): The maximum number of force field evaluations of a stochastic
+                                            conformer combination search.
 
     Returns:
         list: The deduced conformers.
@@ -325,18 +411,20 @@ def deduce_new_conformers(label, conformers, torsions, tops, mol_list, smeared_s
             multiple_sampling_points.append(points)
 
     diastereomeric_conformers = get_lowest_diastereomers(label=label, mol=mol, conformers=conformers,
-                                                         diastereomers=diastereomers)
+                                                         diastereomers=diastereomers, max_workers=max_workers)
     new_conformers = list()
+    workspace = RDKitConformerWorkspace(mol=mol, force_field=force_field) if len(single_tors) else None
     for diastereomeric_conformer in diastereomeric_conformers:
         # set symmetric (single well) torsions to the mean of the well
         if 'chirality' in diastereomeric_conformer and diastereomeric_conformer['chirality'] != dict():
             logger.info(f"Considering diastereomer {diastereomeric_conformer['chirality']}")
-        base_xyz = diastereomeric_conformer['xyz']  # base_xyz is modified within the loop below
-        for torsion, dihedral in zip(single_tors, single_sampling_point):
-            torsion_0_indexed = [tor - 1 for tor in torsion]
-            conf, rd_mol = converter.rdkit_conf_from_mol(mol, base_xyz)
-            if conf is not None:
-                base_xyz = converter.set_rdkit_dihedrals(conf, rd_mol, torsion_0_indexed, deg_abs=dihedral)
+        base_xyz = diastereomeric_conformer['xyz']  # base_xyz is modified below
+        if workspace is not None:
+            conf_id = workspace.add_conformer(base_xyz)
+            for torsion, dihedral in zip(single_tors, single_sampling_point):
+                workspace.set_dihedral(conf_id, [tor - 1 for tor in torsion], dihedral)
+            base_xyz = workspace.get_xyz(conf_id)
+            workspace.remove_conformer(conf_id)
 
         new_conformers.extend(generate_conformer_combinations(
             label=label, mol=mol_list[0], base_xyz=base_xyz, hypothetical_num_comb=hypothetical_num_comb,
@@ -344,7 +432,8 @@ def deduce_new_conformers(label, conformers, torsions, tops, mol_list, smeared_s
             combination_threshold=combination_threshold, len_conformers=len(conformers), force_field=force_field,
             max_combination_iterations=max_combination_iterations, plot_path=plot_path, torsion_angles=torsion_angles,
             multiple_sampling_points_dict=multiple_sampling_points_dict, wells_dict=wells_dict,
-            de_threshold=de_threshold, symmetries=symmetries))
+            de_threshold=de_threshold, symmetries=symmetries, max_workers=max_workers,
+            combination_search=combination_search, max_ff_evaluations=max_ff_evaluations))
 
     if plot_path is not None:
         lowest_conf = get_lowest_confs(label=label, confs=new_conformers, n=1)[0]
@@ -362,10 +451,12 @@ def generate_conformer_combinations(label, mol, base_xyz, hypothetical_num_comb,
                                     multiple_sampling_points, combination_threshold=1000, len_conformers=-1,
                                     force_field='MMFF94s', max_combination_iterations=25, plot_path=None,
                                     torsion_angles=None, multiple_sampling_points_dict=None, wells_dict=None,
-                                    de_threshold=None, symmetries=None):
+                                    de_threshold=None, symmetries=None, max_workers=1,
+                                    combination_search='lowest_conformer', max_ff_evaluations=None):
     """
-    Call either conformers_combinations_by_lowest_conformer() or generate_all_combinations(),
-    according to the hypothetical_num_comb.
+    Call either generate_all_combinations() or, if there are too many combinations (according to the
+    hypothetical_num_comb), the search named by ``combination_search``: conformers_combinations_by_lowest_conformer()
+    or conformers_combinations_by_simulated_annealing().
 
     Args:
         label (str): The species' label.
@@ -390,12 +481,35 @@ def generate_conformer_combinations(label, mol, base_xyz, hypothetical_num_comb,
                                             If None, the plot will not be shown (nor saved).
         symmetries (dict, optional): Keys are tuples scan indices (1-indexed), values are internal
                                      rotation symmetry numbers (sigma).
+        max_workers (int, optional): The max number of local processes to use for force field computations.
+        combination_search (str, optional): The strategy for searching conformer combinations if there are more
+                                            than ``combination_threshold`` combinations,
+                                            either 'lowest_conformer' or 'simulated_annealing'.
+        max_ff_evaluations (int, optional): The maximum number of force field evaluations of a stochastic
+                                            conformer combination search.
+
+    Raises:
+        ConformerError: If ``combination_search`` is not recognized.
 
     Returns:
         list: New conformer combinations, entries are conformer dictionaries.
     """
     de_threshold = de_threshold or DE_THRESHOLD
-    if hypothetical_num_comb > combination_threshold:
+    if combination_search not in COMBINATION_SEARCHES:
+        raise ConformerError(f'Unrecognized conformer combination search for {label}. Should be one of '
+                             f'{COMBINATION_SEARCHES}. Got: {combination_search}.')
+    if hypothetical_num_comb > combination_threshold and combination_search == 'simulated_annealing' \
+            and force_field != 'gromacs':
+        # don't generate all combinations, there are simply too many
+        # anneal over the torsion wells within a fixed force field evaluation budget
+        logger.debug(f'hypothetical_num_comb for {label} is > {combination_threshold}')
+        new_conformers = conformers_combinations_by_simulated_annealing(
+            label, mol=mol, base_xyz=base_xyz, multiple_tors=multiple_tors,
+            multiple_sampling_points=multiple_sampling_points, len_conformers=len_conformers, force_field=force_field,
+            max_ff_evaluations=max_ff_evaluations, plot_path=plot_path, de_threshold=de_threshold,
+            torsion_angles=torsion_angles, multiple_sampling_points_dict=multiple_sampling_points_dict,
+            wells_dict=wells_dict, max_workers=max_workers)
+    elif hypothetical_num_comb > combination_threshold:
         # don't generate all combinations, there are simply too many
         # iteratively modify the lowest conformer until it converges.
         logger.debug(f'hypothetical_num_comb for {label} is > {combination_threshold}')
@@ -404,20 +518,21 @@ def generate_conformer_combinations(label, mol, base_xyz, hypothetical_num_comb,
             multiple_sampling_points=multiple_sampling_points, len_conformers=len_conformers, force_field=force_field,
             plot_path=plot_path, de_threshold=de_threshold, max_combination_iterations=max_combination_iterations,
             torsion_angles=torsion_angles, multiple_sampling_points_dict=multiple_sampling_points_dict,
-            wells_dict=wells_dict, symmetries=symmetries)
+            wells_dict=wells_dict, symmetries=symmetries, max_workers=max_workers)
     else:
         # just generate all combinations and get their FF energies
         logger.debug(f'hypothetical_num_comb for {label} is < {combination_threshold}')
         new_conformers = generate_all_combinations(label, mol, base_xyz, multiple_tors, multiple_sampling_points,
                                                    len_conformers=len_conformers, force_field=force_field,
-                                                   torsions=list(torsion_angles.keys()))
+                                                   torsions=list(torsion_angles.keys()), max_workers=max_workers)
     return new_conformers
 
 
 def conformers_combinations_by_lowest_conformer(label, mol, base_xyz, multiple_tors, multiple_sampling_points,
                                                 len_conformers=-1, force_field='MMFF94s', max_combination_iterations=25,
                                                 torsion_angles=None, multiple_sampling_points_dict=None,
-                                                wells_dict=None, de_threshold=None, plot_path=False, symmetries=None):
+                                                wells_dict=None, de_threshold=None, plot_path=False, symmetries=None,
+                                                max_workers=1):
     """
     Iteratively modify dihedrals in the lowest conformer (each iteration deduces a new lowest conformer),
     until convergence.
@@ -442,6 +557,7 @@ def conformers_combinations_by_lowest_conformer(label, mol, base_xyz, multiple_t
                                             If None, the plot will not be shown (nor saved).
         symmetries (dict, optional): Keys are tuples scan indices (1-indexed), values are internal
                                      rotation symmetry numbers (sigma).
+        max_workers (int, optional): The max number of local processes to use for force field computations.
 
     Returns:
         list: New conformer combinations, entries are conformer dictionaries.
@@ -456,16 +572,21 @@ def conformers_combinations_by_lowest_conformer(label, mol, base_xyz, multiple_t
     lowest_conf_i = None
     for i in range(max_combination_iterations):
         newest_conformers_dict, newest_conformer_list = dict(), list()  # conformers from the current iteration
-        for tor, sampling_points in zip(multiple_tors, multiple_sampling_points):
-            xyzs, energies = change_dihedrals_and_force_field_it(label, mol, xyz=base_xyz, torsions=[tor],
-                                                                 new_dihedrals=[[sp] for sp in sampling_points],
-                                                                 force_field=force_field, optimize=False)
+        # all torsions are independently modified on the same base conformer, spread them across processes
+        results = map_in_process_pool(func=get_dihedral_combinations_results,
+                                      args_list=[(label, mol, base_xyz, [tor], [[sp] for sp in sampling_points],
+                                                  force_field)
+                                                 for tor, sampling_points in zip(multiple_tors,
+                                                                                 multiple_sampling_points)],
+                                      max_workers=max_workers)
+        for tor, sampling_points, tor_results in zip(multiple_tors, multiple_sampling_points, results):
             newest_conformers_dict[tor] = list()  # keys are torsions for plotting
-            for xyz, energy, dihedral in zip(xyzs, energies, sampling_points):
-                exists = False
-                if any([converter.compare_confs(xyz, conf['xyz']) for conf in new_conformers + newest_conformer_list]):
-                    exists = True
+            for (xyz_dihedrals, _, energy), dihedral in zip(tor_results, sampling_points):
+                # results are aligned with the sampling points, colliding dihedrals aren't optimized (energy is None)
+                xyz = xyz_dihedrals if energy is not None else None
                 if xyz is not None:
+                    exists = any([converter.compare_confs(xyz, conf['xyz'])
+                                  for conf in new_conformers + newest_conformer_list])
                     conformer = {'index': len_conformers + len(new_conformers) + len(newest_conformer_list),
                                  'xyz': xyz,
                                  'FF energy': round(energy, 3),
@@ -508,8 +629,113 @@ def conformers_combinations_by_lowest_conformer(label, mol, base_xyz, multiple_t
     return new_conformers
 
 
+def conformers_combinations_by_simulated_annealing(label, mol, base_xyz, multiple_tors, multiple_sampling_points,
+                                                   len_conformers=-1, force_field='MMFF94s', max_ff_evaluations=None,
+                                                   torsion_angles=None, multiple_sampling_points_dict=None,
+                                                   wells_dict=None, de_threshold=None, plot_path=None, max_workers=1,
+                                                   seed=1):
+    """
+    Search for low energy conformer combinations by simulated annealing over the sampling points of the torsion wells,
+    within a fixed budget of force field evaluations (so the runtime doesn't depend on the number of combinations).
+    A state is a combination of sampling points, one per torsion. Each step proposes a batch of unvisited states
+    (each modifies one or two random torsions of the current state), evaluates the batch at once
+    (spread across local processes if ``max_workers`` is greater than 1), and moves to the lowest proposal
+    according to the Metropolis criterion. The temperature is geometrically decreased over the budget.
+    Proposals are drawn using a seeded random number generator, so the search is reproducible.
+
+    Args:
+        label (str): The species' label.
+        mol (Molecule): The RMG molecule with the connectivity information.
+        base_xyz (dict): The base 3D geometry to be changed.
+        multiple_tors (list): Entries are torsion tuples of non-symmetric torsions.
+        multiple_sampling_points (list): Entries are lists of dihedral angles (sampling points), respectively correspond
+                                         to torsions in multiple_tors.
+        len_conformers (int, optional): The length of the existing conformers list (for consecutive numbering).
+        force_field (str, optional): The type of force field to use.
+        max_ff_evaluations (int, optional): The maximum number of force field evaluations.
+        torsion_angles (dict, optional): The torsion angles. Keys are torsion tuples, values are lists of all
+                                         corresponding angles from conformers.
+        multiple_sampling_points_dict (dict, optional): Keys are torsion tuples, values are respective sampling points.
+        wells_dict (dict, optional): Keys are torsion tuples, values are well dictionaries.
+        de_threshold (float, optional): An energy threshold (in kJ/mol) above which conformers will not be returned
+                                        (relative to the lowest conformer).
+        plot_path (str, optional): A folder path in which the plot will be saved.
+                                            If None, the plot will not be shown (nor saved).
+        max_workers (int, optional): The max number of local processes to use for force field computations.
+        seed (int, optional): The seed of the random number generator.
+
+    Returns:
+        list: New conformer combinations, entries are conformer dictionaries.
+    """
+    max_ff_evaluations = max_ff_evaluations or default_conformer_max_ff_evaluations
+    rng = random.Random(seed)
+    num_points = [len(sampling_points) for sampling_points in multiple_sampling_points]
+    batch_size = max(max_workers or 1, 1) * CHUNKS_PER_WORKER
+    # start from the sampling points closest to the dihedrals of the base conformer
+    current_state = tuple(min(range(len(sampling_points)),
+                              key=lambda j: abs((sampling_points[j] - dihedral + 180) % 360 - 180))
+                          for sampling_points, dihedral in
+                          zip(multiple_sampling_points,
+                              vectors.calculate_dihedral_angles(coords=base_xyz, torsions=multiple_tors, index=1)))
+    current_energy = None
+    results = dict()  # keys are visited states, values are (xyz, energy) tuples (None if the evaluation failed)
+    proposals = [current_state]
+    while proposals:
+        new_results = get_dihedral_combinations_results(
+            label, mol, base_xyz, multiple_tors,
+            [[sampling_points[j] for sampling_points, j in zip(multiple_sampling_points, state)] for state in proposals],
+            force_field=force_field, max_workers=max_workers)
+        for state, (_, xyz, energy) in zip(proposals, new_results):
+            results[state] = (xyz, energy) if xyz is not None and energy is not None else None
+        evaluated_proposals = [state for state in proposals if results[state] is not None]
+        if evaluated_proposals:
+            best_state = min(evaluated_proposals, key=lambda state: results[state][1])
+            temperature = ANNEALING_TEMPERATURES[0] * (ANNEALING_TEMPERATURES[1] / ANNEALING_TEMPERATURES[0]) \
+                ** (len(results) / max_ff_evaluations)
+            if current_energy is None or results[best_state][1] <= current_energy \
+                    or rng.random() < math.exp((current_energy - results[best_state][1]) / temperature):
+                current_state, current_energy = best_state, results[best_state][1]
+
+        # propose new states around the current state, restart from a random state if the neighborhood is exhausted
+        proposals = list()
+        num_proposals = min(batch_size, max_ff_evaluations - len(results))
+        for attempt in range(20 * num_proposals):
+            if len(proposals) >= num_proposals:
+                break
+            if attempt < 10 * num_proposals:
+                state = list(current_state)
+                for j in rng.sample(range(len(num_points)), min(rng.choice([1, 2]), len(num_points))):
+                    state[j] = rng.choice([k for k in range(num_points[j]) if k != state[j]] or [state[j]])
+            else:
+                state = [rng.randrange(num_points[j]) for j in range(len(num_points))]
+            state = tuple(state)
+            if state not in results and state not in proposals:
+                proposals.append(state)
+
+    new_conformers = list()
+    for i, result in enumerate(results.values()):
+        if result is not None:
+            new_conformers.append({'index': len_conformers + len(new_conformers),
+                                   'xyz': result[0],
+                                   'FF energy': round(result[1], 3),
+                                   'source': f'Simulated annealing over torsion wells, evaluation {i}'})
+    logger.debug(f'Evaluated {len(results)} conformer combinations of {label} by simulated annealing')
+    if not new_conformers:
+        return new_conformers
+    if plot_path is not None:
+        lowest_conf = get_lowest_confs(label, new_conformers, n=1)[0]
+        logger.info(converter.xyz_to_str(lowest_conf['xyz']))
+        arc.plotter.draw_structure(xyz=lowest_conf['xyz'])
+        arc.plotter.plot_torsion_angles(torsion_angles, multiple_sampling_points_dict, wells_dict=wells_dict,
+                                        de_threshold=de_threshold, plot_path=plot_path)
+    if de_threshold is not None:
+        min_e = min([conf['FF energy'] for conf in new_conformers])
+        new_conformers = [conf for conf in new_conformers if conf['FF energy'] - min_e < de_threshold]
+    return new_conformers
+
+
 def generate_all_combinations(label, mol, base_xyz, multiple_tors, multiple_sampling_points, len_conformers=-1,
-                              torsions=None, force_field='MMFF94s'):
+                              torsions=None, force_field='MMFF94s', max_workers=1):
     """
     Generate all combinations of torsion wells from a base conformer.
 
@@ -523,6 +749,7 @@ def generate_all_combinations(label, mol, base_xyz, multiple_tors, multiple_samp
         len_conformers (int, optional): The length of the existing conformers list (for consecutive numbering).
         force_field (str, optional): The type of force field to use.
         torsions (list, optional): A list of all possible torsions in the molecule. Will be determined if not given.
+        max_workers (int, optional): The max number of local processes to use for force field computations.
 
     Returns:
         list: New conformer combinations, entries are conformer dictionaries.
@@ -534,7 +761,7 @@ def generate_all_combinations(label, mol, base_xyz, multiple_tors, multiple_samp
     if multiple_tors:
         xyzs, energies = change_dihedrals_and_force_field_it(label, mol, xyz=base_xyz, torsions=multiple_tors,
                                                              new_dihedrals=product_combinations, optimize=True,
-                                                             force_field=force_field)
+                                                             force_field=force_field, max_workers=max_workers)
         for xyz, energy in zip(xyzs, energies):
             if xyz is not None:
                 new_conformers.append({'index': len_conformers + len(new_conformers),
@@ -562,10 +789,14 @@ def generate_force_field_conformers(label,
                                     multiplicity,
                                     xyzs=None,
                                     num_confs=None,
-                                    force_field='MMFF94s'):
+                                    force_field='MMFF94s',
+                                    max_workers=1,
+                                    wall_time=None):
     """
     Generate conformers using RDKit and OpenBabel and optimize them using a force field
     Also consider user guesses in `xyzs`
+    If ``wall_time`` is given, the number of conformers determined by ``determine_number_of_conformers_to_generate()``
+    (or ``num_confs``) is the max number of conformers, see ``get_force_field_energies_adaptively()``.
 
     Args:
         label (str): The species' label.
@@ -576,6 +807,9 @@ def generate_force_field_conformers(label,
         multiplicity (int): The species spin multiplicity.
         num_confs (int, optional): The number of conformers to generate.
         force_field (str, optional): The type of force field to use.
+        max_workers (int, optional): The max number of local processes to use for force field computations.
+        wall_time (float, optional): A wall time budget (in seconds) for embedding the conformers of all
+                                     resonance structures in ``mol_list``.
 
     Returns:
         list: Entries are conformer dictionaries.
@@ -583,6 +817,7 @@ def generate_force_field_conformers(label,
     Raises:
         ConformerError: If xyzs is given and it is not a list, or its entries are not strings.
     """
+    t0 = time.time()
     conformers = list()
     number_of_heavy_atoms = len([atom for atom in mol_list[0].atoms if atom.is_non_hydrogen()])
     if num_confs is None:
@@ -592,15 +827,23 @@ def generate_force_field_conformers(label,
     else:
         num_chiral_centers = ''
     chiral_centers = '' if not num_chiral_centers else f', {num_chiral_centers} chiral centers,'
+    budget = f' (within a wall time of {wall_time} s)' if wall_time is not None else ''
     logger.info(f'Species {label} has {number_of_heavy_atoms} heavy atoms{chiral_centers} and {torsion_num} torsions. '
-                f'Using {num_confs} random conformers.')
-    for mol in mol_list:
+                f'Using {"up to " if budget else ""}{num_confs} random conformers{budget}.')
+    for i, mol in enumerate(mol_list):
         ff_xyzs, ff_energies = list(), list()
         try:
-            ff_xyzs, ff_energies = get_force_field_energies(label,
-                                                            mol,
-                                                            num_confs=num_confs,
-                                                            force_field=force_field)
+            if wall_time is not None:
+                # split the remaining time between the remaining resonance structures
+                ff_xyzs, ff_energies = get_force_field_energies_adaptively(
+                    label, mol, max_num_confs=num_confs, force_field=force_field, max_workers=max_workers,
+                    wall_time=(wall_time - (time.time() - t0)) / (len(mol_list) - i))
+            else:
+                ff_xyzs, ff_energies = get_force_field_energies(label,
+                                                                mol,
+                                                                num_confs=num_confs,
+                                                                force_field=force_field,
+                                                                max_workers=max_workers)
         except ValueError as e:
             logger.warning(f'Could not generate conformers for {label}, failed with: {e}')
         if ff_xyzs:
@@ -625,7 +868,8 @@ def generate_force_field_conformers(label,
     return conformers
 
 
-def change_dihedrals_and_force_field_it(label, mol, xyz, torsions, new_dihedrals, optimize=True, force_field='MMFF94s'):
+def change_dihedrals_and_force_field_it(label, mol, xyz, torsions, new_dihedrals, optimize=True, force_field='MMFF94s',
+                                        max_workers=1):
     """
     Change dihedrals of specified torsions according to the new dihedrals specified, and get FF energies.
 
@@ -639,6 +883,8 @@ def change_dihedrals_and_force_field_it(label, mol, xyz, torsions, new_dihedrals
     generated conformer are kept.
 
     We assume that each list entry in new_dihedrals is of the length of the torsions list (2 in the example).
+    Results are memoized in ``force_field_cache``, only dihedral combinations which aren't cached are computed.
+    If ``max_workers`` is greater than 1, these dihedral combinations are spread across local processes.
 
     Args:
         label (str): The species' label.
@@ -648,6 +894,7 @@ def change_dihedrals_and_force_field_it(label, mol, xyz, torsions, new_dihedrals
         new_dihedrals (list): Entries are same size lists of dihedral angles (floats) corresponding to the torsions.
         optimize (bool, optional): Whether to optimize the coordinates using FF. True to optimize.
         force_field (str, optional): The type of force field to use.
+        max_workers (int, optional): The max number of local processes to use for force field computations.
 
     Returns:
         list: The conformer FF energies corresponding to the list of dihedrals.
@@ -669,28 +916,123 @@ def change_dihedrals_and_force_field_it(label, mol, xyz, torsions, new_dihedrals
     if isinstance(new_dihedrals, list) and not isinstance(new_dihedrals[0], (list, tuple)):
         new_dihedrals = [new_dihedrals]
 
-    for dihedrals in new_dihedrals:
-        xyz_dihedrals = xyz
-        for torsion, dihedral in zip(torsions, dihedrals):
-            conf, rd_mol = converter.rdkit_conf_from_mol(mol, xyz_dihedrals)
-            if conf is not None:
-                torsion_0_indexed = [tor - 1 for tor in torsion]
-                xyz_dihedrals = converter.set_rdkit_dihedrals(conf, rd_mol, torsion_0_indexed, deg_abs=dihedral)
-        if force_field != 'gromacs':
-            xyz_, energy = get_force_field_energies(label, mol=mol, xyz=xyz_dihedrals, optimize=True,
-                                                    force_field=force_field, suppress_warning=True)
-            if energy and xyz_:
-                energies.append(energy[0])
-                if optimize:
-                    xyzs.append(xyz_[0])
-                else:
-                    xyzs.append(xyz_dihedrals)
-        else:
+    if force_field == 'gromacs':
+        for xyz_dihedrals, _, _ in set_dihedrals_and_force_field_it(label, mol, xyz, torsions, new_dihedrals,
+                                                                     force_field=force_field):
             energies.append(None)
             xyzs.append(xyz_dihedrals)
+        return xyzs, energies
+
+    results = get_dihedral_combinations_results(label, mol, xyz, torsions, new_dihedrals, force_field=force_field,
+                                                max_workers=max_workers)
+    for xyz_dihedrals, xyz_, energy in results:
+        if energy is not None and xyz_ is not None:
+            energies.append(energy)
+            if optimize:
+                xyzs.append(xyz_)
+            else:
+                xyzs.append(xyz_dihedrals)
     return xyzs, energies
 
 
+def get_dihedral_combinations_results(label, mol, xyz, torsions, new_dihedrals, force_field='MMFF94s', max_workers=1):
+    """
+    Get the force field results of dihedral combinations set on a base conformer,
+    only dihedral combinations which aren't cached in ``force_field_cache`` are computed.
+    If ``max_workers`` is greater than 1, these dihedral combinations are spread across local processes.
+
+    Args:
+        label (str): The species' label.
+        mol (Molecule): The RMG molecule with the connectivity information.
+        xyz (dict): The base 3D geometry to be changed.
+        torsions (list): Entries are torsion tuples for which the dihedral will be changed relative to xyz.
+        new_dihedrals (list): Entries are same size lists of dihedral angles (floats) corresponding to the torsions.
+        force_field (str, optional): The type of force field to use.
+        max_workers (int, optional): The max number of local processes to use for force field computations.
+
+    Returns:
+        list: Entries are tuples of the conformer xyz with the new dihedrals, the optimized conformer xyz, and the
+              conformer FF energy, respectively corresponding to the list of dihedrals.
+              The last two are ``None`` if the conformer wasn't optimized.
+    """
+    mol_key = force_field_cache.get_mol_key(mol)
+    keys = [force_field_cache.get_key(mol_key, force_field, xyz, torsions, dihedrals) if mol_key is not None else None
+            for dihedrals in new_dihedrals]
+    results = [force_field_cache.get(key) if key is not None else None for key in keys]
+    missing_indices = [i for i, result in enumerate(results) if result is None]
+    if missing_indices:
+        missing_dihedrals = [new_dihedrals[i] for i in missing_indices]
+        if max_workers is not None and max_workers > 1 and len(missing_dihedrals) > 1:
+            chunk_results = map_in_process_pool(func=set_dihedrals_and_force_field_it,
+                                                args_list=[(label, mol, xyz, torsions, chunk, force_field)
+                                                           for chunk in split_into_chunks(missing_dihedrals,
+                                                                                          max_workers)],
+                                                max_workers=max_workers)
+            missing_results = [result for chunk_result in chunk_results for result in chunk_result]
+        else:
+            missing_results = set_dihedrals_and_force_field_it(label, mol, xyz, torsions, missing_dihedrals,
+                                                               force_field=force_field)
+        for i, result in zip(missing_indices, missing_results):
+            results[i] = result
+            if keys[i] is not None:
+                force_field_cache.set(keys[i], result)
+    force_field_cache.commit()
+    return results
+
+
+def set_dihedrals_and_force_field_it(label, mol, xyz, torsions, new_dihedrals, force_field='MMFF94s'):
+    """
+    Change dihedrals of specified torsions according to the new dihedrals specified, and optimize the resulting
+    conformers using a force field. A helper function for ``get_dihedral_combinations_results()`` (w/o caching).
+    All dihedral combinations are set and optimized in place on a single ``RDKitConformerWorkspace``.
+    Dihedral combinations in which atoms collide are screened out (in a single batch) before any force field
+    optimization is spent on them.
+
+    Args:
+        label (str): The species' label.
+        mol (Molecule): The RMG molecule with the connectivity information.
+        xyz (dict): The base 3D geometry to be changed.
+        torsions (list): Entries are torsion tuples for which the dihedral will be changed relative to xyz.
+        new_dihedrals (list): Entries are same size lists of dihedral angles (floats) corresponding to the torsions.
+        force_field (str, optional): The type of force field to use, the conformers are not optimized for 'gromacs'.
+
+    Returns:
+        list: Entries are tuples of the conformer xyz with the new dihedrals, the optimized conformer xyz, and the
+              conformer FF energy, respectively corresponding to the list of dihedrals.
+              The last two are ``None`` if the conformer wasn't optimized (e.g., if atoms collide).
+    """
+    results = list()
+    workspace = RDKitConformerWorkspace(mol=mol, force_field=force_field)
+    base_conf_id = workspace.add_conformer(xyz)
+    torsions_0_indexed = [[tor - 1 for tor in torsion] for torsion in torsions]
+    conf_ids, xyzs_dihedrals = list(), list()
+    for dihedrals in new_dihedrals:
+        conf_id = workspace.copy_conformer(base_conf_id)
+        for torsion_0_indexed, dihedral in zip(torsions_0_indexed, dihedrals):
+            workspace.set_dihedral(conf_id, torsion_0_indexed, dihedral)
+        conf_ids.append(conf_id)
+        xyzs_dihedrals.append(workspace.get_xyz(conf_id) if len(torsions_0_indexed) else xyz)
+    if force_field != 'gromacs' and len(torsions_0_indexed):
+        collisions = colliding_atoms_list(xyzs_dihedrals)
+    else:
+        collisions = [False] * len(conf_ids)
+    for conf_id, xyz_dihedrals, colliding in zip(conf_ids, xyzs_dihedrals, collisions):
+        xyz_, energy = None, None
+        if force_field != 'gromacs' and not colliding:
+            if workspace.mol_properties is not None:
+                energy = workspace.optimize(conf_id)
+                xyz_ = workspace.get_xyz(conf_id)
+            else:
+                # not an RDKit MMFF force field, or RDKit could not type the molecule, fall back to OpenBabel
+                xyzs_, energies_ = get_force_field_energies(label, mol=mol, xyz=xyz_dihedrals, optimize=True,
+                                                            force_field=force_field, suppress_warning=True)
+                if energies_ and xyzs_:
+                    xyz_, energy = xyzs_[0], energies_[0]
+        workspace.remove_conformer(conf_id)
+        results.append((xyz_dihedrals, xyz_, energy))
+    return results
+
+
 def determine_rotors(mol_list):
     """
     Determine possible unique rotors in the species to be treated as hindered rotors.
@@ -791,19 +1133,42 @@ def determine_dihedrals(conformers, torsions):
     Returns:
         list: Entries are conformer dictionaries.
     """
-    for conformer in conformers:
-        if isinstance(conformer['xyz'], str):
-            xyz = converter.str_to_xyz(conformer['xyz'])
-        else:
-            xyz = conformer['xyz']
-        if 'torsion_dihedrals' not in conformer or not conformer['torsion_dihedrals']:
+    new_conformers = [conformer for conformer in conformers
+                      if 'torsion_dihedrals' not in conformer or not conformer['torsion_dihedrals']]
+    if new_conformers:
+        xyzs = [converter.str_to_xyz(conformer['xyz']) if isinstance(conformer['xyz'], str) else conformer['xyz']
+                for conformer in new_conformers]
+        dihedrals = get_dihedral_angle_matrix(xyzs, torsions) if len(torsions) else None
+        for i, conformer in enumerate(new_conformers):
             conformer['torsion_dihedrals'] = dict()
-            for torsion in torsions:
-                dihedral = vectors.calculate_dihedral_angle(coords=xyz['coords'], torsion=torsion, index=1)
-                conformer['torsion_dihedrals'][tuple(torsion)] = dihedral
+            for j, torsion in enumerate(torsions):
+                if np.isnan(dihedrals[i, j]):
+                    # raises the respective error
+                    dihedrals[i, j] = vectors.calculate_dihedral_angle(coords=xyzs[i]['coords'], torsion=torsion,
+                                                                       index=1)
+                conformer['torsion_dihedrals'][tuple(torsion)] = float(dihedrals[i, j])
     return conformers
 
 
+def get_dihedral_angle_matrix(xyzs: list,
+                              torsions: list,
+                              index: int = 1,
+                              ) -> np.ndarray:
+    """
+    Calculate the dihedral angles of all torsions in all conformers at once (as ``vectors.calculate_dihedral_angle()``).
+
+    Args:
+        xyzs (list): Entries are xyz dicts of conformers of the same species.
+        torsions (list): Entries are torsions, each is a list of four atom indices.
+        index (int, optional): Whether ``torsions`` are 0-indexed or 1-indexed (values are 0 or 1).
+
+    Returns:
+        np.ndarray: An M x K array of dihedral angles in degrees in a 0-360 range, M is the number of conformers and
+                    K is the number of torsions. Entries are ``nan`` if the dihedral angle is not defined.
+    """
+    return vectors.calculate_dihedral_angles(coords=xyzs, torsions=torsions, index=index)
+
+
 def determine_torsion_sampling_points(label, torsion_angles, smeared_scan_res=None, symmetry=1):
     """
     Determine how many points to consider in each well of a torsion for conformer combinations.
@@ -831,7 +1196,7 @@ def determine_torsion_sampling_points(label, torsion_angles, smeared_scan_res=No
         else:
             num = int(width / smeared_scan_res)
             padding = abs(mean - well['start_angle'] - ((num - 1) * smeared_scan_res) / 2)
-            sampling_points.extend([padding + well['angles'][0] + smeared_scan_res * j for j in range(int(num))])
+            sampling_points.extend((padding + well['angles'][0] + smeared_scan_res * np.arange(num)).tolist())
         if symmetry > 1 and i == len(wells) / symmetry - 1:
             break
     return sampling_points, wells
@@ -942,6 +1307,8 @@ def get_lowest_confs(label: str,
                      ) -> list:
     """
     Get the most stable conformer
+    Conformers are considered in an increasing energy order, and ones with almost equal distance matrices to an already
+    selected conformer are pruned (using distance matrix fingerprints, see ``index_unique_fingerprint()``).
 
     Args:
         label (str): The species' label.
@@ -981,17 +1348,73 @@ def get_lowest_confs(label: str,
 
     conformer_list.sort(key=lambda conformer: conformer[energy], reverse=False)
     if e is not None:
-        min_e = min([conf[energy] for conf in conformer_list])
-    lowest_confs = [conformer_list[0]]
-    for index in range(len(conformer_list)):
-        if (e is not None and conformer_list[index][energy] > min_e + e) or (n is not None and len(lowest_confs) >= n):
-            break
-        if index > 0 and not any([converter.compare_confs(lowest_conf['xyz'], conformer_list[index]['xyz'])
-                                  for lowest_conf in lowest_confs]):
-            lowest_confs.append(conformer_list[index])
+        min_e = conformer_list[0][energy]
+        conformer_list = [conformer for conformer in conformer_list if conformer[energy] <= min_e + e]
+    if len(conformer_list) == 1 or (n is not None and n <= 1):
+        return [conformer_list[0]]
+    lowest_confs, fingerprints, fingerprint_sums = list(), list(), list()
+    for start in range(0, len(conformer_list), FINGERPRINT_CHUNK_SIZE):
+        chunk = conformer_list[start:start + FINGERPRINT_CHUNK_SIZE]
+        for conformer, fingerprint in zip(chunk, get_distance_matrix_fingerprints([conf['xyz'] for conf in chunk])):
+            if index_unique_fingerprint(fingerprint, fingerprints, fingerprint_sums):
+                lowest_confs.append(conformer)
+                if n is not None and len(lowest_confs) >= n:
+                    return lowest_confs
     return lowest_confs
 
 
+def get_distance_matrix_fingerprints(xyzs: list) -> np.ndarray:
+    """
+    Get distance matrix fingerprints of conformers, i.e., their flattened upper triangle interatomic distances.
+    The coordinates of all conformers are stacked into a single array, and all distances are computed at once.
+
+    Args:
+        xyzs (list): Entries are xyz coordinates of conformers of the same species, each in a dict or a string format.
+
+    Returns:
+        np.ndarray: An M x N(N-1)/2 array, M is the number of conformers and N is the number of atoms.
+    """
+    coords = np.array([converter.xyz_to_coords_array(xyz) for xyz in xyzs], dtype=np.float64)
+    i, j = np.triu_indices(coords.shape[1], k=1)
+    return np.linalg.norm(coords[:, i, :] - coords[:, j, :], axis=2)
+
+
+def index_unique_fingerprint(fingerprint: np.ndarray,
+                             fingerprints: list,
+                             fingerprint_sums: list,
+                             rtol: float = 1e-5,
+                             atol: float = 1e-5,
+                             ) -> bool:
+    """
+    Add a distance matrix fingerprint to a fingerprint index if it is unique.
+    The fingerprint is unique if no indexed fingerprint is almost equal to it element-wise, using the tolerances
+    of ``converter.compare_confs()``. The index is sorted by the fingerprint sums: Almost equal fingerprints have sums
+    which differ by at most ``fingerprint.size * atol + rtol * sum(fingerprint)``, so only fingerprints within this
+    sum window are compared (in a single vectorized comparison).
+
+    Args:
+        fingerprint (np.ndarray): The fingerprint to add.
+        fingerprints (list): The indexed fingerprints, modified in place.
+        fingerprint_sums (list): The sorted sums of the indexed fingerprints, modified in place.
+        rtol (float, optional): The relative tolerance parameter.
+        atol (float, optional): The absolute tolerance parameter.
+
+    Returns:
+        bool: Whether the fingerprint is unique (and was added to the index).
+    """
+    total = float(fingerprint.sum())
+    window = fingerprint.size * atol + rtol * total
+    start = bisect.bisect_left(fingerprint_sums, total - window)
+    stop = bisect.bisect_right(fingerprint_sums, total + window)
+    if stop > start and np.any(np.all(np.abs(np.array(fingerprints[start:stop]) - fingerprint)
+                                      <= atol + rtol * np.abs(fingerprint), axis=1)):
+        return False
+    position = bisect.bisect_right(fingerprint_sums, total)
+    fingerprints.insert(position, fingerprint)
+    fingerprint_sums.insert(position, total)
+    return True
+
+
 def get_torsion_angles(label, conformers, torsions):
     """
     Populate each torsion pivots with all available angles from the generated conformers
@@ -1004,19 +1427,42 @@ def get_torsion_angles(label, conformers, torsions):
     Returns:
         dict: The torsion angles. Keys are torsion tuples, values are lists of all corresponding angles from conformers.
     """
-    torsion_angles = dict()
+    angle_matrix, torsion_indices = get_torsion_angle_matrix(label, conformers, torsions)
+    if not angle_matrix.shape[0]:
+        return dict()
+    angle_matrix = np.sort(angle_matrix, axis=0)
+    return {torsion: angle_matrix[:, j].tolist() for torsion, j in torsion_indices.items()}
+
+
+def get_torsion_angle_matrix(label: str,
+                             conformers: list,
+                             torsions: list,
+                             ) -> (np.ndarray, dict):
+    """
+    Get the torsion angles of all conformers (which have torsion dihedrals) as a matrix.
+
+    Args:
+        label (str): The species' label.
+        conformers (list): The conformers from which to extract the angles.
+        torsions (list): The torsions to consider.
+
+    Raises:
+        ConformerError: If no conformer has torsion dihedrals.
+
+    Returns:
+        np.ndarray: The M x K torsion angles matrix, M is the number of conformers and K is the number of torsions.
+    Returns:
+        dict: Keys are torsion tuples, values are the respective column indices in the matrix.
+    """
     if len(conformers) and not any(['torsion_dihedrals' in conformer for conformer in conformers]):
         raise ConformerError(f'Could not determine dihedral torsion angles for {label}. '
                              f'Consider calling `determine_dihedrals()` first.')
-    for conformer in conformers:
-        if 'torsion_dihedrals' in conformer and conformer['torsion_dihedrals']:
-            for torsion in torsions:
-                if tuple(torsion) not in torsion_angles:
-                    torsion_angles[tuple(torsion)] = list()
-                torsion_angles[tuple(torsion)].append(conformer['torsion_dihedrals'][tuple(torsion)])
-    for tor in torsion_angles.keys():
-        torsion_angles[tor].sort()
-    return torsion_angles
+    torsion_indices = {tuple(torsion): j for j, torsion in enumerate(torsions)}
+    angle_matrix = np.array([[conformer['torsion_dihedrals'][torsion] for torsion in torsion_indices.keys()]
+                             for conformer in conformers
+                             if 'torsion_dihedrals' in conformer and conformer['torsion_dihedrals']],
+                            dtype=float).reshape(-1, len(torsion_indices))
+    return angle_matrix, torsion_indices
 
 
 def get_force_field_energies(label: str,
@@ -1026,7 +1472,10 @@ def get_force_field_energies(label: str,
                              force_field: str = 'MMFF94s',
                              optimize: bool = True,
                              try_ob: bool = True,
-                             suppress_warning: bool = False) -> (list, list):
+                             suppress_warning: bool = False,
+                             max_workers: int = 1,
+                             random_seed: int = 1,
+                             ) -> (list, list):
     """
     Determine force field energies using RDKit.
     If ``num_confs`` is given, random 3D geometries will be generated. If xyz is given, it will be directly used instead.
@@ -1041,6 +1490,9 @@ def get_force_field_energies(label: str,
         optimize (bool, optional): Whether to first optimize the conformer using FF. True to optimize.
         try_ob (bool, optional): Whether to try OpenBabel if RDKit fails. ``True`` to try, ``True`` by default.
         suppress_warning (bool, optional): Wheter to suppress warning of using OpenBabel. ``True`` to suppress, ``False`` by default.
+        max_workers (int, optional): The max number of local threads and processes to use for embedding and optimizing
+                                     random conformers. The results do not depend on this number.
+        random_seed (int, optional): The seed for embedding random conformers.
 
     Raises:
         ConformerError: If conformers could not be generated.
@@ -1052,8 +1504,10 @@ def get_force_field_energies(label: str,
     """
     xyzs, energies = list(), list()
     if force_field.lower() in ['mmff94', 'mmff94s', 'uff']:
-        rd_mol = embed_rdkit(label, mol, num_confs=num_confs, xyz=xyz)
-        xyzs, energies = rdkit_force_field(label, rd_mol, force_field=force_field, optimize=optimize)
+        rd_mol = embed_rdkit(label, mol, num_confs=num_confs, xyz=xyz, num_threads=max_workers,
+                             random_seed=random_seed)
+        xyzs, energies = rdkit_force_field(label, rd_mol, force_field=force_field, optimize=optimize,
+                                           max_workers=max_workers)
     if not len(xyzs) and force_field.lower() in ['gaff', 'mmff94', 'mmff94s', 'uff', 'ghemical'] and try_ob:
         if not suppress_warning:
             logger.warning(f'Using OpenBabel instead of RDKit as a fall back method to generate conformers for {label}. '
@@ -1068,6 +1522,67 @@ def get_force_field_energies(label: str,
     return xyzs, energies
 
 
+def get_force_field_energies_adaptively(label: str,
+                                        mol: Molecule,
+                                        max_num_confs: int,
+                                        wall_time: float,
+                                        force_field: str = 'MMFF94s',
+                                        max_workers: int = 1,
+                                        ) -> (list, list):
+    """
+    Embed random conformers and determine their force field energies in batches (each with a different seed),
+    until a batch is not expected to finish within the wall time budget (the per conformer cost is measured
+    on the fly), until ``ADAPTIVE_EMBED_PATIENCE`` consecutive batches found no new unique conformers
+    within ``DE_THRESHOLD`` of the lowest conformer, or until ``max_num_confs`` conformers were embedded.
+    At least one batch is always embedded.
+
+    Args:
+        label (str): The species' label.
+        mol (Molecule): The RMG molecule object with connectivity and bond order information.
+        max_num_confs (int): The max number of random 3D conformations to generate.
+        wall_time (float): The wall time budget in seconds.
+        force_field (str, optional): The type of force field to use.
+        max_workers (int, optional): The max number of local threads and processes to use.
+
+    Returns:
+        list: Entries are xyz coordinates, each in a dict format.
+    Returns:
+        list: Entries are the FF energies (in kJ/mol).
+    """
+    t0 = time.time()
+    xyzs, energies, fingerprints, fingerprint_sums = list(), list(), list(), list()
+    num_embedded, batch, stale_batches = 0, 0, 0
+    while num_embedded < max_num_confs and stale_batches < ADAPTIVE_EMBED_PATIENCE:
+        num_confs = min(ADAPTIVE_EMBED_BATCH_SIZE, max_num_confs - num_embedded)
+        elapsed = time.time() - t0
+        if batch and elapsed + num_confs * elapsed / num_embedded > wall_time:
+            logger.info(f'Stopped embedding conformers for {label} after {num_embedded} conformers '
+                        f'due to the wall time budget of {wall_time:.1f} s.')
+            break
+        batch += 1
+        batch_xyzs, batch_energies = get_force_field_energies(label, mol, num_confs=num_confs,
+                                                              force_field=force_field, max_workers=max_workers,
+                                                              random_seed=batch, suppress_warning=batch > 1)
+        num_embedded += num_confs
+        xyzs.extend(batch_xyzs)
+        energies.extend(batch_energies)
+        if not batch_energies:
+            break
+        min_energy = min(energies)
+        new_low_conformers = 0
+        for fingerprint, energy in zip(get_distance_matrix_fingerprints(batch_xyzs), batch_energies):
+            if index_unique_fingerprint(fingerprint, fingerprints, fingerprint_sums,
+                                        rtol=0, atol=ADAPTIVE_EMBED_DISTANCE_TOL) \
+                    and energy - min_energy <= DE_THRESHOLD:
+                new_low_conformers += 1
+        stale_batches = stale_batches + 1 if not new_low_conformers else 0
+    else:
+        if stale_batches:
+            logger.debug(f'Stopped embedding conformers for {label} after {num_embedded} conformers, '
+                         f'no new low energy conformers were found.')
+    return xyzs, energies
+
+
 def openbabel_force_field_on_rdkit_conformers(label, rd_mol, force_field='MMFF94s', optimize=True):
     """
     Optimize RDKit conformers by OpenBabel using a force field (MMFF94 or MMFF94s are recommended).
@@ -1261,14 +1776,15 @@ def openbabel_force_field(label, mol, num_confs=None, xyz=None, force_field='GAF
         xyz_str = '\n'.join(obconversion.WriteString(obmol).splitlines()[2:])
         xyz_dict = converter.str_to_xyz(xyz_str)
         # reorder:
-        xyz_dict['coords'] = tuple(xyz_dict['coords'][ob_atom_ids[mol.atoms[j]]]
-                                   for j in range(len(xyz_dict['coords'])))
+        order = [ob_atom_ids[mol.atoms[j]] for j in range(len(xyz_dict['symbols']))]
+        xyz_dict = converter.XYZ(symbols=xyz_dict['symbols'], isotopes=xyz_dict['isotopes'],
+                                 coords=xyz_dict.array[order])
         xyzs.append(xyz_dict)
         energies.append(ff.Energy())
     return xyzs, energies
 
 
-def embed_rdkit(label, mol, num_confs=None, xyz=None):
+def embed_rdkit(label, mol, num_confs=None, xyz=None, num_threads=1, random_seed=1):
     """
     Generate unoptimized conformers in RDKit. If ``xyz`` is not given, random conformers will be generated.
 
@@ -1277,6 +1793,9 @@ def embed_rdkit(label, mol, num_confs=None, xyz=None):
         mol (RMG Molecule or RDKit RDMol): The molecule object with connectivity and bond order information.
         num_confs (int, optional): The number of random 3D conformations to generate.
         xyz (dict, optional): The 3D coordinates.
+        num_threads (int, optional): The number of threads RDKit uses to embed random conformers.
+                                     The (seeded) conformers do not depend on this number.
+        random_seed (int, optional): The seed for embedding random conformers.
 
     Returns:
         RDMol: An RDKIt molecule with embedded conformers.
@@ -1291,7 +1810,8 @@ def embed_rdkit(label, mol, num_confs=None, xyz=None):
         raise ConformerError(f'Argument mol can be either an RMG Molecule or an RDKit RDMol object. '
                              f'Got {type(mol)} for {label}')
     if num_confs is not None:
-        Chem.AllChem.EmbedMultipleConfs(rd_mol, numConfs=num_confs, randomSeed=1, enforceChirality=True)
+        Chem.AllChem.EmbedMultipleConfs(rd_mol, numConfs=num_confs, randomSeed=random_seed, enforceChirality=True,
+                                        numThreads=num_threads or 1)
         # Chem.AllChem.EmbedMultipleConfs(rd_mol, numConfs=num_confs, randomSeed=15, enforceChirality=False)
     elif xyz is not None:
         rd_conf = Chem.Conformer(rd_mol.GetNumAtoms())
@@ -1355,15 +1875,17 @@ def read_rdkit_embedded_conformer_i(rd_mol, i, rd_index_map=None):
     return xyz_dict
 
 
-def rdkit_force_field(label, rd_mol, force_field='MMFF94s', optimize=True):
+def rdkit_force_field(label, rd_mol, force_field='MMFF94s', optimize=True, max_workers=1):
     """
     Optimize RDKit conformers using a force field (MMFF94 or MMFF94s are recommended).
+    If ``max_workers`` is greater than 1, the conformers are optimized in local processes (``rd_mol`` is not modified).
 
     Args:
         label (str): The species' label.
         rd_mol (RDKit RDMol): The RDKit molecule with embedded conformers to optimize.
         force_field (str, optional): The type of force field to use.
         optimize (bool, optional): Whether to first optimize the conformer using FF. True to optimize.
+        max_workers (int, optional): The max number of local processes to use.
 
     Returns:
         list: Entries are optimized xyz's in a dictionary format.
@@ -1371,6 +1893,21 @@ def rdkit_force_field(label, rd_mol, force_field='MMFF94s', optimize=True):
         list: Entries are float numbers representing the energies.
     """
     xyzs, energies = list(), list()
+    if max_workers is not None and max_workers > 1 and rd_mol.GetNumConformers() > 1:
+        chunk_mols = list()
+        for conf_ids in split_into_chunks(list(range(rd_mol.GetNumConformers())), max_workers):
+            chunk_mol = Chem.Mol(rd_mol)
+            chunk_mol.RemoveAllConformers()
+            for i in conf_ids:
+                chunk_mol.AddConformer(Chem.Conformer(rd_mol.GetConformer(i)), assignId=True)
+            chunk_mols.append(chunk_mol)
+        results = map_in_process_pool(func=rdkit_force_field,
+                                      args_list=[(label, chunk_mol, force_field, optimize) for chunk_mol in chunk_mols],
+                                      max_workers=max_workers)
+        for chunk_xyzs, chunk_energies in results:
+            xyzs.extend(chunk_xyzs)
+            energies.extend(chunk_energies)
+        return xyzs, energies
     for i in range(rd_mol.GetNumConformers()):
         if optimize:
             v, j = 1, 0
@@ -1399,38 +1936,28 @@ def get_wells(label, angles, blank=20):
     Returns:
         list: Entry are well dicts with keys: ``start_idx``, ``end_idx``, ``start_angle``, ``end_angle``, ``angles``.
     """
-    if not angles:
+    if not len(angles):
         raise ConformerError(f'Cannot determine wells without angles for {label}')
-    new_angles = angles
-    if angles[0] < 0 + blank and angles[-1] > 360 - blank:
+    new_angles = np.array(angles)
+    # the indices of the last points of wells (the gaps between consecutive angles are larger than the blank)
+    gaps = np.flatnonzero(np.abs(np.diff(new_angles)) > blank)
+    if new_angles[0] < 0 + blank and new_angles[-1] > 360 - blank and gaps.size:
         # relocate the first chunk of data at the end, the well seems to include the  +180/-180 degrees point
-        for i, angle in enumerate(angles):
-            if i > 0 and abs(angle - angles[i - 1]) > blank:
-                part2 = angles[:i]
-                for j, _ in enumerate(part2):
-                    part2[j] += 360
-                new_angles = angles[i:] + part2
-                break
+        new_angles = np.concatenate((new_angles[gaps[0] + 1:], new_angles[:gaps[0] + 1] + 360))
+        gaps = np.flatnonzero(np.abs(np.diff(new_angles)) > blank)
+    if new_angles.size < 2:
+        return list()
+    # a last well with a single point is merged into the previous well
+    end_indices = gaps[gaps < new_angles.size - 2].tolist() + [new_angles.size - 1]
+    start_indices = [0] + [end_idx + 1 for end_idx in end_indices[:-1]]
+    new_angles = new_angles.tolist()
     wells = list()
-    new_well = True
-    for i in range(len(new_angles) - 1):
-        if new_well:
-            wells.append({'start_idx': i,
-                          'end_idx': None,
-                          'start_angle': new_angles[i],
-                          'end_angle': None,
-                          'angles': list()})
-            new_well = False
-        wells[-1]['angles'].append(new_angles[i])
-        if abs(new_angles[i + 1] - new_angles[i]) > blank:
-            # This is the last point in this well
-            wells[-1]['end_idx'] = i
-            wells[-1]['end_angle'] = new_angles[i]
-            new_well = True
-    if len(wells):
-        wells[-1]['end_idx'] = len(new_angles) - 1
-        wells[-1]['end_angle'] = new_angles[-1]
-        wells[-1]['angles'].append(new_angles[-1])
+    for start_idx, end_idx in zip(start_indices, end_indices):
+        wells.append({'start_idx': start_idx,
+                      'end_idx': end_idx,
+                      'start_angle': new_angles[start_idx],
+                      'end_angle': new_angles[end_idx],
+                      'angles': new_angles[start_idx:end_idx + 1]})
     return wells
 
 
@@ -1744,7 +2271,7 @@ def get_number_of_chiral_centers(label, mol, conformer=None, xyz=None, just_get_
     return result
 
 
-def get_lowest_diastereomers(label, mol, conformers, diastereomers=None):
+def get_lowest_diastereomers(label, mol, conformers, diastereomers=None, max_workers=1):
     """
     Get the 2^(n-1) diastereomers with the lowest energy (where n is the number of chiral centers in the molecule).
     We exclude enantiomers (mirror images where ALL chiral centers simultaneously invert).
@@ -1757,6 +2284,7 @@ def get_lowest_diastereomers(label, mol, conformers, diastereomers=None):
         conformers (list): Entries are conformer dictionaries.
         diastereomers (list, optional): Entries are xyz's in a dictionary format or conformer structures
                                         representing specific diastereomers to keep.
+        max_workers (int, optional): The max number of local processes to use for perceiving chirality.
 
     Returns:
         list: Entries are lowest energy diastereomeric conformer dictionaries to consider.
@@ -1766,14 +2294,14 @@ def get_lowest_diastereomers(label, mol, conformers, diastereomers=None):
                         or if conformers with the requested chirality combination could not be generated.
     """
     # assign chirality properties to all conformers
-    conformers = determine_chirality(conformers, label, mol)
+    conformers = determine_chirality(conformers, label, mol, max_workers=max_workers)
     # initialize the enantiomeric dictionary (includes enantiomers and diastereomers)
     # keys are chiral combinations, values are lowest conformers
     enantiomers_dict = dict()
     for conformer in conformers:
         if conformer['FF energy'] is not None:
             chirality_tuple = chirality_dict_to_tuple(conformer['chirality'])
-            if chirality_tuple not in list(enantiomers_dict.keys()):
+            if chirality_tuple not in enantiomers_dict:
                 # this is a new enantiomer, consider it
                 enantiomers_dict[chirality_tuple] = conformer
             elif conformer['FF energy'] < enantiomers_dict[chirality_tuple]['FF energy']:
@@ -1800,9 +2328,10 @@ def get_lowest_diastereomers(label, mol, conformers, diastereomers=None):
         else:
             raise ConformerError(f'diastereomers must be a list of xyz coordinates, got: {type(diastereomers)}')
         chirality_tuples = [chirality_dict_to_tuple(conformer['chirality']) for conformer in diastereomer_confs]
+        chirality_tuples_set = set(chirality_tuples)
         new_enantiomers_dict = dict()
         for chirality_tuple, conformer in enantiomers_dict.items():
-            if chirality_tuple in chirality_tuples:
+            if chirality_tuple in chirality_tuples_set:
                 new_enantiomers_dict[chirality_tuple] = conformer
         if not new_enantiomers_dict:
             raise ConformerError(f'Could not generate conformers with chirality combination:\n{chirality_tuples}')
@@ -1832,7 +2361,7 @@ def prune_enantiomers_dict(label, enantiomers_dict):
                                            for chirality_tuple in chirality_tuples])
         if chirality_tuples not in pruned_enantiomers_dict and inversed_chirality_tuples not in pruned_enantiomers_dict:
             # this combination (or its exact mirror image) was not considered yet
-            if inversed_chirality_tuples in list(enantiomers_dict.keys()):
+            if inversed_chirality_tuples in enantiomers_dict:
                 # the mirror image exists, check which has a lower energy
                 inversed_conformer = enantiomers_dict[inversed_chirality_tuples]
                 if inversed_conformer['FF energy'] is None and conformer['FF energy'] is None:
@@ -1910,16 +2439,19 @@ def chirality_dict_to_tuple(chirality_dict):
     return tuple(result)
 
 
-def determine_chirality(conformers, label, mol, force=False):
+def determine_chirality(conformers, label, mol, force=False, max_workers=1):
     """
     Determines the Cahn–Ingold–Prelog (CIP) chirality (R or S) of atoms in the conformer,
     as well as the CIP chirality of double bonds (E or Z).
+    The chirality of all conformers is perceived in a single batch (see ``perceive_chirality()``),
+    which is spread across local processes if ``max_workers`` is greater than 1.
 
     Args:
         conformers (list): Entries are conformer dictionaries.
         label (str): The species' label.
         mol (RMG Molecule or RDKit RDMol): The molecule object with connectivity and bond order information.
         force (bool, optional): Whether to override data, ``True`` to override, default is ``False``.
+        max_workers (int, optional): The max number of local processes to use.
 
     Returns:
         list: Conformer dictionaries with updated with 'chirality'. ``conformer['chirality']`` is a dictionary.
@@ -1928,8 +2460,7 @@ def determine_chirality(conformers, label, mol, force=False):
               (or 'NR' or 'NS' for chiral nitrogen centers), or 'E' or 'Z' for chiral double bonds.
               All atom indices are 0-indexed.
     """
-    chiral_nitrogen_centers = identify_chiral_nitrogen_centers(mol)
-    new_mol, elements_to_insert = replace_n_with_c_in_mol(mol, chiral_nitrogen_centers)
+    new_conformers = list()
     for conformer in conformers:
         if 'chirality' not in conformer:
             # keys are either 1-length atom indices (for chiral atom centers)
@@ -1939,24 +2470,67 @@ def determine_chirality(conformers, label, mol, force=False):
         elif conformer['chirality'] != dict() and not force:
             # don't override data
             continue
-        new_xyz = replace_n_with_c_in_xyz(label, mol, conformer['xyz'], chiral_nitrogen_centers, elements_to_insert)
-        rd_mol = embed_rdkit(label, new_mol, xyz=new_xyz)
+        new_conformers.append(conformer)
+    if not new_conformers:
+        return conformers
+    xyzs = [conformer['xyz'] for conformer in new_conformers]
+    if max_workers is not None and max_workers > 1 and len(xyzs) > 1:
+        chiralities = [chirality for chunk_chiralities in
+                       map_in_process_pool(func=perceive_chirality,
+                                           args_list=[(label, mol, chunk)
+                                                      for chunk in split_into_chunks(xyzs, max_workers)],
+                                           max_workers=max_workers)
+                       for chirality in chunk_chiralities]
+    else:
+        chiralities = perceive_chirality(label, mol, xyzs)
+    for conformer, chirality in zip(new_conformers, chiralities):
+        conformer['chirality'].update(chirality)
+    return conformers
+
+
+def perceive_chirality(label, mol, xyzs):
+    """
+    Perceive the CIP chirality of atoms and double bonds in conformers of a molecule.
+    A helper function for ``determine_chirality()``. The molecule is converted to RDKit once,
+    and the chirality of each conformer is assigned from 3D on a copy of this RDKit molecule.
+
+    Args:
+        label (str): The species' label.
+        mol (Molecule): The molecule object with connectivity and bond order information.
+        xyzs (list): Entries are xyz dictionaries of conformers.
+
+    Returns:
+        list: Entries are chirality dictionaries (see ``determine_chirality()``) respectively corresponding to ``xyzs``.
+    """
+    chiral_nitrogen_centers = identify_chiral_nitrogen_centers(mol)
+    new_mol, elements_to_insert = replace_n_with_c_in_mol(mol, chiral_nitrogen_centers)
+    base_rd_mol = converter.to_rdkit_mol(mol=new_mol, remove_h=False)
+    nitrogen_indices = [i for i, atom in enumerate(mol.atoms) if atom.is_nitrogen()]
+    chiralities = list()
+    for xyz in xyzs:
+        chirality = dict()
+        new_xyz = replace_n_with_c_in_xyz(label, mol, xyz, chiral_nitrogen_centers, elements_to_insert)
+        rd_mol = Chem.Mol(base_rd_mol)
+        rd_conf = Chem.Conformer(rd_mol.GetNumAtoms())
+        for i in range(rd_mol.GetNumAtoms()):
+            rd_conf.SetAtomPosition(i, new_xyz['coords'][i])
+        rd_mol.AddConformer(rd_conf)
         Chem.rdmolops.AssignStereochemistryFrom3D(rd_mol, 0)
         for i, rd_atom in enumerate(rd_mol.GetAtoms()):
-            rd_atom_props_dict = rd_atom.GetPropsAsDict()
-            if '_CIPCode' in list(rd_atom_props_dict.keys()):
-                if mol.atoms[i].is_nitrogen():
+            if rd_atom.HasProp('_CIPCode'):
+                if i in nitrogen_indices:
                     # this is a nitrogen site in the original molecule, mark accordingly
-                    conformer['chirality'][(i,)] = 'N' + rd_atom_props_dict['_CIPCode']
+                    chirality[(i,)] = 'N' + rd_atom.GetProp('_CIPCode')
                 else:
-                    conformer['chirality'][(i,)] = rd_atom_props_dict['_CIPCode']
+                    chirality[(i,)] = rd_atom.GetProp('_CIPCode')
         for rd_bond in rd_mol.GetBonds():
             stereo = str(rd_bond.GetStereo())
             if stereo in ['STEREOE', 'STEREOZ']:
                 # possible values are 'STEREOANY', 'STEREOCIS', 'STEREOE', 'STEREONONE', 'STEREOTRANS', and 'STEREOZ'
                 rd_atoms = [rd_bond.GetBeginAtomIdx(), rd_bond.GetEndAtomIdx()]  # indices of atoms bonded by this bond
-                conformer['chirality'][tuple(rd_atom for rd_atom in rd_atoms)] = stereo[-1]
-    return conformers
+                chirality[tuple(rd_atom for rd_atom in rd_atoms)] = stereo[-1]
+        chiralities.append(chirality)
+    return chiralities
 
 
 def identify_chiral_nitrogen_centers(mol):
@@ -2163,3 +2737,479 @@ def initialize_log(verbose=logging.INFO):
     ch.setLevel(verbose)
     ch.setFormatter(formatter)
     logger.addHandler(ch)
+
+
+def split_into_chunks(entries, max_workers):
+    """
+    Split a list into contiguous chunks (preserving the order of entries) to be distributed between worker processes.
+
+    Args:
+        entries (list): The entries to split.
+        max_workers (int): The max number of worker processes.
+
+    Returns:
+        list: Entries are non-empty lists, their concatenation is ``entries``.
+    """
+    num_chunks = max(1, min(len(entries), max_workers * CHUNKS_PER_WORKER))
+    chunk_size, remainder = divmod(len(entries), num_chunks)
+    chunks, start = list(), 0
+    for i in range(num_chunks):
+        stop = start + chunk_size + (1 if i < remainder else 0)
+        chunks.append(list(entries[start:stop]))
+        start = stop
+    return [chunk for chunk in chunks if chunk]
+
+
+def map_in_process_pool(func, args_list, max_workers=1):
+    """
+    Call a function with each tuple of positional arguments in ``args_list`` using a pool of local processes.
+    The results are returned in the order of ``args_list``, identical to calling the function serially.
+    Falls back to a serial execution if ``max_workers`` is not greater than 1, if this process is daemonic,
+    or if the pool breaks.
+
+    Args:
+        func (function): A module-level (picklable) function.
+        args_list (list): Entries are tuples of positional arguments for ``func``.
+        max_workers (int, optional): The max number of local processes to use.
+
+    Returns:
+        list: The results of the function calls.
+    """
+    args_list = list(args_list)
+    if max_workers is None or max_workers <= 1 or len(args_list) < 2 or multiprocessing.current_process().daemon:
+        # daemonic processes (e.g., process pool workers in Python < 3.9) are not allowed to have child processes
+        return [func(*args) for args in args_list]
+    key = (os.getpid(), max_workers)
+    if key not in _process_pools:
+        _process_pools[key] = ProcessPoolExecutor(max_workers=max_workers,
+                                                  mp_context=multiprocessing.get_context(PROCESS_START_METHOD))
+    try:
+        return list(_process_pools[key].map(func, *zip(*args_list)))
+    except BrokenProcessPool as e:
+        logger.warning(f'A force field worker process terminated abruptly ({e}), running serially instead.')
+        _process_pools.pop(key).shutdown(wait=False)
+        return [func(*args) for args in args_list]
+
+
+@atexit.register
+def shutdown_process_pools():
+    """
+    Shut down all process pools created by this process. Called automatically when the process exits.
+    """
+    for key in list(_process_pools.keys()):
+        pool = _process_pools.pop(key)
+        if key[0] == os.getpid():
+            pool.shutdown(wait=True)
+
+
+def initialize_conformer_generation_process(force_field_cache_path=None, log_queue=None, verbose=logging.INFO):
+    """
+    Initialize a background process for generating conformers (an initializer of a ``ProcessPoolExecutor``).
+    Processes started using 'forkserver' or 'spawn' re-import this module, so the force field cache file path
+    set in the parent process is set here again, and log records are sent to the parent process
+    (which should handle them using a ``logging.handlers.QueueListener``).
+
+    Args:
+        force_field_cache_path (str, optional): The force field cache database file path.
+        log_queue (multiprocessing.Queue, optional): A queue to send log records to.
+        verbose (int, optional): Specify the amount of log text sent.
+    """
+    force_field_cache.set_path(force_field_cache_path)
+    if log_queue is not None:
+        initialize_log(verbose=verbose)  # also sets ARC's level names
+        while logger.handlers:
+            logger.removeHandler(logger.handlers[0])
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+class RDKitConformerWorkspace(object):
+    """
+    A persistent RDKit molecule tied to an RMG Molecule, holding multiple conformers.
+    Dihedral changes, force field setup and energy evaluations are done in place on the conformers of this molecule,
+    so the RMG Molecule is converted to RDKit and typed by the force field only once
+    (rather than per dihedral change or per force field optimization).
+    The atom order of the RDKit molecule is the atom order of the RMG Molecule.
+
+    Args:
+        mol (Molecule): The RMG molecule with the connectivity information.
+        force_field (str, optional): The type of force field to use.
+
+    Attributes:
+        mol (Molecule): The RMG molecule with the connectivity information.
+        force_field (str): The type of force field to use.
+        rd_mol (RDMol): The RDKit molecule holding the conformers.
+        symbols (tuple): The chemical element symbols of the atoms.
+        isotopes (tuple): The most common isotopes of the atoms.
+    """
+
+    def __init__(self,
+                 mol: Molecule,
+                 force_field: str = 'MMFF94s',
+                 ):
+        self.mol = mol
+        self.force_field = force_field
+        self.rd_mol = converter.to_rdkit_mol(mol=mol, remove_h=False)
+        self.symbols = tuple(rd_atom.GetSymbol() for rd_atom in self.rd_mol.GetAtoms())
+        self.isotopes = tuple(converter.get_most_common_isotope_for_element(symbol) for symbol in self.symbols)
+        self._mol_properties, self._mol_properties_set = None, False
+
+    @property
+    def mol_properties(self):
+        """
+        The MMFF molecule properties (atom types and charges), set up once on demand.
+        ``None`` if the force field isn't MMFF94 or MMFF94s, or if the molecule could not be typed.
+        """
+        if not self._mol_properties_set:
+            self._mol_properties_set = True
+            if self.force_field.lower() in ['mmff94', 'mmff94s']:
+                self._mol_properties = Chem.AllChem.MMFFGetMoleculeProperties(self.rd_mol,
+                                                                              mmffVariant=self.force_field)
+        return self._mol_properties
+
+    def add_conformer(self, xyz: dict) -> int:
+        """
+        Add a conformer to the workspace.
+
+        Args:
+            xyz (dict): The coordinates, atoms must be ordered as in ``mol``.
+
+        Returns:
+            int: The conformer ID.
+        """
+        rd_conf = Chem.Conformer(self.rd_mol.GetNumAtoms())
+        for i, coord in enumerate(xyz['coords']):
+            rd_conf.SetAtomPosition(i, coord)
+        return self.rd_mol.AddConformer(rd_conf, assignId=True)
+
+    def copy_conformer(self, conf_id: int) -> int:
+        """
+        Add a copy of a conformer to the workspace.
+
+        Args:
+            conf_id (int): The ID of the conformer to copy.
+
+        Returns:
+            int: The ID of the new conformer.
+        """
+        return self.rd_mol.AddConformer(Chem.Conformer(self.rd_mol.GetConformer(conf_id)), assignId=True)
+
+    def remove_conformer(self, conf_id: int):
+        """
+        Remove a conformer from the workspace.
+
+        Args:
+            conf_id (int): The conformer ID.
+        """
+        self.rd_mol.RemoveConformer(conf_id)
+
+    def get_dihedral(self, conf_id: int, torsion: list) -> float:
+        """
+        Get a dihedral angle of a conformer.
+
+        Args:
+            conf_id (int): The conformer ID.
+            torsion (list): The 0-indexed atom indices of the four atoms defining the torsion.
+
+        Returns:
+            float: The dihedral angle in degrees.
+        """
+        return rdMT.GetDihedralDeg(self.rd_mol.GetConformer(conf_id), *torsion)
+
+    def set_dihedral(self, conf_id: int, torsion: list, dihedral: float):
+        """
+        Set a dihedral angle of a conformer in place, the atoms on the side of the last torsion atom are rotated.
+
+        Args:
+            conf_id (int): The conformer ID.
+            torsion (list): The 0-indexed atom indices of the four atoms defining the torsion.
+            dihedral (float): The dihedral angle to set in degrees.
+        """
+        rdMT.SetDihedralDeg(self.rd_mol.GetConformer(conf_id), *torsion, dihedral)
+
+    def optimize(self, conf_id: int) -> Optional[float]:
+        """
+        Optimize a conformer in place using the force field, and get its energy.
+
+        Args:
+            conf_id (int): The conformer ID.
+
+        Returns:
+            Optional[float]: The force field energy, ``None`` if the force field could not be set up.
+        """
+        if self.mol_properties is None:
+            return None
+        ff = Chem.AllChem.MMFFGetMoleculeForceField(self.rd_mol, self.mol_properties, confId=conf_id,
+                                                    ignoreInterfragInteractions=False)
+        v, j = 1, 0
+        while v == 1 and j < 200:  # v == 1: continue, v == 0: enough steps
+            v = ff.Minimize(maxIts=500)
+            j += 1
+        return self.get_energy(conf_id)
+
+    def get_energy(self, conf_id: int) -> Optional[float]:
+        """
+        Get the force field energy of a conformer.
+
+        Args:
+            conf_id (int): The conformer ID.
+
+        Returns:
+            Optional[float]: The force field energy, ``None`` if the force field could not be set up.
+        """
+        if self.mol_properties is None:
+            return None
+        return Chem.AllChem.MMFFGetMoleculeForceField(self.rd_mol, self.mol_properties, confId=conf_id).CalcEnergy()
+
+    def get_xyz(self, conf_id: int) -> dict:
+        """
+        Get the coordinates of a conformer.
+
+        Args:
+            conf_id (int): The conformer ID.
+
+        Returns:
+            XYZ: The xyz coordinates.
+        """
+        coords = self.rd_mol.GetConformer(conf_id).GetPositions()
+        return converter.XYZ(symbols=self.symbols, isotopes=self.isotopes, coords=coords)
+
+
+class ForceFieldCache(object):
+    """
+    A least recently used (LRU) cache of force field results, so repeated force field optimizations
+    of the same geometry (e.g., the same dihedral combination on the same base conformer) are skipped.
+    Keys are hashes of the connectivity (an adjacency list in the atom order), the force field,
+    the rounded base coordinates, and the torsions with their rounded dihedral angles.
+    If a path is set, the cache is also backed by an SQLite database file, so results are shared between processes
+    and survive an ARC restart. Both the in-memory and the on-disk caches are limited in size,
+    least recently used entries are evicted first. New entries and the usage times of entries read from the file
+    are only written to the file on commit, in a single short transaction, so other processes aren't locked out.
+    If the file cannot be used (e.g., it is locked for too long), results are cached only in memory.
+
+    Args:
+        max_size (int, optional): The max number of entries to keep in memory.
+        max_disk_size (int, optional): The max number of entries to keep in the database file.
+        path (str, optional): The database file path, if ``None`` the cache is only kept in memory.
+
+    Attributes:
+        max_size (int): The max number of entries to keep in memory.
+        max_disk_size (int): The max number of entries to keep in the database file.
+        path (str): The database file path.
+        entries (OrderedDict): The in-memory entries, ordered from the least to the most recently used.
+        uncommitted (dict): Keys are cache keys of entries not yet written to the database file, values are results.
+        used (dict): Keys are cache keys of entries read from the database file, values are the times they were used.
+    """
+
+    def __init__(self,
+                 max_size: int = 20000,
+                 max_disk_size: int = 1000000,
+                 path: str = None,
+                 ):
+        self.max_size = max_size
+        self.max_disk_size = max_disk_size
+        self.path = path
+        self.entries = OrderedDict()
+        self.uncommitted = dict()
+        self.used = dict()
+        self._connection, self._connection_pid = None, None
+
+    def set_path(self, path: str = None):
+        """
+        Set the database file path (e.g., in the project directory). Pass ``None`` to only cache in memory.
+
+        Args:
+            path (str, optional): The database file path.
+        """
+        self.commit()
+        if self._connection is not None and self._connection_pid == os.getpid():
+            self._connection.close()
+        self._connection, self._connection_pid = None, None
+        self.path = path
+
+    @staticmethod
+    def get_mol_key(mol: Molecule) -> Optional[str]:
+        """
+        Get a key representing the connectivity of a molecule (respecting its atom order).
+
+        Args:
+            mol (Molecule): The RMG molecule.
+
+        Returns:
+            Optional[str]: The molecule key, ``None`` if ``mol`` is not an RMG Molecule.
+        """
+        if not isinstance(mol, Molecule):
+            return None
+        return mol.to_adjacency_list(remove_h=False, remove_lone_pairs=True)
+
+    @staticmethod
+    def get_key(mol_key: str,
+                force_field: str,
+                xyz: dict,
+                torsions: Optional[list] = None,
+                dihedrals: Optional[list] = None,
+                optimize: bool = True,
+                ) -> str:
+        """
+        Get a cache key.
+
+        Args:
+            mol_key (str): The molecule key, see ``get_mol_key()``.
+            force_field (str): The force field.
+            xyz (dict): The (base) coordinates.
+            torsions (list, optional): Entries are torsion tuples to set on the base coordinates.
+            dihedrals (list, optional): The dihedral angles to set, respectively corresponding to the torsions.
+            optimize (bool, optional): Whether the coordinates are optimized.
+
+        Returns:
+            str: The key.
+        """
+        coords = tuple(tuple(round(c, FF_CACHE_XYZ_DECIMALS) + 0.0 for c in coord) for coord in xyz['coords'])
+        if torsions is not None and dihedrals is not None:
+            torsions = tuple(tuple(torsion) for torsion in torsions)
+            # normalize after rounding as well, e.g., 359.999 is rounded to 360.0, which is the same as 0.0
+            dihedrals = tuple(float(round(dihedral % 360, FF_CACHE_DIHEDRAL_DECIMALS) % 360) for dihedral in dihedrals)
+        content = repr((mol_key, force_field.lower(), optimize, coords, torsions, dihedrals))
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def get(self, key: str):
+        """
+        Get a cached result.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            The cached result, ``None`` if it isn't cached.
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        connection = self._get_connection()
+        if connection is None:
+            return None
+        try:
+            row = connection.execute('SELECT content, coords FROM cache WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error as e:
+            self._disconnect(e)
+            return None
+        if row is None:
+            return None
+        self.used[key] = time.time()  # written to the file on commit, a read doesn't lock the file
+        result = serialization.decode_content(json_string=row[0], coords=np.frombuffer(row[1]).reshape(-1, 3))
+        self._add_to_memory(key, result)
+        return result
+
+    def set(self, key: str, result):
+        """
+        Cache a result.
+
+        Args:
+            key (str): The cache key.
+            result: The result to cache, must be serializable by ``arc.serialization.encode_content()``.
+        """
+        self._add_to_memory(key, result)
+        if self.path is not None:
+            self.uncommitted[key] = result
+            if len(self.uncommitted) >= FF_CACHE_COMMIT_INTERVAL:
+                self.commit()
+
+    def commit(self):
+        """
+        Write the new entries and the usage times of the entries read to the database file in a single transaction,
+        and evict the least recently used entries from the file if needed.
+        """
+        uncommitted, used = self.uncommitted, self.used
+        self.uncommitted, self.used = dict(), dict()
+        if not uncommitted and not used:
+            return
+        connection = self._get_connection()
+        if connection is None:
+            return
+        now = time.time()
+        rows = list()
+        for key, result in uncommitted.items():
+            json_string, coords = serialization.encode_content(result)
+            rows.append((key, json_string, coords.tobytes(), now))
+        try:
+            with connection:  # commits, or rolls back on an error, so the file is never left locked
+                connection.executemany('INSERT OR REPLACE INTO cache (key, content, coords, used) VALUES (?, ?, ?, ?)',
+                                       rows)
+                connection.executemany('UPDATE cache SET used = ? WHERE key = ?',
+                                       [(used_time, key) for key, used_time in used.items()])
+                number_of_entries = connection.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+                if number_of_entries > self.max_disk_size:
+                    connection.execute('DELETE FROM cache WHERE key IN '
+                                       '(SELECT key FROM cache ORDER BY used, rowid LIMIT ?)',
+                                       (number_of_entries - self.max_disk_size,))
+        except sqlite3.Error as e:
+            self._disconnect(e)
+
+    def clear(self):
+        """
+        Clear the cache (both in memory and in the database file).
+        """
+        self.entries = OrderedDict()
+        self.uncommitted, self.used = dict(), dict()
+        connection = self._get_connection()
+        if connection is not None:
+            try:
+                with connection:
+                    connection.execute('DELETE FROM cache')
+            except sqlite3.Error as e:
+                self._disconnect(e)
+
+    def _add_to_memory(self, key: str, result):
+        """
+        Add a result to the in-memory cache, evicting the least recently used entry if needed.
+
+        Args:
+            key (str): The cache key.
+            result: The result to cache.
+        """
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def _get_connection(self) -> Optional[sqlite3.Connection]:
+        """
+        Get a connection to the database file of this process (a connection must not be shared with forked processes).
+
+        Returns:
+            Optional[sqlite3.Connection]: The connection, ``None`` if no path was set or if the file cannot be used.
+        """
+        if self.path is None:
+            return None
+        if self._connection is None or self._connection_pid != os.getpid():
+            try:
+                self._connection = sqlite3.connect(self.path, timeout=60)
+                self._connection.execute('PRAGMA synchronous = OFF')
+                self._connection.execute('CREATE TABLE IF NOT EXISTS cache '
+                                         '(key TEXT PRIMARY KEY, content TEXT, coords BLOB, used REAL)')
+                self._connection.commit()
+            except sqlite3.Error as e:
+                self._disconnect(e)
+                return None
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _disconnect(self, error: sqlite3.Error):
+        """
+        Stop using the database file after an error, and keep caching results only in memory.
+
+        Args:
+            error (sqlite3.Error): The error raised when using the database file.
+        """
+        logger.warning(f'Could not use the force field cache file {self.path}, got: {error}\n'
+                       f'Caching force field results only in memory.')
+        if self._connection is not None and self._connection_pid == os.getpid():
+            try:
+                self._connection.close()
+            except sqlite3.Error:
+                pass
+        self.path, self._connection, self._connection_pid = None, None, None
+        self.uncommitted, self.used = dict(), dict()
+
+
+force_field_cache = ForceFieldCache(max_size=force_field_cache_sizes['memory'],
+                                    max_disk_size=force_field_cache_sizes['disk'])
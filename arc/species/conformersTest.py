@@ -5,7 +5,10 @@
 This module contains unit tests of the arc.species.conformers module
 """
 
+import multiprocessing
+import os
 import unittest
+from concurrent.futures import ProcessPoolExecutor
 
 from rdkit.Chem import rdMolTransforms as rdMT
 
@@ -18,6 +21,7 @@ import arc.species.converter as converter
 import arc.species.vectors as vectors
 from arc.common import almost_equal_coords_lists
 from arc.exceptions import ConformerError
+from arc.settings import arc_path
 from arc.species.species import ARCSpecies
 
 
@@ -427,6 +431,42 @@ H      -1.22610851    0.40421362    1.35170355"""
             self.assertEqual(new_conformer['dihedral'], expected_new_conformer['dihedral'])
             self.assertTrue(almost_equal_coords_lists(new_conformer['xyz'], expected_new_conformer['xyz']))
 
+    def test_conformers_combinations_by_simulated_annealing(self):
+        """Test searching conformer combinations by simulated annealing within a force field evaluation budget"""
+        xyz = {'symbols': ('O', 'C', 'C', 'C', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'),
+               'isotopes': (16, 12, 12, 12, 1, 1, 1, 1, 1, 1, 1, 1),
+               'coords': ((2.09496537, -0.68203123, 0.41738811), (-0.17540789, 0.11818414, 0.51180976),
+                          (0.92511172, -0.46810337, -0.36086829), (-1.45486974, 0.34772573, -0.27221056),
+                          (-0.37104415, -0.55290987, 1.35664654), (0.16538089, 1.0635112, 0.95069762),
+                          (0.61854668, -1.431406, -0.78023161), (1.17698645, 0.20191002, -1.18924062),
+                          (-2.22790196, 0.76917222, 0.37791757), (-1.8347639, -0.59150616, -0.68674647),
+                          (-1.28838516, 1.04591267, -1.0987324), (2.3713817, 0.17954064, 0.77357037))}
+        mol = ARCSpecies(label='propanol', smiles='CCCO', xyz=xyz).mol
+        multiple_tors = [(4, 2, 3, 1), (2, 3, 1, 12)]
+        multiple_sampling_points = [[-180.0, -60.0, 60.0], [-180.0, -60.0, 60.0]]
+        kwargs = {'label': 'propanol', 'mol': mol, 'base_xyz': xyz, 'hypothetical_num_comb': 9,
+                  'multiple_tors': multiple_tors, 'multiple_sampling_points': multiple_sampling_points,
+                  'combination_threshold': 5, 'torsion_angles': {tor: list() for tor in multiple_tors},
+                  'de_threshold': 1000, 'combination_search': 'simulated_annealing'}
+
+        new_conformers = conformers.generate_conformer_combinations(max_ff_evaluations=4, **kwargs)
+        self.assertLessEqual(len(new_conformers), 4)
+        self.assertTrue(all('Simulated annealing' in conf['source'] for conf in new_conformers))
+
+        # the budget exceeds the number of combinations, all of them are evaluated
+        new_conformers = conformers.generate_conformer_combinations(max_ff_evaluations=100, **kwargs)
+        all_conformers = conformers.generate_all_combinations(label='propanol', mol=mol, base_xyz=xyz,
+                                                              multiple_tors=multiple_tors,
+                                                              multiple_sampling_points=multiple_sampling_points,
+                                                              torsions=multiple_tors)
+        self.assertEqual(len(new_conformers), len(all_conformers))
+        self.assertAlmostEqual(min(conf['FF energy'] for conf in new_conformers),
+                               min(conf['FF energy'] for conf in all_conformers), 2)
+
+        kwargs['combination_search'] = 'exhaustive'
+        with self.assertRaises(ConformerError):
+            conformers.generate_conformer_combinations(**kwargs)
+
     def test_get_force_field_energies(self):
         """Test attaining force field conformer energies"""
         xyzs, energies = conformers.get_force_field_energies(label='', mol=self.mol0, num_confs=10)
@@ -483,6 +523,19 @@ H       0.68104300    0.74807180    0.61546062""")]
         self.assertEqual(confs[-1]['source'], 'User Guess')
         self.assertFalse(any([confs[i]['xyz'] == confs[0]['xyz'] for i in range(1, 52)]))
 
+    def test_get_force_field_energies_adaptively(self):
+        """Test embedding conformers in batches until no new conformers are found or the wall time is used"""
+        xyzs, energies = conformers.get_force_field_energies_adaptively(label='ethanol', mol=self.mol0,
+                                                                        max_num_confs=1000, wall_time=600)
+        self.assertEqual(len(xyzs), len(energies))
+        self.assertEqual(len(xyzs) % conformers.ADAPTIVE_EMBED_BATCH_SIZE, 0)
+        self.assertGreaterEqual(len(xyzs), conformers.ADAPTIVE_EMBED_BATCH_SIZE * conformers.ADAPTIVE_EMBED_PATIENCE)
+        self.assertLess(len(xyzs), 1000)  # ethanol has only a few conformers
+
+        xyzs, energies = conformers.get_force_field_energies_adaptively(label='ethanol', mol=self.mol0,
+                                                                        max_num_confs=1000, wall_time=0)
+        self.assertEqual(len(xyzs), conformers.ADAPTIVE_EMBED_BATCH_SIZE)
+
     def test_determine_number_of_conformers_to_generate(self):
         """Test that the correct number of conformers to generate is determined"""
         self.assertEqual(conformers.determine_number_of_conformers_to_generate(heavy_atoms=0, torsion_num=0,
@@ -1069,6 +1122,19 @@ O       1.40839617    0.14303696    0.00000000"""
         self.assertTrue(all([int(round(angle / 5.0) * 5.0) in [60, 300]
                              for angle in torsion_angles[tuple(torsions[1])]]))  # batch check almost equal
 
+        angle_matrix, torsion_indices = conformers.get_torsion_angle_matrix(label='', conformers=confs,
+                                                                            torsions=torsions)
+        self.assertEqual(angle_matrix.shape, (len(confs), 2))
+        self.assertEqual(torsion_indices, {(9, 1, 2, 3): 0, (1, 2, 3, 6): 1})
+        self.assertEqual(sorted(angle_matrix[:, 1].tolist()), torsion_angles[(1, 2, 3, 6)])
+
+        dihedrals = conformers.get_dihedral_angle_matrix([converter.str_to_xyz(conf['xyz']) for conf in confs],
+                                                         torsions)
+        for i, conf in enumerate(confs):
+            for j, torsion in enumerate(torsions):
+                self.assertAlmostEqual(dihedrals[i, j], vectors.calculate_dihedral_angle(
+                    coords=converter.str_to_xyz(conf['xyz']), torsion=torsion, index=1), 8)
+
     def test_determine_torsion_symmetry(self):
         """Test that we correctly determine the torsion symmetry"""
         adj0 = """1 O u0 p2 c0 {2,S} {9,S}
@@ -1485,6 +1551,124 @@ O       1.40839617    0.14303696    0.00000000"""
                                                                         new_dihedrals=[[0, 180], [90, -120]])
         self.assertEqual(len(energies), 2)
 
+        new_dihedrals = [[0, 180], [90, -120], [60, 60], [120, -60], [-90, 30]]
+        serial_xyzs, serial_energies = conformers.change_dihedrals_and_force_field_it(
+            label='NCC', mol=ncc_mol, xyz=ncc_xyz, torsions=[torsion, torsion], new_dihedrals=new_dihedrals)
+        parallel_xyzs, parallel_energies = conformers.change_dihedrals_and_force_field_it(
+            label='NCC', mol=ncc_mol, xyz=ncc_xyz, torsions=[torsion, torsion], new_dihedrals=new_dihedrals,
+            max_workers=2)
+        self.assertEqual(parallel_energies, serial_energies)
+        self.assertEqual(parallel_xyzs, serial_xyzs)
+
+    def test_rdkit_conformer_workspace(self):
+        """Test setting dihedrals and optimizing conformers in place using an RDKit conformer workspace"""
+        ncc_xyz = {'coords': ((0.92795, -0.065916, -0.036432),
+                              (2.389325, -0.061851, -0.064911),
+                              (2.913834, 1.357417, -0.223617),
+                              (2.741111, -0.474299, 0.885656),
+                              (2.810508, -0.695037, -0.861612),
+                              (2.543779, 1.992973, 0.584107),
+                              (4.00671, 1.373862, -0.212637),
+                              (2.583945, 1.791163, -1.17337),
+                              (0.552434, 0.274266, -0.914418),
+                              (0.566796, -1.001559, 0.102471)),
+                   'isotopes': (14, 12, 12, 1, 1, 1, 1, 1, 1, 1),
+                   'symbols': ('N', 'C', 'C', 'H', 'H', 'H', 'H', 'H', 'H', 'H')}
+        ncc_mol = ARCSpecies(label='NCC', smiles='NCC', xyz=ncc_xyz).mol
+        torsion = [8, 0, 1, 2]  # 0-indexed H-N-C-C
+        workspace = conformers.RDKitConformerWorkspace(mol=ncc_mol)
+        base_conf_id = workspace.add_conformer(ncc_xyz)
+        self.assertTrue(almost_equal_coords_lists(workspace.get_xyz(base_conf_id), ncc_xyz))
+
+        conf_id = workspace.copy_conformer(base_conf_id)
+        self.assertEqual(workspace.rd_mol.GetNumConformers(), 2)
+        workspace.set_dihedral(conf_id, torsion, 180)
+        self.assertAlmostEqual(workspace.get_dihedral(conf_id, torsion) % 360, 180, 5)
+        self.assertNotAlmostEqual(workspace.get_dihedral(base_conf_id, torsion) % 360, 180, 1)
+        xyz_dihedrals = workspace.get_xyz(conf_id)
+        energy = workspace.optimize(conf_id)
+        expected_xyzs, expected_energies = conformers.get_force_field_energies(label='NCC', mol=ncc_mol,
+                                                                               xyz=xyz_dihedrals, optimize=True)
+        self.assertAlmostEqual(energy, expected_energies[0], 5)
+        self.assertTrue(almost_equal_coords_lists(workspace.get_xyz(conf_id), expected_xyzs[0]))
+        workspace.remove_conformer(conf_id)
+        self.assertEqual(workspace.rd_mol.GetNumConformers(), 1)
+
+        self.assertIsNone(conformers.RDKitConformerWorkspace(mol=ncc_mol, force_field='gromacs').mol_properties)
+
+    def test_force_field_cache(self):
+        """Test memoizing force field results in memory and in a database file"""
+        path = os.path.join(arc_path, 'arc', 'testing', 'force_field_cache_delete_after_usage.db')
+        ff_cache = conformers.ForceFieldCache(max_size=2, max_disk_size=3, path=path)
+        xyz = converter.str_to_xyz('C 0.0 0.0 0.0\nO 1.2 0.0 0.0')
+        mol_key = ff_cache.get_mol_key(Molecule(smiles='C=O'))
+        keys = [ff_cache.get_key(mol_key, 'MMFF94s', xyz, [(1, 2, 3, 4)], [dihedral]) for dihedral in [10, 20, 30, 40]]
+        self.assertEqual(keys[1], ff_cache.get_key(mol_key, 'MMFF94s', xyz, [(1, 2, 3, 4)], [-340.0001]))
+        self.assertEqual(ff_cache.get_key(mol_key, 'MMFF94s', xyz, [(1, 2, 3, 4)], [0]),
+                         ff_cache.get_key(mol_key, 'MMFF94s', xyz, [(1, 2, 3, 4)], [359.999]))
+        self.assertNotEqual(keys[1], ff_cache.get_key(mol_key, 'UFF', xyz, [(1, 2, 3, 4)], [20]))
+        for i, key in enumerate(keys):
+            ff_cache.set(key, (xyz, xyz, float(i)))
+        ff_cache.commit()
+        self.assertEqual(list(ff_cache.entries.keys()), keys[2:])  # least recently used entries were evicted
+        self.assertEqual(ff_cache.get(keys[3]), (xyz, xyz, 3.0))
+
+        new_ff_cache = conformers.ForceFieldCache(path=path)  # e.g., after restarting ARC
+        self.assertIsNone(new_ff_cache.get(keys[0]))  # evicted from the file
+        self.assertEqual(new_ff_cache.get(keys[1]), (xyz, xyz, 1.0))
+        self.assertFalse(new_ff_cache._connection.in_transaction)  # reading doesn't lock the file
+        ff_cache.set(keys[0], (xyz, xyz, 0.0))
+        ff_cache.commit()  # doesn't wait for new_ff_cache to release the file
+        new_ff_cache.commit()
+        self.assertFalse(new_ff_cache.used)
+        new_ff_cache.clear()
+        self.assertIsNone(new_ff_cache.get(keys[1]))
+        new_ff_cache.set_path(None)
+        ff_cache.set_path(None)
+        os.remove(path)
+
+    def test_force_field_cache_in_conformer_generation_process(self):
+        """Test that a background conformer generation process writes force field results to the cache file"""
+        path = os.path.join(arc_path, 'arc', 'testing', 'force_field_cache_process_delete_after_usage.db')
+        ncc_xyz = converter.str_to_xyz("""N       0.92795000   -0.06591600   -0.03643200
+C       2.38932500   -0.06185100   -0.06491100
+C       2.91383400    1.35741700   -0.22361700
+H       2.74111100   -0.47429900    0.88565600
+H       2.81050800   -0.69503700   -0.86161200
+H       2.54377900    1.99297300    0.58410700
+H       4.00671000    1.37386200   -0.21263700
+H       2.58394500    1.79116300   -1.17337000
+H       0.55243400    0.27426600   -0.91441800
+H       0.56679600   -1.00155900    0.10247100""")
+        ncc_mol = ARCSpecies(label='NCC', smiles='NCC', xyz=ncc_xyz).mol
+        torsions, new_dihedrals = [(9, 1, 2, 3)], [[60.0], [180.0]]
+        with ProcessPoolExecutor(max_workers=1,
+                                 mp_context=multiprocessing.get_context(conformers.PROCESS_START_METHOD),
+                                 initializer=conformers.initialize_conformer_generation_process,
+                                 initargs=(path,)) as executor:
+            results = executor.submit(conformers.get_dihedral_combinations_results, 'NCC', ncc_mol, ncc_xyz,
+                                      torsions, new_dihedrals).result()
+        ff_cache = conformers.ForceFieldCache(path=path)
+        mol_key = ff_cache.get_mol_key(ncc_mol)
+        for dihedrals, result in zip(new_dihedrals, results):
+            self.assertEqual(ff_cache.get(ff_cache.get_key(mol_key, 'MMFF94s', ncc_xyz, torsions, dihedrals)), result)
+        ff_cache.set_path(None)
+        os.remove(path)
+
+    def test_logging_in_conformer_generation_process(self):
+        """Test that a background conformer generation process sends its log records to the parent process"""
+        mp_context = multiprocessing.get_context(conformers.PROCESS_START_METHOD)
+        log_queue = mp_context.Queue()
+        with ProcessPoolExecutor(max_workers=1, mp_context=mp_context,
+                                 initializer=conformers.initialize_conformer_generation_process,
+                                 initargs=(None, log_queue)) as executor:
+            executor.submit(conformers.logger.warning, 'Could not generate conformers for species X').result()
+            self.assertEqual(executor.submit(conformers.map_in_process_pool, max, [(1, 2), (4, 3)], 2).result(),
+                             [2, 4])
+        record = log_queue.get(timeout=10)
+        self.assertEqual(record.getMessage(), 'Could not generate conformers for species X')
+        self.assertEqual(record.levelname, 'Warning: ')
+
     def test_determine_well_width_tolerance(self):
         """Test determining well width tolerance"""
         tols = list()
@@ -1567,6 +1751,21 @@ O       1.40839617    0.14303696    0.00000000"""
         lowest_confs = conformers.get_lowest_confs(label='', confs=confs, n=2, e=None, energy='FF energy')
         self.assertEqual(len(lowest_confs), 1)  # only 1, not 2
 
+    def test_distance_matrix_fingerprints(self):
+        """Test pruning conformers using distance matrix fingerprints"""
+        xyz1 = converter.str_to_xyz('O 0 0 0\nH 0.96 0 0\nH -0.24 0.93 0')
+        xyz2 = converter.str_to_xyz('O 1 1 1\nH 1 1.96 1\nH 1 0.76 1.93')  # xyz1 rotated and translated
+        xyz3 = converter.str_to_xyz('O 0 0 0\nH 0.96 0 0\nH -0.30 0.91 0')
+        fingerprints = conformers.get_distance_matrix_fingerprints([xyz1, xyz2, xyz3])
+        self.assertEqual(fingerprints.shape, (3, 3))
+        self.assertAlmostEqual(fingerprints[0][0], 0.96)
+        indexed_fingerprints, fingerprint_sums = list(), list()
+        self.assertTrue(conformers.index_unique_fingerprint(fingerprints[0], indexed_fingerprints, fingerprint_sums))
+        self.assertFalse(conformers.index_unique_fingerprint(fingerprints[1], indexed_fingerprints, fingerprint_sums))
+        self.assertTrue(conformers.index_unique_fingerprint(fingerprints[2], indexed_fingerprints, fingerprint_sums))
+        self.assertEqual(len(indexed_fingerprints), 2)
+        self.assertEqual(fingerprint_sums, sorted(fingerprint_sums))
+
     def test_update_mol(self):
         """Test that atom ordering remains the same after updating a molecule in update_mol()"""
         xyz = {'symbols': ('S', 'O', 'O', 'N', 'N', 'C', 'C', 'C', 'C', 'C',
@@ -1899,6 +2098,11 @@ Cl      2.38846685    0.24054066    0.55443324
         confs = conformers.determine_chirality(conformers=confs, label='ON(C)(S)', mol=mol)
         self.assertEqual(confs[0]['chirality'], {(2,): 'NS'})
         self.assertEqual(confs[1]['chirality'], {(2,): 'NR'})
+        parallel_confs = conformers.determine_chirality(conformers=[{'xyz': conf['xyz']} for conf in confs],
+                                                        label='ON(C)(S)', mol=mol, max_workers=2)
+        self.assertEqual([conf['chirality'] for conf in parallel_confs], [conf['chirality'] for conf in confs])
+        self.assertEqual(conformers.perceive_chirality(label='ON(C)(S)', mol=mol, xyzs=[confs[1]['xyz']]),
+                         [{(2,): 'NR'}])
 
         # one chiral N center
         confs = [{'xyz': {'symbols': ('O', 'N', 'C', 'C', 'C', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'),
@@ -2386,6 +2590,28 @@ Cl      2.38846685    0.24054066    0.55443324
         for mol_atom, conf_atom in zip(spc1.mol.atoms, spc1.conformers[0]['symbols']):
             self.assertEqual(mol_atom.element.symbol, conf_atom)
 
+    def test_split_into_chunks(self):
+        """Test splitting a list into ordered chunks for worker processes"""
+        entries = list(range(10))
+        chunks = conformers.split_into_chunks(entries, max_workers=2)
+        self.assertEqual(len(chunks), 8)
+        self.assertEqual(sum(chunks, list()), entries)
+        self.assertEqual(conformers.split_into_chunks([1, 2], max_workers=4), [[1], [2]])
+        self.assertEqual(conformers.split_into_chunks(list(), max_workers=4), list())
+
+    def test_map_in_process_pool(self):
+        """Test calling a function in a process pool, keeping the order of the results"""
+        args_list = [(str(i), 'a' * i) for i in range(20)]
+        serial_results = conformers.map_in_process_pool(conformers.inverse_chirality_symbol, [('R',), ('S',)])
+        self.assertEqual(serial_results, ['S', 'R'])
+        parallel_results = conformers.map_in_process_pool(max, args_list, max_workers=2)
+        self.assertEqual(parallel_results, [max(*args) for args in args_list])
+        pool = conformers._process_pools[(os.getpid(), 2)]
+        self.assertEqual(pool._mp_context.get_start_method(), conformers.PROCESS_START_METHOD)
+        self.assertNotEqual(conformers.PROCESS_START_METHOD, 'fork')
+        conformers.shutdown_process_pools()
+        self.assertEqual(conformers._process_pools, dict())
+
     def test_generate_monoatomic_conformer(self):
         """Test generating a monoatomic conformer"""
         conf = conformers.generate_monoatomic_conformer('N')
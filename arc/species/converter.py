@@ -11,6 +11,7 @@ from typing import Tuple
 
 import pybel
 import qcelemental as qcel
+import yaml
 from rdkit import Chem
 from rdkit.Chem import rdMolTransforms as rdMT
 
@@ -21,20 +22,137 @@ from rmgpy.quantity import ArrayQuantity
 from rmgpy.species import Species
 from rmgpy.statmech import Conformer
 
-from arc.common import almost_equal_lists, get_atom_radius, get_logger, is_str_float
-from arc.exceptions import ConverterError, InputError, SanitizationError, SpeciesError
+from arc.common import almost_equal_lists, determine_top_group_indices, get_atom_radius, get_logger, is_str_float
+from arc.exceptions import ConverterError, InputError, SanitizationError, SpeciesError, ZMatError
 from arc.species.xyz_to_2d import MolGraph
 from arc.species.zmat import (KEY_FROM_LEN,
                               _compare_zmats,
                               get_all_neighbors,
                               get_atom_indices_from_zmat_parameter,
                               get_parameter_from_atom_indices,
+                              get_zmat_plan,
                               zmat_to_coords,
                               xyz_to_zmat)
+from arc.species.vectors import calculate_dihedral_angles
 
 
 logger = get_logger()
 
+RESONANCE_CACHE_SIZE = 1000  # the max number of molecules for which resonance structures are kept in memory
+RESONANCE_STRUCTURES = dict()  # keys are determined by get_resonance_structures(), values are (structures, hashes)
+WL_HASH_ITERATIONS = 3  # the number of Weisfeiler-Lehman refinement iterations used for molecule fingerprints
+
+
+class XYZ(dict):
+    """
+    An immutable ARC xyz dictionary, also holding its coordinates as a contiguous (N x 3) float64 NumPy array.
+
+    An XYZ object is a read-only dictionary of the ARC xyz format (with 'symbols', 'isotopes', and 'coords' keys),
+    so it could be passed wherever an xyz dictionary is expected. Functions that do numerical work should use
+    the read-only ``array`` attribute, which is never copied, rather than the 'coords' tuples.
+    Use ``copy()`` to get a mutable xyz dictionary.
+
+    Attributes:
+        symbols (tuple): The element symbols.
+        isotopes (tuple): The element isotope numbers.
+        array (np.ndarray): The read-only (N x 3) float64 Cartesian coordinates array in Angstrom.
+    """
+    __slots__ = ('symbols', 'isotopes', 'array')
+
+    def __init__(self,
+                 symbols: tuple,
+                 isotopes: tuple,
+                 coords: tuple or list or np.ndarray,
+                 ):
+        """
+        Initialize an XYZ object. A read-only C-contiguous float64 ``coords`` array is used as is (w/o copying).
+
+        Args:
+            symbols (tuple): The element symbols.
+            isotopes (tuple): The element isotope numbers.
+            coords (tuple, list, np.ndarray): The Cartesian coordinates.
+
+        Raises:
+            ConverterError: If the coordinates are not of an (N x 3) shape,
+                            or if the lengths of the symbols, isotopes, and coordinates are inconsistent.
+        """
+        if isinstance(coords, np.ndarray) and not coords.flags.writeable and coords.dtype == np.float64 \
+                and coords.flags.c_contiguous:
+            array = coords
+        else:
+            array = np.array(coords, dtype=np.float64)
+            if not array.size:
+                array = array.reshape(0, 3)
+            array.setflags(write=False)
+        if array.ndim != 2 or array.shape[1] != 3:
+            raise ConverterError(f'Expected coordinates of an (N x 3) shape, got an array of shape {array.shape}.')
+        if not len(symbols) == len(isotopes) == array.shape[0]:
+            raise ConverterError(f'Got {len(symbols)} symbols, {len(isotopes)} isotopes, '
+                                 f'and {array.shape[0]} coordinates.')
+        symbols, isotopes = tuple(symbols), tuple(isotopes)
+        super().__init__(symbols=symbols, isotopes=isotopes, coords=tuple(tuple(coord) for coord in array.tolist()))
+        object.__setattr__(self, 'symbols', symbols)
+        object.__setattr__(self, 'isotopes', isotopes)
+        object.__setattr__(self, 'array', array)
+
+    @property
+    def coords(self) -> tuple:
+        """The coordinates as a tuple of float tuples (the ARC xyz dictionary format)."""
+        return dict.__getitem__(self, 'coords')
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f'{self.__class__.__name__} objects are immutable, use copy() to get a mutable xyz dictionary')
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __eq__(self, other):
+        if isinstance(other, XYZ):
+            return self.symbols == other.symbols and self.isotopes == other.isotopes \
+                and np.array_equal(self.array, other.array)
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.symbols, self.isotopes, self.coords))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f'{self.__class__.__name__} objects are immutable')
+
+    def __delattr__(self, key):
+        raise AttributeError(f'{self.__class__.__name__} objects are immutable')
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({dict(self)})'
+
+    def __reduce__(self):
+        return self.__class__, (self.symbols, self.isotopes, self.array)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def copy(self) -> dict:
+        """
+        Get a mutable copy (as in ``dict.copy()``).
+
+        Returns:
+            dict: The ARC xyz dictionary format.
+        """
+        return dict(self)
+
+
+def _represent_xyz(dumper, xyz):
+    """Represent an XYZ object in YAML files as the ARC xyz dictionary format."""
+    return dumper.represent_dict(dict(xyz))
+
+
+yaml.add_representer(XYZ, _represent_xyz)
+
 
 def str_to_xyz(xyz_str):
     """
@@ -64,7 +182,7 @@ def str_to_xyz(xyz_str):
         xyz_str (str): The string xyz format to be converted.
 
     Returns:
-        dict: The ARC xyz format.
+        XYZ: The ARC xyz format.
 
     Raises:
         ConverterError: If xyz_str is not a string or does not have four space-separated entries per non empty line.
@@ -78,7 +196,7 @@ def str_to_xyz(xyz_str):
     if len(xyz_str.splitlines()[0]) == 1:
         # this is a zmat
         return zmat_to_xyz(zmat=str_to_zmat(xyz_str), keep_dummy=False)
-    xyz_dict = {'symbols': tuple(), 'isotopes': tuple(), 'coords': tuple()}
+    symbols, isotopes, coords = list(), list(), list()
     if all([len(line.split()) == 6 for line in xyz_str.splitlines() if line.strip()]):
         # Convert Gaussian output format, e.g., "      1          8           0        3.132319    0.769111   -0.080869"
         # not considering isotopes in this method!
@@ -86,10 +204,9 @@ def str_to_xyz(xyz_str):
             if line.strip():
                 splits = line.split()
                 symbol = symbol_by_number[int(splits[1])]
-                coord = (float(splits[3]), float(splits[4]), float(splits[5]))
-                xyz_dict['symbols'] += (symbol,)
-                xyz_dict['isotopes'] += (get_most_common_isotope_for_element(symbol),)
-                xyz_dict['coords'] += (coord,)
+                symbols.append(symbol)
+                isotopes.append(get_most_common_isotope_for_element(symbol))
+                coords.append((float(splits[3]), float(splits[4]), float(splits[5])))
     else:
         # this is a "regular" string xyz format, if it has isotope information it will be preserved
         for line in xyz_str.strip().splitlines():
@@ -105,11 +222,10 @@ def str_to_xyz(xyz_str):
                 else:
                     # no specific isotope is specified in str_xyz
                     isotope = get_most_common_isotope_for_element(symbol)
-                coord = (float(splits[1]), float(splits[2]), float(splits[3]))
-                xyz_dict['symbols'] += (symbol,)
-                xyz_dict['isotopes'] += (isotope,)
-                xyz_dict['coords'] += (coord,)
-    return xyz_dict
+                symbols.append(symbol)
+                isotopes.append(isotope)
+                coords.append((float(splits[1]), float(splits[2]), float(splits[3])))
+    return XYZ(symbols=symbols, isotopes=isotopes, coords=coords)
 
 
 def xyz_to_str(xyz_dict, isotope_format=None):
@@ -190,13 +306,8 @@ def xyz_to_x_y_z(xyz_dict):
     Returns:
         Tuple[tuple, tuple, tuple]: The X coordinates, the Y coordinates, the Z coordinates.
     """
-    xyz_dict = check_xyz_dict(xyz_dict)
-    x, y, z = tuple(), tuple(), tuple()
-    for coord in xyz_dict['coords']:
-        x += (coord[0],)
-        y += (coord[1],)
-        z += (coord[2],)
-    return x, y, z
+    x, y, z = xyz_to_coords_array(xyz_dict).T.tolist()
+    return tuple(x), tuple(y), tuple(z)
 
 
 def xyz_to_coords_list(xyz_dict):
@@ -209,12 +320,21 @@ def xyz_to_coords_list(xyz_dict):
     Returns:
         list: The coordinates.
     """
-    xyz_dict = check_xyz_dict(xyz_dict)
-    coords_tuple = xyz_dict['coords']
-    coords_list = list()
-    for coords_tup in coords_tuple:
-        coords_list.append([coords_tup[0], coords_tup[1], coords_tup[2]])
-    return coords_list
+    return xyz_to_coords_array(xyz_dict).tolist()
+
+
+def xyz_to_coords_array(xyz_dict) -> np.ndarray:
+    """
+    Get the coords part of an xyz dict as a read-only (N x 3) float64 array.
+    The array of an ``XYZ`` object is returned as is (w/o copying).
+
+    Args:
+        xyz_dict (dict): The ARC xyz format.
+
+    Returns:
+        np.ndarray: The coordinates.
+    """
+    return check_xyz_dict(xyz_dict).array
 
 
 def xyz_to_xyz_file_format(xyz_dict, comment=''):
@@ -249,9 +369,8 @@ def xyz_to_dmat(xyz_dict: dict) -> np.array:
     Returns:
         list: the distance matrix.
     """
-    xyz_dict = check_xyz_dict(xyz_dict)
-    dmat = qcel.util.misc.distance_matrix(a=np.array(xyz_to_coords_list(xyz_dict)),
-                                          b=np.array(xyz_to_coords_list(xyz_dict)))
+    coords = xyz_to_coords_array(xyz_dict)
+    dmat = qcel.util.misc.distance_matrix(a=coords, b=coords)
     return dmat
 
 
@@ -295,16 +414,14 @@ def xyz_from_data(coords, numbers=None, symbols=None, isotopes=None):
         isotopes (tuple, list, optional): Element isotope numbers.
 
     Returns:
-        dict: The ARC dictionary xyz format.
+        XYZ: The ARC xyz format.
 
     Raises:
         ConverterError: If neither ``numbers`` nor ``symbols`` are specified, if both are specified,
                         or if the input lengths aren't consistent.
     """
-    if isinstance(coords, np.ndarray):
-        coords = tuple(tuple(coord.tolist()) for coord in coords)
-    elif isinstance(coords, list):
-        coords = tuple(tuple(coord) for coord in coords)
+    if isinstance(coords, list):
+        coords = tuple(coords)
     if numbers is not None and isinstance(numbers, np.ndarray):
         numbers = tuple(numbers.tolist())
     elif numbers is not None and isinstance(numbers, list):
@@ -313,7 +430,7 @@ def xyz_from_data(coords, numbers=None, symbols=None, isotopes=None):
         symbols = tuple(symbols)
     if isotopes is not None and isinstance(isotopes, list):
         isotopes = tuple(isotopes)
-    if not isinstance(coords, tuple):
+    if not isinstance(coords, (tuple, np.ndarray)):
         raise ConverterError('Expected coords to be a tuple, got {0} which is a {1}'.format(coords, type(coords)))
     if numbers is not None and not isinstance(numbers, tuple):
         raise ConverterError('Expected numbers to be a tuple, got {0} which is a {1}'.format(numbers, type(numbers)))
@@ -335,8 +452,7 @@ def xyz_from_data(coords, numbers=None, symbols=None, isotopes=None):
                              f'({len(isotopes)}).')
     if isotopes is None:
         isotopes = tuple(get_most_common_isotope_for_element(symbol) for symbol in symbols)
-    xyz_dict = {'symbols': symbols, 'isotopes': isotopes, 'coords': coords}
-    return xyz_dict
+    return XYZ(symbols=symbols, isotopes=isotopes, coords=coords)
 
 
 def rmg_conformer_to_xyz(conformer):
@@ -356,7 +472,7 @@ def rmg_conformer_to_xyz(conformer):
         TypeError: If conformer is not an rmgpy.statmech.Conformer object
 
     Returns:
-        dict: The ARC xyz format
+        XYZ: The ARC xyz format
     """
     if not isinstance(conformer, Conformer):
         raise TypeError(f'Expected conformer to be an rmgpy.statmech.Conformer object but instead got {conformer}, '
@@ -364,10 +480,7 @@ def rmg_conformer_to_xyz(conformer):
 
     symbols = tuple(symbol_by_number[n] for n in conformer.number.value)
     isotopes = tuple(int(round(m)) for m in conformer.mass.value)
-    coords = tuple(tuple(coord) for coord in conformer.coordinates.value)
-
-    xyz_dict = {'symbols': symbols, 'isotopes': isotopes, 'coords': coords}
-    return xyz_dict
+    return XYZ(symbols=symbols, isotopes=isotopes, coords=conformer.coordinates.value)
 
 
 def xyz_to_rmg_conformer(xyz_dict):
@@ -424,32 +537,40 @@ def check_xyz_dict(xyz):
     If it is a string, convert it.
     If it is a Z matrix, convert it to cartesian coordinates,
     If isotopes are not in xyz_dict, common values will be added.
+    An ``XYZ`` object is returned as is, an xyz dictionary is converted into an ``XYZ`` object.
 
     Args:
         xyz (dict, str): The xyz dictionary.
 
+    Returns:
+        XYZ: The ARC xyz format.
+
     Raises:
         ConverterError: If ``xyz`` is of wrong type or is missing symbols or coords.
     """
+    if isinstance(xyz, XYZ):
+        return xyz
     xyz_dict = str_to_xyz(xyz) if isinstance(xyz, str) else xyz
+    if isinstance(xyz_dict, XYZ):
+        return xyz_dict
     if not isinstance(xyz_dict, dict):
         raise ConverterError(f'Expected a dictionary, got {type(xyz_dict)}')
-    if 'vars' in list(xyz_dict.keys()):
+    if 'vars' in xyz_dict:
         # this is a zmat, convert to cartesian
-        xyz_dict = zmat_to_xyz(zmat=xyz_dict, keep_dummy=False)
-    if 'symbols' not in list(xyz_dict.keys()):
+        return zmat_to_xyz(zmat=xyz_dict, keep_dummy=False)
+    if 'symbols' not in xyz_dict:
         raise ConverterError(f'XYZ dictionary is missing symbols. Got:\n{xyz_dict}')
-    if 'coords' not in list(xyz_dict.keys()):
+    if 'coords' not in xyz_dict:
         raise ConverterError(f'XYZ dictionary is missing coords. Got:\n{xyz_dict}')
     if len(xyz_dict['symbols']) != len(xyz_dict['coords']):
         raise ConverterError(f'Got {len(xyz_dict["symbols"])} symbols and {len(xyz_dict["coords"])} '
                              f'coordinates:\n{xyz_dict}')
-    if 'isotopes' not in list(xyz_dict.keys()):
-        xyz_dict = xyz_from_data(coords=xyz_dict['coords'], symbols=xyz_dict['symbols'])
+    if 'isotopes' not in xyz_dict:
+        return xyz_from_data(coords=xyz_dict['coords'], symbols=xyz_dict['symbols'])
     if len(xyz_dict['symbols']) != len(xyz_dict['isotopes']):
         raise ConverterError(f'Got {len(xyz_dict["symbols"])} symbols and {len(xyz_dict["isotopes"])} '
                              f'isotopes:\n{xyz_dict}')
-    return xyz_dict
+    return XYZ(symbols=xyz_dict['symbols'], isotopes=xyz_dict['isotopes'], coords=xyz_dict['coords'])
 
 
 def check_zmat_dict(zmat):
@@ -914,6 +1035,65 @@ def modify_coords(coords, indices, new_value, modification_type, mol=None):
     return new_xyz
 
 
+def modify_dihedrals(xyz, torsions, dihedrals, mol):
+    """
+    Set the dihedral angles of several torsions in many geometries at once.
+    A zmat of ``xyz`` is generated once, and the zmat parameters changed by rotating each torsion are identified.
+    All requested dihedral combinations are then converted into cartesian coordinates in a single batched pass
+    (see ``arc.species.zmat.ZMatPlan``). Setting a dihedral rotates the group of the last torsion atom
+    (including all other groups bonded to the third atom) about the central bond.
+
+    Args:
+        xyz (dict): The cartesian coordinates.
+        torsions (list): Entries are four-atom torsion indices (0-indexed).
+        dihedrals (list): Entries are lists of the dihedral angles (in degrees) to set, one angle per torsion.
+        mol (Molecule): The corresponding RMG Molecule with the connectivity information.
+
+    Returns:
+        list: Entries are the xyz coordinates corresponding to the ``dihedrals`` entries.
+              ``None`` if the torsions could not be set by changing zmat parameters (e.g., for a torsion in a ring).
+    """
+    # place the group rotated by the first torsion last, so other atoms aren't defined relative to it
+    try:
+        zmat = xyz_to_zmat(xyz=xyz, mol=mol, consolidate=False, constraints={'D_group': [tuple(torsions[0][::-1])]})
+    except ZMatError:
+        return None
+    plan = get_zmat_plan(zmat)
+    coefficients = np.zeros((len(plan.variables), len(torsions)), dtype=np.float64)
+    for t, torsion in enumerate(torsions):
+        top = determine_top_group_indices(mol=mol, atom1=mol.atoms[torsion[1]], atom2=mol.atoms[torsion[2]],
+                                          index=0)[0]
+        if torsion[3] not in top or any(mol.atoms.index(atom) in top for atom in mol.atoms[torsion[1]].edges.keys()
+                                        if atom is not mol.atoms[torsion[2]]):
+            # the torsion is in a ring
+            return None
+        # sides are 0 for the pivots, 1 for rotating atoms, and -1 for the rest
+        sides = {zmat_index: 0 if index in torsion[1:3] else 1 if index in top else -1
+                 for zmat_index, index in zmat['map'].items() if isinstance(index, int)}
+        for zmat_index, index in zmat['map'].items():
+            if not isinstance(index, int):
+                # a dummy atom moves with the atom it is attached to
+                attached_to = get_atom_indices_from_zmat_parameter(zmat['coords'][zmat_index][0])[0][1]
+                sides[zmat_index] = sides[attached_to] or None
+        for p, var in enumerate(plan.variables):
+            indices = get_atom_indices_from_zmat_parameter(var)[0]
+            var_sides = [sides[index] for index in indices]
+            if None in var_sides:
+                return None
+            if 1 in var_sides and -1 in var_sides:
+                if var[0] != 'D' or var_sides[1] or var_sides[2]:
+                    # this parameter isn't a dihedral angle about the rotating bond, it changes non-linearly
+                    return None
+                coefficients[p, t] = var_sides[3] if zmat['map'][indices[1]] == torsion[1] else -var_sides[3]
+    params = plan.get_params(zmat['vars'])
+    # measure the original dihedrals in the zmat geometry (which might slightly differ from xyz if dummies were added)
+    increments = np.asarray(dihedrals, dtype=np.float64) \
+        - calculate_dihedral_angles(coords=plan.to_coords(params), torsions=torsions, index=0)
+    params = params + increments.dot(coefficients.T)
+    return [translate_to_center_of_mass(xyz_from_data(coords=coords, symbols=plan.symbols, isotopes=xyz['isotopes']))
+            for coords in plan.to_coords(params)]
+
+
 def get_most_common_isotope_for_element(element_symbol):
     """
     Get the most common isotope for a given element symbol.
@@ -1479,7 +1659,9 @@ def check_isomorphism(mol1, mol2, filter_structures=True, convert_to_single_bond
     """
     Convert ``mol1`` and ``mol2`` to RMG Species objects, and generate resonance structures.
     Then check Species isomorphism.
-    This function first makes copies of the molecules, since isIsomorphic() changes atom orders.
+    The resonance structures are cached per molecule (see ``get_resonance_structures()``), so checking many conformers
+    against the same species generates them only once. Only pairs of structures with equal Weisfeiler-Lehman hashes
+    are compared, so non-isomorphic species are usually rejected without running an isomorphism check.
 
     Args:
         mol1 (Molecule): An RMG Molecule object.
@@ -1500,30 +1682,80 @@ def check_isomorphism(mol1, mol2, filter_structures=True, convert_to_single_bond
         return False
 
     mol1.reactive, mol2.reactive = True, True
+    structures1, hashes1 = get_resonance_structures(mol1, filter_structures=filter_structures,
+                                                    convert_to_single_bonds=convert_to_single_bonds)
+    structures2, hashes2 = get_resonance_structures(mol2, filter_structures=filter_structures,
+                                                    convert_to_single_bonds=convert_to_single_bonds)
+    if set(hashes1).isdisjoint(hashes2):
+        return False
+    for molecule1, hash1 in zip(structures1, hashes1):
+        for molecule2, hash2 in zip(structures2, hashes2):
+            if hash1 == hash2 and molecule1.is_isomorphic(molecule2, save_order=True):
+                return True
+    return False
+
+
+def get_resonance_structures(mol, filter_structures=True, convert_to_single_bonds=False):
+    """
+    Get the resonance structures of a molecule and their Weisfeiler-Lehman hashes for checking isomorphism.
+    Results are cached by the molecule's adjacency list, the structures are copies which aren't modified.
+
+    Args:
+        mol (Molecule): An RMG Molecule object.
+        filter_structures (bool, optional): Whether to apply the filtration algorithm when generating
+                                            resonance structures. ``True`` to apply.
+        convert_to_single_bonds (bool, optional): Whether to convert the molecule to single bonds instead of
+                                                  generating resonance structures.
+
+    Returns:
+        Tuple[list, list]: The structures (Molecule objects), and the respective hashes.
+    """
+    try:
+        key = (mol.to_adjacency_list(), filter_structures, convert_to_single_bonds)
+    except Exception:
+        key = None
+    if key is not None and key in RESONANCE_STRUCTURES:
+        return RESONANCE_STRUCTURES[key]
     if convert_to_single_bonds:
-        mol1_copy = mol1.to_single_bonds(raise_atomtype_exception=False)
-        mol2_copy = mol2.to_single_bonds(raise_atomtype_exception=False)
+        spc = Species(molecule=[mol.to_single_bonds(raise_atomtype_exception=False)])
     else:
-        mol1_copy = mol1.copy(deep=True)
-        mol2_copy = mol2.copy(deep=True)
-    spc1 = Species(molecule=[mol1_copy])
-    spc2 = Species(molecule=[mol2_copy])
-
-    if not convert_to_single_bonds:
+        spc = Species(molecule=[mol.copy(deep=True)])
         try:
-            spc1.generate_resonance_structures(keep_isomorphic=False, filter_structures=filter_structures)
-        except (AtomTypeError, ValueError):
-            pass
-        try:
-            spc2.generate_resonance_structures(keep_isomorphic=False, filter_structures=filter_structures)
+            spc.generate_resonance_structures(keep_isomorphic=False, filter_structures=filter_structures)
         except (AtomTypeError, ValueError):
             pass
+    result = (spc.molecule, [get_wl_hash(structure) for structure in spc.molecule])
+    if key is not None:
+        if len(RESONANCE_STRUCTURES) >= RESONANCE_CACHE_SIZE:
+            del RESONANCE_STRUCTURES[next(iter(RESONANCE_STRUCTURES))]  # evict the oldest entry
+        RESONANCE_STRUCTURES[key] = result
+    return result
 
-    for molecule1 in spc1.molecule:
-        for molecule2 in spc2.molecule:
-            if molecule1.is_isomorphic(molecule2, save_order=True):
-                return True
-    return False
+
+def get_wl_hash(mol, iterations=None):
+    """
+    Get a Weisfeiler-Lehman hash of a molecule graph.
+    Atoms are labeled by their element, isotope, charge, and radical electrons, and bonds by their order,
+    so isomorphic molecules always have equal hashes (the converse isn't guaranteed).
+    Hashes are only comparable within the same Python process.
+
+    Args:
+        mol (Molecule): An RMG Molecule object.
+        iterations (int, optional): The number of refinement iterations.
+
+    Returns:
+        int: The hash.
+    """
+    iterations = iterations if iterations is not None else WL_HASH_ITERATIONS
+    indices = {atom: i for i, atom in enumerate(mol.atoms)}
+    labels = [hash((atom.element.symbol, atom.element.isotope, atom.charge, atom.radical_electrons))
+              for atom in mol.atoms]
+    neighbors = [[(indices[neighbor], round(bond.order, 3)) for neighbor, bond in atom.edges.items()]
+                 for atom in mol.atoms]
+    for _ in range(iterations):
+        labels = [hash((label, tuple(sorted((labels[j], order) for j, order in atom_neighbors))))
+                  for label, atom_neighbors in zip(labels, neighbors)]
+    return hash(tuple(sorted(labels)))
 
 
 def get_center_of_mass(xyz):
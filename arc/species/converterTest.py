@@ -5,6 +5,7 @@
 This module contains unit tests of the arc.species.converter module
 """
 
+import copy
 import numpy as np
 import unittest
 
@@ -20,6 +21,7 @@ import arc.species.converter as converter
 from arc.common import almost_equal_coords_lists, almost_equal_lists
 from arc.exceptions import ConverterError
 from arc.species.species import ARCSpecies
+from arc.species.vectors import calculate_dihedral_angle, calculate_distance
 from arc.species.zmat import xyz_to_zmat
 
 
@@ -594,6 +596,55 @@ R1=1.0912"""
                            [-1.29769464, -1.18742971, 0.0]]
         self.assertEqual(coords, expected_coords)
 
+    def test_xyz_to_coords_array(self):
+        """Test the xyz_to_coords_array function"""
+        coords = converter.xyz_to_coords_array(self.xyz1['dict'])
+        self.assertEqual(coords.shape, (5, 3))
+        self.assertEqual(coords.dtype, np.float64)
+        self.assertFalse(coords.flags.writeable)
+        self.assertAlmostEqual(coords[1][2], 0.6300326)
+        xyz = converter.check_xyz_dict(self.xyz1['dict'])
+        self.assertIs(converter.xyz_to_coords_array(xyz), xyz.array)
+
+    def test_xyz_class(self):
+        """Test the XYZ class"""
+        xyz = converter.XYZ(symbols=self.xyz1['dict']['symbols'],
+                            isotopes=self.xyz1['dict']['isotopes'],
+                            coords=self.xyz1['dict']['coords'])
+        self.assertEqual(xyz, self.xyz1['dict'])
+        self.assertEqual(self.xyz1['dict'], xyz)
+        self.assertEqual(dict(xyz), self.xyz1['dict'])
+        self.assertIsInstance(xyz, dict)
+        self.assertEqual(list(xyz.keys()), ['symbols', 'isotopes', 'coords'])
+        self.assertIn('isotopes', xyz)
+        self.assertNotIn('vars', xyz)
+        self.assertIsInstance(xyz['coords'], tuple)
+        self.assertIsInstance(xyz['coords'][0], tuple)
+        self.assertEqual(xyz.array.shape, (5, 3))
+        self.assertIs(converter.check_xyz_dict(xyz), xyz)
+        self.assertIs(copy.deepcopy(xyz), xyz)
+        self.assertEqual(converter.xyz_to_str(xyz), converter.standardize_xyz_string(self.xyz1['str']))
+        with self.assertRaises(AttributeError):
+            xyz.symbols = ('C',)
+        with self.assertRaises(ValueError):
+            xyz.array[0, 0] = 1.0
+        with self.assertRaises(KeyError):
+            xyz['vars']
+        with self.assertRaises(TypeError):
+            xyz['coords'] = ((0.0, 0.0, 0.0),)
+        with self.assertRaises(TypeError):
+            xyz.update({'symbols': ('C',)})
+        with self.assertRaises(ConverterError):
+            converter.XYZ(symbols=('C', 'H'), isotopes=(12, 1), coords=((0.0, 0.0, 0.0),))
+        mutable_xyz = xyz.copy()
+        mutable_xyz['coords'] = ((0.0, 0.0, 0.0),)
+        self.assertEqual(xyz, self.xyz1['dict'])
+
+        # a read-only float64 array is used as is
+        array = np.zeros((2, 3), dtype=np.float64)
+        array.setflags(write=False)
+        self.assertIs(converter.XYZ(symbols=('C', 'O'), isotopes=(12, 16), coords=array).array, array)
+
     def test_xyz_to_xyz_file_format(self):
         """Test generating the XYZ file format from the xyz dictionary"""
         xyzf1 = converter.xyz_to_xyz_file_format(xyz_dict=self.xyz1['dict'], comment='test methane xyz conversion')
@@ -4044,6 +4095,40 @@ H      -0.81291200   -0.46933500   -0.31111876"""
         self.assertTrue(almost_equal_coords_lists(new_xyz, expected_xyz))
         self.assertAlmostEqual(converter.get_zmat_param_value(coords=new_xyz, indices=indices, mol=mol4), new_val, 5)
 
+    def test_modify_dihedrals(self):
+        """Test setting dihedral angles in many geometries at once"""
+        xyz1 = {'symbols': ('O', 'C', 'C', 'O', 'H', 'H', 'H', 'H'),
+                'isotopes': (16, 12, 12, 16, 1, 1, 1, 1),
+                'coords': ((1.53830201, 0.86423425, 0.07482439), (0.94923576, -0.20847619, -0.03881977),
+                           (-0.56154542, -0.31516675, -0.05011465), (-1.18981166, 0.93489731, 0.17603211),
+                           (1.49712659, -1.15833718, -0.15458647), (-0.87737433, -0.70077243, -1.02287491),
+                           (-0.87053611, -1.01071746, 0.73427128), (-0.48610273, 1.61361259, 0.11915705))}
+        mol1 = converter.molecules_from_xyz(xyz1)[1]
+        torsions = [[0, 1, 2, 3], [1, 2, 3, 7]]
+        bonds = [[0, 1], [1, 2], [2, 3], [1, 4], [2, 5], [2, 6], [3, 7]]
+
+        dihedrals = [[-170.0], [-60.0], [5.0], [59.5], [120.0], [180.0]]
+        new_xyzs = converter.modify_dihedrals(xyz=xyz1, torsions=torsions[:1], dihedrals=dihedrals, mol=mol1)
+        self.assertEqual(len(new_xyzs), 6)
+        original_dihedral = calculate_dihedral_angle(coords=xyz1, torsion=torsions[1], index=0)
+        for new_xyz, new_dihedrals in zip(new_xyzs, dihedrals):
+            self.assertEqual(new_xyz['symbols'], xyz1['symbols'])
+            self.assertEqual(new_xyz['isotopes'], xyz1['isotopes'])
+            self.assertAlmostEqual(calculate_dihedral_angle(coords=new_xyz, torsion=torsions[0], index=0) % 360,
+                                   new_dihedrals[0] % 360, 3)
+            self.assertAlmostEqual(calculate_dihedral_angle(coords=new_xyz, torsion=torsions[1], index=0),
+                                   original_dihedral, 3)
+            for bond in bonds:
+                self.assertAlmostEqual(calculate_distance(coords=new_xyz, atoms=bond, index=0),
+                                       calculate_distance(coords=xyz1, atoms=bond, index=0), 3)
+
+        dihedrals = [[-120.0, 60.0], [5.0, 180.0], [120.0, -90.0]]
+        new_xyzs = converter.modify_dihedrals(xyz=xyz1, torsions=torsions, dihedrals=dihedrals, mol=mol1)
+        for new_xyz, new_dihedrals in zip(new_xyzs, dihedrals):
+            for torsion, new_dihedral in zip(torsions, new_dihedrals):
+                self.assertAlmostEqual(calculate_dihedral_angle(coords=new_xyz, torsion=torsion, index=0) % 360,
+                                       new_dihedral % 360, 3)
+
     def test_compare_zmats(self):
         """Test determining whether two conformers have almost equal internal coordinates (zmats)"""
         z_1 = {'symbols': ('N', 'N', 'H', 'H'),
@@ -4186,6 +4271,31 @@ H      -0.81291200   -0.46933500   -0.31111876"""
         mol2 = Molecule(smiles='[N-]=[N+]=O')
         self.assertTrue(converter.check_isomorphism(mol1, mol2))
 
+        mol3 = Molecule(smiles='CCO')
+        mol4 = Molecule(smiles='COC')
+        self.assertFalse(converter.check_isomorphism(mol3, mol4))
+        self.assertTrue(converter.check_isomorphism(mol3, Molecule(smiles='OCC')))
+        self.assertFalse(converter.check_isomorphism(mol3, mol4, convert_to_single_bonds=True))
+
+    def test_get_resonance_structures(self):
+        """Test getting cached resonance structures of a molecule"""
+        mol = Molecule(smiles='[O-][N+]#N')
+        structures, hashes = converter.get_resonance_structures(mol)
+        self.assertGreater(len(structures), 1)
+        self.assertEqual(len(structures), len(hashes))
+        self.assertIn(converter.get_wl_hash(Molecule(smiles='[N-]=[N+]=O')), hashes)
+        cached_structures, cached_hashes = converter.get_resonance_structures(mol.copy(deep=True))
+        self.assertIs(cached_structures, structures)
+        single_bond_structures = converter.get_resonance_structures(mol, convert_to_single_bonds=True)[0]
+        self.assertEqual(len(single_bond_structures), 1)
+        self.assertTrue(all(bond.is_single() for bond in single_bond_structures[0].get_all_edges()))
+
+    def test_get_wl_hash(self):
+        """Test getting a Weisfeiler-Lehman hash of a molecule"""
+        self.assertEqual(converter.get_wl_hash(Molecule(smiles='CCO')), converter.get_wl_hash(Molecule(smiles='OCC')))
+        self.assertNotEqual(converter.get_wl_hash(Molecule(smiles='CCO')), converter.get_wl_hash(Molecule(smiles='COC')))
+        self.assertNotEqual(converter.get_wl_hash(Molecule(smiles='C=C')), converter.get_wl_hash(Molecule(smiles='CC')))
+
 
 if __name__ == '__main__':
     unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
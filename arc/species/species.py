@@ -844,6 +844,10 @@ class ARCSpecies(object):
                             n_confs: int = 10,
                             e_confs: float = 5,
                             plot_path: str = None,
+                            max_workers: int = 1,
+                            combination_search: str = None,
+                            max_ff_evaluations: int = None,
+                            wall_time: float = None,
                             ) -> None:
         """
         Generate conformers
@@ -855,39 +859,104 @@ class ARCSpecies(object):
                                        (unique) generated conformers will be stored in the .conformers attribute.
             plot_path (str, optional): A folder path in which the plot will be saved.
                                        If None, the plot will not be shown (nor saved).
+            max_workers (int, optional): The max number of local processes to use for force field computations.
+            combination_search (str, optional): The strategy for searching conformer combinations of species with many
+                                                torsions, either 'lowest_conformer' or 'simulated_annealing'.
+                                                The ``default_conformer_combination_search`` setting is used
+                                                if not given.
+            max_ff_evaluations (int, optional): The maximum number of force field evaluations of a stochastic
+                                                conformer combination search.
+                                                The ``default_conformer_max_ff_evaluations`` setting is used
+                                                if not given.
+            wall_time (float, optional): A wall time budget in seconds for embedding random force field conformers.
+                                         The ``conformer_wall_time`` setting is used if not given.
         """
         if not self.is_ts:
-            if not self.charge:
-                mol_list = self.mol_list
-            else:
-                mol_list = [self.mol]
-            if self.consider_all_diastereomers:
-                diastereomers = None
-            else:
-                xyz = self.get_xyz(generate=False)
-                diastereomers = [xyz] if xyz is not None else None
-            lowest_confs = conformers.generate_conformers(mol_list=mol_list,
-                                                          label=self.label,
-                                                          charge=self.charge,
-                                                          multiplicity=self.multiplicity,
-                                                          force_field=self.force_field,
-                                                          print_logs=False,
-                                                          n_confs=n_confs,
-                                                          e_confs=e_confs,
-                                                          return_all_conformers=False,
-                                                          plot_path=plot_path,
-                                                          diastereomers=diastereomers)
-            if len(lowest_confs):
-                self.conformers.extend([conf['xyz'] for conf in lowest_confs])
-                self.conformer_energies.extend([None] * len(lowest_confs))
-                if lowest_confs:
-                    lowest_conf = conformers.get_lowest_confs(label=self.label, confs=lowest_confs, n=1)[0]
-                    logger.debug(f'Most stable force field conformer for {self.label}:\n'
-                                 f'{xyz_to_str(lowest_conf["xyz"])}\n')
-            else:
-                xyz = self.get_xyz(generate=False)
-                if xyz is None or not xyz:
-                    logger.error(f'No 3D coordinates available for species {self.label}!')
+            kwargs = self.get_conformer_generation_kwargs(n_confs=n_confs, e_confs=e_confs, plot_path=plot_path,
+                                                          max_workers=max_workers,
+                                                          combination_search=combination_search,
+                                                          max_ff_evaluations=max_ff_evaluations,
+                                                          wall_time=wall_time)
+            lowest_confs = conformers.generate_conformers(**kwargs)
+            self.add_generated_conformers(lowest_confs)
+
+    def get_conformer_generation_kwargs(self,
+                                        n_confs: int = 10,
+                                        e_confs: float = 5,
+                                        plot_path: str = None,
+                                        max_workers: int = 1,
+                                        combination_search: str = None,
+                                        max_ff_evaluations: int = None,
+                                        wall_time: float = None,
+                                        ) -> dict:
+        """
+        Get the (picklable) keyword arguments for generating conformers of this species
+        using ``conformers.generate_conformers()``, e.g., in a background process.
+
+        Args:
+            n_confs (int, optional): The max number of conformers to generate.
+            e_confs (float, optional): The energy threshold in kJ/mol above the lowest energy conformer below which all
+                                       (unique) generated conformers will be returned.
+            plot_path (str, optional): A folder path in which the plot will be saved.
+                                       If None, the plot will not be shown (nor saved).
+            max_workers (int, optional): The max number of local processes to use for force field computations.
+            combination_search (str, optional): The strategy for searching conformer combinations of species with many
+                                                torsions, either 'lowest_conformer' or 'simulated_annealing'.
+                                                The ``default_conformer_combination_search`` setting is used
+                                                if not given.
+            max_ff_evaluations (int, optional): The maximum number of force field evaluations of a stochastic
+                                                conformer combination search.
+                                                The ``default_conformer_max_ff_evaluations`` setting is used
+                                                if not given.
+            wall_time (float, optional): A wall time budget in seconds for embedding random force field conformers.
+                                         The ``conformer_wall_time`` setting is used if not given.
+
+        Returns:
+            dict: The keyword arguments.
+        """
+        if not self.charge:
+            mol_list = self.mol_list
+        else:
+            mol_list = [self.mol]
+        if self.consider_all_diastereomers:
+            diastereomers = None
+        else:
+            xyz = self.get_xyz(generate=False)
+            diastereomers = [xyz] if xyz is not None else None
+        return {'mol_list': mol_list,
+                'label': self.label,
+                'charge': self.charge,
+                'multiplicity': self.multiplicity,
+                'force_field': self.force_field,
+                'print_logs': False,
+                'n_confs': n_confs,
+                'e_confs': e_confs,
+                'return_all_conformers': False,
+                'plot_path': plot_path,
+                'diastereomers': diastereomers,
+                'max_workers': max_workers,
+                'combination_search': combination_search,
+                'max_ff_evaluations': max_ff_evaluations,
+                'wall_time': wall_time,
+                }
+
+    def add_generated_conformers(self, lowest_confs: list):
+        """
+        Store conformers generated by ``conformers.generate_conformers()`` in the .conformers attribute.
+
+        Args:
+            lowest_confs (list): Entries are conformer dictionaries.
+        """
+        if lowest_confs is not None and len(lowest_confs):
+            self.conformers.extend([conf['xyz'] for conf in lowest_confs])
+            self.conformer_energies.extend([None] * len(lowest_confs))
+            lowest_conf = conformers.get_lowest_confs(label=self.label, confs=lowest_confs, n=1)[0]
+            logger.debug(f'Most stable force field conformer for {self.label}:\n'
+                         f'{xyz_to_str(lowest_conf["xyz"])}\n')
+        else:
+            xyz = self.get_xyz(generate=False)
+            if xyz is None or not xyz:
+                logger.error(f'No 3D coordinates available for species {self.label}!')
 
     def get_cheap_conformer(self):
         """
@@ -52,9 +52,33 @@ def get_angle(v1: list,
     """
     if len(v1) != len(v2):
         raise VectorsError(f'v1 and v2 must be the same length, got {len(v1)} and {len(v2)}.')
-    v1_u, v2_u = unit_vector(v1), unit_vector(v2)
+    return float(get_angles(v1, v2, units=units))
+
+
+def get_angles(v1: np.ndarray,
+               v2: np.ndarray,
+               units: str = 'rads',
+               ) -> np.ndarray:
+    """
+    Calculate the angles between pairs of vectors at once.
+
+    Args:
+         v1 (np.ndarray): The first vectors, an array of shape (..., D).
+         v2 (np.ndarray): The second vectors, an array of the same shape as ``v1``.
+         units (str, optional): The desired units, either 'rads' for radians, or 'degs' for degrees.
+
+    Returns:
+        np.ndarray: The angles between the respective vectors in the desired units, an array of shape (...).
+                    Entries are ``nan`` if either vector has a zero length.
+    """
+    v1, v2 = np.asarray(v1), np.asarray(v2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # the vector lengths are taken in the precision of the given vectors (as done by ``get_vector_length()``)
+        v1_u = v1.astype(np.float64) / np.sqrt((v1 * v1).sum(axis=-1, keepdims=True).astype(np.float64))
+        v2_u = v2.astype(np.float64) / np.sqrt((v2 * v2).sum(axis=-1, keepdims=True).astype(np.float64))
+        angles = np.arccos(np.clip((v1_u * v2_u).sum(axis=-1), -1.0, 1.0))
     conversion = 180 / math.pi if 'degs' in units else 1
-    return float(np.arccos(np.clip(np.dot(v1_u, v2_u), -1.0, 1.0)) * conversion)
+    return angles * conversion
 
 
 def get_dihedral(v1:list,
@@ -81,18 +105,58 @@ def get_dihedral(v1:list,
     """
     if len(v1) != 3 or len(v2) != 3 or len(v3) != 3:
         raise VectorsError(f'v1, v2, and v3 must have a length of three, got {len(v1)}, {len(v2)}, and {len(v3)}.')
-    v1, v2, v3 = np.array(v1, np.float64), np.array(v2, np.float64), np.array(v3, np.float64)
-    v2_x_v1 = np.cross(v2, v1)
-    v2_x_v1 /= float(np.linalg.norm(v2_x_v1))
-    v3_x_v2 = np.cross(v3, v2)
-    v3_x_v2 /= np.linalg.norm(v3_x_v2)
-    dihedral = np.arccos(np.clip(np.vdot(v2_x_v1, v3_x_v2), -1, 1))
-    if np.vdot(v2_x_v1, v3) > 0:
-        dihedral = 2 * np.pi - dihedral
+    dihedral = get_dihedrals(v1, v2, v3, units=units)
     if np.isnan(dihedral):
         raise VectorsError('Could not calculate a dihedral angle')
+    return float(dihedral)
+
+
+def get_dihedrals(v1: np.ndarray,
+                  v2: np.ndarray,
+                  v3: np.ndarray,
+                  units: str = 'degs',
+                  ) -> np.ndarray:
+    """
+    Calculate the dihedral angles between triplets of vectors at once (see ``get_dihedral()``).
+
+    Args:
+         v1 (np.ndarray): The first vectors, an array of shape (..., 3).
+         v2 (np.ndarray): The second vectors, an array of shape (..., 3).
+         v3 (np.ndarray): The third vectors, an array of shape (..., 3).
+         units (str, optional): The desired units, either 'rads' for radians, or 'degs' for degrees.
+
+    Returns:
+        np.ndarray: The dihedral angles in the desired units in a 0-360 degrees range, an array of shape (...).
+                    Entries are ``nan`` if the dihedral angle is not defined.
+    """
+    v1, v2, v3 = np.asarray(v1, np.float64), np.asarray(v2, np.float64), np.asarray(v3, np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        v2_x_v1 = _cross(v2, v1)
+        v2_x_v1 /= np.sqrt((v2_x_v1 * v2_x_v1).sum(axis=-1, keepdims=True))
+        v3_x_v2 = _cross(v3, v2)
+        v3_x_v2 /= np.sqrt((v3_x_v2 * v3_x_v2).sum(axis=-1, keepdims=True))
+        dihedrals = np.arccos(np.clip((v2_x_v1 * v3_x_v2).sum(axis=-1), -1, 1))
+    dihedrals = np.where((v2_x_v1 * v3).sum(axis=-1) > 0, 2 * np.pi - dihedrals, dihedrals)
     conversion = 180 / math.pi if 'degs' in units else 1
-    return float(dihedral * conversion)
+    return dihedrals * conversion
+
+
+def _cross(v1: np.ndarray,
+           v2: np.ndarray,
+           ) -> np.ndarray:
+    """
+    A cross product of 3D vectors stacked in arrays of shape (..., 3) (faster than ``np.cross`` for small arrays).
+
+    Args:
+        v1 (np.ndarray): The first vectors.
+        v2 (np.ndarray): The second vectors.
+
+    Returns:
+        np.ndarray: The cross products.
+    """
+    return np.stack([v1[..., 1] * v2[..., 2] - v1[..., 2] * v2[..., 1],
+                     v1[..., 2] * v2[..., 0] - v1[..., 0] * v2[..., 2],
+                     v1[..., 0] * v2[..., 1] - v1[..., 1] * v2[..., 0]], axis=-1)
 
 
 def calculate_distance(coords: list or tuple or dict,
@@ -114,9 +178,11 @@ def calculate_distance(coords: list or tuple or dict,
     Returns:
         float: The distance in the coords units.
     """
-    if isinstance(coords, dict) and 'coords' in coords:
+    if isinstance(coords, converter.XYZ):
+        coords = coords.array
+    elif isinstance(coords, dict) and 'coords' in coords:
         coords = coords['coords']
-    if not isinstance(coords, (list, tuple)):
+    if not isinstance(coords, (list, tuple, np.ndarray)):
         raise TypeError(f'coords must be a list or a tuple, got\n{coords}\nwhich is a {type(coords)}')
     if index not in [0, 1]:
         raise VectorsError(f'index must be either 0 or 1, got {index}')
@@ -132,10 +198,27 @@ def calculate_distance(coords: list or tuple or dict,
             new_atoms.append(atom)
     if not all([isinstance(a, int) for a in new_atoms]):
         raise VectorsError(f'all entries in atoms must be integers, got: {new_atoms} ({[type(a) for a in new_atoms]})')
-    new_atoms = [a - index for a in new_atoms]  # convert 1-index to 0-index
-    coords = np.asarray(coords, dtype=np.float32)
-    vector = coords[new_atoms[1]] - coords[new_atoms[0]]
-    return get_vector_length(vector)
+    return float(calculate_distances(coords=coords, atoms=[new_atoms], index=index)[0])
+
+
+def calculate_distances(coords: list or tuple or dict or np.ndarray,
+                        atoms: list or np.ndarray,
+                        index: int = 0,
+                        ) -> np.ndarray:
+    """
+    Calculate distances between pairs of atoms at once, optionally in several conformers.
+
+    Args:
+        coords (list, tuple, dict, np.ndarray): The coordinates (see ``get_coords_array()``).
+        atoms (list, np.ndarray): Entries are the 2 atoms defining each distance (a K x 2 array).
+        index (int, optional): Whether ``atoms`` are 0-indexed or 1-indexed (values are 0 or 1).
+
+    Returns:
+        np.ndarray: The distances in the coords units, an array of length K, or an M x K array for M conformers.
+    """
+    coords, atoms = get_coords_array(coords), get_atoms_array(atoms, length=2, index=index)
+    vectors = coords[..., atoms[:, 1], :] - coords[..., atoms[:, 0], :]
+    return np.sqrt((vectors * vectors).sum(axis=-1).astype(np.float64))
 
 
 def calculate_angle(coords: list or tuple or dict,
@@ -159,9 +242,11 @@ def calculate_angle(coords: list or tuple or dict,
     Returns:
         float: The angle.
     """
-    if isinstance(coords, dict) and 'coords' in coords:
+    if isinstance(coords, converter.XYZ):
+        coords = coords.array
+    elif isinstance(coords, dict) and 'coords' in coords:
         coords = coords['coords']
-    if not isinstance(coords, (list, tuple)):
+    if not isinstance(coords, (list, tuple, np.ndarray)):
         raise TypeError(f'coords must be a list or a tuple, got\n{coords}\nwhich is a {type(coords)}')
     if index not in [0, 1]:
         raise VectorsError(f'index must be either 0 or 1, got {index}')
@@ -177,11 +262,32 @@ def calculate_angle(coords: list or tuple or dict,
             new_atoms.append(atom)
     if not all([isinstance(a, int) for a in new_atoms]):
         raise VectorsError(f'all entries in atoms must be integers, got: {new_atoms} ({[type(a) for a in new_atoms]})')
-    new_atoms = [a - index for a in new_atoms]  # convert 1-index to 0-index
-    coords = np.asarray(coords, dtype=np.float32)
-    v1 = coords[new_atoms[1]] - coords[new_atoms[0]]
-    v2 = coords[new_atoms[1]] - coords[new_atoms[2]]
-    return get_angle(v1, v2, units=units)
+    return float(calculate_angles(coords=coords, atoms=[new_atoms], index=index, units=units)[0])
+
+
+def calculate_angles(coords: list or tuple or dict or np.ndarray,
+                     atoms: list or np.ndarray,
+                     index: int = 0,
+                     units: str = 'degs',
+                     ) -> np.ndarray:
+    """
+    Calculate angles at once, optionally in several conformers.
+
+    Args:
+        coords (list, tuple, dict, np.ndarray): The coordinates (see ``get_coords_array()``).
+        atoms (list, np.ndarray): Entries are the 3 atoms defining each angle (a K x 3 array),
+                                  the second atom is the vertex.
+        index (int, optional): Whether ``atoms`` are 0-indexed or 1-indexed (values are 0 or 1).
+        units (str, optional): The desired units, either 'rads' for radians, or 'degs' for degrees.
+
+    Returns:
+        np.ndarray: The angles, an array of length K, or an M x K array for M conformers.
+                    Entries are ``nan`` if the angle is not defined.
+    """
+    coords, atoms = get_coords_array(coords), get_atoms_array(atoms, length=3, index=index)
+    v1 = coords[..., atoms[:, 1], :] - coords[..., atoms[:, 0], :]
+    v2 = coords[..., atoms[:, 1], :] - coords[..., atoms[:, 2], :]
+    return get_angles(v1, v2, units=units)
 
 
 def calculate_dihedral_angle(coords: list or tuple or dict,
@@ -205,9 +311,11 @@ def calculate_dihedral_angle(coords: list or tuple or dict,
     Returns:
         float: The dihedral angle in a 0-360 degrees range.
     """
-    if isinstance(coords, dict) and 'coords' in coords:
+    if isinstance(coords, converter.XYZ):
+        coords = coords.array
+    elif isinstance(coords, dict) and 'coords' in coords:
         coords = coords['coords']
-    if not isinstance(coords, (list, tuple)):
+    if not isinstance(coords, (list, tuple, np.ndarray)):
         raise TypeError(f'coords must be a list or a tuple, got\n{coords}\nwhich is a {type(coords)}')
     if index not in [0, 1]:
         raise VectorsError(f'index must be either 0 or 1, got {index}')
@@ -224,12 +332,90 @@ def calculate_dihedral_angle(coords: list or tuple or dict,
     if not all([isinstance(t, int) for t in new_torsion]):
         raise VectorsError(f'all entries in torsion must be integers, got: {new_torsion} '
                            f'({[type(t) for t in new_torsion]})')
-    new_torsion = [t - index for t in new_torsion]  # convert 1-index to 0-index if needed
-    coords = np.asarray(coords, dtype=np.float32)
-    v1 = coords[new_torsion[1]] - coords[new_torsion[0]]
-    v2 = coords[new_torsion[2]] - coords[new_torsion[1]]
-    v3 = coords[new_torsion[3]] - coords[new_torsion[2]]
-    return get_dihedral(v1, v2, v3, units=units)
+    dihedral = calculate_dihedral_angles(coords=coords, torsions=[new_torsion], index=index, units=units)[0]
+    if np.isnan(dihedral):
+        raise VectorsError('Could not calculate a dihedral angle')
+    return float(dihedral)
+
+
+def calculate_dihedral_angles(coords: list or tuple or dict or np.ndarray,
+                              torsions: list or np.ndarray,
+                              index: int = 0,
+                              units: str = 'degs',
+                              ) -> np.ndarray:
+    """
+    Calculate dihedral angles at once, optionally in several conformers
+    (e.g., all torsions of an entire conformer ensemble in a single call).
+
+    Args:
+        coords (list, tuple, dict, np.ndarray): The coordinates (see ``get_coords_array()``).
+        torsions (list, np.ndarray): Entries are the 4 atoms defining each dihedral angle (a K x 4 array).
+        index (int, optional): Whether ``torsions`` are 0-indexed or 1-indexed (values are 0 or 1).
+        units (str, optional): The desired units, either 'rads' for radians, or 'degs' for degrees.
+
+    Returns:
+        np.ndarray: The dihedral angles in a 0-360 degrees range, an array of length K, or an M x K array
+                    for M conformers. Entries are ``nan`` if the dihedral angle is not defined.
+    """
+    coords, torsions = get_coords_array(coords), get_atoms_array(torsions, length=4, index=index)
+    v1 = coords[..., torsions[:, 1], :] - coords[..., torsions[:, 0], :]
+    v2 = coords[..., torsions[:, 2], :] - coords[..., torsions[:, 1], :]
+    v3 = coords[..., torsions[:, 3], :] - coords[..., torsions[:, 2], :]
+    return get_dihedrals(v1, v2, v3, units=units)
+
+
+def get_coords_array(coords: list or tuple or dict or np.ndarray) -> np.ndarray:
+    """
+    Get a coordinates array for calculating internal coordinates.
+    Differences between coordinates are taken in single precision, as done historically by the scalar functions
+    (e.g., ``calculate_distance()``), so that the scalar and the array functions give identical results.
+
+    Args:
+        coords (list, tuple, dict, np.ndarray): Either the array-format or tuple-format coordinates or the xyz dict
+                                                of a single conformer, or a list of xyz dicts of several conformers,
+                                                or an M x N x 3 array of the coordinates of M conformers.
+
+    Raises:
+        TypeError: If ``coords`` is of wrong type.
+
+    Returns:
+        np.ndarray: An N x 3 (or M x N x 3) array.
+    """
+    if isinstance(coords, converter.XYZ):
+        coords = coords.array
+    elif isinstance(coords, dict) and 'coords' in coords:
+        coords = coords['coords']
+    elif isinstance(coords, (list, tuple)) and len(coords) and isinstance(coords[0], (dict, converter.XYZ)):
+        coords = [converter.xyz_to_coords_array(xyz) for xyz in coords]
+    if not isinstance(coords, (list, tuple, np.ndarray)):
+        raise TypeError(f'coords must be a list or a tuple, got\n{coords}\nwhich is a {type(coords)}')
+    return np.asarray(coords, dtype=np.float32)
+
+
+def get_atoms_array(atoms: list or np.ndarray,
+                    length: int,
+                    index: int = 0,
+                    ) -> np.ndarray:
+    """
+    Get a 0-indexed array of atom index tuples defining internal coordinates.
+
+    Args:
+        atoms (list, np.ndarray): Entries are atom indices defining each internal coordinate.
+        length (int): The number of atoms defining each internal coordinate (2, 3, or 4).
+        index (int, optional): Whether ``atoms`` are 0-indexed or 1-indexed (values are 0 or 1).
+
+    Raises:
+        VectorsError: If ``index`` is out of range, or ``atoms`` are of wrong length.
+
+    Returns:
+        np.ndarray: A K x ``length`` array of 0-indexed atom indices.
+    """
+    if index not in [0, 1]:
+        raise VectorsError(f'index must be either 0 or 1, got {index}')
+    atoms = np.asarray(atoms, dtype=int)
+    if atoms.size and atoms.shape[-1] != length:
+        raise VectorsError(f'atom lists must be of length {length}, got {atoms.shape[-1]}')
+    return atoms.reshape(-1, length) - index
 
 
 def unit_vector(vector: list) -> list:
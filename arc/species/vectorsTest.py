@@ -8,6 +8,8 @@ This module contains unit tests of the arc.species.vectors module
 import math
 import unittest
 
+import numpy as np
+
 import arc.species.converter as converter
 import arc.species.vectors as vectors
 from arc.exceptions import VectorsError
@@ -87,6 +89,17 @@ class TestVectors(unittest.TestCase):
         dihedral = vectors.get_dihedral(v1, v2, v3, units='degs')
         self.assertEqual(dihedral, 90.0)
 
+    def test_get_dihedrals(self):
+        """Test calculating dihedral angles from stacked vectors"""
+        v1 = [[1, 1, 0], [1, 0, 0], [0, 0, 0]]
+        v2 = [[0, 1, 1], [0, 1, 0], [0, 0, 0]]
+        v3 = [[1, 0, 1], [0, 0, 1], [0, 0, 0]]
+        dihedrals = vectors.get_dihedrals(v1, v2, v3, units='degs')
+        self.assertEqual(dihedrals.shape, (3,))
+        self.assertAlmostEqual(dihedrals[0], 109.4712206)
+        self.assertEqual(dihedrals[1], 90.0)
+        self.assertTrue(np.isnan(dihedrals[2]))
+
     def test_calculate_distance(self):
         """Test calculating a distance between two atoms"""
         propene = converter.str_to_xyz("""C       1.22905000   -0.16449200    0.00000000
@@ -246,6 +259,43 @@ O      -1.40465894   -0.03095532    0.00000000""")
         dihedral2 = vectors.calculate_dihedral_angle(coords=cj_11974['coords'], torsion=[15, 18, 19, 20], index=1)
         self.assertAlmostEqual(dihedral2, 308.04758, 2)
 
+    def test_calculate_internal_coordinates_arrays(self):
+        """Test calculating distances, angles, and dihedral angles of several conformers at once"""
+        propene = converter.str_to_xyz("""C       1.22905000   -0.16449200    0.00000000
+    C      -0.13529200    0.45314000    0.00000000
+    C      -1.27957200   -0.21983000    0.00000000
+    H       1.17363000   -1.25551200    0.00000000
+    H       1.79909600    0.15138400    0.87934300
+    H       1.79909600    0.15138400   -0.87934300
+    H      -0.16831500    1.54137600    0.00000000
+    H      -2.23664600    0.28960500    0.00000000
+    H      -1.29848800   -1.30626200    0.00000000""")
+        shifted_propene = converter.xyz_from_data(coords=propene.array + 1.0, symbols=propene['symbols'])
+        distances = vectors.calculate_distances(coords=propene, atoms=[[1, 4], [1, 2], [2, 3]], index=1)
+        self.assertEqual(distances.shape, (3,))
+        for distance, expected_distance in zip(distances, [1.092426698, 1.49763087, 1.32750337]):
+            self.assertAlmostEqual(distance, expected_distance)
+
+        angles = vectors.calculate_angles(coords=[propene, shifted_propene],
+                                          atoms=[[8, 3, 9], [1, 2, 3], [5, 1, 2]], index=1)
+        self.assertEqual(angles.shape, (2, 3))
+        for i, atoms in enumerate([[8, 3, 9], [1, 2, 3], [5, 1, 2]]):
+            self.assertEqual(angles[0, i], vectors.calculate_angle(coords=propene, atoms=atoms, index=1))
+            self.assertAlmostEqual(angles[1, i], angles[0, i], 4)
+
+        torsions = [[9, 3, 2, 7], [5, 1, 2, 7]]
+        dihedrals = vectors.calculate_dihedral_angles(coords=np.array([propene.array, shifted_propene.array]),
+                                                      torsions=torsions, index=1)
+        self.assertEqual(dihedrals.shape, (2, 2))
+        for i, torsion in enumerate(torsions):
+            self.assertEqual(dihedrals[0, i], vectors.calculate_dihedral_angle(coords=propene, torsion=torsion,
+                                                                               index=1))
+            self.assertAlmostEqual(dihedrals[1, i], dihedrals[0, i], 2)
+        self.assertAlmostEqual(dihedrals[0, 1], 59.26447, 2)
+
+        with self.assertRaises(VectorsError):
+            vectors.calculate_dihedral_angles(coords=propene, torsions=[[1, 2, 3]])
+
     def test_unit_vector(self):
         """Test calculating a unit vector"""
         v1 = [1, 0, 0]
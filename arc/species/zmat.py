@@ -36,7 +36,14 @@ from rmgpy.molecule.molecule import Molecule
 
 from arc.common import get_logger, key_by_val,determine_top_group_indices
 from arc.exceptions import ZMatError
-from arc.species.vectors import calculate_distance, calculate_angle, calculate_dihedral_angle, get_vector_length
+from arc.species.vectors import (calculate_angle,
+                                 calculate_angles,
+                                 calculate_dihedral_angle,
+                                 calculate_dihedral_angles,
+                                 calculate_distance,
+                                 calculate_distances,
+                                 get_coords_array,
+                                 )
 
 
 logger = get_logger()
@@ -49,6 +56,11 @@ DEFAULT_COMPARISON_A_TOL = 2.0  # degrees
 DEFAULT_COMPARISON_D_TOL = 2.0  # degrees
 TOL_180 = 0.9  # degrees
 KEY_FROM_LEN = {2: 'R', 3: 'A', 4: 'D'}
+ZMAT_PLAN_CACHE_SIZE = 1000  # the max number of compiled zmat plans (of distinct zmat skeletons) kept in memory
+ZMAT_PLANS = dict()  # compiled zmat plans, keys are zmat skeletons
+ZMAT_TEMPLATE_CACHE_SIZE = 1000  # the max number of zmat templates (of distinct species) kept in memory
+ZMAT_TEMPLATES = dict()  # zmat templates, keys are determined by get_zmat_template_key()
+RECORDED_ANGLES = list()  # a stack of lists to which angles evaluated while constructing a zmat are recorded
 
 
 def xyz_to_zmat(xyz, mol=None, constraints=None, consolidate=True, consolidation_tols=None):
@@ -61,6 +73,8 @@ def xyz_to_zmat(xyz, mol=None, constraints=None, consolidate=True, consolidation
     - 'map': a dictionary connecting atom indices in the zmat (keys) to atom indices in the mol/coords (values)
     This function assumes ``xyz`` has no dummy atoms.
     This function does not attempt to resolve constrain locks, and assumes only few non-circular constraints were given.
+    The zmat skeleton of a species is cached as a template (see ``ZMatTemplate``), and only the variable values
+    are calculated for other geometries of the same species.
 
     Args:
         xyz (dict): The xyz coordinates.
@@ -93,6 +107,54 @@ def xyz_to_zmat(xyz, mol=None, constraints=None, consolidate=True, consolidation
     constraints = constraints or dict()
     if mol is None and any('group' in constraint_key for constraint_key in constraints.keys()):
         raise ZMatError(f'Cannot generate a constrained zmat without mol. Got mol=None and constraints=\n{constraints}')
+    template_key = get_zmat_template_key(xyz, mol=mol, constraints=constraints)
+    template = ZMAT_TEMPLATES.get(template_key) if template_key is not None else None
+    zmat = template.fill(xyz) if template is not None else None
+    if zmat is None:
+        # no template, or the template does not fit this geometry (e.g., an angle became linear), construct the zmat
+        recorded_angles = list()
+        RECORDED_ANGLES.append(recorded_angles)
+        try:
+            zmat = _construct_zmat(xyz, mol=mol, constraints=constraints)
+        finally:
+            RECORDED_ANGLES.pop()
+        if template_key is not None and not any(symbol == 'X' for symbol in zmat['symbols']):
+            template = ZMatTemplate(zmat=zmat, recorded_angles=recorded_angles)
+            if len(ZMAT_TEMPLATES) >= ZMAT_TEMPLATE_CACHE_SIZE:
+                del ZMAT_TEMPLATES[next(iter(ZMAT_TEMPLATES))]  # evict the oldest template
+            ZMAT_TEMPLATES[template_key] = template
+            # values of templated zmats are always evaluated by the template, so they don't depend on the cache state
+            zmat = template.fill(xyz) or zmat
+
+    if consolidate and not constraints:
+        try:
+            zmat = consolidate_zmat(zmat, mol, consolidation_tols)
+        except (KeyError, ZMatError) as e:
+            logger.error(f'Could not consolidate zmat, got:\n{e.__class__}: {str(e)}')
+            logger.error(f'Generating zmat without consolidation.')
+
+    zmat['symbols'] = tuple(zmat['symbols'])
+    zmat['coords'] = tuple(zmat['coords'])
+    return zmat
+
+
+def _construct_zmat(xyz, mol=None, constraints=None):
+    """
+    Construct an (unconsolidated) z-matrix from cartesian coordinates.
+    A helper function for ``xyz_to_zmat()``, see its docstring for a description of the arguments.
+
+    Args:
+        xyz (dict): The xyz coordinates.
+        mol (Molecule, optional): The corresponding RMG Molecule.
+        constraints (dict, optional): The zmat constraints.
+
+    Returns:
+        dict: The z-matrix, its 'symbols' and 'coords' sections are lists.
+
+    Raises:
+        ZMatError: If the zmat could not be generated.
+    """
+    constraints = constraints or dict()
     xyz = xyz.copy()
     zmat = {'symbols': list(), 'coords': list(), 'vars': dict(), 'map': dict()}
     atom_order, connectivity = get_atom_order_from_mol(mol, constraints_dict=constraints) if mol is not None \
@@ -120,17 +182,115 @@ def xyz_to_zmat(xyz, mol=None, constraints=None, consolidate=True, consolidation
             # no atoms were popped from the skipped atoms list when iterating through all skipped atoms
             raise ZMatError(f"Could not generate the zmat, skipped atoms could not be assigned, there's probably "
                             f"a constraint lock. The partial zmat is:\n{zmat}\n\nskipped atoms are:\n{skipped_atoms}.")
+    return zmat
 
-    if consolidate and not constraints:
-        try:
-            zmat = consolidate_zmat(zmat, mol, consolidation_tols)
-        except (KeyError, ZMatError) as e:
-            logger.error(f'Could not consolidate zmat, got:\n{e.__class__}: {str(e)}')
-            logger.error(f'Generating zmat without consolidation.')
 
-    zmat['symbols'] = tuple(zmat['symbols'])
-    zmat['coords'] = tuple(zmat['coords'])
-    return zmat
+def get_zmat_template_key(xyz, mol=None, constraints=None):
+    """
+    Get a key of the geometry independent information a zmat is constructed from
+    (the atom symbols, the molecule connectivity, and the constraints).
+
+    Args:
+        xyz (dict): The xyz coordinates.
+        mol (Molecule, optional): The corresponding RMG Molecule.
+        constraints (dict, optional): The zmat constraints.
+
+    Returns:
+        Optional[tuple]: The key, ``None`` if it could not be determined.
+    """
+    mol_key = None
+    if mol is not None:
+        if not isinstance(mol, Molecule):
+            return None
+        mol_key = mol.to_adjacency_list(remove_h=False, remove_lone_pairs=True)
+    constraints_key = tuple(sorted((key, tuple(tuple(atoms) for atoms in val))
+                                   for key, val in (constraints or dict()).items()))
+    return tuple(xyz['symbols']), mol_key, constraints_key
+
+
+class ZMatTemplate(object):
+    """
+    The geometry independent part of a zmat (its skeleton: symbols, coords, and map), constructed once per species
+    from connectivity and constraints, and reused for filling in the zmat variable values of other geometries.
+
+    The atoms chosen for the zmat parameters depend on the geometry only by whether certain angles are linear.
+    All angles evaluated while constructing the zmat are recorded, and the template is only reused for a geometry
+    in which all of these angles have the same linearity. Templates aren't made for zmats with dummy atoms.
+
+    Args:
+        zmat (dict): The (unconsolidated) zmat to make a template of.
+        recorded_angles (list): Entries are tuples of xyz atom indices of angles evaluated while constructing the zmat,
+                                and whether the angle was linear.
+
+    Attributes:
+        symbols (tuple): The zmat symbols.
+        coords (tuple): The zmat coords (variable names).
+        map (dict): The zmat map.
+        var_names (tuple): The zmat variable names, ordered as in the zmat.
+        variables (dict): Keys are 'R', 'A', and 'D'. Values are tuples of the respective variable names
+                          and an array of the xyz atom indices of each variable.
+        angle_atoms (np.ndarray): The xyz atom indices of the recorded angles (K x 3).
+        linear (np.ndarray): Whether each recorded angle was linear.
+    """
+
+    def __init__(self, zmat, recorded_angles):
+        self.symbols = tuple(zmat['symbols'])
+        self.coords = tuple(zmat['coords'])
+        self.map = dict(zmat['map'])
+        self.var_names = tuple(zmat['vars'].keys())
+        self.variables = dict()
+        for key in ['R', 'A', 'D']:
+            names = tuple(var for var in zmat['vars'].keys() if var[0] == key)
+            atoms = [[self.map[index] for index in get_atom_indices_from_zmat_parameter(var)[0]] for var in names]
+            self.variables[key] = (names, np.array(atoms, dtype=int).reshape(-1, 'RAD'.index(key) + 2))
+        self.angle_atoms = np.array([atoms for atoms, _ in recorded_angles], dtype=int).reshape(-1, 3)
+        self.linear = np.array([linear for _, linear in recorded_angles], dtype=bool)
+
+    def fill(self, xyz):
+        """
+        Fill in the zmat variable values from a geometry.
+
+        Args:
+            xyz (dict): The xyz coordinates, ordered as the xyz from which the template was constructed.
+
+        Returns:
+            Optional[dict]: The (unconsolidated) zmat, its 'symbols' and 'coords' sections are lists.
+                            ``None`` if the template does not fit this geometry.
+        """
+        coords = get_coords_array(xyz)
+        angles = calculate_angles(coords, self.angle_atoms)
+        linear = ((180 - TOL_180 < angles) & (angles <= 180)) | ((0 <= angles) & (angles < TOL_180))
+        if np.any(linear != self.linear):
+            return None
+        values = dict()
+        for key, func in [('R', calculate_distances), ('A', calculate_angles), ('D', calculate_dihedral_angles)]:
+            names, atoms = self.variables[key]
+            key_values = func(coords, atoms)
+            if np.any(np.isnan(key_values)):
+                return None
+            values.update(zip(names, key_values.tolist()))
+        return {'symbols': list(self.symbols),
+                'coords': list(self.coords),
+                'vars': {var: values[var] for var in self.var_names},
+                'map': dict(self.map)}
+
+
+def _calculate_angle(coords, atoms):
+    """
+    Calculate an angle on which the zmat construction depends (see ``calculate_angle()``).
+    The angle atoms and whether the angle is linear are recorded if a zmat is being constructed for a template.
+
+    Args:
+        coords (list, tuple, dict): The array-format or tuple-format coordinates, or the xyz dict.
+        atoms (list): The 3 atoms (0-indexed) defining the angle.
+
+    Returns:
+        float: The angle in degrees.
+    """
+    angle = calculate_angle(coords=coords, atoms=atoms)
+    if RECORDED_ANGLES:
+        RECORDED_ANGLES[-1].append((tuple(atoms), is_angle_linear(angle)))
+    return angle
 
 
 def determine_r_atoms(zmat, xyz, connectivity, n, atom_index, r_constraint=None, trivial_assignment=False):
@@ -186,7 +346,7 @@ def determine_r_atoms(zmat, xyz, connectivity, n, atom_index, r_constraint=None,
                 atom_list_to_explore1, atom_list_to_explore2 = atom_list_to_explore2, []
                 if len(top) >= 2:
                     # calculate the angle formed with the index_atom
-                    angle = calculate_angle(coords=xyz['coords'], atoms=[atom_index] + top[-2:], index=0, units='degs')
+                    angle = _calculate_angle(coords=xyz['coords'], atoms=[atom_index] + top[-2:])
                     if not is_angle_linear(angle):
                         linear = False
                         if len(top) >= 3:
@@ -305,7 +465,7 @@ def determine_a_atoms(zmat, coords, connectivity, r_atoms, n, atom_index, a_cons
                             # atom B might be in a linear chain, determine the A -- B -- C angle
                             b_neighbors = connectivity[atom_b]
                             atom_a = b_neighbors[0] if b_neighbors[0] != atom_c else b_neighbors[1]
-                            angle = calculate_angle(coords=coords, atoms=[atom_a, atom_b, atom_c])
+                            angle = _calculate_angle(coords=coords, atoms=[atom_a, atom_b, atom_c])
                             if is_angle_linear(angle):
                                 # A -- B -- C is linear, change indices and test angle E -- A -- B instead
                                 atom_c = atom_b
@@ -345,7 +505,7 @@ def determine_a_atoms(zmat, coords, connectivity, r_atoms, n, atom_index, a_cons
                     if j != i and atom_a not in [atom_b, atom_c] \
                             and (j in list(zmat['map'].keys()) and not is_dummy(zmat, j)
                                  or j not in list(zmat['map'].keys())):
-                        angle = calculate_angle(coords=coords, atoms=[atom_a, atom_b, atom_c])
+                        angle = _calculate_angle(coords=coords, atoms=[atom_a, atom_b, atom_c])
                         if is_angle_linear(angle):
                             # A -- B -- C is linear, change indices and test angle E -- A -- B
                             atom_b = atom_a
@@ -423,8 +583,8 @@ def determine_d_atoms(zmat, xyz, coords, connectivity, a_atoms, n, atom_index, d
         if len(d_atoms) < 4:
             for i in reversed(range(len(xyz['symbols']))):
                 if i not in d_atoms and i in list(zmat['map'].keys()):
-                    angle = calculate_angle(coords=coords, atoms=[zmat['map'][z_index]
-                                                                  for z_index in d_atoms[1:] + [i]])
+                    angle = _calculate_angle(coords=coords, atoms=[zmat['map'][z_index]
+                                                                   for z_index in d_atoms[1:] + [i]])
                     if not is_angle_linear(angle):
                         d_atoms.append(i)
                         break
@@ -454,7 +614,7 @@ def determine_d_atoms_without_connectivity(zmat, coords, a_atoms, n):
     d_atoms = [atom for atom in a_atoms]
     for i in reversed(range(n)):
         if i not in d_atoms and i in list(zmat['map'].keys()) and (i >= len(zmat['symbols']) or not is_dummy(zmat, i)):
-            angle = calculate_angle(coords=coords, atoms=[zmat['map'][z_index] for z_index in d_atoms[1:] + [i]])
+            angle = _calculate_angle(coords=coords, atoms=[zmat['map'][z_index] for z_index in d_atoms[1:] + [i]])
             if not is_angle_linear(angle):
                 d_atoms.append(i)
                 break
@@ -462,7 +622,7 @@ def determine_d_atoms_without_connectivity(zmat, coords, a_atoms, n):
         # try again and consider dummies
         for i in reversed(range(n)):
             if i not in d_atoms and i in list(zmat['map'].keys()):
-                angle = calculate_angle(coords=coords, atoms=[zmat['map'][z_index] for z_index in d_atoms[1:] + [i]])
+                angle = _calculate_angle(coords=coords, atoms=[zmat['map'][z_index] for z_index in d_atoms[1:] + [i]])
                 if not is_angle_linear(angle):
                     d_atoms.append(i)
                     break
@@ -508,7 +668,7 @@ def determine_d_atoms_from_connectivity(zmat, xyz, coords, connectivity, a_atoms
                 i = 0
                 atom_a, atom_b, atom_c = atom, zmat['map'][d_atoms[2]], zmat['map'][d_atoms[1]]
                 while i < len(list(connectivity.keys())):
-                    angle = calculate_angle(coords=coords, atoms=[atom_a, atom_b, atom_c])
+                    angle = _calculate_angle(coords=coords, atoms=[atom_a, atom_b, atom_c])
                     if is_angle_linear(angle):
                         num_of_neighbors = len(list(connectivity[atom_a]))
                         if num_of_neighbors == 1:
@@ -524,7 +684,7 @@ def determine_d_atoms_from_connectivity(zmat, xyz, coords, connectivity, a_atoms
                             a_neighbors = connectivity[atom_a]
                             atom_e = a_neighbors[0] if a_neighbors[0] != atom_b else a_neighbors[1]
                             if atom_e in list(zmat['map'].values()):
-                                angle = calculate_angle(coords=coords, atoms=[atom_e, atom_b, atom_c])
+                                angle = _calculate_angle(coords=coords, atoms=[atom_e, atom_b, atom_c])
                                 if is_angle_linear(angle):
                                     # E -- B -- C is linear, change indices and test angle F -- B -- C
                                     atom_a = atom_e
@@ -536,7 +696,7 @@ def determine_d_atoms_from_connectivity(zmat, xyz, coords, connectivity, a_atoms
                             # atom A is connected to at least one other atom not in this linear chain
                             for a_neighbor in connectivity[atom_a]:
                                 if a_neighbor != atom_b:
-                                    angle = calculate_angle(coords=coords, atoms=[a_neighbor, atom_b, atom_c])
+                                    angle = _calculate_angle(coords=coords, atoms=[a_neighbor, atom_b, atom_c])
                                     if not is_angle_linear(angle) \
                                             and a_neighbor in list(zmat['map'].values()) \
                                             and key_by_val(zmat['map'], a_neighbor) not in d_atoms:
@@ -559,8 +719,8 @@ def determine_d_atoms_from_connectivity(zmat, xyz, coords, connectivity, a_atoms
     if len(d_atoms) == 3 and len(connectivity[atom_index]) > 2 \
             and connectivity[atom_index][2] in list(zmat['map'].values()) \
             and connectivity[atom_index][2] not in [zmat['map'][d_atom] for d_atom in d_atoms[1:]]:
-        angle = calculate_angle(coords=coords, atoms=[zmat['map'][d_atom] for d_atom in d_atoms[1:]]
-                                                     + [connectivity[atom_index][2]])
+        angle = _calculate_angle(coords=coords, atoms=[zmat['map'][d_atom] for d_atom in d_atoms[1:]]
+                                                      + [connectivity[atom_index][2]])
         if not is_angle_linear(angle) \
                 and connectivity[atom_index][2] in list(zmat['map'].values()) \
                 and key_by_val(zmat['map'], connectivity[atom_index][2]) not in d_atoms:
@@ -638,7 +798,7 @@ def _add_nth_atom_to_zmat(zmat, xyz, connectivity, n, atom_index, constraints):
         # calculate the angle, add a dummy atom if needed
         added_dummy = False
         if a_atoms is not None and all([not re.match(r'X\d', str(zmat['map'][atom])) for atom in a_atoms[1:]]):
-            angle = calculate_angle(coords=coords, atoms=[atom_index] + [zmat['map'][atom] for atom in a_atoms[1:]])
+            angle = _calculate_angle(coords=coords, atoms=[atom_index] + [zmat['map'][atom] for atom in a_atoms[1:]])
             if is_angle_linear(angle):
                 # the angle is too close to 180 (or 0) degrees, add a dummy atom
                 zmat, coords, n, r_atoms, a_atoms, specific_last_d_atom = \
@@ -785,8 +945,17 @@ def add_dummy_atom(zmat, xyz, coords, connectivity, r_atoms, a_atoms, n, atom_in
         #  A
         zmat['vars'][d_str] = calculate_dihedral_angle(
             coords=coords, torsion=[atom_index] + [zmat['map'][atom] for atom in d_atoms[1:]])
-    # update xyz with the dummy atom (useful when this atom is used to define dihedrals of other atoms)
-    coords = _add_nth_atom_to_coords(zmat=zmat, coords=list(coords), i=n)
+    # update xyz with the dummy atom (useful when this atom is used to define dihedrals of other atoms),
+    # it is placed 1 Angstrom away from atom C (r_atoms[1]) with a B-C-X angle of 90 degrees
+    coords = list(coords)
+    if d_str is not None:
+        a, b, c = [np.array([coords[atom]], dtype=np.float64) for atom in d_atoms[:0:-1]]
+        dihedral = math.radians(zmat['vars'][d_str])
+        coords.append(tuple(_place_atoms(a=a, b=b, c=c, d_x=np.zeros(1), d_y=np.array([math.cos(dihedral)]),
+                                         d_z=np.array([math.sin(dihedral)]))[0].tolist()))
+    else:
+        # the dummy atom is the 3rd atom in the zmat, place it on the YZ plane (see ``ZMatPlan.to_coords()``)
+        coords.append((0.0, 1.0, coords[r_atoms[1]][2]))
     if connectivity is not None:
         # update the connectivity dict to reflect that X is connected to the respective atom (r_atoms[1]),
         # this will help later in avoiding linear angles in the last three indices of a dihedral.
@@ -814,10 +983,8 @@ def zmat_to_coords(zmat, keep_dummy=False, skip_undefined=False):
     Most common isotopes assumed, if this is not the case, then isotopes should be reassigned to the xyz.
     This function assumes that all zmat variables relate to already defined atoms with a lower index in the zmat.
 
-    This function implements the SN-NeRF algorithm as described in:
-    J. Parsons, J.B. Holmes, J.M Rojas, J. Tsai, C.E.M. Strauss, "Practical Conversion from Torsion Space to Cartesian
-    Space for In Silico Protein Synthesis", Journal of Computational Chemistry 2005, 26 (10), 1063-1068,
-    https://doi.org/10.1002/jcc.20237
+    The conversion is done by a (cached) compiled ``ZMatPlan`` (see its docstring for the SN-NeRF reference).
+    Use ``get_zmat_plan()`` directly to convert many sets of variable values of the same zmat at once.
 
     Tested in converterTest.py rather than zmatTest
 
@@ -832,6 +999,29 @@ def zmat_to_coords(zmat, keep_dummy=False, skip_undefined=False):
     Returns:
         list: The atomic symbols corresponding to the coordinates.
 
+    Raises:
+        ZMatError: If zmat if of wrong type or does not contain all keys.
+    """
+    plan = get_zmat_plan(zmat, keep_dummy=keep_dummy, skip_undefined=skip_undefined)
+    coords = plan.to_coords(plan.get_params(zmat['vars']))
+    return [tuple(coord) for coord in coords.tolist()], list(plan.symbols)
+
+
+def get_zmat_plan(zmat, keep_dummy=False, skip_undefined=False):
+    """
+    Get a compiled plan for converting zmats of the same skeleton (symbols, coords, map, and variable names)
+    into cartesian coordinates. Plans are cached per skeleton, so zmats which only differ by their variable values
+    (e.g., modified dihedral angles) are parsed only once.
+
+    Args:
+        zmat (dict): The zmat.
+        keep_dummy (bool): Whether to keep dummy atoms ('X'), ``True`` to keep, default is ``False``.
+        skip_undefined (bool): Whether to skip atoms with undefined variables, instead of raising an error.
+                               ``True`` to skip, default is ``False``.
+
+    Returns:
+        ZMatPlan: The compiled zmat plan.
+
     Raises:
         ZMatError: If zmat if of wrong type or does not contain all keys.
     """
@@ -842,115 +1032,202 @@ def zmat_to_coords(zmat, keep_dummy=False, skip_undefined=False):
     if not len(zmat['symbols']) == len(zmat['coords']) == len(zmat['map']):
         raise ZMatError(f'zmat sections symbols, coords, and map have different lengths: {len(zmat["symbols"])}, '
                         f'{len(zmat["coords"])}, and {len(zmat["map"])}, respectively.')
-    var_list = list(zmat['vars'].keys())
-    coords_to_skip = list()
-    for i, coords in enumerate(zmat['coords']):
-        for coord in coords:
-            if coord is not None and coord not in var_list:
-                if skip_undefined:
-                    coords_to_skip.append(i)
-                else:
-                    raise ZMatError(f'The parameter {coord} was not found in the "vars" section of '
-                                    f'the zmat:\n{zmat["vars"]}')
-
-    coords = list()
-    for i in range(len(zmat['symbols'])):
-        coords = _add_nth_atom_to_coords(zmat=zmat, coords=coords, i=i, coords_to_skip=coords_to_skip)
-
-    # reorder the xyz according to the zmat map and remove dummy atoms
-    ordered_coords, ordered_symbols = list(), list()
-    for i in range(len([symbol for symbol in zmat['symbols'] if symbol != 'X'])):
-        zmat_index = key_by_val(zmat['map'], i)
-        if zmat_index < len(coords) and i not in coords_to_skip:
-            ordered_coords.append(coords[zmat_index])
-            ordered_symbols.append(zmat['symbols'][zmat_index])
-    if keep_dummy:
-        for key, val in zmat['map'].items():
-            if 'X' in str(val):
-                ordered_coords.append(coords[key])
-                ordered_symbols.append(zmat['symbols'][key])
-
-    return ordered_coords, ordered_symbols
-
-
-def _add_nth_atom_to_coords(zmat, coords, i, coords_to_skip=None):
+    key = (tuple(zmat['symbols']), tuple(tuple(coords) for coords in zmat['coords']), tuple(zmat['vars'].keys()),
+           tuple(zmat['map'].items()), keep_dummy, skip_undefined)
+    plan = ZMAT_PLANS.get(key)
+    if plan is None:
+        plan = ZMatPlan(zmat=zmat, keep_dummy=keep_dummy, skip_undefined=skip_undefined)
+        if len(ZMAT_PLANS) >= ZMAT_PLAN_CACHE_SIZE:
+            del ZMAT_PLANS[next(iter(ZMAT_PLANS))]  # evict the oldest plan
+        ZMAT_PLANS[key] = plan
+    return plan
+
+
+class ZMatPlan(object):
     """
-    Add the n-th atom to the coords (n >= 0).
+    A zmat compiled into index arrays and parameter slots, converting many sets of zmat variable values of the same
+    skeleton into cartesian coordinates using a batched NeRF, vectorized over the sets of values.
+    Parameter vectors hold the zmat variable values ordered as ``variables`` (distances in Angstrom,
+    angles in degrees). Use ``get_zmat_plan()`` to get a cached plan rather than compiling one.
+
+    This implements the SN-NeRF algorithm as described in:
+    J. Parsons, J.B. Holmes, J.M Rojas, J. Tsai, C.E.M. Strauss, "Practical Conversion from Torsion Space to Cartesian
+    Space for In Silico Protein Synthesis", Journal of Computational Chemistry 2005, 26 (10), 1063-1068,
+    https://doi.org/10.1002/jcc.20237
 
     Args:
-        zmat (dict): The zmat.
-        coords (list): The coordinates to be updated (not the entire xyz dict).
-        i (int): The atom number in the zmat to be added to the coords (0-indexed)
-        coords_to_skip (list, optional): Entries are indices to skip.
+        zmat (dict): The zmat, only the variable names are used from its 'vars' section.
+        keep_dummy (bool): Whether to keep dummy atoms ('X'), ``True`` to keep, default is ``False``.
+        skip_undefined (bool): Whether to skip atoms with undefined variables, instead of raising an error.
+                               ``True`` to skip, default is ``False``.
+
+    Attributes:
+        variables (tuple): The zmat variable names, in the order of the parameter vectors.
+        symbols (tuple): The atomic symbols corresponding to the resulting coordinates.
+        num_rows (int): The number of atoms placed by the plan (before reordering according to the zmat map).
+        order (np.ndarray): Indices of the placed atoms, ordered according to the zmat map.
+        placements (list): Entries are tuples of the row index and the R, A, and D parameter slots of the atoms placed
+                           relative to three previous atoms, and the A, B, C row indices of these reference atoms.
+
+    Raises:
+        ZMatError: If a zmat parameter isn't a variable and ``skip_undefined`` is ``False``.
+    """
+
+    def __init__(self, zmat, keep_dummy=False, skip_undefined=False):
+        self.variables = tuple(zmat['vars'].keys())
+        slots = {var: i for i, var in enumerate(self.variables)}
+        coords_to_skip = list()
+        for i, coords in enumerate(zmat['coords']):
+            for coord in coords:
+                if coord is not None and coord not in slots:
+                    if skip_undefined:
+                        coords_to_skip.append(i)
+                    else:
+                        raise ZMatError(f'The parameter {coord} was not found in the "vars" section of '
+                                        f'the zmat:\n{zmat["vars"]}')
+
+        # compile the placement of atoms, rows are indexed by the order in which atoms are placed
+        num_atoms = len(zmat['symbols'])
+        self.num_rows = min(num_atoms, 3) + len([i for i in range(3, num_atoms) if i not in coords_to_skip])
+        self.r1_slot = slots[zmat['coords'][1][0]] if num_atoms > 1 else None
+        self.r2_slot, self.a2_slot, self.b2_row = None, None, None
+        if num_atoms > 2:
+            r_key, a_key = zmat['coords'][2][0], zmat['coords'][2][1]
+            self.r2_slot, self.a2_slot = slots[r_key], slots[a_key]
+            self.b2_row = [indices for indices in get_atom_indices_from_zmat_parameter(r_key) if indices[0] == 2][0][1]
+        self.placements, row = list(), 3
+        for i in range(3, num_atoms):
+            if i not in coords_to_skip:
+                d_indices = [indices for indices in get_atom_indices_from_zmat_parameter(zmat['coords'][i][2])
+                             if indices[0] == i][0]
+                if any(index >= row for index in d_indices[1:]):
+                    raise ZMatError(f'Atom {i} of the zmat is defined relative to atoms which were not placed yet '
+                                    f'({d_indices[1:]}).')
+                self.placements.append((row, slots[zmat['coords'][i][0]], slots[zmat['coords'][i][1]],
+                                        slots[zmat['coords'][i][2]], d_indices[3], d_indices[2], d_indices[1]))
+                row += 1
+
+        # reorder the coordinates according to the zmat map and remove dummy atoms
+        order, symbols = list(), list()
+        for i in range(len([symbol for symbol in zmat['symbols'] if symbol != 'X'])):
+            zmat_index = key_by_val(zmat['map'], i)
+            if zmat_index < self.num_rows and i not in coords_to_skip:
+                order.append(zmat_index)
+                symbols.append(zmat['symbols'][zmat_index])
+        if keep_dummy:
+            for key, val in zmat['map'].items():
+                if 'X' in str(val):
+                    order.append(key)
+                    symbols.append(zmat['symbols'][key])
+        if any(index >= self.num_rows for index in order):
+            raise ZMatError(f'Could not place all atoms of the zmat, only {self.num_rows} atoms are defined.')
+        self.order = np.array(order, dtype=int)
+        self.symbols = tuple(symbols)
+
+    def get_params(self, zmat_vars):
+        """
+        Get parameter vectors from zmat variable values.
+
+        Args:
+            zmat_vars (dict, list): The 'vars' section of a zmat, or a list of such sections.
+
+        Returns:
+            np.ndarray: A P-length parameter vector, or an M x P array of parameter vectors if a list was given.
+        """
+        if isinstance(zmat_vars, dict):
+            return np.array([zmat_vars[var] for var in self.variables], dtype=np.float64)
+        return np.array([[vars_[var] for var in self.variables] for vars_ in zmat_vars], dtype=np.float64)
+
+    def to_coords(self, params):
+        """
+        Convert parameter vectors into cartesian coordinates, vectorized over all parameter vectors.
+
+        Args:
+            params (np.ndarray): A P-length parameter vector, or an M x P array of parameter vectors.
+
+        Returns:
+            np.ndarray: The N x 3 cartesian coordinates, or M x N x 3 coordinates if an M x P array was given.
+        """
+        params = np.asarray(params, dtype=np.float64)
+        single = params.ndim == 1
+        if single:
+            params = params[np.newaxis]
+        rows = np.zeros((params.shape[0], self.num_rows, 3), dtype=np.float64)  # the 1st atom is at the origin
+        if self.r1_slot is not None:
+            # atom B is placed on axis Z, distant by the AB bond length
+            rows[:, 1, 2] = params[:, self.r1_slot]
+        if self.r2_slot is not None:
+            # atom C is placed on the YZ plane, either atom A (case 1) or atom B (case 2) is at the origin:
+            #  y
+            #  ^                    C                         C
+            #  |           (1)       \        or     (2)     /
+            #  L__ > z           A -- B                    B -- A
+            # In case 1, we need to deduct len(B-C) from the z coordinate of atom B,
+            # but in case 2 we need to take the positive value of len(B-C).
+            # The above is also true if alpha(A-B-C) is > 90 degrees.
+            bc_length = params[:, self.r2_slot]
+            alpha = params[:, self.a2_slot]
+            alpha = np.radians(np.where(alpha < 180, alpha, 360 - alpha))
+            b_z = rows[:, self.b2_row, 2]
+            rows[:, 2, 1] = bc_length * np.sin(alpha)
+            rows[:, 2, 2] = np.where(b_z != 0, b_z - bc_length * np.cos(alpha), bc_length * np.cos(alpha))
+        if self.placements:
+            placements = np.array(self.placements, dtype=int)
+            cd_lengths = params[:, placements[:, 1]]
+            bcd_angles = np.radians(params[:, placements[:, 2]])
+            abcd_dihedrals = np.radians(params[:, placements[:, 3]])
+            # place all atoms D in their default coordinate systems at once
+            d_x = - cd_lengths * np.cos(bcd_angles)
+            d_y = cd_lengths * np.sin(bcd_angles) * np.cos(abcd_dihedrals)
+            d_z = cd_lengths * np.sin(bcd_angles) * np.sin(abcd_dihedrals)
+            for k, (row, _, _, _, a_row, b_row, c_row) in enumerate(self.placements):
+                rows[:, row] = _place_atoms(a=rows[:, a_row], b=rows[:, b_row], c=rows[:, c_row],
+                                            d_x=d_x[:, k], d_y=d_y[:, k], d_z=d_z[:, k])
+        coords = rows[:, self.order]
+        return coords[0] if single else coords
+
+
+def _place_atoms(a, b, c, d_x, d_y, d_z):
+    """
+    Place M atoms D relative to their reference atoms A, B, and C (a NeRF step, see ``ZMatPlan``).
+
+    Args:
+        a (np.ndarray): The M x 3 coordinates of atoms A.
+        b (np.ndarray): The M x 3 coordinates of atoms B.
+        c (np.ndarray): The M x 3 coordinates of atoms C.
+        d_x (np.ndarray): The x coordinates of the M atoms D in their default coordinate systems.
+        d_y (np.ndarray): The y coordinates of the M atoms D in their default coordinate systems.
+        d_z (np.ndarray): The z coordinates of the M atoms D in their default coordinate systems.
+
+    Returns:
+        np.ndarray: The M x 3 coordinates of atoms D.
+    """
+    # atoms B and C aren't necessarily connected in the zmat, calculate from coords
+    ab = b - a  # a vector pointing from atom A to atom B
+    bc = c - b
+    ubc = bc / np.sqrt(np.sum(bc * bc, axis=1))[:, None]  # a normalized vector pointing from B to C
+    n = _cross(ab, ubc)
+    un = n / np.sqrt(np.sum(n * n, axis=1))[:, None]
+    un_cross_ubc = _cross(un, ubc)
+    # rotate the coordinate system into the reference frame of orientation defined by A, B, C,
+    # and add the coordinates of atom C to the resulting atom D
+    return c + d_x[:, None] * ubc + d_y[:, None] * un_cross_ubc + d_z[:, None] * un
+
+
+def _cross(v1, v2):
+    """
+    A cross product of vectors stacked in M x 3 arrays (faster than ``np.cross`` for small arrays).
+
+    Args:
+        v1 (np.ndarray): The first M x 3 vectors.
+        v2 (np.ndarray): The second M x 3 vectors.
 
     Returns:
-        list: The updated coords.
+        np.ndarray: The M x 3 cross products.
     """
-    coords_to_skip = coords_to_skip or list()
-    if i == 0:
-        # add the 1st atom
-        coords.append((0.0, 0.0, 0.0))  # atom A is placed at the origin
-    elif i == 1:
-        # add the 2nd atom
-        r_key = zmat['coords'][i][0]
-        coords.append((0.0, 0.0, zmat['vars'][r_key]))  # atom B is placed on axis Z, distant by the AB bond length
-    elif i == 2:
-        # add the 3rd atom (atom "C")
-        r_key, a_key = zmat['coords'][i][0], zmat['coords'][i][1]
-        bc_length = zmat['vars'][r_key]
-        alpha = zmat['vars'][a_key]
-        alpha = math.radians(alpha if alpha < 180 else 360 - alpha)
-        b_index = [indices for indices in get_atom_indices_from_zmat_parameter(r_key) if indices[0] == i][0][1]
-        b_z = coords[b_index][2]
-        c_y = bc_length * math.sin(alpha)
-        # we differentiate between two cases for c_z:
-        # Either atom A is at the origin (case 1), or atom B is at the origin (case 2).
-        # One of them has to be at the origin (0, 0, 0), since we're adding the 3rd atom (so either A or B were 1st)
-        #  y
-        #  ^                    C                         C
-        #  |           (1)       \        or     (2)     /
-        #  L__ > z           A -- B                    B -- A
-        # In case 1, we need to deduct len(B-C) from the z coordinate of atom B,
-        # but in case 2 we need to take the positive value of len(B-C).
-        # The above is also true if alpha(A-B-C) is > 90 degrees.
-        c_z = b_z - bc_length * math.cos(alpha) if b_z else bc_length * math.cos(alpha)
-        coords.append((0.0, c_y, c_z))
-    elif i not in coords_to_skip:
-        d_indices = [indices for indices in get_atom_indices_from_zmat_parameter(zmat['coords'][i][2])
-                     if indices[0] == i][0]
-        a_index, b_index, c_index = d_indices[3], d_indices[2], d_indices[1]
-        # atoms B and C aren't necessarily connected in the zmat, calculate from coords
-        bc_length = get_vector_length([coords[c_index][0] - coords[b_index][0],
-                                       coords[c_index][1] - coords[b_index][1],
-                                       coords[c_index][2] - coords[b_index][2]])
-        cd_length = zmat['vars'][zmat['coords'][i][0]]
-        bcd_angle = math.radians(zmat['vars'][zmat['coords'][i][1]])
-        abcd_dihedral = math.radians(zmat['vars'][zmat['coords'][i][2]])
-        # a vector pointing from atom A to atom B:
-        ab = [(coords[b_index][0] - coords[a_index][0]),
-              (coords[b_index][1] - coords[a_index][1]),
-              (coords[b_index][2] - coords[a_index][2])]
-        # a normalized vector pointing from atom B to atom C:
-        ubc = [(coords[c_index][0] - coords[b_index][0]) / bc_length,
-               (coords[c_index][1] - coords[b_index][1]) / bc_length,
-               (coords[c_index][2] - coords[b_index][2]) / bc_length]
-        n = np.cross(ab, ubc)
-        un = n / get_vector_length(n)
-        un_cross_ubc = np.cross(un, ubc)
-
-        # the transformation matrix:
-        m = np.array([[ubc[0], un_cross_ubc[0], un[0]],
-                      [ubc[1], un_cross_ubc[1], un[1]],
-                      [ubc[2], un_cross_ubc[2], un[2]]], np.float64)
-
-        # place atom D in a default coordinate system
-        d = np.array([- cd_length * math.cos(bcd_angle),
-                      cd_length * math.sin(bcd_angle) * math.cos(abcd_dihedral),
-                      cd_length * math.sin(bcd_angle) * math.sin(abcd_dihedral)])
-        d = m.dot(d)  # rotate the coordinate system into the reference frame of orientation defined by A, B, C
-        # add the coordinates of atom C the the resulting atom D:
-        coords.append((d[0] + coords[c_index][0], d[1] + coords[c_index][1], d[2] + coords[c_index][2]))
-    return coords
+    return np.stack([v1[:, 1] * v2[:, 2] - v1[:, 2] * v2[:, 1],
+                     v1[:, 2] * v2[:, 0] - v1[:, 0] * v2[:, 2],
+                     v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0]], axis=1)
 
 
 def check_atom_r_constraints(atom_index, constraints):
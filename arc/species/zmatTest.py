@@ -7,6 +7,8 @@ This module contains unit tests of the arc.species.species module
 
 import unittest
 
+import numpy as np
+
 import arc.species.zmat as zmat
 from arc.exceptions import ZMatError
 from arc.species.species import ARCSpecies
@@ -1084,6 +1086,40 @@ class TestZMat(unittest.TestCase):
                       'map': {0: 3, 1: 1, 2: 0, 3: 2}}
         self.assertTrue(zmat._compare_zmats(z, expected_z, verbose=True))
 
+    def test_xyz_to_zmat_template(self):
+        """Test reusing a cached zmat template for another geometry of the same species"""
+        mol = ARCSpecies(label='CH3NH2', xyz=self.ch3nh2, smiles='CN').mol
+        key = zmat.get_zmat_template_key(self.ch3nh2, mol=mol)
+        zmat.ZMAT_TEMPLATES.pop(key, None)
+        zmat_1 = zmat.xyz_to_zmat(self.ch3nh2, mol=mol, consolidate=False)
+        self.assertIn(key, zmat.ZMAT_TEMPLATES)
+        self.assertEqual(zmat.xyz_to_zmat(self.ch3nh2, mol=mol, consolidate=False), zmat_1)
+
+        # a scaled geometry has the same angles and dihedrals and scaled distances
+        scaled_xyz = {'symbols': self.ch3nh2['symbols'], 'isotopes': self.ch3nh2['isotopes'],
+                      'coords': tuple(tuple(1.1 * c for c in coord) for coord in self.ch3nh2['coords'])}
+        zmat_2 = zmat.xyz_to_zmat(scaled_xyz, mol=mol, consolidate=False)
+        self.assertEqual(zmat.get_zmat_template_key(scaled_xyz, mol=mol), key)
+        self.assertEqual(zmat_2['coords'], zmat_1['coords'])
+        self.assertEqual(zmat_2['map'], zmat_1['map'])
+        for var, value in zmat_1['vars'].items():
+            self.assertAlmostEqual(zmat_2['vars'][var], 1.1 * value if var[0] == 'R' else value, places=3)
+
+        # the same zmat is constructed without the template
+        zmat.ZMAT_TEMPLATES.pop(key)
+        zmat_3 = zmat.xyz_to_zmat(scaled_xyz, mol=mol, consolidate=False)
+        self.assertEqual(zmat_3, zmat_2)
+
+        # a linear angle changes the zmat construction, and zmats with dummy atoms aren't templated
+        co2 = ARCSpecies(label='CO2', xyz=self.co2, smiles='O=C=O')
+        bent_co2 = {'symbols': ('O', 'C', 'O'), 'isotopes': (16, 12, 16),
+                    'coords': ((-1.4, 0.3, 0.0), (0.0, 0.0, 0.0), (1.4, 0.3, 0.0))}
+        zmat_4 = zmat.xyz_to_zmat(bent_co2, mol=co2.mol)
+        self.assertNotIn('X', zmat_4['symbols'])
+        self.assertIn(zmat.get_zmat_template_key(bent_co2, mol=co2.mol), zmat.ZMAT_TEMPLATES)
+        zmat_5 = zmat.xyz_to_zmat(self.co2, mol=co2.mol)
+        self.assertIn('X', zmat_5['symbols'])
+
     def test_consolidate_zmat(self):
         """Test consolidating a zmat"""
         # test consolidating CH4
@@ -1230,6 +1266,36 @@ class TestZMat(unittest.TestCase):
                               13: 13, 14: 14, 15: 15, 16: 16, 17: 17, 18: 18}}
         self.assertTrue(zmat._compare_zmats(zmat.consolidate_zmat(z), expected_z, verbose=True))
 
+    def test_get_zmat_plan(self):
+        """Test converting many sets of zmat variable values into coordinates using a compiled zmat plan"""
+        zmat_ = zmat.xyz_to_zmat(self.ch4)
+        plan = zmat.get_zmat_plan(zmat_)
+        self.assertIs(zmat.get_zmat_plan(zmat_), plan)  # cached per zmat skeleton
+        self.assertEqual(plan.variables, tuple(zmat_['vars'].keys()))
+        self.assertEqual(plan.symbols, ('C', 'H', 'H', 'H', 'H'))
+        coords, symbols = zmat.zmat_to_coords(zmat_)
+        self.assertEqual(symbols, ['C', 'H', 'H', 'H', 'H'])
+        np.testing.assert_allclose(plan.to_coords(plan.get_params(zmat_['vars'])), np.array(coords), atol=1e-12)
+
+        d_key = [key for key in zmat_['vars'].keys() if key[0] == 'D'][0]
+        vars_list = list()
+        for dihedral in [0.0, 60.0, 120.0, 300.0]:
+            vars_ = zmat_['vars'].copy()
+            vars_[d_key] = dihedral
+            vars_list.append(vars_)
+        params = plan.get_params(vars_list)
+        self.assertEqual(params.shape, (4, len(plan.variables)))
+        batch_coords = plan.to_coords(params)
+        self.assertEqual(batch_coords.shape, (4, 5, 3))
+        for vars_, coords_ in zip(vars_list, batch_coords):
+            new_zmat = {'symbols': zmat_['symbols'], 'coords': zmat_['coords'], 'vars': vars_, 'map': zmat_['map']}
+            self.assertIs(zmat.get_zmat_plan(new_zmat), plan)
+            np.testing.assert_allclose(coords_, np.array(zmat.zmat_to_coords(new_zmat)[0]), atol=1e-12)
+
+        bad_zmat = {'symbols': zmat_['symbols'], 'coords': zmat_['coords'], 'vars': {}, 'map': zmat_['map']}
+        with self.assertRaises(ZMatError):
+            zmat.get_zmat_plan(bad_zmat)
+
     def test_get_atom_indices_from_zmat_parameter(self):
         """Test attaining atom indices from the zmat string parameter"""
         param = 'R_0_1'